@@ -17,6 +17,7 @@ import warnings
 import pandas as pd
 
 from pyeconlab import WDI, CIDAtlasDataConstructor, PENN
+from pyeconlab.util import groupby_sum_observed
 from dataset_info import SOURCE_DIR, TARGET_DATASET_DIR
 
 #---------#
@@ -84,7 +85,7 @@ if COMPILE_ATLAS:
 					if level != 4:
 						atlas.dataset[productid] = atlas.dataset["hs4"].apply(lambda x: x[0:level])
 				#-Collapse Levels-#
-				countrydata = atlas.dataset[idx+["value"]].groupby(idx, as_index=False).sum()
+				countrydata = groupby_sum_observed(atlas.dataset, idx, ["value"])  	#-eiso3c/iiso3c are categorical-#
 				store.put("L%s"%level, countrydata, format="table")
 				del countrydata
 			store.close()
@@ -116,7 +117,7 @@ if COMPILE_ATLAS:
 					idx = ["year", "eiso3c", "hs4"]
 				elif dtype == "import": 
 					idx = ["year", "iiso3c", "hs4"]
-			countrydata = countrydata.groupby(idx).sum()["rca"].reset_index()
+			countrydata = groupby_sum_observed(countrydata, idx, ["rca"])
 			store.put("L4", countrydata, format="table")
 			store.close()
 			del countrydata
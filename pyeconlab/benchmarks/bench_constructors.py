@@ -0,0 +1,57 @@
+"""
+Benchmarks: Dataset Constructors
+================================
+
+Ingestion benchmarks for NBERWTFConstructor and BACIConstructor on synthetic RAW source files
+(pyeconlab.trade.dataset.synthetic) with a total number of rows as the parameter
+
+Notes
+-----
+    1. Source files are generated in setup() into a temporary directory (not timed)
+    2. 10M rows is skipped unless the environment variable PYECONLAB_BENCH_SLOW=1 is set
+
+"""
+
+import shutil
+import tempfile
+
+from pyeconlab.trade.dataset import NBERWTFConstructor, BACIConstructor
+from pyeconlab.trade.dataset.synthetic import generate_nberwtf_source, generate_baci_source
+
+from .bench_systems import skip_slow
+
+ROWS = [100000, 1000000, 10000000]
+
+class RowsBenchmark(object):
+    params = ROWS
+    param_names = ['rows']
+    timeout = 3600
+    slow_rows = [10000000]
+
+    def teardown(self, rows):
+        shutil.rmtree(self.source_dir, ignore_errors=True)
+
+class TimeNBERWTFConstructor(RowsBenchmark):
+
+    def setup(self, rows):
+        skip_slow(rows, self.slow_rows)
+        self.source_dir = tempfile.mkdtemp(prefix='pyeconlab-bench-')
+        self.years = [1988, 1989, 1990]
+        generate_nberwtf_source(self.source_dir, years=self.years, num_rows=rows)
+
+    def time_load_raw_from_dta(self, rows):
+        NBERWTFConstructor(source_dir=self.source_dir, years=self.years, ftype='dta', apply_fixes=False, verbose=False)
+
+    def time_load_raw_from_dta_apply_fixes(self, rows):
+        NBERWTFConstructor(source_dir=self.source_dir, years=self.years, ftype='dta', verbose=False)
+
+class TimeBACIConstructor(RowsBenchmark):
+
+    def setup(self, rows):
+        skip_slow(rows, self.slow_rows)
+        self.source_dir = tempfile.mkdtemp(prefix='pyeconlab-bench-')
+        self.years = [1998, 1999, 2000]
+        generate_baci_source(self.source_dir, classification='HS96', years=self.years, num_rows=rows)
+
+    def time_load_raw_from_csv(self, rows):
+        BACIConstructor(source_dir=self.source_dir, source_classification='HS96', years=self.years, ftype='csv', verbose=False)
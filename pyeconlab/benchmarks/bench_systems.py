@@ -0,0 +1,184 @@
+"""
+Benchmarks: ProductLevelExportSystem and DynamicProductLevelExportSystem
+========================================================================
+
+asv style benchmark classes (setup() + time_<name>() methods parameterised by scale). Run with ``asv run`` or with
+the runner in this directory (``python benchmarks/run.py``)
+
+Notes
+-----
+    1. Each scale is a synthetic panel from benchmarks.synthetic (SITC3, SITC4, HS6)
+    2. Pure Python loop implementations (proximity_matrix_pandas(), proximity_matrix_numpy() and
+       compute_probable_improbable_emergence()) take minutes to hours at the larger scales. These scales are skipped
+       (setup() raises NotImplementedError as in asv) unless the environment variable PYECONLAB_BENCH_SLOW=1 is set
+
+"""
+
+import os
+import shutil
+import tempfile
+import warnings
+
+from pyeconlab.trade.systems import ProductLevelExportSystem, DynamicProductLevelExportSystem
+
+from .synthetic import synthetic_cross_section, synthetic_panel
+
+SCALE_NAMES = ['SITC3', 'SITC4', 'HS6']
+YEARS = (2000, 2001)
+
+## -- Helpers -- ##
+
+DATA_CACHE = dict()
+
+def cached(function, *args):
+    """ Synthetic data is generated once per process for each set of arguments """
+    key = (function.__name__,) + args
+    if key not in DATA_CACHE:
+        DATA_CACHE[key] = function(*args)
+    return DATA_CACHE[key]
+
+def skip_slow(scale, slow_scales):
+    """ Skip a Slow Scale (asv convention: raise NotImplementedError in setup()) """
+    if scale in slow_scales and os.environ.get('PYECONLAB_BENCH_SLOW', '0') != '1':
+        raise NotImplementedError("Skipped at scale %s (set PYECONLAB_BENCH_SLOW=1 to run)" % scale)
+
+def build_system(scale, stage='data'):
+    """
+    ProductLevelExportSystem for a Single Synthetic Year
+
+    Parameters
+    ----------
+    stage   :   str, optional(default='data')
+                'data', 'rca', 'mcp' or 'mcc' (compute_mcc() and compute_mpp() as prerequisites of the ECI/PCI)
+
+    """
+    system = ProductLevelExportSystem()
+    system.from_df(cached(synthetic_cross_section, scale).copy(), 'synthetic', 'synthetic', ['DataFrame'], YEARS[0])
+    if stage in ['rca', 'mcp', 'mcc']:
+        system.rca_matrix(complete_data=True)
+    if stage in ['mcp', 'mcc']:
+        system.mcp_matrix()
+    if stage == 'mcc':
+        system.compute_mcc()
+        system.compute_mpp()
+    return system
+
+def build_dynamic_system(scale):
+    """ DynamicProductLevelExportSystem (Global Panel) for YEARS """
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        system = DynamicProductLevelExportSystem()
+        system.from_df(cached(synthetic_panel, scale, YEARS).copy())
+    system.global_panel = True
+    return system
+
+## -- Benchmarks -- ##
+
+class ScaleBenchmark(object):
+    params = SCALE_NAMES
+    param_names = ['scale']
+    timeout = 3600
+    slow_scales = []
+
+class TimeRCA(ScaleBenchmark):
+
+    def setup(self, scale):
+        self.system = build_system(scale, stage='data')
+
+    def time_rca_matrix(self, scale):
+        self.system.rca_matrix(complete_data=True)
+
+class TimeMcp(ScaleBenchmark):
+
+    def setup(self, scale):
+        self.system = build_system(scale, stage='rca')
+
+    def time_mcp_matrix(self, scale):
+        self.system.mcp_matrix()
+
+class TimeProximity(ScaleBenchmark):
+
+    def setup(self, scale):
+        self.system = build_system(scale, stage='mcp')
+        self.tempdir = tempfile.mkdtemp(prefix='pyeconlab-bench-')
+
+    def teardown(self, scale):
+        shutil.rmtree(self.tempdir, ignore_errors=True)
+
+    def time_proximity_matrix_numba(self, scale):
+        self.system.proximity_matrix_numba()
+
+    def time_proximity_matrix_packed(self, scale):
+        self.system.proximity_matrix_packed()
+
+    def time_proximity_matrix_sparse_top_k(self, scale):
+        self.system.proximity_matrix_sparse(top_k=20)
+
+    def time_proximity_matrix_tiled(self, scale):
+        self.system.proximity_matrix_tiled(os.path.join(self.tempdir, 'proximity.npy'))
+
+    def time_compute_proximity_symmetric(self, scale):
+        self.system.compute_proximity(matrix_type='symmetric')
+
+class TimeProximityNumpy(ScaleBenchmark):
+    slow_scales = ['HS6']
+
+    def setup(self, scale):
+        skip_slow(scale, self.slow_scales)
+        self.system = build_system(scale, stage='mcp')
+
+    def time_proximity_matrix_numpy(self, scale):
+        self.system.proximity_matrix_numpy()
+
+class TimeProximityPandas(ScaleBenchmark):
+    slow_scales = ['SITC4', 'HS6']
+
+    def setup(self, scale):
+        skip_slow(scale, self.slow_scales)
+        self.system = build_system(scale, stage='mcp')
+
+    def time_proximity_matrix_pandas(self, scale):
+        self.system.proximity_matrix_pandas()
+
+class TimeComplexity(ScaleBenchmark):
+
+    def setup(self, scale):
+        self.system = build_system(scale, stage='mcc')
+
+    def time_compute_mcc(self, scale):
+        self.system.compute_mcc()
+
+    def time_compute_mpp(self, scale):
+        self.system.compute_mpp()
+
+    def time_compute_eci(self, scale):
+        self.system.compute_eci()
+
+    def time_compute_pci(self, scale):
+        self.system.compute_pci()
+
+    def time_compute_iterated_countryproduct_complexity(self, scale):
+        self.system.compute_iterated_countryproduct_complexity()
+
+class TimeDynamicBuild(ScaleBenchmark):
+
+    def setup(self, scale):
+        self.data = cached(synthetic_panel, scale, YEARS)
+
+    def time_from_df(self, scale):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            DynamicProductLevelExportSystem().from_df(self.data.copy())
+
+class TimeEmergence(ScaleBenchmark):
+    slow_scales = ['HS6']
+
+    def setup(self, scale):
+        skip_slow(scale, self.slow_scales)
+        self.system = build_dynamic_system(scale)
+        self.system.rca_matrices(complete_data=True)
+        self.system.mcp_matrices()
+        self.system.proximity_matrices()
+
+    def time_compute_probable_improbable_emergence(self, scale):
+        self.system.compute_probable_improbable_emergence()
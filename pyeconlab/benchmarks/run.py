@@ -0,0 +1,176 @@
+"""
+Benchmark Runner
+================
+
+Minimal runner for the asv style benchmarks in this directory (for use where asv is not installed)
+
+Usage
+-----
+    python benchmarks/run.py                                        Run all benchmarks and write results/<commit>.json
+    python benchmarks/run.py --bench Proximity --scale SITC4        Run benchmarks matching a regex at a single scale
+    python benchmarks/run.py --compare results/baseline.json        Compare against a baseline (exit status 1 on regression)
+
+Notes
+-----
+    1. setup() is run once for each benchmark class and scale. Each time_<name>() method is then run --repeat times
+       and the minimum (and median) wall time is recorded
+    2. A benchmark is a regression if min(time) / min(baseline time) > --threshold (default 1.25)
+    3. Results include the commit and the numpy / pandas versions so that results are only compared like for like
+
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import inspect
+import argparse
+import datetime
+import platform
+import subprocess
+
+import numpy as np
+import pandas as pd
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+def benchmark_modules():
+    """ Import benchmarks.bench_* modules """
+    import importlib
+    names = sorted(fl[:-3] for fl in os.listdir(BENCHMARK_DIR) if fl.startswith('bench_') and fl.endswith('.py'))
+    return [importlib.import_module('benchmarks.%s' % name) for name in names]
+
+def benchmark_classes(modules):
+    """ (name, class, [time_ methods]) for each benchmark class """
+    classes = list()
+    for module in modules:
+        for name, obj in sorted(inspect.getmembers(module, inspect.isclass)):
+            if obj.__module__ != module.__name__:
+                continue
+            methods = sorted(method for method in dir(obj) if method.startswith('time_'))
+            if methods:
+                classes.append((name, obj, methods))
+    return classes
+
+def current_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCHMARK_DIR).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def run_benchmarks(bench=None, scales=None, repeat=3, verbose=True):
+    """
+    Run Benchmarks
+
+    Parameters
+    ----------
+    bench   :   str, optional(default=None)
+                Regex matched against '<Class>.<method>'
+    scales  :   list, optional(default=None)
+                Scales to run (default: all params of each class)
+    repeat  :   int, optional(default=3)
+
+    Returns
+    -------
+    dict('<Class>.<method>[<scale>]' : dict('min', 'median', 'times') or dict('skipped'))
+
+    """
+    results = dict()
+    for name, cls, methods in benchmark_classes(benchmark_modules()):
+        methods = [method for method in methods if bench is None or re.search(bench, '%s.%s' % (name, method))]
+        if not methods:
+            continue
+        for scale in cls.params:
+            if scales is not None and scale not in scales:
+                continue
+            instance = cls()
+            try:
+                instance.setup(scale)
+            except NotImplementedError as e:
+                for method in methods:
+                    results['%s.%s[%s]' % (name, method, scale)] = {'skipped' : str(e)}
+                if verbose: print "[SKIP] %s[%s]: %s" % (name, scale, e)
+                continue
+            try:
+                for method in methods:
+                    key = '%s.%s[%s]' % (name, method, scale)
+                    times = list()
+                    for num in xrange(repeat):
+                        start = time.time()
+                        getattr(instance, method)(scale)
+                        times.append(time.time() - start)
+                    results[key] = {'min' : min(times), 'median' : float(np.median(times)), 'times' : times}
+                    if verbose: print "%-80s %10.4f s" % (key, min(times))
+            finally:
+                if hasattr(instance, 'teardown'):
+                    instance.teardown(scale)
+    return results
+
+def compare_results(results, baseline, threshold=1.25, verbose=True):
+    """
+    Compare Results against a Baseline
+
+    Returns
+    -------
+    dict('<key>' : ratio) of regressions (ratio = min(time) / min(baseline time) > threshold)
+
+    """
+    regressions = dict()
+    for key in sorted(results.keys()):
+        if 'min' not in results[key] or key not in baseline or 'min' not in baseline[key]:
+            continue
+        ratio = results[key]['min'] / baseline[key]['min']
+        if ratio > threshold:
+            status = 'REGRESSION'
+            regressions[key] = ratio
+        elif ratio < 1.0 / threshold:
+            status = 'IMPROVED'
+        else:
+            status = ''
+        if verbose: print "%-80s %10.4f s %10.4f s %6.2fx %s" % (key, baseline[key]['min'], results[key]['min'], ratio, status)
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run pyeconlab benchmarks")
+    parser.add_argument('--bench', default=None, help="Regex matched against <Class>.<method>")
+    parser.add_argument('--scale', action='append', default=None, help="Scale to run (repeatable: SITC3, SITC4, HS6)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default=None, help="Results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', default=None, help="Baseline results file")
+    parser.add_argument('--threshold', type=float, default=1.25)
+    args = parser.parse_args(argv)
+    results = run_benchmarks(bench=args.bench, scales=args.scale, repeat=args.repeat)
+    commit = current_commit()
+    output = args.output
+    if output is None:
+        output = os.path.join(BENCHMARK_DIR, 'results', '%s.json' % commit)
+    if os.path.dirname(output) and not os.path.isdir(os.path.dirname(output)):
+        os.makedirs(os.path.dirname(output))
+    record = {
+        'commit'    :   commit,
+        'date'      :   datetime.datetime.now().isoformat(),
+        'machine'   :   platform.node(),
+        'python'    :   platform.python_version(),
+        'numpy'     :   np.__version__,
+        'pandas'    :   pd.__version__,
+        'results'   :   results,
+    }
+    with open(output, 'w') as f:
+        json.dump(record, f, indent=2, sort_keys=True)
+    print "[INFO] Results written to: %s" % output
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        for item in ['python', 'numpy', 'pandas']:
+            if baseline.get(item) != record[item]:
+                print "[WARNING] Baseline %s version (%s) differs from the current version (%s)" % (item, baseline.get(item), record[item])
+        regressions = compare_results(results, baseline['results'], threshold=args.threshold)
+        if regressions:
+            print "[WARNING] %s benchmarks regressed by more than %sx" % (len(regressions), args.threshold)
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
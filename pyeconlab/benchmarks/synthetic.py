@@ -0,0 +1,113 @@
+"""
+Synthetic Export Data for Benchmarks
+====================================
+
+Reproducible country x product export panels with the structure found in real trade data (nested Mcp matrices,
+heavy-tailed export values and slowly evolving export baskets) so that benchmark timings are representative
+
+Scales
+------
+    'SITC3'     :   230 countries x 240 products
+    'SITC4'     :   230 countries x 780 products
+    'HS6'       :   230 countries x 5000 products
+
+"""
+
+import numpy as np
+import pandas as pd
+
+SCALES = {
+    'SITC3' :   (230, 240),
+    'SITC4' :   (230, 780),
+    'HS6'   :   (230, 5000),
+}
+
+PRODUCTCODE_WIDTH = {
+    'SITC3' :   3,
+    'SITC4' :   4,
+    'HS6'   :   6,
+}
+
+def synthetic_export_matrix(num_countries, num_products, num_years=1, density=0.3, seed=0):
+    """
+    Synthetic Export Values (t x c x p)
+
+    Parameters
+    ----------
+    num_countries   :   int
+    num_products    :   int
+    num_years       :   int, optional(default=1)
+    density         :   float, optional(default=0.3)
+                        Expected share of country-product pairs with positive exports
+    seed            :   int, optional(default=0)
+
+    Notes
+    -----
+        1. Countries have a capability and products a complexity drawn from U(0,1). A country exports a product with a
+           probability that is logistic in (capability - complexity) which gives a nested Mcp matrix
+        2. Values are lognormal with country size and product market size effects
+        3. Capabilities follow a small random walk across years so that products emerge and disappear
+
+    """
+    rng = np.random.RandomState(seed)
+    capability = rng.rand(num_countries)
+    complexity = rng.rand(num_products)
+    country_size = rng.lognormal(0.0, 1.5, num_countries)
+    product_size = rng.lognormal(0.0, 1.0, num_products)
+    # - Calibrate the Shift so the Expected Density of the First Year is density (Bisection) - #
+    gap = 8.0 * (capability[:, np.newaxis] - complexity[np.newaxis, :])
+    lower, upper = -20.0, 20.0
+    for num in xrange(50):
+        shift = (lower + upper) / 2.0
+        if (1.0 / (1.0 + np.exp(-(gap + shift)))).mean() < density:
+            lower = shift
+        else:
+            upper = shift
+    exports = np.zeros((num_years, num_countries, num_products))
+    for year in xrange(num_years):
+        if year > 0:
+            capability = np.clip(capability + rng.normal(0.0, 0.02, num_countries), 0.0, 1.0)
+        probability = 1.0 / (1.0 + np.exp(-(8.0 * (capability[:, np.newaxis] - complexity[np.newaxis, :]) + shift)))
+        exported = rng.rand(num_countries, num_products) < probability
+        values = country_size[:, np.newaxis] * product_size[np.newaxis, :] * rng.lognormal(0.0, 1.0, (num_countries, num_products))
+        exports[year] = np.where(exported, np.round(values * 1000.0, 0) + 1.0, 0.0)
+    return exports
+
+def synthetic_labels(num_countries, num_products, width=4):
+    """ Country ('C000') and Product ('0000') Codes """
+    countries = ['C%03d' % idx for idx in xrange(num_countries)]
+    products = [str(idx).zfill(width) for idx in xrange(num_products)]
+    return countries, products
+
+def synthetic_cross_section(scale='SITC4', density=0.3, seed=0):
+    """
+    Single Year in the ProductLevelExportSystem.from_df() Interface
+
+    Returns
+    -------
+    pd.DataFrame('export') indexed by (country, productcode) with all country x product pairs
+    """
+    num_countries, num_products = SCALES[scale]
+    countries, products = synthetic_labels(num_countries, num_products, width=PRODUCTCODE_WIDTH[scale])
+    exports = synthetic_export_matrix(num_countries, num_products, num_years=1, density=density, seed=seed)[0]
+    index = pd.MultiIndex.from_product([countries, products], names=['country', 'productcode'])
+    return pd.DataFrame({'export' : exports.ravel()}, index=index)
+
+def synthetic_panel(scale='SITC4', years=(2000, 2001), density=0.3, seed=0):
+    """
+    Balanced Panel in the DynamicProductLevelExportSystem.from_df() Interface
+
+    Returns
+    -------
+    pd.DataFrame('country', 'productcode', 'export') indexed by 'year' with all country x product pairs in each year
+    """
+    num_countries, num_products = SCALES[scale]
+    countries, products = synthetic_labels(num_countries, num_products, width=PRODUCTCODE_WIDTH[scale])
+    exports = synthetic_export_matrix(num_countries, num_products, num_years=len(years), density=density, seed=seed)
+    size = num_countries * num_products
+    data = pd.DataFrame({
+        'country'       :   np.tile(np.repeat(countries, num_products), len(years)),
+        'productcode'   :   np.tile(products, num_countries * len(years)),
+        'export'        :   exports.ravel(),
+    }, index=pd.Index(np.repeat(list(years), size), name='year'))
+    return data[['country', 'productcode', 'export']]
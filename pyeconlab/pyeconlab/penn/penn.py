@@ -8,9 +8,80 @@ Dataset
 """
 
 import os
+import numpy as np
 import pandas as pd
+from pyeconlab.util import lookup_keys, lookup_values
 from .meta import series_description
 
+### --- PENN Store --- ###
+
+STORE_DIR = "cache/"
+STORES = dict()                                         #-Process Level Cache {fn : {'hdf', 'series', 'index', 'country_names', 'series_codes'}}-#
+
+def penn_to_store(data, country_names, fn, complevel=9, complib='zlib'):
+    """
+    Write PENN Data to an HDF Store with One Node per Variable (Columnar)
+
+    Parameters
+    ----------
+    data            :   pd.DataFrame
+                        PENN data indexed by (iso3c, year) (see PENN.from_df())
+    country_names   :   dict
+                        {iso3c : countryname}
+    fn              :   str
+                        HDF store file
+
+    Notes
+    -----
+    1. Store Structure: ::
+
+        index           (fixed)     iso3c, year  [row order of every variable]
+        columns         (fixed)     variable codes in source order
+        countries       (fixed)     iso3c, countryname
+        series/<code>   (fixed)     values for a single variable
+
+    """
+    tmp_fn = fn + ".tmp"
+    if os.path.exists(tmp_fn):
+        os.remove(tmp_fn)
+    store = pd.HDFStore(tmp_fn, complevel=complevel, complib=complib)
+    index = data.index.to_frame(index=False) if hasattr(data.index, 'to_frame') else data.reset_index()[['iso3c', 'year']]
+    store.put('index', index)
+    store.put('columns', pd.Series(list(data.columns)))
+    store.put('countries', pd.DataFrame({'iso3c' : country_names.keys(), 'countryname' : country_names.values()}, columns=['iso3c', 'countryname']))
+    for code in data.columns:
+        store.put('series/%s' % code, pd.Series(data[code].values))
+    store.close()
+    os.rename(tmp_fn, fn)
+    return fn
+
+def open_store(fn):
+    """ 
+    Open a PENN Store (Read Only) Once per Process
+
+    Notes
+    -----
+    1. The handle, index, meta data and every variable loaded through PENN.series_data() are kept for the life of the process. 
+       Use close_stores() to release them
+
+    """
+    if fn not in STORES:
+        hdf = pd.HDFStore(fn, mode='r')
+        index, countries = hdf['index'], hdf['countries']
+        STORES[fn] = {
+            'hdf'           :   hdf,
+            'series'        :   dict(),
+            'index'         :   pd.MultiIndex.from_arrays([index['iso3c'].values, index['year'].values], names=['iso3c', 'year']),
+            'country_names' :   dict(zip(countries['iso3c'], countries['countryname'])),
+            'series_codes'  :   list(hdf['columns']),
+        }
+    return STORES[fn]
+
+def close_stores():
+    """ Close all PENN Stores opened in this Process """
+    for fn in STORES.keys():
+        STORES.pop(fn)['hdf'].close()
+
 class PENN(object):
     """
     PENN World Tables (Dataset) Object
@@ -19,13 +90,24 @@ class PENN(object):
     ----------
     source_dir  :   string
                     Specify the path to the dataset file. 
+    version     :   float, optional(default=8.1)
+                    PENN World Table version
+    store       :   bool, optional(default=True)
+                    Use the columnar HDF store for the version in source_dir/cache/ (built from the source file on first use) and 
+                    load variables as they are requested. If False the source file is read and all data is held in memory
+
+    Notes
+    -----
+    1. series_long() and year filters on the store only read the requested variables
 
     """
 
     #-Source Directory-#
     source_dir = "" 
 
-    data = None                   
+    _data = None                   
+    _store = None
+    _years = None
     country_codes = None
     country_names = dict() 
     series_codes = None         
@@ -40,13 +122,44 @@ class PENN(object):
 
     ## -- Setup and Initialise -- ##
 
-    def __init__(self, source_dir, version=8.1, verbose=True):
+    def __init__(self, source_dir, version=8.1, store=True, verbose=True):
         self.source_dir = source_dir
         self.version = version
         fl = self.source_dir + self.versions[self.version]
-        if verbose: print "Loading data for PENN world tables from: %s" % (fl)
-        self.from_df(pd.read_stata(fl))
-        
+        if store and not os.path.exists(self.store_fn):
+            if verbose: print "Loading data for PENN world tables from: %s" % (fl)
+            self.from_df(pd.read_stata(fl))
+            if not os.path.exists(self.source_dir + STORE_DIR):
+                os.makedirs(self.source_dir + STORE_DIR)
+            if verbose: print "Writing PENN world tables store: %s" % (self.store_fn)
+            penn_to_store(self.data, self.country_names, self.store_fn)
+        elif store:
+            self._store = open_store(self.store_fn)
+            self.country_names = self._store['country_names']
+            self.country_codes = sorted(self.country_names.keys())
+            self.series_codes = pd.Index([code for code in self._store['series_codes'] if code != 'currency_unit'])
+            years = self._store['index'].get_level_values('year')
+            self.start_year = years.min()
+            self.end_year = years.max()
+        else:
+            if verbose: print "Loading data for PENN world tables from: %s" % (fl)
+            self.from_df(pd.read_stata(fl))
+
+    @property
+    def store_fn(self):
+        return self.source_dir + STORE_DIR + "penn_%s.h5" % self.version
+
+    @property
+    def data(self):
+        """ PENN Data indexed by (iso3c, year) [Loads all variables from the store on first access] """
+        if self._data is None and self._store is not None:
+            self._data = self.series_data(self._store['series_codes'])
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
     ## -- Object Information -- ##
 
     def info(self):
@@ -79,9 +192,8 @@ class PENN(object):
         self.start_year = self.data.year.min()
         self.end_year = self.data.year.max()
         # Country Meta Data #
-        tmp = self.data[['countryname', 'iso3c']].copy(deep=True).drop_duplicates()
-        for idx, s in tmp.iterrows():
-            self.country_names[s['iso3c']] = s['countryname']
+        tmp = self.data[['countryname', 'iso3c']].drop_duplicates()
+        self.country_names = dict(zip(tmp['iso3c'], tmp['countryname']))
         self.country_codes = sorted(self.country_names.keys())
         del tmp
         # Data Meta Data #
@@ -120,104 +232,151 @@ class PENN(object):
         Retrieve a data value for Country, Series_Code and Year
         """
         idx = (cntry, int(year))
-        return self.data.get_value(idx, series_code)
+        return self.series_data([series_code]).get_value(idx, series_code)
+
+    def lookup(self, cntry, series_code, year, missing='nan', overrides=None, verbose=False):
+        """
+        Retrieve Data Values for Arrays of (Country, Series_Code, Year) Keys
+
+        Parameters
+        ----------
+        cntry           :   str or array-like
+                            ISO3C Country Codes
+        series_code     :   str or array-like
+                            PENN Variable Codes (i.e. 'rgdpe')
+        year            :   int or array-like
+        missing         :   str or value, optional(default='nan')
+                            Missing value policy ('nan', 'raise', 'drop' or a fill value)
+        overrides       :   dict, optional(default=None)
+                            Fallback values {(cntry, series_code, year) : value} for keys without data
+
+        Returns
+        -------
+        pd.Series indexed by (iso3c, series_code, year) aligned with the keys
+
+        """
+        cntry, series_code, year = lookup_keys(cntry, series_code, year)
+        data = self.series_data(sorted(set(series_code)), verbose=verbose).stack()
+        data.index.names = ['iso3c', 'year', 'series_code']
+        data = data.reorder_levels(['iso3c', 'series_code', 'year'])
+        keys = pd.MultiIndex.from_arrays([cntry, series_code, year.astype(int)], names=['iso3c', 'series_code', 'year'])
+        return lookup_values(data, keys, missing=missing, overrides=overrides)
 
     ## -- Filters -- ##
 
     def year_filter(self, years, verbose=False):
         """ 
         Filter PENN Object for Years
+
+        Parameters
+        ----------
+        years   :   tuple (start_year, end_year), slice (start_year, end_year, step) or list(int)
+
+        Notes
+        -----
+        1. The filter is also applied to variables loaded from the store after the call (series_data(), series_long())
+        2. The filter is applied in place and None is returned (no variables are loaded from the store). Use data, series_data() 
+           or series_long() for the filtered values
+
         """
+        yearlist = self.parse_years(years, verbose=verbose)
+        self._years = yearlist
+        ## -- Reset Data -- ##
+        if self._data is not None:
+            self._data = self._data.loc[self._data.index.get_level_values('year').isin(yearlist)]
+        self.start_year = min(yearlist)
+        self.end_year = max(yearlist)
+
+    def parse_years(self, years, verbose=False):
+        """ Years from a tuple (start_year, end_year), slice (start_year, end_year, step) or list """
         if type(years) == tuple:
             start_year, end_year = years
             if verbose: print "[Year Filter] Start Year: %s and End Year: %s" % (start_year, end_year)
-            yearlist = [str(x) for x in range(start_year, end_year+1, 1)]                                       #Note: +1 for Inclusive Years! Not in Python Convention
+            return range(start_year, end_year+1, 1)                                                             #Note: +1 for Inclusive Years! Not in Python Convention
         elif type(years) == slice:
             start_year, end_year, step = (years.start, years.stop, years.step)
             if verbose: print "[Year Filter] Start Year: %s and End Year: %s and Step: %s" % (start_year, end_year, step)
-            yearlist = [str(x) for x in range(start_year, end_year+1, step)]                                    #Note: +1 for Inclusive Years! Not in Python Convention
+            return range(start_year, end_year+1, step)                                                          #Note: +1 for Inclusive Years! Not in Python Convention
         elif type(years) == list:
-       		start_year = years[0]
-       		end_year = years[-1]
-        	yearlist = years
+            return [int(x) for x in years]
         else:
             raise ValueError("Years is not a tuple, slice or list")
-        ## -- Reset Data -- ##
-        self.data = self.data.reset_index()
-        self.data = self.data.loc[self.data["year"].isin(set(yearlist))]
-        self.data = self.data.set_index(["iso3c", "year"])
-        self.start_year = start_year
-        self.end_year = end_year
-        return self.data
 
-    # ## -- Data Retrieval -- ##
+    ## -- Data Retrieval -- ##
 
-    # def series(self, series_code, cntry=None, verbose=False):
-    #     """
-    #     Returns a pd.Series or pd.DataFrame of WDI Series that matches a series_code
-        
-    #     Parameters
-    #     ----------
-    #     series_code     :   string
-    #                         A WDI Series Code
-    #     cntry           :   string or list(string), optional(default=None)
-    #                         specify a year filter, [default=return all countries]
+    def series_data(self, series_codes, years=None, verbose=False):
+        """
+        PENN Data indexed by (iso3c, year) for a list of series_codes
 
-    #     Returns
-    #     -------
-    #     data    :   pd.Series (single country) or pd.DataFrame (list of countries)
+        Parameters
+        ----------
+        series_codes    :   list(str)
+                            PENN variable codes (i.e. ['rgdpe', 'pop'])
+        years           :   tuple, slice or list, optional(default=None)
+                            Year filter (see year_filter()) applied to the rows that are returned
 
-    #     """
-    #     if cntry == None:
-    #         if verbose: print "No country specified ... returning data for ALL countries"
-    #         cntry = self.data.index.levels[0]
-    #     elif type(cntry) == unicode:                                #Should I use unicode utf-8 OR Strings?
-    #         if verbose: print "Converting Unicode Country (%s) to ASCII String" % cntry
-    #         cntry.encode('ascii', 'ignore')
-    #     elif type(cntry) != list:
-    #         if verbose: print "Returning Series for Country: %s, and Series: %s" % (cntry, series_code)
-    #         name = cntry + "-" + series_code
-    #         s = self.data.xs(cntry).xs(series_code)
-    #         s.name = name
-    #         return s
-    #     if verbose: print "Returning Series: %s for Countries: %s" % (series_code, cntry)
-    #     idx = list(it.product(cntry, [series_code]))
-    #     return self.data.ix[idx]
-    
-    # def series_long(self, series_code, verbose=False):
-    #     """
-    #     Returns a DataFrame of WDI Series that matches series_codes
-    
-    #     Parameters
-    #     ----------
-    #     series_code     :   string or list(string)
-    #                         WDI Series code      
+        Notes
+        -----
+        1. Variables are read from the store (one node per variable) and memoized for the process unless the data 
+           attribute is already in memory
 
-    #     Returns
-    #     -------
-    #     data    :   pd.DataFrame
+        """
+        if self._data is not None or self._store is None:
+            data = self.data[series_codes]
+        else:
+            cache = self._store['series']
+            for code in series_codes:
+                if code not in cache:
+                    if verbose: print "[INFO] Loading series %s from %s" % (code, self.store_fn)
+                    cache[code] = self._store['hdf']['series/%s' % code].values
+            data = pd.DataFrame(dict((code, cache[code]) for code in series_codes), index=self._store['index'], columns=series_codes)
+            if self._years is not None:
+                data = data.loc[data.index.get_level_values('year').isin(self._years)]
+        if years is not None:
+            data = data.loc[data.index.get_level_values('year').isin(self.parse_years(years))]
+        return data
+
+    def series(self, series_code, cntry=None, verbose=False):
+        """
+        Returns a pd.Series of a PENN variable indexed by (iso3c, year) [or year for a single country]
 
-    #     ..  Future Work
-    #         -----------
-    #         [1] Write Tests
+        Parameters
+        ----------
+        series_code     :   string
+                            A PENN variable code
+        cntry           :   string or list(string), optional(default=None)
+                            specify a country filter, [default=return all countries]
 
-    #     """
-    #     if type(series_code) == str:
-    #         series_code = [series_code]
-    #     for idx, code in enumerate(series_code):
-    #         data = self.series(code, cntry=None, verbose=verbose).reset_index()
-    #         del data['series_code']
-    #         data = data.set_index(['iso3c']).stack()
-    #         data = pd.DataFrame(data, columns=[CodeToName[code]])
-    #         if idx == 0:
-    #             df = data
-    #         else:
-    #             df = df.merge(data, left_index=True, right_index=True)
-    #     #-Ensure Years are Integers-#
-    #     df = df.reset_index()
-    #     df['year'] = df['year'].apply(lambda x: int(x))
-    #     df = df.set_index(['iso3c', 'year'])
-    #     return df
+        """
+        s = self.series_data([series_code], verbose=verbose)[series_code]
+        if cntry == None:
+            return s
+        elif type(cntry) != list:
+            return s.xs(cntry, level='iso3c')
+        return s.loc[s.index.get_level_values('iso3c').isin(cntry)]
+
+    def series_long(self, series_code, years=None, how='inner', verbose=False):
+        """
+        Returns a DataFrame of PENN variables indexed by (iso3c, year)
+    
+        Parameters
+        ----------
+        series_code     :   string or list(string)
+                            PENN variable codes
+        years           :   tuple, slice or list, optional(default=None)
+                            Year filter (see year_filter())
+        how             :   str, optional(default='inner')
+                            'inner' keeps (iso3c, year) observations with data for all variables, 'outer' keeps all rows
+
+        """
+        if type(series_code) == str:
+            series_code = [series_code]
+        df = self.series_data(series_code, years=years, verbose=verbose)
+        if how == 'inner':
+            df = df.dropna(how='any')
+        elif how != 'outer':
+            raise ValueError("how must be 'inner' or 'outer'")
+        return df
 
     # def year_data(self, year, verbose=False):
     #     """ 
@@ -0,0 +1,73 @@
+"""
+Tests for the PENN Store
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+from pyeconlab.penn import penn as pennmodule
+from pyeconlab.penn import PENN
+
+
+def synthetic_pwt_dta(fn, seed=0):
+	""" Synthetic pwt81.dta (countrycode, country, currency_unit, year, variables ...) """
+	rng = np.random.RandomState(seed)
+	countries = [('AUS', 'Australia', 'Australian Dollar'), ('CHN', 'China', 'Yuan Renminbi'), ('USA', 'United States', 'US Dollar')]
+	rows = [(code, name, unit, year) for code, name, unit in countries for year in range(1990, 1996)]
+	data = pd.DataFrame(rows, columns=['countrycode', 'country', 'currency_unit', 'year'])
+	for code in ['rgdpe', 'rgdpo', 'pop', 'emp']:
+		data[code] = rng.rand(len(data))
+		data.loc[rng.rand(len(data)) < 0.2, code] = np.nan
+	data.to_stata(fn, write_index=False)
+	return data
+
+
+class TestSuite_penn(unittest.TestCase):
+	"""
+	Test Lazy Variable Loading from the Store against the In Memory PENN
+	"""
+
+	def setUp(self):
+		self.source_dir = tempfile.mkdtemp() + '/'
+		synthetic_pwt_dta(self.source_dir + 'pwt81.dta')
+		self.memory = PENN(self.source_dir, store=False, verbose=False)
+		PENN(self.source_dir, verbose=False)
+
+	def tearDown(self):
+		pennmodule.close_stores()
+		shutil.rmtree(self.source_dir)
+
+	def test_store(self):
+		self.assertTrue(os.path.exists(self.source_dir + 'cache/penn_8.1.h5'))
+		penn = PENN(self.source_dir, verbose=False)
+		self.assertEqual(penn._data, None)
+		self.assertEqual(penn.country_names, self.memory.country_names)
+		self.assertEqual(list(penn.series_codes), list(self.memory.series_codes))
+		pd.util.testing.assert_series_equal(penn.series('pop'), self.memory.data['pop'], check_names=False)
+		self.assertEqual(sorted(pennmodule.STORES[penn.store_fn]['series'].keys()), ['pop'])
+		pd.util.testing.assert_frame_equal(penn.data, self.memory.data, check_dtype=False)
+
+	def test_series_long(self):
+		penn = PENN(self.source_dir, verbose=False)
+		result = penn.series_long(['rgdpe', 'pop'], years=(1991, 1993))
+		expected = self.memory.data[['rgdpe', 'pop']].dropna()
+		expected = expected.loc[expected.index.get_level_values('year').isin([1991, 1992, 1993])]
+		pd.util.testing.assert_frame_equal(result, expected, check_dtype=False)
+		self.assertEqual(len(penn.series_long(['rgdpe', 'pop'], how='outer')), len(self.memory.data))
+
+	def test_year_filter(self):
+		penn = PENN(self.source_dir, verbose=False)
+		penn.year_filter([1990, 1995])
+		self.assertEqual(pennmodule.STORES[penn.store_fn]['series'], {})
+		expected = self.memory.data['emp']
+		expected = expected.loc[expected.index.get_level_values('year').isin([1990, 1995])]
+		pd.util.testing.assert_series_equal(penn.series('emp'), expected, check_names=False)
+		self.assertTrue(np.isnan(penn.lookup('AUS', 'emp', 1991).values[0]))
+		np.testing.assert_array_equal(penn.lookup('AUS', 'emp', 1995).values, [self.memory.get('AUS', 'emp', 1995)])
+		expected = self.memory.data.loc[self.memory.data.index.get_level_values('year').isin([1990, 1991])]
+		self.memory.year_filter((1990, 1991))
+		pd.util.testing.assert_frame_equal(self.memory.data, expected)
@@ -58,7 +58,9 @@ from .base import BACI
 from .dataset import BACITradeData, BACIExportData, BACIImportData
 from pyeconlab.trade.dataset import CPTradeData, CPExportData, CPImportData
 from pyeconlab.country import ISO3166
-from pyeconlab.util import check_directory, check_operations, update_operations, from_idxseries_to_pydict, concord_data
+from pyeconlab.trade.util.productlevels import productcode_cube
+from pyeconlab.util import check_directory, check_operations, update_operations, from_idxseries_to_pydict, concord_data, \
+                            start_operation, record_operation, operations_log
 
 class BACIConstructor(BACI):
     """
@@ -133,7 +135,7 @@ class BACIConstructor(BACI):
     country_datafl_fixed = bool
 
 
-    def __init__(self, source_dir, source_classification, ftype='hdf', years=[], standard_names=True, skip_setup=False, reduce_memory=False, verbose=True):
+    def __init__(self, source_dir, source_classification, ftype='hdf', years=[], standard_names=True, skip_setup=False, reduce_memory=False, operations_log_fn=None, verbose=True):
         """ 
         Load RAW Data into Object
 
@@ -154,6 +156,8 @@ class BACIConstructor(BACI):
                                     This will delete self.__raw_data after initializing self.dataset with the raw_data
                                     [Warning: This will render properties that depend on self.__raw_data inoperable]
                                     Useful when building datasets to be more memory efficient as the operations don't require a record of the original raw_data
+        operations_log_fn       :   str, optional(default=None)
+                                    Append a JSON-lines record for each operation to this file (see operations_log)
     
         """
         #-Assign Source Directory-#
@@ -169,6 +173,7 @@ class BACIConstructor(BACI):
         self.revision       = source_classification[-2:]        #Last two digits    
         self.notes          = ""
         self.operations     = u"" 
+        self.operations_log_fn = operations_log_fn
         self.complete_dataset = False
         self.units_value_str = self.source_units_value_str
         #-Cache Directory-#
@@ -199,6 +204,7 @@ class BACIConstructor(BACI):
             return None
 
         # - Fetch Raw Data for Years - #
+        start_operation(self, u"(load_raw)")
         if ftype == 'rar':
             self.load_raw_from_rar(verbose=verbose)
         elif ftype == 'csv':
@@ -217,6 +223,7 @@ class BACIConstructor(BACI):
                 self.convert_raw_data_to_hdf_yearindex(verbose=verbose)     #Compute Year Index Version Also
         else:
             raise ValueError("ftype must be 'rar', 'csv', or 'hdf'")
+        record_operation(self, u"(load_raw)", data=self.__raw_data)
 
         #-Reduce Memory-#
         if reduce_memory:
@@ -261,6 +268,17 @@ class BACIConstructor(BACI):
         if force==True:
             del self.__raw_data
 
+    @property
+    def operations_log(self):
+        """
+        Operations Log (wall time, peak RSS delta, rows and memory in/out for each operation) as a DataFrame
+
+        Notes
+        -----
+        1. Set operations_log_fn to also stream each record to a JSON-lines file
+        """
+        return operations_log(self)
+
     @property
     def source_dir(self):
         return self.__source_dir
@@ -560,7 +578,7 @@ class BACIConstructor(BACI):
         This method selects the appropriate collection of fixes based on source data revision
         """
         opstring = u"(fix_country_code)"
-        if check_operations(self, opstring):
+        if check_operations(self, opstring, start=True):
             print "[INFO] Process has already been applied to source file"
             return
         if self.classification == "HS92":
@@ -863,6 +881,31 @@ class BACIConstructor(BACI):
         self.classification = new_classification
         self.level = new_level      
 
+    def productcode_level_cube(self, levels=[4,2], verbose=True):
+        """
+        Aggregate the HS6 Dataset to Coarser HS Levels (HS6 -> HS4 -> HS2) in a Single Pass
+
+        Parameters
+        ----------
+        levels  :   list, optional(default=[4,2])
+                    Specify HS Levels
+
+        Returns
+        -------
+        ProductCodeCube (cube[4] returns the dataset aggregated to 'hs4')
+
+        Notes
+        -----
+        1. 'quantity' is not aggregated due to units
+        2. self.dataset is not modified
+
+        """
+        if 'hs6' not in self.dataset.columns:
+            raise ValueError("Dataset does not contain 'hs6' product codes [Classification: %s]" % self.classification)
+        keys = [item for item in self.dataset.columns if item not in ['value', 'quantity']]
+        if verbose: print "[INFO] Aggregating hs6 to HS Levels %s on: %s" % (levels, keys)
+        return productcode_cube(self.dataset, productcode='hs6', levels=levels, keys=keys, values=['value'])
+
 
     def merge_all_sourcefiles(self, rename_newvars=True, verbose=True):
         """
@@ -37,4 +37,18 @@ class AtlasOfComplexity(object):
             "HS92"    : ["year", "origin", "hs4", "export_val", "import_val", "export_rca", "import_rca"], 
     }
 
+    #-Compact Column dtypes for Reading the Source Files-#
+    source_productcode = {"SITCR2" : "sitc4", "HS92" : "hs4"}
+    source_column_dtypes = {
+            "year"          : np.int16,
+            "origin"        : str,
+            "destination"   : str,
+            "sitc4"         : str,
+            "hs4"           : str,
+            "export_val"    : np.float64,
+            "import_val"    : np.float64,
+            "export_rca"    : np.float64,
+            "import_rca"    : np.float64,
+    }
+
     units_value_str = "$'s"
@@ -8,13 +8,48 @@ Constructor Class for Atlas of Complexity Dataset
 
 import os
 import gc
+import collections
+import numpy as np
 import pandas as pd
 import warnings
 import shutil
 
 from .base import AtlasOfComplexity
 from .dataset import CIDAtlasTradeData, CIDAtlasExportData, CIDAtlasImportData
-from pyeconlab.util import check_directory, check_operations, update_operations, from_idxseries_to_pydict, concord_data
+from pyeconlab.util import check_directory, check_operations, update_operations, from_idxseries_to_pydict, concord_data, \
+                            start_operation, record_operation, operations_log
+
+
+def normalize_codes(values, normalize=lambda x: x.upper()):
+    """
+    Factorize Codes and Normalize the Unique Values
+
+    Parameters
+    ----------
+    values      :   np.array
+                    Codes (i.e. 'aus')
+    normalize   :   function, optional(default=upper case)
+                    Applied once to each unique code
+
+    Returns
+    -------
+    (codes, categories) where categories.take(codes) are the normalized values (codes are -1 for NaN)
+
+    """
+    codes, uniques = pd.factorize(values)
+    if len(uniques) == 0:
+        return codes, pd.Index([], dtype=object)
+    normalized, remap = pd.factorize(np.array([normalize(item) for item in uniques], dtype=object))
+    codes = np.where(codes >= 0, normalized.take(np.maximum(codes, 0)), -1)
+    return codes, pd.Index(remap)
+
+def coded_values(codes, categories, categorical=True):
+    """ pd.Categorical (or object array) from normalize_codes() output """
+    if categorical:
+        return pd.Categorical.from_codes(codes, categories)
+    values = categories.values.take(np.maximum(codes, 0)).astype(object)
+    values[codes < 0] = np.nan
+    return values
 
 
 class CIDAtlasDataConstructor(AtlasOfComplexity):
@@ -22,7 +57,7 @@ class CIDAtlasDataConstructor(AtlasOfComplexity):
     Constructor for Atlas of Complexity Data (CID)
     """
 
-    def __init__(self, source_dir, trade_classification, dtype, years=[], ftype='hdf', reduce_memory=False, standardize_dataset=False, reset_cache=False, verbose=True):
+    def __init__(self, source_dir, trade_classification, dtype, years=[], ftype='hdf', reduce_memory=False, standardize_dataset=False, reset_cache=False, operations_log_fn=None, verbose=True):
         """
         Constructor for the CID Atlas of Economic Complexity Data
         
@@ -49,6 +84,8 @@ class CIDAtlasDataConstructor(AtlasOfComplexity):
                                     Useful when building datasets to be more memory efficient as the operations don't require a record of the original raw_data
         standardize_dataset     :   bool, optional(default=False)
                                     Standardize dataset into Trade, Export, Import Values Only from RAW Files.
+        operations_log_fn       :   str, optional(default=None)
+                                    Append a JSON-lines record for each operation to this file (see operations_log)
 
         """
         #-Setup Attributes-#
@@ -63,6 +100,7 @@ class CIDAtlasDataConstructor(AtlasOfComplexity):
         self.level = self.source_level
         self.notes = ""
         self.operations = ""
+        self.operations_log_fn = operations_log_fn
         self.complete_dataset = False
         
         #-Parse Years-#
@@ -76,6 +114,7 @@ class CIDAtlasDataConstructor(AtlasOfComplexity):
         self.__source_dir = check_directory(source_dir)
         self.__cache_dir = "cache/"
         #-Load Data-#
+        start_operation(self, u"(load_raw)")
         if ftype=="tsv" or reset_cache:
             self.load_raw_from_tsv(reset_cache=reset_cache)
         else:
@@ -83,6 +122,7 @@ class CIDAtlasDataConstructor(AtlasOfComplexity):
                 self.load_raw_from_tsv()
             else:
                 self.load_raw_from_hdf()
+        record_operation(self, u"(load_raw)", data=self.__raw_data)
         #-Reduce Memory-#
         if reduce_memory:
             self.dataset = self.__raw_data
@@ -97,61 +137,110 @@ class CIDAtlasDataConstructor(AtlasOfComplexity):
     @property
     def raw_data(self):
         return self.__raw_data
+
+    @property
+    def operations_log(self):
+        """
+        Operations Log (wall time, peak RSS delta, rows and memory in/out for each operation) as a DataFrame
+
+        Notes
+        -----
+        1. Set operations_log_fn to also stream each record to a JSON-lines file
+        """
+        return operations_log(self)
     
 
-    def load_raw_from_tsv(self, reset_cache=False, verbose=True):
-        """ Load Raw Data from TSV """
+    @property
+    def cache_fn(self):
+        """ HDF Cache File (one table per year: 'Y<year>') """
+        return self.__source_dir + self.__cache_dir + "cidatlas_%s_%s_year.h5" % (self.classification, self.dtype)
+
+    def load_raw_from_tsv(self, reset_cache=False, chunksize=1000000, complevel=9, complib='zlib', verbose=True):
+        """ 
+        Load Raw Data from TSV (Single Pass over the File in Chunks)
+
+        Parameters
+        ----------
+        reset_cache     :   bool, optional(default=False)
+                            Rebuild the HDF cache file
+        chunksize       :   int, optional(default=1000000)
+                            Number of rows read at a time. Peak memory is bounded by the chunk plus the rows kept for self.years
+        complevel       :   int, optional(default=9)
+                            Compression level of the HDF cache
+        complib         :   str, optional(default='zlib')
+                            Compression library of the HDF cache ('blosc' is much faster to write)
+
+        Notes
+        -----
+        1. Columns are read with the compact dtypes in source_column_dtypes
+        2. Each chunk is split by year. Rows for self.years are kept in memory and, when the cache is being built, rows 
+           for ALL years are appended to the year tables in the same pass
+        3. The cache is written to a temporary file and moved into place once complete
+
+        """
         #-Data Type-#
         if self.dtype == "trade":
             fl = self.__source_dir+self.source_trade_datafl[self.classification]
         elif self.dtype == "export" or self.dtype == "import":
             fl = self.__source_dir+self.source_exportimport_datafl[self.classification]
-        #-Classification-#
-        if self.classification == "SITCR2":
-            self.productcode = "sitc4"
-        elif self.classification == "HS92":
-            self.productcode = "hs4"
-        #-Load Data-#
-        if verbose: print "[INFO] Loading Raw Data From %s ..." % (fl)
-        self.__raw_data = pd.read_table(fl, dtype={self.productcode : str})             #Could Use chunksize to be more memory efficient
-        #-Parse Years-#
-        if not self.complete_dataset:
-            warnings.warn("This method must import all data ... best to use hdf cache file for specific years")
-            self.__raw_data = self.__raw_data.loc[self.__raw_data['year'].isin(self.years)]
-            self.__raw_data = self.__raw_data.reset_index()
-            del self.__raw_data["index"]
-            gc.collect()
+        self.productcode = self.source_productcode[self.classification]
         #-Construct a Cache Folder-#
         if not os.path.exists(self.__source_dir + self.__cache_dir):
             print "[INFO] Setting up a Cache Directory ..."
             os.makedirs(self.__source_dir + self.__cache_dir)
             reset_cache = True
-        #-Cache-#
-        hdf_fn = self.__source_dir + self.__cache_dir + "cidatlas_%s_%s_year.h5" % (self.classification, self.dtype)
-        if reset_cache or os.path.exists(hdf_fn) == False:
-            if verbose: print "[INFO] Writing raw_data to %s" % hdf_fn
-            #-Construct HDF File-#
-            hdf = pd.HDFStore(hdf_fn, complevel=9, complib='zlib')
-            for year in self.years: 
-                if verbose: print "[INFO] Processing year %s ..." % year
-                data = self.__raw_data.loc[self.__raw_data['year'] == year].reset_index()
-                del data["index"]
-                hdf.put('Y'+str(year), data, format='table')    
+        write_cache = reset_cache or os.path.exists(self.cache_fn) == False
+        if write_cache:
+            if verbose: print "[INFO] Writing raw_data to %s" % self.cache_fn
+            tmp_fn = self.cache_fn + ".tmp"
+            if os.path.exists(tmp_fn):
+                os.remove(tmp_fn)
+            hdf = pd.HDFStore(tmp_fn, complevel=complevel, complib=complib)
+            min_itemsize = dict((column, 8) for column in self.source_column_dtypes if self.source_column_dtypes[column] == str)
+        #-Load Data-#
+        if verbose: print "[INFO] Loading Raw Data From %s ..." % (fl)
+        years = set(self.years)
+        partitions = dict((year, []) for year in self.years)
+        reader = pd.read_table(fl, dtype=self.source_column_dtypes, chunksize=chunksize)
+        for num, chunk in enumerate(reader):
+            if verbose: print "[INFO] Processing chunk %s (%s rows) ..." % (num, len(chunk))
+            for year, data in chunk.groupby('year', sort=False):
+                if write_cache:
+                    hdf.append('Y'+str(year), data, format='table', index=False, min_itemsize=dict((column, size) for column, size in min_itemsize.items() if column in data.columns))
+                if year in years:
+                    partitions[year].append(data)
+            del chunk
+        if write_cache:
             if verbose: print hdf
             hdf.close()
+            os.rename(tmp_fn, self.cache_fn)
+        #-Combine Year Partitions-#
+        partitions = [data for year in self.years for data in partitions[year]]
+        if len(partitions) == 0:
+            raise ValueError("No data found in %s for years: %s" % (fl, list(self.years)))
+        self.__raw_data = pd.concat(partitions, ignore_index=True)
+        del partitions
         gc.collect()
 
     def load_raw_from_hdf(self, verbose=True):
-        """ Load Raw Data from HDF Cache """
-        #-Data Type-#
-        hdf_fn = self.__source_dir + self.__cache_dir + "cidatlas_%s_%s_year.h5" % (self.classification, self.dtype) 
+        """ Load Raw Data from HDF Cache (the cache is rebuilt from the TSV file if it is missing years) """
+        hdf_fn = self.cache_fn
         if not os.path.exists(hdf_fn):
-            self.load_raw_from_tsv(verbose=verbose)
+            return self.load_raw_from_tsv(verbose=verbose)
+        self.productcode = self.source_productcode[self.classification]
         #-Data-#
-        self.__raw_data = pd.DataFrame()  
+        hdf = pd.HDFStore(hdf_fn, mode='r')
+        keys = set(key.strip('/') for key in hdf.keys())
+        if not set('Y'+str(year) for year in self.years).issubset(keys):
+            hdf.close()
+            if verbose: print "[INFO] Cache %s is missing years. Rebuilding from the TSV file ..." % hdf_fn
+            return self.load_raw_from_tsv(reset_cache=True, verbose=verbose)
+        data = []
         for year in self.years:
             if verbose: print "[INFO] Loading RAW DATA for year: %s ..." % (year)
-            self.__raw_data = self.__raw_data.append(pd.read_hdf(hdf_fn, key='Y'+str(year)))
+            data.append(hdf.select('Y'+str(year)))
+        hdf.close()
+        self.__raw_data = pd.concat(data, ignore_index=True)
 
     def load_country_data(self, verbose=True):
         """ Load Country Meta Data File """
@@ -166,80 +255,78 @@ class CIDAtlasDataConstructor(AtlasOfComplexity):
 
     #-Datasets-#
 
-    def construct_standardized_dataset(self, verbose=True):
-        """ Construct a Standardized Dataset """
+    def construct_standardized_dataset(self, categorical=True, verbose=True):
+        """ 
+        Construct a Standardized Dataset 
+
+        trade   :   ['year', 'eiso3c', 'iiso3c', productcode, 'value'] with export_val (origin -> destination) stacked 
+                    on import_val (destination -> origin)
+        export  :   ['year', 'eiso3c', productcode, 'value', 'rca']
+        import  :   ['year', 'iiso3c', productcode, 'value', 'rca']
+
+        Parameters
+        ----------
+        categorical     :   bool, optional(default=True)
+                            Return eiso3c and iiso3c as pd.Categorical (otherwise object strings)
+                            [Warning: groupby on categorical columns returns the cartesian product of all categories (pandas 0.19) 
+                            so collapse the dataset with pyeconlab.util.groupby_sum_observed()]
+
+        Notes
+        -----
+        1. ISO3C codes are upper cased once for the unique codes (see normalize_codes())
+        2. The stacked trade dataset is assembled from column arrays into preallocated buffers so only one copy of
+           the value columns is held in addition to the source data
+
+        """
+        op_string = u"(construct_standardized_dataset)"
+        if check_operations(self, op_string, start=True): return None
         if verbose: print "[INFO] Running .construct_standardized_dataset()"
+        productcode = self.source_productcode[self.classification]
+        olength = self.dataset.shape[0]
         #-Reshape Data Contents and Fix Names-#
         if self.dtype == "trade":
-            olength = self.dataset.shape[0]
-            #-Export Data-#
-            export_cols = self.dataset.columns.drop("import_val")
-            export_recodes = {
-                "origin" : "eiso3c",
-                "destination" : "iiso3c",
-                "export_val"  : "value",
-            }
-            exports = self.dataset[export_cols]
-            exports.rename(columns=export_recodes, inplace=True)
-            #-Import Data-#
-            import_cols = self.dataset.columns.drop("export_val")
-            import_recodes = {
-                "origin" : "iiso3c",
-                "destination" : "eiso3c",
-                "import_val" : "value",
-            }
-            imports = self.dataset[import_cols]
-            imports.rename(columns=import_recodes, inplace=True)
+            #-Country Codes (origin and destination share categories)-#
+            codes, categories = normalize_codes(np.concatenate([self.dataset["origin"].values, self.dataset["destination"].values]))
+            origin, destination = codes[:olength], codes[olength:]
+            #-Stack [Exports; Imports]-#
+            year = np.empty(2*olength, dtype=self.dataset["year"].dtype)
+            year[:olength] = year[olength:] = self.dataset["year"].values
+            eiso3c = np.concatenate([origin, destination])
+            iiso3c = np.concatenate([destination, origin])
+            del codes, origin, destination
+            products = np.empty(2*olength, dtype=object)
+            products[:olength] = products[olength:] = self.dataset[productcode].values
+            value = np.empty(2*olength, dtype=np.float64)
+            value[:olength] = self.dataset["export_val"].values
+            value[olength:] = self.dataset["import_val"].values
             del self.dataset
             gc.collect()
-            #-Combine-#
-            if self.classification == "HS92":
-                productcode = u'hs4'
-            elif self.classification == "SITCR2":
-                productcode = u'sitc4'
-            order = [u'year', u'eiso3c', u'iiso3c', productcode, u'value']
-            self.dataset = exports.append(imports)[order]
-            del exports
-            del imports
-            gc.collect()
-            self.dataset = self.dataset.reset_index()
-            del self.dataset["index"]
+            self.dataset = pd.DataFrame(collections.OrderedDict([
+                ('year', year),
+                ('eiso3c', coded_values(eiso3c, categories, categorical)),
+                ('iiso3c', coded_values(iiso3c, categories, categorical)),
+                (productcode, products),
+                ('value', value),
+            ]))
             #-Checks-#
             assert 2*olength == self.dataset.shape[0]
             gc.collect()
-        elif self.dtype == "export":
-            olength = self.dataset.shape[0]
-            export_cols = self.dataset.columns.drop(["import_val", "import_rca"])
-            export_recodes = {
-                "origin" : "eiso3c",
-                "export_val"  : "value",
-                "export_rca"  : "rca",
-            }
-            exports = self.dataset[export_cols].copy()
-            exports.rename(columns=export_recodes, inplace=True)
-            self.dataset = exports
-            #-Checks-#
-            assert olength == self.dataset.shape[0]          
-        elif self.dtype == "import":
-            olength = self.dataset.shape[0]
-            import_cols = self.dataset.columns.drop(["export_val", "export_rca"])
-            import_recodes = {
-                "origin" : "iiso3c",
-                "import_val" : "value",
-                "import_rca" : "rca",
-            }
-            imports = self.dataset[import_cols].copy()
-            imports.rename(columns=import_recodes, inplace=True)
-            self.dataset = imports
+        elif self.dtype == "export" or self.dtype == "import":
+            if self.dtype == "export":
+                iso3c, drop = "eiso3c", ["import_val", "import_rca"]
+                recodes = {"origin" : iso3c, "export_val" : "value", "export_rca" : "rca"}
+            else:
+                iso3c, drop = "iiso3c", ["export_val", "export_rca"]
+                recodes = {"origin" : iso3c, "import_val" : "value", "import_rca" : "rca"}
+            for column in drop:
+                del self.dataset[column]
+            self.dataset.rename(columns=recodes, inplace=True)
+            codes, categories = normalize_codes(self.dataset[iso3c].values)
+            self.dataset[iso3c] = coded_values(codes, categories, categorical)
             #-Checks-#
             assert olength == self.dataset.shape[0]
-        #-Fix ISO3C Codes-#
-        if self.dtype == "export" or self.dtype == "trade":
-            self.dataset["eiso3c"] = self.dataset["eiso3c"].apply(lambda x: x.upper())
-            gc.collect()
-        if self.dtype == "import" or self.dtype == "trade":
-            self.dataset["iiso3c"] = self.dataset["iiso3c"].apply(lambda x: x.upper())
             gc.collect()
+        update_operations(self, op_string)
 
     # def construct_rca_dataset(self, verbose=True):
     #     """ Construct RCA Datasets """
@@ -254,6 +341,8 @@ class CIDAtlasDataConstructor(AtlasOfComplexity):
     def countries_only(self, verbose=True):
         """ Return a Dataset that only Contains Countries """ 
         from .meta import iso3c_notcountries
+        op_string = u"(countries_only)"
+        if check_operations(self, op_string, start=True): return None
         #-Adjust Dataset-#
         if self.dtype == "export" or self.dtype == "trade":
             country_list = set(self.dataset.eiso3c.unique())
@@ -261,6 +350,8 @@ class CIDAtlasDataConstructor(AtlasOfComplexity):
             keep_list = country_list.difference(set(iso3c_notcountries))
             if verbose: print "[INFO] ... dropping eiso3c codes %s" % drop_list
             self.dataset = self.dataset.loc[self.dataset["eiso3c"].isin(keep_list)]
+            if hasattr(self.dataset["eiso3c"], 'cat'):
+                self.dataset["eiso3c"] = self.dataset["eiso3c"].cat.remove_unused_categories()
             gc.collect()
         if self.dtype == "import" or self.dtype == "trade":
             country_list = set(self.dataset.iiso3c.unique())
@@ -268,7 +359,10 @@ class CIDAtlasDataConstructor(AtlasOfComplexity):
             keep_list = country_list.difference(set(iso3c_notcountries))
             if verbose: print "[INFO] ... dropping iiso3c codes %s" % drop_list
             self.dataset = self.dataset.loc[self.dataset["iiso3c"].isin(keep_list)]
+            if hasattr(self.dataset["iiso3c"], 'cat'):
+                self.dataset["iiso3c"] = self.dataset["iiso3c"].cat.remove_unused_categories()
             gc.collect()
+        update_operations(self, op_string)
 
     # def to_level(self, level, verbose=True):
     #     """ Drop Dataset to a Specified Level"""
@@ -311,6 +405,9 @@ class CIDAtlasDataConstructor(AtlasOfComplexity):
         elif self.classification == "SITCR2":
             productcode = "sitc4"
         data = data.rename_axis({productcode : 'productcode'}, axis=1)
+        for column in ["eiso3c", "iiso3c"]:                                 #-Dataset Objects group by country codes (not categoricals)-#
+            if column in data.columns and hasattr(data[column], 'cat'):
+                data[column] = coded_values(data[column].cat.codes.values, data[column].cat.categories, categorical=False)
         if self.dtype == "trade":
             cols = ["year", "eiso3c", "iiso3c", productcode, value]
             data = data[cols]
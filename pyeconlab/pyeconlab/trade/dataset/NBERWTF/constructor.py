@@ -55,8 +55,10 @@ warnings.simplefilter("always")
 from .base import NBERWTF
 from .dataset import NBERWTFTradeData, NBERWTFExportData, NBERWTFImportData 
 from pyeconlab.util import  from_series_to_pyfile, check_directory, recode_index, merge_columns, check_operations, update_operations, from_idxseries_to_pydict, \
+                            start_operation, record_operation, operations_log, \
                             countryname_concordance, concord_data, random_sample, find_row, assert_merged_series_items_equal
 from pyeconlab.trade.classification import SITC
+from pyeconlab.trade.util.productlevels import productcode_cube
 
 #-Debug and Testing-#
 # from memory_profiler import profile
@@ -247,7 +249,7 @@ class NBERWTFConstructor(NBERWTF):
     __raw_data_hdf_yearindex_fn = u'wtf62-00_yearindex.h5'
     __cache_dir = u"cache/"
 
-    def __init__(self, source_dir, years=[], ftype='hdf', standardise=False, apply_fixes=True, skip_setup=False, force=False, reduce_memory=False, verbose=True):
+    def __init__(self, source_dir, years=[], ftype='hdf', standardise=False, apply_fixes=True, skip_setup=False, force=False, reduce_memory=False, operations_log_fn=None, verbose=True):
         """ 
         Load RAW Data into Object
 
@@ -274,12 +276,15 @@ class NBERWTFConstructor(NBERWTF):
                             [Warning: This will render properties that depend on self.__raw_data inoperable]
                             Usage: Useful when building datasets to be more memory efficient as the operations don't require a record of the original raw_data
                             [Default: False] Only Saves ~2GB of RAM
+        operations_log_fn   :   str, optional(default=None)
+                            Append a JSON-lines record for each operation to this file (see operations_log)
         
         """
         #-Assign Source Directory-#
         self._source_dir    = check_directory(source_dir)   # check_directory() performs basic tests on the specified directory
         self.data_type      = u"trade"
         self._apply_fixes   = apply_fixes
+        self.operations_log_fn = operations_log_fn
         #-Parse Skip Setup-#
         if skip_setup == True:
             print "[INFO] Skipping Setup of NBERWTFConstructor!"
@@ -293,6 +298,7 @@ class NBERWTFConstructor(NBERWTF):
         #-Assign to Attribute-#
         self.years  = years
         # - Fetch Raw Data for Years - #
+        start_operation(self, u"(load_raw)")
         if ftype == 'dta':
             self.load_raw_from_dta(verbose=verbose)
         elif ftype == 'hdf':
@@ -309,6 +315,7 @@ class NBERWTFConstructor(NBERWTF):
                 self.convert_stata_to_hdf_yearindex(verbose=verbose)    #Compute Year Index Version Also
         else:
             raise ValueError("ftype must be dta or hdf")  
+        record_operation(self, u"(load_raw)", data=self.__raw_data)
 
         #-Reduce Memory-#
         if reduce_memory:
@@ -375,6 +382,17 @@ class NBERWTFConstructor(NBERWTF):
         if force == True:
             self.__raw_data = None
 
+    @property
+    def operations_log(self):
+        """
+        Operations Log (wall time, peak RSS delta, rows and memory in/out for each operation) as a DataFrame
+
+        Notes
+        -----
+        1. Set operations_log_fn to also stream each record to a JSON-lines file
+        """
+        return operations_log(self)
+
     @property
     def raw_data_operations(self):
         """
@@ -947,7 +965,7 @@ class NBERWTFConstructor(NBERWTF):
 
         """
         op_string = u'(adjust_raw_china_hongkongdata)'
-        if check_operations(self, op_string):                           #Check if Operation has been conducted
+        if check_operations(self, op_string, start=True):                           #Check if Operation has been conducted
             return None
         #-Merge Settings-#
         if not check_operations(self, "load_china_hongkongdata"):
@@ -1028,7 +1046,7 @@ class NBERWTFConstructor(NBERWTF):
         """
         op_string = u"(standardise_data)"
         #-Check if Operation has been conducted-#
-        if check_operations(self, op_string): return None
+        if check_operations(self, op_string, start=True): return None
         #-Core-#
         self.change_value_units(verbose=verbose)            #Change Units to $'s
         self.add_iso3c(verbose=verbose)
@@ -1128,7 +1146,7 @@ class NBERWTFConstructor(NBERWTF):
             data = self.__raw_data
         #-Check if Operation has been conducted-#
         op_string = u"(split_countrycodes)"
-        if check_operations(self, op_string, verbose=verbose): 
+        if check_operations(self, op_string, start=True, verbose=verbose): 
             if force:   
                 pass
             else:
@@ -1177,7 +1195,7 @@ class NBERWTFConstructor(NBERWTF):
         """
         #-Op String-#
         op_string = u"(apply_iso3n_custom_fixes)"
-        if check_operations(self, op_string): 
+        if check_operations(self, op_string, start=True): 
             return None
         if not check_operations(self, u"(split_countrycodes)", verbose=verbose):        #ensure iiso3n, eiso3n are constructed
             if verbose: print "[INFO] Calling split_countrycodes() method"
@@ -1233,7 +1251,7 @@ class NBERWTFConstructor(NBERWTF):
         """
         #-OpString-#
         op_string = u"(add_iso3c)"
-        if check_operations(self, op_string): return None
+        if check_operations(self, op_string, start=True): return None
         #-Core-#
         if not check_operations(self, u"(split_countrycodes)"):         #Requires iiso3n, eiso3n
             if verbose: print "[INFO] Calling split_countrycodes() method"
@@ -1266,7 +1284,7 @@ class NBERWTFConstructor(NBERWTF):
         """
         #-OpString-#
         op_string = u"(add_isocountrynames)"
-        if check_operations(self, op_string): return None
+        if check_operations(self, op_string, start=True): return None
         #-Checks-#
         if not check_operations(self, u"(split_countrycodes"):      #Requires iiso3n, eiso3n
             self.split_countrycodes(apply_fixes=True, iso3n_only=True, verbose=verbose)
@@ -1301,7 +1319,7 @@ class NBERWTFConstructor(NBERWTF):
         """
         #-OpString-#
         op_string = u"(countries_only)"
-        if check_operations(self, op_string): return self.dataset           #Already been computed
+        if check_operations(self, op_string, start=True): return self.dataset           #Already been computed
         #-Checks-#
         if not check_operations(self, u"(add_iso3c)"):          
             if verbose: print "[INFO] Calling add_iso3c method"
@@ -1330,7 +1348,7 @@ class NBERWTFConstructor(NBERWTF):
         """
         #-OpString-#
         op_string = u"(drop_world_observations)"
-        if check_operations(self, op_string): 
+        if check_operations(self, op_string, start=True): 
             return None             #Already been computed
         #-Core-#
         if verbose: print "[INFO] Dropping Observations that include `World` in importer or exporter attribute"
@@ -1364,7 +1382,7 @@ class NBERWTFConstructor(NBERWTF):
         """
         #-OpString-#
         op_string = u"(world_only)"
-        if check_operations(self, op_string): return self.dataset   #Already been computed
+        if check_operations(self, op_string, start=True): return self.dataset   #Already been computed
         #-Checks-#
         if not check_operations(self, u"(add_iso3c)"):          #Requires iiso3n, eiso3n
             self.add_iso3c(verbose=verbose)
@@ -1402,7 +1420,7 @@ class NBERWTFConstructor(NBERWTF):
                 raise ValueError("This is not a complete Dataset! ... use force=True if you want to proceed.")
         #-OpString-#
         op_string = u"(adjust_countrycodes_intertemporal)"
-        if check_operations(self, op_string): 
+        if check_operations(self, op_string, start=True): 
             return None
         #-Checks-#
         if not check_operations(self, u"(countries_only)"):         #Adds iso3c 
@@ -1532,7 +1550,7 @@ class NBERWTFConstructor(NBERWTF):
             subidx = list(subidx)                       
         #-Check if Operation has been conducted-#
         op_string = u"(collapse_to_valuesonly[%s])" % subidx
-        if check_operations(self, op_string): return None
+        if check_operations(self, op_string, start=True): return None
         # - Conduct Duplicate Analysis - #
         dup = self._dataset.duplicated(subset=subidx)  
         if verbose:
@@ -1557,7 +1575,7 @@ class NBERWTFConstructor(NBERWTF):
         """
         #-OpString-#
         op_string = u"(change_value_units)"
-        if check_operations(self, op_string): return None
+        if check_operations(self, op_string, start=True): return None
         #-Core-#
         if verbose: print "[INFO] Setting Values to be in $'s not %s$'s" % (self._units_value)
         self._dataset['value'] = self.dataset['value'] * self._units_value
@@ -1578,7 +1596,7 @@ class NBERWTFConstructor(NBERWTF):
         """
         #-OpString-#
         op_string = u"(add_sitcr2_official_marker)"
-        if check_operations(self, op_string): return None
+        if check_operations(self, op_string, start=True): return None
         #-Core-#
         if verbose: print "[INFO] Adding SITC Revision 2 (Source='un') marker variable 'SITCR2'"
         sitc = SITC(revision=2, source_institution=source_institution)
@@ -1611,23 +1629,23 @@ class NBERWTFConstructor(NBERWTF):
         """
         if level == 1:
             op_string = u"(add_productcode_level1)"
-            if check_operations(self, op_string): return None
+            if check_operations(self, op_string, start=True): return None
         elif level == 2:
             op_string = u"(add_productcode_level2)"
-            if check_operations(self, op_string): return None
+            if check_operations(self, op_string, start=True): return None
         elif level == 3:
             op_string = u"(add_productcode_level3)"
-            if check_operations(self, op_string): return None
+            if check_operations(self, op_string, start=True): return None
         else:
             raise ValueError("SITC4 Can Only Be Split into Levels 1,2, or 3")
         #-Core-#
         if verbose: print "[INFO] Adding Product Code Level: SITC L%s" % level
         if level == 1:
-            self._dataset['SITCL1'] = self._dataset['sitc4'].apply(lambda x: x[0:1])
+            self._dataset['SITCL1'] = self._dataset['sitc4'].str[0:1]
         if level == 2:
-            self._dataset['SITCL2'] = self._dataset['sitc4'].apply(lambda x: x[0:2])
+            self._dataset['SITCL2'] = self._dataset['sitc4'].str[0:2]
         if level == 3:
-            self._dataset['SITCL3'] = self._dataset['sitc4'].apply(lambda x: x[0:3])
+            self._dataset['SITCL3'] = self._dataset['sitc4'].str[0:3]
         #-OpString-#
         update_operations(self, op_string)
 
@@ -1656,7 +1674,7 @@ class NBERWTFConstructor(NBERWTF):
         """
         if verbose: print "[INFO] Cannot Aggregate Quantity due to units. Discarding 'quantity'"
         op_string = u"(collapse_to_productcode_level%s)" % level
-        if check_operations(self, op_string): 
+        if check_operations(self, op_string, start=True): 
             return None
         if level not in [1,2,3]:
             raise ValueError("Level must be 1,2, or 3 for SITC4 Data")
@@ -1672,7 +1690,7 @@ class NBERWTFConstructor(NBERWTF):
             subidx = list(cols) + ['value']                                         #Is this really necessary? just remove value?
         if verbose: print "[INFO] Collapsing Data to SITC Level #%s" % level
         colcode = 'sitc%s' % level
-        self._dataset[colcode] = self.dataset['sitc4'].apply(lambda x: x[0:level])
+        self._dataset[colcode] = self.dataset['sitc4'].str[0:level]
         #-Aggregate-#
         for idx,item in enumerate(subidx):
             if item == 'sitc4': subidx[idx] = colcode                               # Remove sitc4 and add in the lower level of aggregation sitc3 etc.
@@ -1683,6 +1701,37 @@ class NBERWTFConstructor(NBERWTF):
         #-OpString-#
         update_operations(self, op_string)
 
+    def productcode_level_cube(self, levels='default', subidx='default', verbose=False):
+        """
+        Aggregate the Dataset to all Coarser SITC Levels (i.e. L4 -> L3 -> L2 -> L1) in a Single Pass
+
+        Parameters
+        ----------
+        levels  :   list, optional(default='default')
+                    Specify SITC Levels below self.level [Default: all levels below self.level]
+        subidx  :   list, optional(default='default')
+                    Specify a Column Filter (as collapse_to_productcode_level)
+                    [Default: all columns except 'quantity', 'unit', 'dot']
+
+        Returns
+        -------
+        ProductCodeCube (cube[3] returns the dataset collapsed to 'sitc3')
+
+        Notes
+        -----
+        1. The dataset is sorted once and each level is reduced from the level above it
+        2. self.dataset is not modified. Use collapse_to_productcode_level() to replace the dataset with a single level
+
+        """
+        productcode = 'sitc%s' % self.level
+        if levels == 'default':
+            levels = range(self.level-1, 0, -1)
+        if subidx == 'default':
+            subidx = [item for item in self.dataset.columns if item not in ['quantity', 'unit', 'dot']]
+        keys = [item for item in subidx if item != 'value']
+        if verbose: print "[INFO] Aggregating %s to SITC Levels %s on: %s" % (productcode, levels, keys)
+        return productcode_cube(self.dataset, productcode=productcode, levels=levels, keys=keys, values=['value'])
+
     def delete_sitc4_issues_with_raw_data(self, verbose=False):
         """
         This method deletes any known issues with the raw_data associated with productcodes
@@ -1732,7 +1781,7 @@ class NBERWTFConstructor(NBERWTF):
 
         """
         op_string = u"(add_productcode_alpha_indicator)"
-        if check_operations(self, op_string): return None
+        if check_operations(self, op_string, start=True): return None
         #-Core-#
         if verbose: print "[INFO] Identifying SITC Codes with A and X"
         self._dataset['SITCA'] = self._dataset['sitc%s' % self.level].apply(lambda x: 1 if re.search("[aA]",x) else 0)
@@ -1757,7 +1806,7 @@ class NBERWTFConstructor(NBERWTF):
             to bring the specially constructed product codes to data in future years.
         """
         op_string = u"(drop_alpha_productcodes)"
-        if check_operations(self, op_string): return None
+        if check_operations(self, op_string, start=True): return None
         pre_value = self.dataset["value"].sum()
         #-Core-#
         if not check_operations(self, u"(identify_alpha_productcodes)"):
@@ -1925,7 +1974,7 @@ class NBERWTFConstructor(NBERWTF):
         str_kwargs = [", %s=%s" % (key, SITC_DATASET_OPTIONS[dataset][key]) for key in sorted(SITC_DATASET_OPTIONS[dataset].keys())]
         op_string = u"(construct_sitc_dataset(data_type=%s, dataset=%s, product_level=%s, sitc_revision=%s, report=%s, dataset_object=%s, verbose=%s%s))" % (data_type, dataset, product_level, sitc_revision, report, dataset_object, verbose, "".join(str_kwargs))
         self.notes = op_string #-Save Settings-#
-        if check_operations(self, op_string): 
+        if check_operations(self, op_string, start=True): 
             return None
         #-Main Work-#
         DESCRIPTION = SITC_DATASET_DESCRIPTION[dataset]
@@ -3026,61 +3075,49 @@ class NBERWTFConstructor(NBERWTF):
                         Cleanup Construction Variables
 
         """
+        if self.level < 2:
+            raise ValueError("Level Cannot be Less than 2")
         table = self.intertemporal_productcodes_dataset(tabletype=tabletype, meta=True, verbose=verbose)
         idx = list(table.index.names)
         table = table.reset_index()
-        table["NOTSITCR2"] = table["SITCR2"].apply(lambda x: False if x == 1 else True)  #defines sitc revision 2 code
-        if self.level < 2:
-            raise ValueError("Level Cannot be Less than 2")
-        table["sitc%s"%(self.level-1)] = table["sitc%s"%self.level].apply(lambda x: x[0:self.level-1])     #defines higher chapter level
-        #-Group Analysis-#
-        #-Check Any Non SITCR2 in Higher Chapter Level-#
-        indicator = table[["NOTSITCR2","sitc%s"%(self.level-1)]].groupby("sitc%s"%(self.level-1))["NOTSITCR2"].any()              #For Each Higher Chapter Level see if any codes are not SITCR2          
-        indicator.name = "NOTSITCR2-ING"
-        table = table.join(indicator, on="sitc%s"%(self.level-1), how="left")
-        idx.append("NOTSITCR2-ING")
-        #-Compute Number of Items in Group-#
-        num_items = table[["SITCR2","sitc%s"%(self.level-1)]].groupby("sitc%s"%(self.level-1))["SITCR2"].count()
-        num_items.name = "SITC-COUNT-ING"
-        table = table.join(num_items, on="sitc%s"%(self.level-1), how="left")
-        idx.append("SITC-COUNT-ING")
-        #-Compute Number of Non SITCR2 Items in Group-#
-        num_sitcr2 = table[["SITCR2","sitc%s"%(self.level-1)]].groupby("sitc%s"%(self.level-1))["SITCR2"].sum()
-        num_sitcr2.name = "SITCR2-SUM-ING"
-        table = table.join(num_sitcr2, on="sitc%s"%(self.level-1), how="left")
-        idx.append("SITCR2-SUM-ING")
-        table["NUM-NOTSITCR2-ING"] = table["SITC-COUNT-ING"] - table["SITCR2-SUM-ING"]
-        idx.append("NUM-NOTSITCR2-ING")
-        #-Check if any group members are intertemporally inconsistent-#
-        table["NotIntertempConsistent"] = table["%Coverage"].apply(lambda x: False if x == 1 else True)
-        inconsistent = table[["NotIntertempConsistent", "sitc%s"%(self.level-1)]].groupby("sitc%s"%(self.level-1))["NotIntertempConsistent"].any()
-        inconsistent.name = "NotIntertempConsistent-ING"
-        table = table.join(inconsistent, on="sitc%s"%(self.level-1), how="left")
-        idx.append("NotIntertempConsistent-ING")
-        #-Check for Low Value Group Members-#
+        sitcg = "sitc%s"%(self.level-1)
+        table["NOTSITCR2"] = table["SITCR2"] != 1                                                       #defines sitc revision 2 code
+        table[sitcg] = table["sitc%s"%self.level].str[0:self.level-1]                                   #defines higher chapter level
+        #-Row Level Indicators-#
+        table["NotIntertempConsistent"] = table["%Coverage"] != 1
         if tabletype != "composition":
             data = self.intertemporal_productcode_simple_adjustments_table(tabletype="composition", verbose=verbose).reset_index()
         else:
             data = table
         rowavgnorm, rowmax = low_value_settings
-        table["LowValue"] = data[["AvgNorm", "Max"]].apply(lambda row: True if (row["AvgNorm"] < rowavgnorm)&(row["Max"] < rowmax) else False, axis=1)
-        low_value = table[["LowValue", "sitc%s"%(self.level-1)]].groupby("sitc%s"%(self.level-1))["LowValue"].any()
-        low_value.name = "LowValue-ING"
-        table = table.join(low_value, on="sitc%s"%(self.level-1), how="left")
-        idx.append("LowValue")
-        idx.append("LowValue-ING")
-        #-Check Official Codes Coverage-#
-        table["OfficialNotIC"] = table[["SITCR2", "%Coverage"]].apply(lambda row: True if (row["%Coverage"]<1)&(row["SITCR2"]==True) else False , axis=1)
-        officialnotic = table[["OfficialNotIC", "sitc%s"%(self.level-1)]].groupby("sitc%s"%(self.level-1))["OfficialNotIC"].any()
-        officialnotic.name = "OfficialNotIC-ING"
-        table = table.join(officialnotic, on="sitc%s"%(self.level-1), how="left")
-        idx.append("OfficialNotIC")
-        idx.append("OfficialNotIC-ING")
+        low_value = (data["AvgNorm"] < rowavgnorm) & (data["Max"] < rowmax)
+        official_not_ic = (table["%Coverage"] < 1) & (table["SITCR2"] == True)
+        #-Group Analysis (One Pass over the Higher Chapter Level)-#
+        groups = table.groupby(sitcg)
+        group_table = pd.DataFrame({
+            "NOTSITCR2-ING"                 :   groups["NOTSITCR2"].any(),                               #For Each Higher Chapter Level see if any codes are not SITCR2
+            "SITC-COUNT-ING"                :   groups["SITCR2"].count(),
+            "SITCR2-SUM-ING"                :   groups["SITCR2"].sum(),
+            "NotIntertempConsistent-ING"    :   groups["NotIntertempConsistent"].any(),                  #Check if any group members are intertemporally inconsistent
+        })
+        group_table["NUM-NOTSITCR2-ING"] = group_table["SITC-COUNT-ING"] - group_table["SITCR2-SUM-ING"]
+        group_table["LowValue-ING"] = low_value.groupby(table[sitcg]).any()                             #Check for Low Value Group Members
+        group_table["OfficialNotIC-ING"] = official_not_ic.groupby(table[sitcg]).any()                  #Check Official Codes Coverage
+        #-Broadcast Group Results to Rows-#
+        positions = group_table.index.get_indexer(table[sitcg])
+        row_level = {"LowValue" : low_value, "OfficialNotIC" : official_not_ic}
+        columns = ["NOTSITCR2-ING", "SITC-COUNT-ING", "SITCR2-SUM-ING", "NUM-NOTSITCR2-ING", "NotIntertempConsistent-ING", "LowValue", "LowValue-ING", "OfficialNotIC", "OfficialNotIC-ING"]
+        for column in columns:
+            if column in row_level:
+                table[column] = row_level[column]
+            else:
+                table[column] = group_table[column].values.take(positions)
+            idx.append(column)
         #-Set Index-#
         table = table.set_index(idx)
         if cleanup:
             del table["NOTSITCR2"]
-            del table["sitc%s"%(self.level-1)]
+            del table[sitcg]
             del table["NotIntertempConsistent"]
         return table
 
@@ -3095,44 +3132,25 @@ class NBERWTFConstructor(NBERWTF):
         drop_items, collapse_items, table
         """
 
-        def all_sitcr2_in_group(df, level, column="VC", indicator="VK"):
-            """ Check to see if non_sitcr2 code is in a chapter group """
-            sitcg = "sitc%s"%(level-1)
-            df[sitcg] = df["sitc%s"%level].apply(lambda x: x[0:level-1])
-            df["ALLSITCR2"] = df["SITCR2"].apply(lambda x: True if x == 1 else 0)
-            columns = [sitcg, "ALLSITCR2", column]
-            result = df[columns].groupby([column, sitcg]).all()                 #Column will split results between VK and VD groups within the chapter definitions
-            #-Cleanup Table-#
-            del df[sitcg]
-            del df["ALLSITCR2"]
-            return result.ix[indicator]
-
-        def check_vc_rule(allsitcr2ing, row):
-            if row["VC"] == "VD":
-                return False
-            #-Parse Other Elements within that Group-#
-            try:
-                return allsitcr2ing.ix[row["sitc%s"%self.level][0:self.level-1]]["ALLSITCR2"]
-            except:
-                return False #SITC Code not in Results Table
- 
         #-Core-#
         value_check, rowavgnorm, rowmax = value_check
         include_special, SpecialCase = include_special
         table = self.intertemporal_productcode_simple_adjustments_table(tabletype=tabletype, low_value_settings=(rowavgnorm, rowmax), verbose=verbose)
         idx = list(table.index.names)
         table = table.reset_index()
+        sitcl, sitcg = "sitc%s"%self.level, "sitc%s"%(self.level-1)
+        codes = table[sitcl]
         #-Drop-#
-        table["D"] = (table["SITC-COUNT-ING"] - table["NUM-NOTSITCR2-ING"]).apply(lambda x: "D" if x == 0 else ".")
-        drop_items = set(table.loc[table.D == "D"]["sitc%s"%self.level].unique())
+        table["D"] = np.where(table["SITC-COUNT-ING"] - table["NUM-NOTSITCR2-ING"] == 0, "D", ".")
+        drop_items = set(codes[table.D == "D"].unique())
         #-Collapse-#
         #-Collapse Items that contain non official SITC R2 Codes within the SITC group to higher chapter level-#
-        table["C"] = table["NOTSITCR2-ING"].apply(lambda x: "C" if x == True else ".")
+        table["C"] = np.where(table["NOTSITCR2-ING"] == True, "C", ".")
         collapse_items = set(table.loc[table.C == "C"]["sitc%s"%self.level].unique())
         #-Itertemporal Check-#
         #-Collapse Items that have productcodes within the SITC group that are intertemporally incomplete-#
-        table["IC"] = table["NotIntertempConsistent-ING"].apply(lambda x: "IC" if x == True else ".")        #Post 1974 and 1984 the products should not get dropped according to this rule (Check this!)
-        table["IC"] = table[["SITC-COUNT-ING", "NotIntertempConsistent-ING", "IC"]].apply(lambda row: "ID" if (row["SITC-COUNT-ING"] == 1) & (row["NotIntertempConsistent-ING"]) else row["IC"] , axis=1)
+        table["IC"] = np.where(table["NotIntertempConsistent-ING"] == True, "IC", ".")                      #Post 1974 and 1984 the products should not get dropped according to this rule (Check this!)
+        table["IC"] = np.where((table["SITC-COUNT-ING"] == 1) & (table["NotIntertempConsistent-ING"] == True), "ID", table["IC"])
         intertemp_collapse_items = set(table.loc[table.IC == "IC"]["sitc%s"%self.level].unique())
         intertemp_drop_items = set(table.loc[table.IC == "ID"]["sitc%s"%self.level].unique())
         if verbose:
@@ -3149,12 +3167,16 @@ class NBERWTFConstructor(NBERWTF):
         collapse_items = collapse_items.union(intertemp_collapse_items).difference(drop_items)                            #Can be Overlap based on Identifying Rules
         if value_check:
             #-Value Check-#
-            table["VC"] = table[["SITCR2", "LowValue"]].apply(lambda row: "VD" if (row["LowValue"] == True)&(row["SITCR2"]==False) else ".", axis=1)
+            table["VC"] = np.where((table["LowValue"] == True) & (table["SITCR2"] == False), "VD", ".")
             #table["VC"] = table[["LowValue-ING", "VC"]].apply(lambda row: "VK" if (row["LowValue-ING"])&(row["VC"]!="VD") else row["VC"], axis=1) #This might not be a 100% reliable so undertake a Manual Review of these items. This requires checking if there are still nonsitr2 codes or significant intertemp inconsistent lines
-            table["VC"] = table[["LowValue-ING", "VC"]].apply(lambda row: "VC" if (row["LowValue-ING"])&(row["VC"]!="VD") else row["VC"], axis=1) #This might not be a 100% reliable so undertake a Manual Review of these items. This requires checking if there are still nonsitr2 codes or significant intertemp inconsistent lines
+            table["VC"] = np.where((table["LowValue-ING"] == True) & (table["VC"] != "VD"), "VC", table["VC"]) #This might not be a 100% reliable so undertake a Manual Review of these items. This requires checking if there are still nonsitr2 codes or significant intertemp inconsistent lines
             #-Keep Adjustments-#
-            allsitcr2ing = all_sitcr2_in_group(table, level=self.level, column="VC", indicator="VC")
-            table["VC"] = table[["sitc%s"%self.level, "VC"]].apply(lambda row: "VK" if check_vc_rule(allsitcr2ing, row) == True else row["VC"], axis=1)
+            #-Keep (VK) if all 'VC' members of the higher chapter level are official SITCR2 codes (and the item is not dropped 'VD')-#
+            group = codes.str[0:self.level-1]
+            value_collapse = (table["VC"] == "VC").values
+            allsitcr2ing = (table["SITCR2"] == 1)[value_collapse].groupby(group[value_collapse]).all()
+            keep = group.map(allsitcr2ing).fillna(False).astype(bool) & (table["VC"] != "VD")
+            table["VC"] = np.where(keep, "VK", table["VC"])
             #-Set's-#
             value_collapse_items = set(table.loc[table.VC == "VC"]["sitc%s"%self.level].unique())
             value_keep_items = set(table.loc[table.VC == "VK"]["sitc%s"%self.level].unique())
@@ -3169,8 +3191,8 @@ class NBERWTFConstructor(NBERWTF):
             collapse_items = collapse_items.union(value_collapse_items) - value_keep_items - value_drop_items
         if official_coverage:
             #-Check Official Codes that don't have complete intertemporal coverage-#
-            table["OC"] = table["OfficialNotIC-ING"].apply(lambda x: "OC" if x else ".")
-            table["JVCOC"] = table[["VC", "OC"]].apply(lambda row: "OC" if (row["VC"]!=".")&(row["OC"]=="OC") else ".", axis=1)
+            table["OC"] = np.where(table["OfficialNotIC-ING"] == True, "OC", ".")
+            table["JVCOC"] = np.where((table["VC"] != ".") & (table["OC"] == "OC"), "OC", ".")
             official_coverage_collapse = set(table.loc[table.JVCOC == "OC"]["sitc%s"%self.level].unique())
             #-Adjust-#
             drop_items = drop_items - official_coverage_collapse
@@ -3197,10 +3219,7 @@ class NBERWTFConstructor(NBERWTF):
                 special_keep = set(IntertemporalProducts().IC8400SpecialCases["L%s"%self.level]["keep"])
                 recode = IntertemporalProducts().IC8400SpecialCases["L%s"%self.level]["recode"]                     #Dictionary            
             special_recode = set(recode.keys())
-            table["SP"] = table["sitc%s"%self.level].apply(lambda x: "SK" if x in special_keep else ".")
-            table["SP"] = table[["sitc%s"%self.level,"SP"]].apply(lambda row: "SC" if row["sitc%s"%self.level] in special_collapse else row["SP"], axis=1)
-            table["SP"] = table[["sitc%s"%self.level,"SP"]].apply(lambda row: "SD" if row["sitc%s"%self.level] in special_drop else row["SP"], axis=1)
-            table["SP"] = table[["sitc%s"%self.level,"SP"]].apply(lambda row: "SR" if row["sitc%s"%self.level] in special_recode else row["SP"], axis=1)
+            table["SP"] = np.select([codes.isin(special_recode), codes.isin(special_drop), codes.isin(special_collapse), codes.isin(special_keep)], ["SR", "SD", "SC", "SK"], ".")
             if verbose: 
                 print "[INFO] Integrating Special Requests ..."
                 print "special_drop = %s" % special_drop
@@ -3211,13 +3230,14 @@ class NBERWTFConstructor(NBERWTF):
             drop_items = drop_items.union(special_drop) - special_keep - special_recode
             collapse_items = collapse_items.union(special_collapse) - special_keep - special_drop - special_recode
         #-Final Rule-#
-        table["RULE"] = "K"     #Default Rule
-        table["RULE"] = table[["sitc%s"%self.level,"RULE"]].apply(lambda row: "C" if row["sitc%s"%self.level] in collapse_items else row["RULE"], axis=1)
+        rule = np.where(codes.isin(collapse_items), "C", "K").astype(object)                               #Default Rule: "K"
         if include_special:
-            table["RULE"] = table[["sitc%s"%self.level,"RULE"]].apply(lambda row: "R(%s)"%recode[row["sitc%s"%self.level]] if row["sitc%s"%self.level] in special_recode else row["RULE"], axis=1)    
-        table["RULE"] = table[["sitc%s"%self.level,"RULE"]].apply(lambda row: "D" if row["sitc%s"%self.level] in drop_items else row["RULE"], axis=1)
+            recoded = codes.isin(special_recode).values
+            rule[recoded] = ["R(%s)" % recode[code] for code in codes[recoded]]                          #One Entry per Recoded Product
+        rule[codes.isin(drop_items).values] = "D"
+        table["RULE"] = rule
         warnings.warn("This requires a manual check in the event some K's should in fact be C due to the presence of nested within group SITCR2")
-        table["CHECK"] = table[["C", "VC", "RULE"]].apply(lambda row: "<-- CHECK" if (row["VC"]=="VK")&(row["C"]=="C") else "", axis=1)
+        table["CHECK"] = np.where((table["VC"] == "VK") & (table["C"] == "C"), "<-- CHECK", "")
         #-Sortedness-#
         drop_items = sorted(drop_items)
         collapse_items = sorted(collapse_items)
@@ -3236,22 +3256,49 @@ class NBERWTFConstructor(NBERWTF):
 
         STATUS: IN-WORK
 
+        Parameters
+        ----------
+        drop_items      :   list
+                            Product codes to drop
+        collapse_items  :   list
+                            Product codes to collapse to the higher chapter level (i.e. '0011' -> '0010')
+
+        Notes
+        -----
+        1. Collapse is applied as one mapping of the unique product codes and rows with repeated product codes are then 
+           summed in a single groupby over the remaining (non value) columns
+        2. Rows with missing (NaN) keys (i.e. ecode, icode) are kept as their own group. The groupby is on factor codes
+           (NaN placed last) as pandas excludes NaN groups
+
         """
-        
-        def check_collapse(value, collapse_code):
-            if value == collapse_code:
-                value = collapse_code[0:self.level-1]+"0"
-            return value
-        
-        data = self.dataset.copy() 
+        sitcl = "sitc%s"%self.level
+        data = self.dataset
         oshape = data.shape 
         #-Drop Items-#
-        keep_items = set(data.sitc4.unique()).difference(set(drop_items))
-        data = data.loc[data["sitc%s"%(self.level)].isin(keep_items)]
+        data = data.loc[~data[sitcl].isin(set(drop_items))]
         #-Collapse Items-#
-        for code in collapse_items:
-            data["sitc%s"%self.level] = data["sitc%s"%self.level].apply(lambda x: check_collapse(x, code))
-        data = data.groupby(data.columns).sum() #Collapse Repeated ProductCodes
+        codes, uniques = pd.factorize(data[sitcl])
+        collapse_items = set(collapse_items)
+        uniques = np.array([code[0:self.level-1]+"0" if code in collapse_items else code for code in uniques] + [np.nan], dtype=object)
+        productcode = uniques.take(codes)                                               #-Code -1 (NaN) takes the appended np.nan-#
+        #-Collapse Repeated ProductCodes-#
+        values = [column for column in ["value", "quantity"] if column in data.columns]
+        keys = [column for column in data.columns if column not in values]
+        key_codes, key_uniques = dict(), dict()
+        for column in keys:
+            codes, uniques = pd.factorize(productcode if column == sitcl else data[column].values, sort=True)
+            key_codes[column] = np.where(codes >= 0, codes, len(uniques))
+            key_uniques[column] = uniques
+        collapsed = pd.DataFrame(key_codes, columns=keys)
+        for column in values:
+            collapsed[column] = data[column].values
+        data = collapsed.groupby(keys, sort=True)[values].sum().reset_index()
+        for column in keys:                                                             #-Restore Keys from Factor Codes-#
+            codes, uniques = data[column].values, key_uniques[column]
+            if (codes == len(uniques)).any():
+                data[column] = np.append(np.asarray(uniques, dtype=object), np.nan).take(codes)
+            else:
+                data[column] = uniques.take(codes)
         fshape = data.shape 
         if verbose: print "From %s to %s due to operation" % (oshape, fshape)
         return data
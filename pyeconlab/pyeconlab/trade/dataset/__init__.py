@@ -48,4 +48,7 @@ from .CEPIIBACI.dataset import BACITradeData, BACIExportData, BACIImportData
 
 #-CID Atlas of Complexity-#
 from .CIDATLAS.base import AtlasOfComplexity
-from .CIDATLAS.dataset import CIDAtlasTradeData, CIDAtlasExportData, CIDAtlasImportData
\ No newline at end of file
+from .CIDATLAS.dataset import CIDAtlasTradeData, CIDAtlasExportData, CIDAtlasImportData
+
+#-Synthetic Raw Data (Testing and Benchmarks)-#
+from .synthetic import generate_nberwtf_source, generate_baci_source
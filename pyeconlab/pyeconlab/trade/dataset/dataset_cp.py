@@ -37,12 +37,14 @@ Future Work
 3. Impliment Geographic Aggregates
 """
 
+import numpy as np
 import pandas as pd
 import cPickle as pickle
 import warnings
 import matplotlib.pyplot as plt
 
 from pyeconlab.util import concord_data
+from pyeconlab.trade.util.aggregation import CountryAggregates
 
 #-Country x Product Trade Dataset-#
 
@@ -434,6 +436,47 @@ class CPTradeDataset(object):
             if item not in columns: 
                 raise TypeError("Need %s to be specified in the incoming data" % item)
 
+    def merge_data(self, other, year_conflict='average'):
+        """
+        Align Data with Another CPDataset and Resolve the 'value' for each Year
+
+        Parameters
+        ----------
+        year_conflict   :   str, optional(default='average')
+                            Provide instruction for year conflicts (average data, left dominant, right dominant)
+
+        Returns
+        -------
+        pd.DataFrame (outer join on the index) with 'value_x', 'value_y' and the resolved 'value'
+
+        Notes
+        -----
+        1. A single index join is made and 'value' is selected from 'value_x' or 'value_y' with a year mask. 
+           Years only in other use 'value_y', years only in self use 'value_x' and conflicting years use year_conflict
+
+        """
+        if year_conflict not in ['average', 'left', 'right']:
+            raise ValueError("year_conflict must be 'average', 'left', or 'right'")
+        #-Year Information-#
+        lyrs = set(self.data.index.get_level_values(level='year'))
+        ryrs = set(other.data.index.get_level_values(level='year'))
+        intersection = sorted(list(lyrs.intersection(ryrs)))
+        print "[INFO] %s years are in conflict through the merge. The year_conflict behaviour is: %s" % (intersection, year_conflict)
+        #-Check Indexing-#
+        assert self.data.index.names == other.data.index.names, "Data is not indexed in the same manner! Are these compatible Classes?" 
+        data = self.data.merge(other.data, how='outer', left_index=True, right_index=True)
+        #-Select Values by Year-#
+        years = data.index.get_level_values(level='year')
+        conflict = years.isin(intersection)
+        right = years.isin(list(ryrs)) & ~conflict
+        value = np.where(right, data['value_y'].values, data['value_x'].values)
+        if year_conflict == 'average':
+            value[conflict] = data[['value_x', 'value_y']].mean(axis=1).values[conflict]
+        elif year_conflict == 'right':
+            value[conflict] = data['value_y'].values[conflict]
+        data['value'] = value
+        return data
+
     def merge(self, other, year_conflict='average', debug=False):
         """ 
         Merge With Another CPDataset
@@ -454,32 +497,7 @@ class CPTradeDataset(object):
         #
         #-Add __class__ checking for eligible merging-#
         #
-        #-Year Information-#
-        lyrs = set(self.data.index.get_level_values(level='year'))
-        ryrs = set(other.data.index.get_level_values(level='year'))
-        intersection = sorted(list(lyrs.intersection(ryrs)))
-        years = sorted(list(lyrs.union(ryrs)))
-        print "[INFO] %s years are in conflict through the merge. The year_conflict behaviour is: %s" % (intersection, year_conflict)
-        #-Check Indexing-#
-        assert self.data.index.names == other.data.index.names, "Data is not indexed in the same manner! Are these compatible Classes?" 
-        data = self.data.merge(other.data, how='outer', left_index=True, right_index=True)
-        s = pd.Series()                                                                             #Probably a better way to do this, but this will do for now
-        for year, df in data.groupby(level='year'):
-            if year in intersection:
-                if year_conflict == 'average':
-                    s = s.append(df[['value_x', 'value_y']].mean(axis=1))
-                elif year_conflict == 'left':
-                    s = s.append(df['value_x'])
-                elif year_conflict == 'right':
-                    s = s.append(df['value_y'])
-                continue
-            if year in ryrs:
-                s = s.append(df['value_y'])
-            else:
-                s = s.append(df['value_x'])
-        #-Return TradeDataset-#
-        value = pd.DataFrame(s, columns=['value'])
-        data = data.merge(value, how='left', left_index=True, right_index=True).reset_index()
+        data = self.merge_data(other, year_conflict=year_conflict).reset_index()
         if debug:
             return data
         del data['value_x']
@@ -510,44 +528,59 @@ class CPTradeDataset(object):
         members     :   dict
                         Provide Country Aggregate Dictionary
         issue_error :   bool or str, optional(default='.')
-                        Issue error for concord_data
+                        Issue error for concord_data (True drops countries not in members, False keeps them, 
+                        a value groups them under that value)
+
+        Notes
+        -----
+        1. eiso3c and iiso3c (where present) are mapped in a single pass using CountryAggregates
 
         """
+        if issue_error is True:
+            unmatched = 'drop'
+        elif issue_error is False:
+            unmatched = 'keep'
+        else:
+            unmatched = issue_error
         df = self.data.reset_index()
-        for cntry in members.keys():
-            try:
-                df['eiso3c'] = df['eiso3c'].apply(lambda x: concord_data(members, x, issue_error=issue_error))  #issue_error = false returns x if no match
-            except:
-                pass #-eiso3c not found-#
-            try:
-                df['iiso3c'] = df['iiso3c'].apply(lambda x: concord_data(members, x, issue_error=issue_error))  #issue_error = false returns x if no match
-            except:
-                pass #-iiso3c not found-#
-        #-Collapse Items-#
-        idx = ['year']
-        for item in ['eiso3c', 'iiso3c']:
-            if item in df.columns:
-                idx.append(item)
-        idx.append('productcode')
+        columns = [item for item in ['eiso3c', 'iiso3c'] if item in df.columns]
+        idx = ['year'] + columns + ['productcode']
         if verbose: print "[INFO] Collapsing on index: %s" % idx
-        df = df.groupby(idx).sum()
-        self.set_data(df, force=True) 
+        df = CountryAggregates(members).aggregate(df[idx + ['value']], columns=columns, unmatched=unmatched)
+        self.set_data(df.set_index(idx), force=True) 
 
-    def geo_aggregates(self, members):
+    def geo_aggregates(self, members, sides='default', unmatched='drop', verbose=True):
         """
         Geographic Aggregates
 
-        Status: NOT IMPLIMENTED
+        Parameters
+        ----------
+        members     :   dict or CountryAggregates
+                        Provide a membership dictionary {'iso3c' : 'region'} or {'iso3c' : ['region', 'region']} for overlapping
+                        memberships or a compiled CountryAggregates object
+        sides       :   list, optional(default='default')
+                        Country columns to aggregate ['eiso3c'], ['iiso3c'] or ['eiso3c', 'iiso3c'] [Default: all country columns in the data]
+        unmatched   :   str, optional(default='drop')
+                        'drop' countries that are not in a region, 'keep' them as their own region, or a region label
+
+        Returns
+        -------
+        pd.DataFrame indexed in the same manner as data with regions in place of countries
 
         Notes
         -----
-        1. Given this methods location, it will have to try eiso3c and iiso3c as this is inherited by both Trade, Import and Export Datasets
-
-        members = dict {'iso3c' : 'region'}
-        Subsitute Country Names for Regions and Collapse.sum()
+        1. Data is not modified so several regional aggregates can be computed from the same dataset
+        2. Compile members once with CountryAggregates when making many aggregates with the same memberships
 
         """
-        raise NotImplementedError
+        if not isinstance(members, CountryAggregates):
+            members = CountryAggregates(members)
+        idx = list(self.data.index.names)
+        if sides == 'default':
+            sides = [item for item in ['eiso3c', 'iiso3c'] if item in idx]
+        if verbose: print "[INFO] Aggregating %s to %s" % (sides, members)
+        df = members.aggregate(self.data.reset_index(), columns=sides, unmatched=unmatched)
+        return df.set_index(idx)
 
 
     #-Plots-#
@@ -735,38 +768,12 @@ class CPExportData(CPTradeDataset):
         ..  Future Work:
             -----------
             1. Class Checking ... Currently using an assert on index names
-            2. Can this call super for year merge? This will split the function up and will make debugging a bit more difficult, for now I am happy with code duplication
 
         """
         #-Country Option-#
         clhs = set(self.exporters)
         crhs = set(other.exporters)
-        #-Year Information-#
-        lyrs = set(self.data.index.get_level_values(level='year'))
-        ryrs = set(other.data.index.get_level_values(level='year'))
-        intersection = sorted(list(lyrs.intersection(ryrs)))
-        years = sorted(list(lyrs.union(ryrs)))
-        print "[INFO] %s years are in conflict through the merge. The year_conflict behaviour is: %s" % (intersection, year_conflict)
-        #-Check Indexing-#
-        assert self.data.index.names == other.data.index.names, "Data is not indexed in the same manner! Are these compatible Classes?" 
-        data = self.data.merge(other.data, how='outer', left_index=True, right_index=True)
-        s = pd.Series()                                                                             #Probably a better way to do this, but this will do for now
-        for year, df in data.groupby(level='year'):
-            if year in intersection:
-                if year_conflict == 'average':
-                    s = s.append(df[['value_x', 'value_y']].mean(axis=1))
-                elif year_conflict == 'left':
-                    s = s.append(df['value_x'])
-                elif year_conflict == 'right':
-                    s = s.append(df['value_y'])
-                continue
-            if year in ryrs:
-                s = s.append(df['value_y'])
-            else:
-                s = s.append(df['value_x'])
-        #-Return TradeDataset-#
-        value = pd.DataFrame(s, columns=['value'])
-        data = data.merge(value, how='left', left_index=True, right_index=True).reset_index()
+        data = self.merge_data(other, year_conflict=year_conflict).reset_index()
         if debug:
             return data
         del data['value_x']
@@ -0,0 +1,367 @@
+"""
+Synthetic Raw Trade Data
+========================
+
+Generate RAW source files that match the NBER World Trade Flows and CEPII BACI schemas so that the dataset
+constructors can be tested and benchmarked at scale without the licensed source files
+
+Source Schemas
+--------------
+    NBERWTF     :   wtf##.dta       (year, icode, importer, ecode, exporter, sitc4, unit, dot, value, quantity)
+    BACI        :   baci##_YYYY.csv (t, i, j, hs6, v, q)
+
+Quirks Reproduced
+-----------------
+    NBERWTF
+        1. icode / ecode are 6 character strings: UN-REGION [2] + ISO3N [3] + Modifier [1]. 'World' = '100000'
+        2. Country names follow the source (i.e. 'Fm USSR' to 1991 and 'Russian Fed' from 1992)
+        3. 'A' and 'X' product codes (i.e. '444A', '444X') and codes ending in '0' when the USA is a partner
+        4. A small number of observations with no sitc4 code ('') and non-standard codes in 1962-1965 (i.e. '0021')
+        5. quantity and unit are only reported from 1984. dot is missing for some observations
+        6. Duplicate (year, importer, exporter, sitc4) observations (i.e. different units) that must be collapsed
+    BACI
+        1. i and j are BACI iso3n codes (i.e. France = 251) and are integers
+        2. hs6 is written as an integer so codes lose their leading zero (i.e. '010111' => 10111)
+        3. Observations are unique on (t, i, j, hs6) and sorted. q is missing for some observations
+
+Notes
+-----
+    1. Trade flows are drawn from a gravity-like model (lognormal exporter, importer and product sizes) so that
+       the data is sparse and concentrated as in the source data. Values are lognormal
+    2. Each year (and each chunk of a year) is generated independently from (seed, year, chunk) so that files can
+       be generated incrementally at any row count (i.e. 100M rows) without holding the data in memory
+
+"""
+
+from __future__ import division
+
+import os
+import shutil
+import numpy as np
+import pandas as pd
+
+from pyeconlab.util import check_directory, package_folder
+
+#-Schemas-#
+
+NBERWTF_COLUMNS = ['year', 'icode', 'importer', 'ecode', 'exporter', 'sitc4', 'unit', 'dot', 'value', 'quantity']
+BACI_COLUMNS = ['t', 'i', 'j', 'hs6', 'v', 'q']
+
+#-NBER Country Name Eras (name : (first year, last year))-#
+NBERWTF_COUNTRY_ERAS = {
+    'Fm USSR'       :   (1962, 1991),
+    'Russian Fed'   :   (1992, 2000),
+    'Fm German FR'  :   (1962, 1990),
+    'Fm German DR'  :   (1962, 1990),
+    'Germany'       :   (1991, 2000),
+    'Fm Yugoslav'   :   (1962, 1991),
+    'Slovenia'      :   (1992, 2000),
+    'Czechoslovak'  :   (1962, 1992),
+    'Czech Rep'     :   (1993, 2000),
+}
+
+NBERWTF_UNITS = ['W', 'N', 'K', 'A', 'H', 'L', 'P', 'V']
+NBERWTF_EARLY_CODES = ['0021', '0023', '0024', '0025', '0031', '0035', '0039', '2829']
+
+BACI_CLASSIFICATION = {
+    'HS92'  :   1992,
+    'HS96'  :   1996,
+    'HS02'  :   2002,
+}
+
+#-------------------#
+#-Country & Product-#
+#-------------------#
+
+def nberwtf_countries():
+    """
+    NBER Country Names and 6 Character Country Codes (UN-REGION + ISO3N + Modifier)
+
+    Returns
+    -------
+    pd.Series(code) indexed by countryname (excluding 'World')
+
+    Notes
+    -----
+        1. Countries without an iso3n code (i.e. 'Areas NES') are assigned codes in 900 - 999
+    """
+    from .NBERWTF.meta import countryname_to_iso3n
+    rng = np.random.RandomState(0)
+    names = sorted(name for name in countryname_to_iso3n.keys() if name != 'World')
+    codes = list()
+    unassigned = 900
+    for name in names:
+        iso3n = countryname_to_iso3n[name]
+        if iso3n == '.':
+            iso3n, unassigned = unassigned, unassigned + 1
+        codes.append("%02d%03d%s" % (rng.randint(11, 70), int(float(iso3n)), '0'))
+    return pd.Series(codes, index=names, name='code')
+
+def baci_countries(classification='HS96'):
+    """ BACI iso3n Country Codes (HS92 uses the HS96 concordance) """
+    from .CEPIIBACI.meta import iso3n_to_iso3c
+    classification = 'HS96' if classification == 'HS92' else classification
+    return np.array(sorted(iso3n_to_iso3c[classification].keys()), dtype=np.int64)
+
+def sitcr2_productcodes():
+    """ SITC Revision 2 Level 4 Product Codes """
+    from pyeconlab.trade.classification import SITCR2
+    return np.array(sorted(SITCR2().get_codes(4)), dtype=object)
+
+def hs_productcodes(classification='HS96'):
+    """ HS Level 6 Product Codes for a BACI classification ('HS92', 'HS96', 'HS02') (excluding special codes i.e. '9999AA') """
+    from pyeconlab.trade.classification import HS
+    codes = HS(BACI_CLASSIFICATION[classification]).L6['Code']
+    return np.array(sorted(codes[codes.str.match(r'^\d{6}$')].unique()), dtype=object)
+
+#------------#
+#-Generators-#
+#------------#
+
+def gravity_weights(num, sigma, rng):
+    """ Lognormal Sizes normalised to Probabilities """
+    weights = rng.lognormal(0.0, sigma, num)
+    return weights / weights.sum()
+
+def draw_flows(num_rows, exporter_weights, importer_weights, product_weights, rng):
+    """
+    Draw Unique (exporter, importer, product) positions from a Gravity-like model (exporter != importer)
+
+    Returns
+    -------
+    exporters, importers, products (sorted by exporter, importer, product)
+
+    Notes
+    -----
+        1. Flows are drawn with replacement and duplicates removed until num_rows are found. num_rows is limited
+           to half the number of possible cells
+    """
+    num_exporters = (exporter_weights > 0).sum()
+    num_importers = (importer_weights > 0).sum()
+    num_products = len(product_weights)
+    if num_rows > num_exporters * num_importers * num_products // 2:
+        raise ValueError("num_rows (%s) is more than half of the %s x %s x %s possible flows" % (num_rows, num_exporters, num_importers, num_products))
+    keys = np.array([], dtype=np.int64)
+    while len(keys) < num_rows:
+        size = int((num_rows - len(keys)) * 1.2) + 10
+        exporters = rng.choice(len(exporter_weights), size=size, p=exporter_weights)
+        importers = rng.choice(len(importer_weights), size=size, p=importer_weights)
+        products = rng.choice(num_products, size=size, p=product_weights)
+        flat = (exporters * len(importer_weights) + importers) * num_products + products
+        keys = np.union1d(keys, flat[exporters != importers])
+    keys = np.sort(rng.choice(keys, size=num_rows, replace=False))
+    exporters, rest = np.divmod(keys, len(importer_weights) * num_products)
+    importers, products = np.divmod(rest, num_products)
+    return exporters, importers, products
+
+def year_rng(seed, year, chunk=0):
+    """ Independent RandomState for each (seed, year, chunk) """
+    return np.random.RandomState([seed, year, chunk])
+
+def synthetic_nberwtf_year(year, num_rows, seed=0, world_share=0.1, alpha_share=0.03, usa_zero_share=0.1, duplicate_share=0.01):
+    """
+    Synthetic RAW NBERWTF Data for a Year (the interface of pd.read_stata('wtf##.dta'))
+
+    Parameters
+    ----------
+    year            :   int
+                        Year (1962 to 2000)
+    num_rows        :   int
+                        Number of observations
+    seed            :   int, optional(default=0)
+                        Country and Product sizes depend only on seed. Flows depend on (seed, year)
+    world_share     :   float, optional(default=0.1)
+                        Share of observations with importer 'World'
+    alpha_share     :   float, optional(default=0.03)
+                        Share of product codes with an 'A' or 'X' code
+    usa_zero_share  :   float, optional(default=0.1)
+                        Share of product codes ending in '0' when the USA is a partner
+    duplicate_share :   float, optional(default=0.01)
+                        Share of observations duplicated with a different unit (1984 to 2000)
+
+    """
+    if year < 1962 or year > 2000:
+        raise ValueError("NBERWTF years are 1962 to 2000")
+    #-Countries (World is the last Importer) and Products (Fixed by seed)-#
+    countries = nberwtf_countries()
+    names = np.append(np.asarray(countries.index, dtype=object), 'World')
+    codes = np.append(np.asarray(countries.values, dtype=object), '100000')
+    products = sitcr2_productcodes()
+    sizes = np.random.RandomState(seed)
+    exporter_weights = sizes.lognormal(0.0, 2.0, len(countries))
+    importer_weights = exporter_weights * sizes.lognormal(0.0, 0.5, len(countries))
+    product_weights = gravity_weights(len(products), 1.5, sizes)
+    #-Countries in Existence in year-#
+    eras = [NBERWTF_COUNTRY_ERAS.get(name, (1962, 2000)) for name in countries.index]
+    active = np.array([start <= year <= end for start, end in eras])
+    exporter_weights = np.append(np.where(active, exporter_weights, 0.0), 0.0)
+    importer_weights = np.where(active, importer_weights, 0.0)
+    importer_weights = np.append(importer_weights / importer_weights.sum() * (1.0 - world_share), world_share)
+    rng = year_rng(seed, year)
+    if year < 1984:
+        duplicate_share = 0.0
+    num_unique = num_rows - int(num_rows * duplicate_share)
+    exporters, importers, positions = draw_flows(num_unique, exporter_weights / exporter_weights.sum(), importer_weights, product_weights, rng)
+    data = pd.DataFrame({
+        'year'      :   np.repeat(year, num_unique).astype(np.int64),
+        'icode'     :   codes[importers],
+        'importer'  :   names[importers],
+        'ecode'     :   codes[exporters],
+        'exporter'  :   names[exporters],
+    })
+    #-Values (US$1000's)-#
+    gravity = np.log(exporter_weights[exporters] * importer_weights[importers] * len(countries) ** 2)
+    data['value'] = np.maximum(np.round(np.exp(rng.normal(2.0 + 0.25 * gravity, 2.0))), 1.0)
+    #-Product Code Quirks-#
+    sitc4 = products[positions]
+    usa = ((data['exporter'].values == 'USA') | (data['importer'].values == 'USA')) & (rng.rand(num_unique) < usa_zero_share)
+    sitc4[usa] = [code[:3] + '0' for code in sitc4[usa]]
+    alpha = rng.rand(num_unique) < alpha_share
+    sitc4[alpha] = [code[:3] + letter for code, letter in zip(sitc4[alpha], rng.choice(['A', 'X'], size=alpha.sum()))]
+    if year <= 1965:
+        early = rng.rand(num_unique) < 0.0005
+        sitc4[early] = rng.choice(NBERWTF_EARLY_CODES, size=early.sum())
+    sitc4[rng.rand(num_unique) < 1e-6] = ''
+    data['sitc4'] = sitc4
+    #-Units, Quantity and Direction of Trade-#
+    if year >= 1984:
+        reported = rng.rand(num_unique) < 0.8
+        data['unit'] = np.where(reported, rng.choice(NBERWTF_UNITS, size=num_unique, p=[0.6, 0.2, 0.1, 0.02, 0.02, 0.02, 0.02, 0.02]), '')
+        data['quantity'] = np.where(reported, np.round(data['value'].values * rng.lognormal(0.0, 1.5, num_unique)), np.nan)
+    else:
+        data['unit'] = ''
+        data['quantity'] = np.nan
+    data['dot'] = np.where(rng.rand(num_unique) < 0.2, np.nan, np.where(rng.rand(num_unique) < 0.85, 1.0, 2.0))
+    #-Duplicate Observations with a Different Unit-#
+    num_duplicates = num_rows - num_unique
+    if num_duplicates > 0:
+        duplicates = data.iloc[rng.randint(0, num_unique, size=num_duplicates)].copy()
+        duplicates['unit'] = rng.choice(NBERWTF_UNITS, size=num_duplicates)
+        duplicates['value'] = np.maximum(np.round(duplicates['value'].values * rng.rand(num_duplicates)), 1.0)
+        duplicates['quantity'] = np.round(duplicates['value'].values * rng.lognormal(0.0, 1.5, num_duplicates))
+        data = data.append(duplicates, ignore_index=True)
+    return data[NBERWTF_COLUMNS]
+
+def synthetic_baci_year(year, num_rows, classification='HS96', seed=0, missing_quantity_share=0.05, chunk=0, num_chunks=1):
+    """
+    Synthetic RAW BACI Data for a Year (the interface of baci##_YYYY.csv)
+
+    Parameters
+    ----------
+    year                    :   int
+    num_rows                :   int
+                                Number of observations (unique on i, j, hs6)
+    classification          :   str, optional(default='HS96')
+                                'HS92', 'HS96', 'HS02'
+    seed                    :   int, optional(default=0)
+    missing_quantity_share  :   float, optional(default=0.05)
+    chunk                   :   int, optional(default=0)
+    num_chunks              :   int, optional(default=1)
+                                Exporters are split into num_chunks blocks and chunk generates the flows of its block
+                                so chunks are unique and sorted across a file
+
+    """
+    countries = baci_countries(classification)
+    products = hs_productcodes(classification)
+    sizes = np.random.RandomState(seed)
+    exporter_weights = gravity_weights(len(countries), 2.0, sizes)
+    importer_weights = gravity_weights(len(countries), 2.0, sizes)
+    product_weights = gravity_weights(len(products), 1.5, sizes)
+    #-Exporters in this Chunk-#
+    block = np.array_split(np.arange(len(countries)), num_chunks)[chunk]
+    exporter_weights = np.where(np.in1d(np.arange(len(countries)), block), exporter_weights, 0.0)
+    exporter_weights = exporter_weights / exporter_weights.sum()
+    rng = year_rng(seed, year, chunk)
+    exporters, importers, positions = draw_flows(num_rows, exporter_weights, importer_weights, product_weights, rng)
+    gravity = np.log(exporter_weights[exporters] * importer_weights[importers] * len(countries) ** 2)
+    values = np.round(np.exp(rng.normal(2.0 + 0.25 * gravity, 2.0)), 3)
+    quantity = np.round(values * rng.lognormal(0.0, 1.5, num_rows), 3)
+    quantity[rng.rand(num_rows) < missing_quantity_share] = np.nan
+    data = pd.DataFrame({
+        't'     :   np.repeat(year, num_rows).astype(np.int64),
+        'i'     :   countries[exporters],
+        'j'     :   countries[importers],
+        'hs6'   :   products.astype(np.int64)[positions],
+        'v'     :   np.maximum(values, 0.001),
+        'q'     :   quantity,
+    })
+    return data[BACI_COLUMNS]
+
+#---------#
+#-Writers-#
+#---------#
+
+def generate_nberwtf_source(target_dir, years=range(1962, 2000+1), num_rows=1000000, seed=0, verbose=False, **kwargs):
+    """
+    Write Synthetic RAW NBERWTF Files (wtf##.dta) for use with NBERWTFConstructor(source_dir=target_dir, ftype='dta')
+
+    Parameters
+    ----------
+    target_dir  :   str
+    years       :   list, optional(default=1962 to 2000)
+    num_rows    :   int, optional(default=1000000)
+                    Total number of observations (split evenly across years)
+    seed        :   int, optional(default=0)
+    kwargs      :   Passed to synthetic_nberwtf_year()
+
+    Returns
+    -------
+    list of file names
+
+    """
+    target_dir = check_directory(target_dir)
+    fls = list()
+    for year, rows in zip(years, split_rows(num_rows, len(years))):
+        fl = target_dir + "wtf%s.dta" % str(year)[-2:]
+        if verbose: print "[INFO] Writing %s observations for year %s to %s" % (rows, year, fl)
+        synthetic_nberwtf_year(year, rows, seed=seed, **kwargs).to_stata(fl, write_index=False)
+        fls.append(fl)
+    return fls
+
+def generate_baci_source(target_dir, classification='HS96', years=None, num_rows=1000000, chunk_size=5000000, seed=0, meta=True, verbose=False, **kwargs):
+    """
+    Write Synthetic RAW BACI Files (baci##_YYYY.csv) for use with BACIConstructor(source_dir=target_dir, ftype='csv')
+
+    Parameters
+    ----------
+    target_dir      :   str
+    classification  :   str, optional(default='HS96')
+    years           :   list, optional(default=None)
+                        Default: BACI.source_available_years[classification]
+    num_rows        :   int, optional(default=1000000)
+                        Total number of observations (split evenly across years)
+    chunk_size      :   int, optional(default=5000000)
+                        Maximum number of observations held in memory (years are written in chunks)
+    seed            :   int, optional(default=0)
+    meta            :   bool, optional(default=True)
+                        Copy the package country and product code files into target_dir
+    kwargs          :   Passed to synthetic_baci_year()
+
+    Returns
+    -------
+    list of file names
+
+    """
+    from .CEPIIBACI.base import BACI
+    target_dir = check_directory(target_dir)
+    if years is None:
+        years = list(BACI.source_available_years[classification])
+    fls = list()
+    for year, rows in zip(years, split_rows(num_rows, len(years))):
+        fl = target_dir + "baci%s_%s.csv" % (classification.strip('HS'), year)
+        num_chunks = max(1, int(np.ceil(rows / chunk_size)))
+        if verbose: print "[INFO] Writing %s observations for year %s to %s (%s chunks)" % (rows, year, fl, num_chunks)
+        for chunk, chunk_rows in enumerate(split_rows(rows, num_chunks)):
+            data = synthetic_baci_year(year, chunk_rows, classification=classification, seed=seed, chunk=chunk, num_chunks=num_chunks, **kwargs)
+            data.to_csv(fl, index=False, header=(chunk == 0), mode='w' if chunk == 0 else 'a')
+        fls.append(fl)
+    if meta:
+        meta_dir = package_folder(__file__, os.path.join('CEPIIBACI', 'meta', 'curated'))
+        for fl in [BACI.country_data_fn[classification], BACI.product_data_fn[classification]]:
+            shutil.copy(meta_dir + fl, target_dir + fl)
+    return fls
+
+def split_rows(num_rows, num_parts):
+    """ Split num_rows into num_parts as evenly as possible """
+    base, extra = divmod(int(num_rows), num_parts)
+    return [base + (1 if part < extra else 0) for part in xrange(num_parts)]
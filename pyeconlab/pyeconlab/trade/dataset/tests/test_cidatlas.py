@@ -0,0 +1,107 @@
+"""
+Tests for CIDAtlasDataConstructor Raw Data Loading
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+from pyeconlab.util import groupby_sum_observed
+from pyeconlab.trade.dataset.CIDATLAS.constructor import CIDAtlasDataConstructor
+
+
+def synthetic_atlas_trade(years, num_rows, seed=0):
+	""" Synthetic year_origin_destination_sitc.tsv Contents """
+	rng = np.random.RandomState(seed)
+	countries = np.array(['aus', 'usa', 'chn', 'fra', 'wld', 'xxa'])
+	data = pd.DataFrame({
+		'year'          :   np.repeat(years, num_rows),
+		'origin'        :   rng.choice(countries, num_rows * len(years)),
+		'destination'   :   rng.choice(countries, num_rows * len(years)),
+		'sitc4'         :   ['%04d' % code for code in rng.randint(0, 200, num_rows * len(years))],
+		'export_val'    :   np.round(rng.lognormal(5, 2, num_rows * len(years)), 0),
+		'import_val'    :   np.round(rng.lognormal(5, 2, num_rows * len(years)), 0),
+	})
+	data.loc[rng.rand(len(data)) < 0.1, 'import_val'] = np.nan
+	return data[['year', 'origin', 'destination', 'sitc4', 'export_val', 'import_val']]
+
+
+class TestSuite_cidatlas_load(unittest.TestCase):
+	"""
+	Test Chunked TSV Ingestion and the Year Partitioned HDF Cache
+	"""
+
+	def setUp(self):
+		self.source_dir = tempfile.mkdtemp() + '/'
+		self.data = synthetic_atlas_trade([1990, 1991, 1992], 500)
+		self.data.to_csv(self.source_dir + 'year_origin_destination_sitc.tsv', sep='\t', index=False)
+
+	def tearDown(self):
+		shutil.rmtree(self.source_dir)
+
+	def expected(self, years):
+		data = self.data.loc[self.data['year'].isin(years)].reset_index(drop=True)
+		data['year'] = data['year'].astype(np.int16)
+		return data
+
+	def test_tsv_year_filter(self):
+		obj = CIDAtlasDataConstructor(self.source_dir, "SITCR2", "trade", years=[1992, 1990], ftype='tsv')
+		expected = pd.concat([self.expected([1992]), self.expected([1990])], ignore_index=True)
+		pd.util.testing.assert_frame_equal(obj.raw_data, expected)
+		self.assertEqual(obj.raw_data['sitc4'].iloc[0], expected['sitc4'].iloc[0])
+
+	def test_chunks_match_single_read(self):
+		obj = CIDAtlasDataConstructor(self.source_dir, "SITCR2", "trade", years=[1991], ftype='tsv')
+		obj.load_raw_from_tsv(reset_cache=True, chunksize=77, verbose=False)
+		pd.util.testing.assert_frame_equal(obj.raw_data, self.expected([1991]))
+
+	def test_cache_has_all_years(self):
+		CIDAtlasDataConstructor(self.source_dir, "SITCR2", "trade", years=[1990], ftype='tsv')
+		self.assertTrue(os.path.exists(self.source_dir + 'cache/cidatlas_SITCR2_trade_year.h5'))
+		obj = CIDAtlasDataConstructor(self.source_dir, "SITCR2", "trade", years=[1991, 1992], ftype='hdf')
+		pd.util.testing.assert_frame_equal(obj.raw_data, self.expected([1991, 1992]))
+
+	def test_standardized_trade_dataset(self):
+		obj = CIDAtlasDataConstructor(self.source_dir, "SITCR2", "trade", years=[1990, 1991], ftype='tsv')
+		raw = obj.raw_data
+		exports = raw[['year', 'origin', 'destination', 'sitc4', 'export_val']]
+		exports.columns = ['year', 'eiso3c', 'iiso3c', 'sitc4', 'value']
+		imports = raw[['year', 'destination', 'origin', 'sitc4', 'import_val']]
+		imports.columns = ['year', 'eiso3c', 'iiso3c', 'sitc4', 'value']
+		expected = exports.append(imports, ignore_index=True)
+		for column in ['eiso3c', 'iiso3c']:
+			expected[column] = expected[column].apply(lambda x: x.upper())
+		obj.construct_standardized_dataset(verbose=False)
+		self.assertTrue(hasattr(obj.dataset['eiso3c'], 'cat'))
+		result = obj.dataset.copy()
+		for column in ['eiso3c', 'iiso3c']:
+			result[column] = result[column].astype(object)
+		pd.util.testing.assert_frame_equal(result, expected)
+		self.assertIn("(construct_standardized_dataset)", obj.operations)
+
+	def test_standardized_object_codes(self):
+		obj = CIDAtlasDataConstructor(self.source_dir, "SITCR2", "trade", years=[1990], ftype='tsv')
+		obj.construct_standardized_dataset(categorical=False, verbose=False)
+		self.assertEqual(obj.dataset['eiso3c'].dtype, object)
+		self.assertEqual(set(obj.dataset['eiso3c']), set(['AUS', 'USA', 'CHN', 'FRA', 'WLD', 'XXA']))
+
+	def test_countries_only_collapse(self):
+		#-dataset_construct_other.py: construct_standardized_dataset() -> countries_only() -> groupby_sum_observed(idx)-#
+		obj = CIDAtlasDataConstructor(self.source_dir, "SITCR2", "trade", years=[1990, 1991], ftype='tsv')
+		obj.construct_standardized_dataset(verbose=False)
+		obj.countries_only(verbose=False)
+		idx = ["year", "eiso3c", "iiso3c", "sitc4"]
+		self.assertEqual(obj.dataset['eiso3c'].dtype.name, 'category')
+		countrydata = groupby_sum_observed(obj.dataset, idx, ["value"])
+		self.assertFalse(countrydata[idx].isnull().any().any())
+		self.assertEqual(len(countrydata), len(obj.dataset.drop_duplicates(idx)))
+		self.assertEqual(set(countrydata['eiso3c']), set(['AUS', 'USA', 'CHN', 'FRA']))
+		np.testing.assert_allclose(countrydata['value'].sum(), obj.dataset['value'].sum())
+		expected = obj.dataset.copy()
+		for column in ['eiso3c', 'iiso3c']:
+			expected[column] = expected[column].astype(object)
+			countrydata[column] = countrydata[column].astype(object)
+		pd.util.testing.assert_frame_equal(countrydata, expected[idx+["value"]].groupby(idx, as_index=False).sum())
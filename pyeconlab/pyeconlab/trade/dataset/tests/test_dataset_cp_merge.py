@@ -0,0 +1,59 @@
+"""
+Tests for CPTradeDataset Merge Year Conflict Resolution
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+
+from pyeconlab.trade.dataset import CPExportData
+
+
+def export_data(name, years, seed):
+	""" CPExportData with Random Values """
+	rng = np.random.RandomState(seed)
+	index = pd.MultiIndex.from_product([years, ['AUS', 'USA', 'CHN'], ['0011', '0012']], names=['year', 'eiso3c', 'productcode'])
+	data = pd.DataFrame({'value' : rng.rand(len(index))}, index=index).reset_index()
+	data = data.loc[rng.rand(len(data)) < 0.8].reset_index(drop=True)
+	data.txf_name = name
+	data.txf_classification = 'SITC'
+	data.txf_revision = 2
+	data.txf_complete_dataset = False
+	data.txf_notes = ''
+	data.txf_units_value_str = 'US$'
+	return CPExportData(data)
+
+
+class TestSuite_merge(unittest.TestCase):
+	"""
+	Test Vectorized Year Conflict Resolution against a Per Year Reference
+	"""
+
+	def setUp(self):
+		self.left = export_data('NBER', [1998, 1999, 2000], seed=0)
+		self.right = export_data('BACI', [2000, 2001], seed=1)
+
+	def expected(self, year_conflict):
+		data = self.left.data.merge(self.right.data, how='outer', left_index=True, right_index=True)
+		values = list()
+		for (year, country, product), row in data.iterrows():
+			if year == 2000:
+				values.append({'average' : row[['value_x', 'value_y']].mean(), 'left' : row['value_x'], 'right' : row['value_y']}[year_conflict])
+			elif year == 2001:
+				values.append(row['value_y'])
+			else:
+				values.append(row['value_x'])
+		data['value'] = values
+		return data
+
+	def test_year_conflict(self):
+		for year_conflict in ['average', 'left', 'right']:
+			result = self.left.merge_data(self.right, year_conflict=year_conflict)
+			pd.util.testing.assert_frame_equal(result, self.expected(year_conflict))
+
+	def test_merge(self):
+		merged = self.left.merge(self.right, year_conflict='right', countries='outer')
+		self.assertEqual(sorted(merged.years), [1998, 1999, 2000, 2001])
+		expected = self.expected('right')['value']
+		pd.util.testing.assert_series_equal(merged.data['value'], expected)
+		self.assertRaises(ValueError, self.left.merge, self.right, year_conflict='mean')
@@ -0,0 +1,86 @@
+"""
+Tests for NBERWTFConstructor Intertemporal ProductCode Adjustments
+"""
+
+import unittest
+import warnings
+import numpy as np
+import pandas as pd
+
+from pyeconlab.trade.dataset.NBERWTF.constructor import NBERWTFConstructor
+
+
+class ProductCodeTable(NBERWTFConstructor):
+	""" NBERWTFConstructor with a Fixed Intertemporal ProductCode Table """
+
+	def __init__(self, table):
+		self.level = 4
+		self.table = table
+
+	def intertemporal_productcodes_dataset(self, tabletype='indicator', **kwargs):
+		return self.table.copy()
+
+
+class TestSuite_intertemporal_productcodes(unittest.TestCase):
+	"""
+	Test Vectorized Drop and Collapse Rules
+	"""
+
+	def setUp(self):
+		table = pd.DataFrame({
+			'sitc4'     :   ['0011', '0012', '0010', '0111', '0112', '0221', '022X', '0340'],
+			'SITCR2'    :   [1, 1, 0, 1, 1, 1, 0, 0],
+			'%Coverage' :   [1.0, 1.0, 0.5, 1.0, 0.8, 1.0, 1.0, 0.5],
+			'AvgNorm'   :   [5.0, 5.0, 5.0, 5.0, 0.1, 5.0, 0.1, 5.0],
+			'Max'       :   [10.0, 10.0, 10.0, 10.0, 1.0, 10.0, 1.0, 10.0],
+		})
+		table['SITCA'], table['SITCX'] = 0, table['sitc4'].str.contains('X').astype(int)
+		self.obj = ProductCodeTable(table.set_index(['sitc4', 'SITCR2', 'SITCA', 'SITCX']))
+
+	def test_simple_adjustments_table(self):
+		table = self.obj.intertemporal_productcode_simple_adjustments_table(tabletype='composition', verbose=False).reset_index().set_index('sitc4')
+		self.assertEqual(list(table['NOTSITCR2-ING']), [True, True, True, False, False, True, True, True])
+		self.assertEqual(list(table['SITC-COUNT-ING']), [3, 3, 3, 2, 2, 2, 2, 1])
+		self.assertEqual(list(table['NUM-NOTSITCR2-ING']), [1, 1, 1, 0, 0, 1, 1, 1])
+		self.assertEqual(list(table['LowValue-ING']), [False, False, False, True, True, True, True, False])
+		self.assertEqual(list(table['OfficialNotIC-ING']), [False, False, False, True, True, False, False, False])
+
+	def test_lists(self):
+		with warnings.catch_warnings():
+			warnings.simplefilter('ignore')
+			drop_items, collapse_items, table = self.obj.intertemporal_productcode_lists(tabletype='composition', include_special=(False, '6200'), \
+																							return_table=True, verbose=False)
+		self.assertEqual(drop_items, ['022X', '0340'])
+		self.assertEqual(collapse_items, ['0010', '0011', '0012', '0111', '0112'])
+		self.assertEqual(table.reset_index().set_index('sitc4')['VC']['0221'], 'VK')
+		rules = table.reset_index().set_index('sitc4')['RULE']
+		self.assertEqual(rules['0340'], 'D')
+		self.assertEqual(rules['0011'], 'C')
+
+	def test_adjustments(self):
+		rng = np.random.RandomState(0)
+		self.obj._dataset = pd.DataFrame({
+			'year'      :   rng.choice([1990, 1991], 500),
+			'eiso3c'    :   rng.choice(['AUS', 'USA'], 500),
+			'sitc4'     :   rng.choice(['0011', '0012', '0010', '0111', '0340'], 500),
+			'value'     :   rng.rand(500),
+		})[['year', 'eiso3c', 'sitc4', 'value']]
+		result = self.obj.intertemporal_productcode_adjustments(['0340'], ['0011', '0012'], verbose=False)
+		expected = self.obj._dataset.loc[self.obj._dataset['sitc4'] != '0340'].copy()
+		expected['sitc4'] = expected['sitc4'].replace({'0011' : '0010', '0012' : '0010'})
+		expected = expected.groupby(['year', 'eiso3c', 'sitc4']).sum().reset_index()
+		pd.util.testing.assert_frame_equal(result, expected)
+		self.assertEqual(sorted(result['sitc4'].unique()), ['0010', '0111'])
+
+	def test_adjustments_missing_keys(self):
+		self.obj._dataset = pd.DataFrame({
+			'year'      :   [1990, 1990, 1990, 1990, 1990],
+			'ecode'     :   ['100', np.nan, np.nan, '100', '200'],
+			'sitc4'     :   ['0011', '0012', '0011', '0010', np.nan],
+			'value'     :   [1.0, 10.0, 100.0, 1000.0, 10000.0],
+		})[['year', 'ecode', 'sitc4', 'value']]
+		result = self.obj.intertemporal_productcode_adjustments([], ['0011', '0012'], verbose=False)
+		self.assertEqual(result['value'].sum(), self.obj._dataset['value'].sum())
+		self.assertEqual(list(result.columns), ['year', 'ecode', 'sitc4', 'value'])
+		self.assertEqual(list(result['value']), [1001.0, 10000.0, 110.0])
+		self.assertTrue(pd.isnull(result['ecode'].iloc[2]) and pd.isnull(result['sitc4'].iloc[1]))
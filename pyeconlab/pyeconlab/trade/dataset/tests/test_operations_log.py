@@ -0,0 +1,67 @@
+"""
+Tests for the Dataset Constructor Operations Log
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+from pyeconlab.trade.dataset.synthetic import generate_baci_source
+from pyeconlab.util import check_operations, update_operations, OPERATIONS_LOG_COLUMNS
+
+
+class TestSuite_operations_log(unittest.TestCase):
+	"""
+	Test Operations Log on BACIConstructor
+	"""
+
+	def setUp(self):
+		from pyeconlab.trade.dataset import BACIConstructor
+		self.target_dir = tempfile.mkdtemp()
+		self.log_fn = os.path.join(self.target_dir, 'operations.jsonl')
+		generate_baci_source(self.target_dir, classification='HS96', years=[1998, 1999], num_rows=5000)
+		self.obj = BACIConstructor(source_dir=self.target_dir, source_classification='HS96', years=[1998, 1999], ftype='csv', \
+									operations_log_fn=self.log_fn, verbose=False)
+
+	def tearDown(self):
+		shutil.rmtree(self.target_dir)
+
+	def test_log_dataframe(self):
+		log = self.obj.operations_log
+		self.assertEqual(list(log.columns), OPERATIONS_LOG_COLUMNS)
+		self.assertEqual(list(log['operation']), [u"(load_raw)", u"(use_standard_column_names)"])
+		self.assertTrue((log['rows_out'] == 5000).all())
+		self.assertTrue(log['wall_time'].iloc[0] >= 0)
+		self.assertTrue((log['memory_out'] > 0).all())
+		self.assertTrue(np.isnan(log['rows_in'].iloc[0]))
+		self.assertIn('int64', log['dtypes_out'].iloc[1])
+
+	def test_check_update_operations(self):
+		op_string = u"(drop_small_values)"
+		self.assertFalse(check_operations(self.obj, op_string, start=True))
+		self.obj.dataset = self.obj.dataset.loc[self.obj.dataset['value'] > 1000].copy()
+		update_operations(self.obj, op_string)
+		self.assertTrue(check_operations(self.obj, op_string, verbose=False))
+		record = self.obj.operations_log.iloc[-1]
+		self.assertEqual(record['operation'], op_string)
+		self.assertEqual(record['rows_in'], 5000)
+		self.assertEqual(record['rows_out'], len(self.obj.dataset))
+		self.assertTrue(record['memory_out'] < record['memory_in'])
+
+	def test_check_operations_is_pure(self):
+		num_records = len(self.obj.operations_log)
+		self.assertFalse(check_operations(self.obj, u"(split_countrycodes)"))
+		self.assertNotIn(u"(split_countrycodes)", getattr(self.obj, '_operations_pending', dict()))
+		self.assertEqual(len(self.obj.operations_log), num_records)
+
+	def test_jsonlines(self):
+		with open(self.log_fn) as f:
+			records = [json.loads(line) for line in f]
+		self.assertEqual([record['operation'] for record in records], list(self.obj.operations_log['operation']))
+		self.assertIsNone(records[0]['rows_in'])
+		pd.util.testing.assert_frame_equal(pd.DataFrame(records, columns=OPERATIONS_LOG_COLUMNS).fillna(np.nan), \
+											self.obj.operations_log, check_dtype=False)
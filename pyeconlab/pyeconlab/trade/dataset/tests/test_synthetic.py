@@ -0,0 +1,83 @@
+"""
+Tests for Synthetic Raw Trade Data
+"""
+
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+from pyeconlab.trade.dataset.synthetic import synthetic_nberwtf_year, synthetic_baci_year, generate_nberwtf_source, generate_baci_source, \
+												NBERWTF_COLUMNS, BACI_COLUMNS
+
+
+class TestSuite_synthetic_nberwtf(unittest.TestCase):
+	"""
+	Test Synthetic NBERWTF Raw Data
+	"""
+
+	def test_schema_and_quirks(self):
+		data = synthetic_nberwtf_year(1990, 20000, seed=1)
+		self.assertEqual(list(data.columns), NBERWTF_COLUMNS)
+		self.assertEqual(len(data), 20000)
+		self.assertTrue(data['icode'].str.len().eq(6).all())
+		self.assertTrue((data.loc[data['importer'] == 'World', 'icode'] == '100000').all())
+		self.assertTrue(data['sitc4'].str.contains('[AX]').any())
+		self.assertTrue(data.duplicated(['importer', 'exporter', 'sitc4']).any())
+		self.assertTrue((data['value'] >= 1).all())
+		self.assertIn('Fm USSR', set(data['exporter']))
+		self.assertNotIn('Russian Fed', set(data['exporter']))
+
+	def test_quantity_from_1984(self):
+		data = synthetic_nberwtf_year(1970, 5000, seed=1)
+		self.assertTrue(data['quantity'].isnull().all())
+		self.assertTrue((data['unit'] == '').all())
+		self.assertFalse(data.duplicated(['importer', 'exporter', 'sitc4']).any())
+
+	def test_reproducible(self):
+		pd.util.testing.assert_frame_equal(synthetic_nberwtf_year(1995, 3000, seed=7), synthetic_nberwtf_year(1995, 3000, seed=7))
+
+	def test_constructor_loads_source(self):
+		from pyeconlab.trade.dataset import NBERWTFConstructor
+		target_dir = tempfile.mkdtemp()
+		try:
+			generate_nberwtf_source(target_dir, years=[1990, 1991], num_rows=10000)
+			obj = NBERWTFConstructor(source_dir=target_dir, years=[1990, 1991], ftype='dta', verbose=False)
+			self.assertEqual(len(obj.raw_data), 10000)
+			self.assertEqual(sorted(obj.raw_data['year'].unique()), [1990, 1991])
+		finally:
+			shutil.rmtree(target_dir)
+
+
+class TestSuite_synthetic_baci(unittest.TestCase):
+	"""
+	Test Synthetic BACI Raw Data
+	"""
+
+	def test_schema_and_quirks(self):
+		data = synthetic_baci_year(2000, 20000, seed=1)
+		self.assertEqual(list(data.columns), BACI_COLUMNS)
+		self.assertEqual(len(data), 20000)
+		self.assertFalse(data.duplicated(['i', 'j', 'hs6']).any())
+		self.assertFalse((data['i'] == data['j']).any())
+		self.assertTrue((data['hs6'] < 100000).any()) 										#Leading zero is lost
+		self.assertTrue(data['q'].isnull().any())
+
+	def test_chunks_are_disjoint_and_sorted(self):
+		first = synthetic_baci_year(2000, 5000, chunk=0, num_chunks=2)
+		second = synthetic_baci_year(2000, 5000, chunk=1, num_chunks=2)
+		self.assertTrue(first['i'].max() < second['i'].min())
+		data = first.append(second, ignore_index=True)
+		self.assertTrue(data[['i', 'j', 'hs6']].equals(data[['i', 'j', 'hs6']].sort_values(['i', 'j', 'hs6'])))
+
+	def test_constructor_loads_source(self):
+		from pyeconlab.trade.dataset import BACIConstructor
+		target_dir = tempfile.mkdtemp()
+		try:
+			generate_baci_source(target_dir, classification='HS96', years=[1998, 1999], num_rows=10000, chunk_size=3000)
+			obj = BACIConstructor(source_dir=target_dir, source_classification='HS96', years=[1998, 1999], ftype='csv', verbose=False)
+			self.assertEqual(len(obj.dataset), 10000)
+			self.assertFalse(obj.dataset.duplicated(['year', 'eiso3n', 'iiso3n', 'hs6']).any())
+		finally:
+			shutil.rmtree(target_dir)
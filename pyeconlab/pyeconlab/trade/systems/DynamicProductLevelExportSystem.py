@@ -55,6 +55,7 @@ from Products import Product 						#Move to Package Trade/Classifications?
 
 ### Remove After Refactor
 from ProductLevelExportSystem import *
+from pyeconlab.trade.util import SpillStore, pinned, parse_nbytes
 
 ### --- Parallel Computing Settings --- ###
 NUM_CORES = 4
@@ -92,10 +93,12 @@ class DynamicProductLevelExportSystem(object):
 	
 	## -- Base Class Functions -- ##
 
-	def __init__(self, fn='', series_name='export', replace={}, verbose=False):
+	def __init__(self, fn='', series_name='export', replace={}, memory_budget=None, spill_dir=None, verbose=False):
 		
 		## -- Core Cross-Section Object Tables -- ##
 		self.ples 			= dict()						# In-Memory Core Data
+		if memory_budget is not None:
+			self.set_memory_budget(memory_budget, spill_dir=spill_dir, verbose=verbose)
 		self.ples_struct 	= 'ProductLevelExportSystem'	
 		self.compile_dtypes = ['DataFrame']   				# List of Objects to Load ['DataFrame', 'MultiDiGraph', 'BiPartiteGraph']
 		# - Panel Level Attributes - #
@@ -122,6 +125,60 @@ class DynamicProductLevelExportSystem(object):
 			self.from_csv(fn, replace=replace, verbose=verbose)
 
 
+	## -- Memory Budget -- ##
+
+	def set_memory_budget(self, memory_budget, spill_dir=None, verbose=False):
+		"""
+		Keep the per-year ProductLevelExportSystems within a Memory Budget
+
+		When the array-like attributes (data, rca, mcp, proximity, mcc, mpp, temp etc.) of the years held in memory exceed 
+		the budget, the least recently used years are spilled to disk and reloaded when accessed through self.ples[year]
+		(see pyeconlab.trade.util.memory)
+
+		Parameters
+		----------
+		memory_budget 	: 	int or str
+							Memory budget in bytes or a string with units (i.e. '8GB')
+		spill_dir 		: 	str, optional(default=None)
+							Directory for spill files [Default: a temporary directory]
+
+		Notes
+		-----
+			1. The most recently accessed year is never spilled. Methods that loop over years (i.e. rca_matrices()) therefore
+			   need roughly the budget plus one year of memory
+			2. Spill and reload counts are available in memory_budget_counters
+
+		"""
+		if isinstance(self.ples, SpillStore):
+			if spill_dir is not None and spill_dir != self.ples.spill_dir:
+				self.release_memory_budget()
+			else:
+				self.ples.memory_budget = parse_nbytes(memory_budget)
+				self.ples.verbose = verbose
+				self.ples.enforce_budget()
+				return None
+		store = SpillStore(memory_budget, spill_dir=spill_dir, verbose=verbose)
+		for year in sorted(self.ples.keys()):
+			store[year] = self.ples[year]
+		self.ples = store
+		if verbose: print "[INFO] Memory budget of %s bytes (spill directory: %s)" % (store.memory_budget, store.spill_dir)
+
+	def release_memory_budget(self, verbose=False):
+		""" Reload all Spilled Years into Memory and Remove the Memory Budget """
+		if not isinstance(self.ples, SpillStore):
+			return None
+		store = self.ples
+		self.ples = store.to_dict()
+		store.close()
+		if verbose: print "[INFO] Memory budget released (%s spills, %s reloads)" % (store.counters['spills'], store.counters['reloads'])
+
+	@property
+	def memory_budget_counters(self):
+		""" Spill and Reload Counters {'spills', 'reloads', 'spilled_bytes', 'reloaded_bytes'} (None if there is no memory budget) """
+		if isinstance(self.ples, SpillStore):
+			return dict(self.ples.counters)
+		return None
+
 	## -- Python Class Methods -- ##
 
 	def __repr__(self):
@@ -141,6 +198,8 @@ class DynamicProductLevelExportSystem(object):
 			else: step = index.step
 			ryrs = range(index.start,index.stop,step)			#Could use (index.stop+1) .. but probably best to stick with convention
 			try:
+				if isinstance(self.ples, SpillStore):
+					return self.ples.view(ryrs)					#Reloads spilled years on access
 				r = dict()
 				for year in ryrs:
 					r[year] = self.ples[year]
@@ -268,6 +327,14 @@ class DynamicProductLevelExportSystem(object):
 			data[year] = self.ples[year].mcp
 		return data		
 
+	@property
+	def mcp_packed(self):
+		if self.years == None: return None
+		data = dict()
+		for year in self.years:
+			data[year] = self.ples[year].mcp_packed
+		return data
+
 	def get_mcp(self, year):
 		return self.ples[year].mcp
 
@@ -376,6 +443,94 @@ class DynamicProductLevelExportSystem(object):
 	def get_pci(self, year):
 		return self.ples[year].pci
 
+	@property
+	def density(self):
+		if self.years == None: return None
+		data = dict()
+		for year in self.years:
+			data[year] = self.ples[year].density
+		return data	
+
+	@property
+	def distance(self):
+		if self.years == None: return None
+		data = dict()
+		for year in self.years:
+			data[year] = self.ples[year].distance
+		return data	
+
+	@property
+	def complexity_outlook(self):
+		if self.years == None: return None
+		data = dict()
+		for year in self.years:
+			data[year] = self.ples[year].complexity_outlook
+		return data	
+
+	@property
+	def opportunity_gain(self):
+		if self.years == None: return None
+		data = dict()
+		for year in self.years:
+			data[year] = self.ples[year].opportunity_gain
+		return data	
+
+	@property
+	def country_proximity(self):
+		if self.years == None: return None
+		data = dict()
+		for year in self.years:
+			data[year] = self.ples[year].country_proximity
+		return data
+
+	@property
+	def fitness(self):
+		if self.years == None: return None
+		data = dict()
+		for year in self.years:
+			data[year] = self.ples[year].fitness
+		return data
+
+	@property
+	def fc_complexity(self):
+		if self.years == None: return None
+		data = dict()
+		for year in self.years:
+			data[year] = self.ples[year].fc_complexity
+		return data
+
+	@property
+	def proximity_zscore(self):
+		if self.years == None: return None
+		data = dict()
+		for year in self.years:
+			data[year] = self.ples[year].proximity_zscore
+		return data
+
+	@property
+	def proximity_pvalue(self):
+		if self.years == None: return None
+		data = dict()
+		for year in self.years:
+			data[year] = self.ples[year].proximity_pvalue
+		return data
+
+	@property
+	def graph(self):
+		if self.years == None: return None
+		data = dict()
+		for year in self.years:
+			data[year] = self.ples[year].graph
+		return data
+
+	@property
+	def backbone(self):
+		if self.years == None: return None
+		data = dict()
+		for year in self.years:
+			data[year] = self.ples[year].backbone
+		return data
+
 	@property
 	def complete_trade_network(self):
 		for year in self.years:
@@ -566,6 +721,18 @@ class DynamicProductLevelExportSystem(object):
 		for year in self.years:
 			self.ples[year].network = self.ples[year].construct_multidi(verbose)
 
+	def construct_sparse_graphs(self, years=None, ntype='bipartitegraph', verbose=False):
+		""" Construct Sparse Graphs (scipy.sparse adjacency) from self.ples without networkx (see ProductLevelExportSystem.construct_sparse_graph()) """
+		if years == None: years = self.years
+		for year in years:
+			self.ples[year].construct_sparse_graph(ntype, verbose=verbose)
+
+	def product_space_backbones(self, years=None, threshold=0.55, verbose=False):
+		""" Construct Product Space Backbones (Maximum Spanning Tree + Threshold) for self.ples (see ProductLevelExportSystem.product_space_backbone()) """
+		if years == None: years = self.years
+		for year in years:
+			self.ples[year].product_space_backbone(threshold=threshold, verbose=verbose)
+
 	##############
 	## -- IO -- ##
 	##############
@@ -771,6 +938,11 @@ class DynamicProductLevelExportSystem(object):
 		fn 	: str, optional(fn='')
 			  Specify a custom file name
 
+		Notes
+		-----
+			1. With a memory budget (set_memory_budget()) all spilled years are reloaded to write the pickle. The budget and a 
+			   spill_dir given by the user are kept in the pickle
+
 		"""
 		if not re.search(".pickle", fn):
 			print "Auto-Generating a name for the object"
@@ -799,11 +971,19 @@ class DynamicProductLevelExportSystem(object):
 		fn 	: 	str
 				Specify filename
 
+		Notes
+		-----
+			1. A memory budget set on this object (budget and spill_dir) is kept and applied to the restored years
+
 		"""
+		store = self.ples if isinstance(self.ples, SpillStore) else None
 		with open(fn) as f:
 			(self.ples, self.ples_struct, self.compile_dtypes, self.years, self.country_classification, self.product_classification, \
 				self.global_panel, self._complete_trade_network, self.data_file) = pickle.load(f)
 		f.close()
+		if store is not None: 												#-Keep the Memory Budget-#
+			store.close()
+			self.set_memory_budget(store.memory_budget, spill_dir=store.user_spill_dir, verbose=verbose)
 		if verbose: print "Pickle read from: %s" % fn
 		return True
 
@@ -1146,34 +1326,98 @@ class DynamicProductLevelExportSystem(object):
 
 	## These are Constructors and therefore returning a property of the object may lead users to access these matrices by building them everytime!
 
-	def mcp_matrices(self, years=None, cutoff=1.0, fillna=True, verbose=False):
+	def mcp_matrices(self, years=None, cutoff=1.0, fillna=True, packbits=False, verbose=False):
 		"""
 			Compute Mcp Matrices for ProductLevelExportSystem
 			Options:
 			-------
 				[1] years 		= list of years (Default: ALL)
+				[2] packbits 	= Store Mcp as Bit-Packed Matrices only (see pack_mcp_matrices())
 		"""
 		if years == None: years = self.years
 		for year in years:
 			if verbose: print "Computing Mcp matrix for year: %s" % year
-			self.ples[year].mcp_matrix(cutoff, fillna, verbose) 				
+			self.ples[year].mcp_matrix(cutoff=cutoff, fillna=fillna, verbose=verbose) 				
+			if packbits:
+				self.ples[year].pack_mcp(drop_dataframe=True, verbose=verbose)
+
+	def pack_mcp_matrices(self, years=None, drop_dataframe=False, verbose=False):
+		"""
+			Store Mcp Matrices as Bit-Packed Matrices (One Bit per Cell) for ProductLevelExportSystem
+			Options:
+			-------
+				[1] years 			= list of years (Default: ALL)
+				[2] drop_dataframe 	= Remove DataFrame Representation of Mcp (Restore with unpack_mcp_matrices())
+		"""
+		if years == None: years = self.years
+		for year in years:
+			if verbose: print "Packing Mcp matrix for year: %s" % year
+			self.ples[year].pack_mcp(drop_dataframe=drop_dataframe, verbose=verbose)
+
+	def unpack_mcp_matrices(self, years=None, verbose=False):
+		"""
+			Restore Mcp DataFrames from Bit-Packed Matrices for ProductLevelExportSystem
+			Options:
+			-------
+				[1] years 		= list of years (Default: ALL)
+		"""
+		if years == None: years = self.years
+		for year in years:
+			if verbose: print "Unpacking Mcp matrix for year: %s" % year
+			self.ples[year].unpack_mcp(verbose=verbose)
 		## -- Q: Should I Return Getter Method? -- ##
 		#return self.mcp
 
 	## -- Proximity Matrices -- ##
 
-	def proximity_matrices(self, years=None, matrix_type='symmetric', clear_temp=True, fillna=False, verbose=False):
+	def proximity_matrices(self, years=None, matrix_type='symmetric', clear_temp=True, fillna=False, top_k=None, threshold=None, filename=None, tile_size=512, verbose=False):
 		"""
 			Compute Mcp Matrices for ProductLevelExportSystem
 			Options:
 			-------
 				[1] years 		= list of years (Default: ALL)
+				[2] top_k 		= Store Sparse Proximity keeping the k strongest links per product (see PLES.proximity_matrix_sparse())
+				[3] threshold 	= Store Sparse Proximity keeping links with proximity >= threshold
+				[4] filename 	= Compute in tiles to memory-mapped .npy files (see tiled_proximity_matrices())
+				[5] tile_size 	= Tile size for the tiled computation
 		"""	
+		if top_k != None or threshold != None:
+			return self.sparse_proximity_matrices(years, matrix_type, top_k, threshold, verbose)
+		if filename != None:
+			return self.tiled_proximity_matrices(filename, years=years, matrix_type=matrix_type, tile_size=tile_size, fillna=fillna, verbose=verbose)
 		# - Disabled MultiCore => No Significant Performance Boost (Overheads ~= Performance Gain) for this type of Matrix - #
 			# if self.multicore == True:
 			# 	return self.multicore_proximity_matrices(years=years, verbose=verbose)
 		return self.serial_proximity_matrices(years, matrix_type, clear_temp, fillna, verbose)
+
+	def sparse_proximity_matrices(self, years=None, matrix_type='symmetric', top_k=None, threshold=None, verbose=False):
+		"""
+			Compute Sparse (Top-k and/or Threshold) Proximity Matrices for ProductLevelExportSystem
+			Options:
+			-------
+				[1] years 		= list of years (Default: ALL)
+		"""
+		if years == None: years = self.years
+		for year in years:
+			if verbose: print "Computing Sparse Proximity matrix for year: %s" % year
+			self.ples[year].proximity_matrix_sparse(matrix_type=matrix_type, top_k=top_k, threshold=threshold, verbose=verbose)
 		
+	def tiled_proximity_matrices(self, filename, years=None, matrix_type='symmetric', tile_size=512, fillna=False, verbose=False):
+		"""
+			Compute Out-of-Core Proximity Matrices written to Memory-Mapped .npy Files
+			Options:
+			-------
+				[1] filename 	= filename template containing %s for the year (i.e. 'proximity-%s.npy')
+				[2] years 		= list of years (Default: ALL)
+				[3] tile_size 	= Peak memory is tile_size x tile_size per year
+		"""
+		if '%s' not in filename:
+			raise ValueError("filename must contain %s to be replaced by the year (i.e. 'proximity-%s.npy')")
+		if years == None: years = self.years
+		for year in years:
+			if verbose: print "Computing Tiled Proximity matrix for year: %s" % year
+			self.ples[year].proximity_matrix_tiled(filename % year, matrix_type=matrix_type, tile_size=tile_size, fillna=fillna, verbose=verbose)
+
 	def serial_proximity_matrices(self, years=None, matrix_type='symmetric', clear_temp=True, fillna=False, verbose=False):
 		"""
 			Compute Mcp Matrices for ProductLevelExportSystem
@@ -1213,18 +1457,20 @@ class DynamicProductLevelExportSystem(object):
 
 		if years == None: years = sorted(self.years) 				# - Should be sorted but make sure - #
 		# - Setup an Execution List to preserve year ordering - #
-		ples_list = []
-		for year in years:
-			ples_list.append(self.ples[year])
-		
-		# - Compute Across Cluster - #
-		results = c[:].map_sync(lambda x: x.proximity_matrix(), ples_list)
-		
-		# # - Assign Results - #
-		year = years[0]
-		for result in results:
-			self.ples[year].proximity = result
-			year += 1
+		# - Pin years under a memory budget so the list is complete while it is pickled to the cluster - #
+		with pinned(self.ples, years):
+			ples_list = []
+			for year in years:
+				ples_list.append(self.ples[year])
+
+			# - Compute Across Cluster - #
+			results = c[:].map_sync(lambda x: x.proximity_matrix(), ples_list)
+
+			# # - Assign Results - #
+			year = years[0]
+			for result in results:
+				self.ples[year].proximity = result
+				year += 1
 		# - Should this return the getter method? - #
 		#return self.proximity
 
@@ -1326,18 +1572,20 @@ class DynamicProductLevelExportSystem(object):
 
 		if years == None: years = sorted(self.years) 			# - Should be sorted but make sure - #
 		# - Setup an Execution List to preserve year ordering - #
-		ples_list = []
-		for year in years:
-			ples_list.append(self.ples[year])
-		
-		# - Compute Across Cluster - #
-		results = c[:].map_sync(lambda x: x.compute_eci(), ples_list)
-		
-		# - Assign Results - #
-		year = years[0]
-		for result in results:
-			self.ples[year].eci = result
-			year += 1
+		# - Pin years under a memory budget so the list is complete while it is pickled to the cluster - #
+		with pinned(self.ples, years):
+			ples_list = []
+			for year in years:
+				ples_list.append(self.ples[year])
+
+			# - Compute Across Cluster - #
+			results = c[:].map_sync(lambda x: x.compute_eci(), ples_list)
+
+			# - Assign Results - #
+			year = years[0]
+			for result in results:
+				self.ples[year].eci = result
+				year += 1
 		# - Should this return? - #
 		#return self.eci
 
@@ -1379,21 +1627,204 @@ class DynamicProductLevelExportSystem(object):
 
 		if years == None: years = sorted(self.years) 			# - Should be sorted but make sure - #
 		# - Setup an Execution List to preserve year ordering - #
-		ples_list = []
-		for year in years:
-			ples_list.append(self.ples[year])
-		
-		# - Compute Across Cluster - #
-		results = c[:].map_sync(lambda x: x.compute_pci(), ples_list)
-		
-		# - Assign Results - #
-		year = years[0]
-		for result in results:
-			self.ples[year].pci = result
-			year += 1
+		# - Pin years under a memory budget so the list is complete while it is pickled to the cluster - #
+		with pinned(self.ples, years):
+			ples_list = []
+			for year in years:
+				ples_list.append(self.ples[year])
+
+			# - Compute Across Cluster - #
+			results = c[:].map_sync(lambda x: x.compute_pci(), ples_list)
+
+			# - Assign Results - #
+			year = years[0]
+			for result in results:
+				self.ples[year].pci = result
+				year += 1
 		# - Should This return? - #
 		#return self.pci
 
+	## -- Opportunity Metrics -- ##
+
+	def compute_opportunity_metrics(self, years=None, verbose=False):
+		"""
+			Compute Density, Distance, Complexity Outlook and Opportunity Gain for all PLES
+			Options:
+			-------
+				[1] years 		= list of years (Default: ALL)
+			Notes:
+			-----
+				[1] Years with the same countries and products (i.e. a Global Panel) are stacked and computed in a single batched pass
+				[2] See ProductLevelExportSystem.compute_opportunity_metrics()
+		"""
+		from pyeconlab.trade.util.opportunity import compute_opportunity_metrics
+		if years == None: years = self.years
+		inputs = dict()
+		for year in years:
+			inputs[year] = self.ples[year].opportunity_inputs(verbose=verbose)
+		# - Group Years by Matrix Labels - #
+		groups = dict()
+		for year in years:
+			key = (tuple(self.ples[year].mcp.index), tuple(self.ples[year].mcp.columns))
+			groups.setdefault(key, []).append(year)
+		for group_years in groups.values():
+			if verbose: print "Computing Opportunity Metrics for years: %s" % group_years
+			metrics = compute_opportunity_metrics(	np.array([inputs[year][0] for year in group_years]), 
+													np.array([inputs[year][1] for year in group_years]), 
+													np.array([inputs[year][2] for year in group_years]) )
+			for idx, year in enumerate(group_years):
+				self.ples[year].set_opportunity_metrics(dict((name, values[idx]) for name, values in metrics.items()))
+
+	## -- Country Proximity -- ##
+
+	def compute_country_proximity(self, years=None, matrix_type='symmetric', fillna=False, verbose=False):
+		"""
+			Compute Country Proximity for all PLES
+			Options:
+			-------
+				[1] years 		= list of years (Default: ALL)
+				[2] matrix_type = 'symmetric', 'asymmetric', 'minmax', 'pearsons' (Default: 'symmetric')
+			Notes:
+			-----
+				[1] Years with the same countries and products are stacked and computed in a single batched pass
+				[2] See ProductLevelExportSystem.compute_country_proximity()
+		"""
+		from pyeconlab.trade.util.proximity import country_proximity_matrix
+		if matrix_type not in ['symmetric', 'asymmetric', 'minmax', 'pearsons']:
+			raise ValueError("Proximity type must be either symmetric, asymmetric, minmax, or pearsons")
+		if years == None: years = self.years
+		groups = dict()
+		for year in years:
+			if type(self.ples[year].mcp) != pd.DataFrame:
+				if verbose: print "Mcp matrix for year: %s is currently not available. Computing Mcp (with default KWARGS)" % year
+				self.ples[year].mcp_matrix()
+			key = (tuple(self.ples[year].mcp.index), tuple(self.ples[year].mcp.columns))
+			groups.setdefault(key, []).append(year)
+		for group_years in groups.values():
+			if verbose: print "Computing Country Proximity (%s) for years: %s" % (matrix_type, group_years)
+			values = country_proximity_matrix(np.array([self.ples[year].mcp.values for year in group_years]), matrix_type=matrix_type)
+			for idx, year in enumerate(group_years):
+				self.ples[year].set_country_proximity(values[idx], matrix_type, fillna=fillna)
+		return self.country_proximity
+
+	## -- Fitness-Complexity -- ##
+
+	def compute_fitness_complexity(self, years=None, tol=1e-8, max_iterations=1000, verbose=False):
+		"""
+			Compute Fitness and Complexity (Tacchella et al. 2012) for all PLES
+			Options:
+			-------
+				[1] years 			= list of years (Default: ALL)
+				[2] tol 			= Convergence Tolerance on log(Fitness) and log(Complexity) [Default: 1e-8]
+				[3] max_iterations 	= Maximum number of iterations [Default: 1000]
+			Notes:
+			-----
+				[1] Years with the same countries and products are stacked into a block-diagonal sparse matrix and iterated together.
+					Each year stops updating once it has converged
+				[2] See ProductLevelExportSystem.compute_fitness_complexity()
+		"""
+		from pyeconlab.trade.util.complexity import fitness_complexity_panel
+		if years == None: years = self.years
+		groups = dict()
+		for year in years:
+			if type(self.ples[year].mcp) != pd.DataFrame:
+				if verbose: print "Mcp matrix for year: %s is currently not available. Computing Mcp (with default KWARGS)" % year
+				self.ples[year].mcp_matrix()
+			key = (tuple(self.ples[year].mcp.index), tuple(self.ples[year].mcp.columns))
+			groups.setdefault(key, []).append(year)
+		for group_years in groups.values():
+			if verbose: print "Computing Fitness-Complexity for years: %s" % group_years
+			fitness, complexity, iterations, converged = fitness_complexity_panel(np.array([self.ples[year].mcp.values for year in group_years]), tol=tol, max_iterations=max_iterations, verbose=verbose)
+			for idx, year in enumerate(group_years):
+				self.ples[year].set_fitness_complexity(fitness[idx], complexity[idx], iterations[idx], converged[idx])
+
+	## -- Null Models -- ##
+
+	def compute_proximity_null_models(self, years=None, num_draws=100, matrix_type='symmetric', seed=None, processes=None, num_trades=None, verbose=False):
+		"""
+			Compute Proximity z-scores and p-values against randomized Mcp matrices for all PLES
+			Options:
+			-------
+				[1] years 		= list of years (Default: ALL)
+				[2] num_draws 	= Number of randomized Mcp matrices per year [Default: 100]
+				[3] seed 		= Master seed for reproducible draws [Default: None]
+				[4] processes 	= Number of local processes [Default: all cores]
+			Notes:
+			-----
+				[1] All years share a single process pool
+				[2] See ProductLevelExportSystem.compute_proximity_null_model()
+		"""
+		from pyeconlab.trade.util.nullmodel import run_null_models, proximity_values
+		if years == None: years = self.years
+		jobs = list()
+		for year in years:
+			if type(self.ples[year].mcp) != pd.DataFrame:
+				if verbose: print "Mcp matrix for year: %s is currently not available. Computing Mcp (with default KWARGS)" % year
+				self.ples[year].mcp_matrix()
+			mcp = np.nan_to_num(self.ples[year].mcp.values)
+			jobs.append(('proximity', (mcp, matrix_type, num_trades), proximity_values(mcp, matrix_type=matrix_type)))
+		results = run_null_models(jobs, num_draws=num_draws, seed=seed, processes=processes, verbose=verbose)
+		for year, result in zip(years, results):
+			self.ples[year].set_proximity_null_model(result)
+
+	def compute_emergence_null_model(self, prox_cutoff='median', style='average', num_draws=100, matrix_type='symmetric', seed=None, processes=None, num_trades=None, verbose=False):
+		"""
+		Test whether the number of Probable New Products exceeds that expected with Proximity from randomized Mcp matrices
+
+		Parameters
+		----------
+		prox_cutoff : 	str or numeric, optional(default='median')
+						Proximity cutoff value, or 'mean' / 'median' of the nonzero observed proximity of both years
+		style 		: 	str, optional(default='average')
+						'average', 'base' or 'next' (see compute_probable_improbable_emergence())
+		num_draws 	: 	int, optional(default=100)
+		matrix_type : 	str, optional(default='symmetric')
+		seed 		: 	int, optional(default=None)
+		processes 	: 	int, optional(default=None)
+		num_trades 	: 	int, optional(default=None)
+
+		Returns
+		-------
+		dict(next_year : pd.DataFrame(index=country, columns=['observed', 'mean', 'std', 'zscore', 'pvalue']))
+
+		Notes
+		-----
+			1. Observed base year baskets and new products are kept and only the Mcp used to compute proximity is randomized
+			   (preserving diversity and ubiquity), so the test is whether proximity explains emergence beyond the degree structure
+			2. Observed proximity is recomputed from Mcp with the same kernel as the draws
+		"""
+		from pyeconlab.trade.util.nullmodel import run_null_models, proximity_values, nonzero_cutoff, probable_emergence
+		if not self.global_panel:
+			raise ValueError("DynamicProductLevelExportSystem needs to be a Global Dynamic Panel (with the same c x p matrix sizes)")
+		if style.lower() not in ['base', 'next', 'average']:
+			raise ValueError("ERROR: Need to Specify style as: 'base', 'next', or 'average'")
+		style = style.lower()
+		Mcp_BothYears, Mcp_NewProducts, Mcp_DieProducts = self.compute_product_changes(verbose=verbose)
+		jobs, next_years, observed_counts = list(), list(), dict()
+		for years in sorted(Mcp_NewProducts.keys()):
+			base_year, next_year = [int(x) for x in years.split('-')]
+			base_mcp = np.nan_to_num(self.mcp[base_year].values)
+			next_mcp = np.nan_to_num(self.mcp[next_year].values)
+			new_products = np.nan_to_num(Mcp_NewProducts[years].values)
+			prox_base, prox_next = proximity_values(base_mcp, matrix_type), proximity_values(next_mcp, matrix_type)
+			if type(prox_cutoff) == str:
+				cutoff = nonzero_cutoff([prox_base, prox_next], statistic=prox_cutoff.lower())
+			else:
+				cutoff = float(prox_cutoff)
+			if verbose: print "Years: %s; Using Prox_Cutoff Value: %s" % (years, cutoff)
+			proximity = {'base' : prox_base, 'next' : prox_next, 'average' : (prox_base + prox_next) / 2.0}[style]
+			probable, improbable = probable_emergence(base_mcp, new_products, proximity, cutoff)
+			observed_counts[next_year] = probable.sum(axis=1).astype(np.float64)
+			jobs.append(('emergence', (base_mcp, next_mcp, new_products, cutoff, style, matrix_type, num_trades), observed_counts[next_year]))
+			next_years.append(next_year)
+		results = run_null_models(jobs, num_draws=num_draws, seed=seed, processes=processes, verbose=verbose)
+		emergence = dict()
+		for next_year, result in zip(next_years, results):
+			emergence[next_year] = pd.DataFrame({'observed' : observed_counts[next_year], 'mean' : result['mean'], 'std' : result['std'], 'zscore' : result['zscore'], 'pvalue' : result['pvalue']},
+												index=self.mcp[next_year].index.copy(), columns=['observed', 'mean', 'std', 'zscore', 'pvalue'])
+			emergence[next_year].name = 'EmergenceNullModel'
+		return emergence
+
 	## -- Adjustment Function for ECI/PCI -- ##
 
 	def auto_adjust_eci_sign(self, cntry_datum=('DEU', '+ve'), verbose=False):
@@ -1773,12 +2204,25 @@ class DynamicProductLevelExportSystem(object):
 	## -- Products -- ##
 	####################
 
-	def compute_product_changes(self, verbose=False):
-		""" Compute Changes in Products Year to Year """
+	def compute_product_changes(self, vectorized=False, verbose=False):
+		""" 
+		Compute Changes in Products Year to Year 
+
+		Parameters
+		----------
+		vectorized 	: 	bool, optional(default=False)
+						Compute all year transitions in a single boolean panel operation (see trade.util.compute_product_changes_panel)
+						Requires a global panel (same countries and products in each year)
+		"""
 		# - Check Required Data is Computed - #
 		if type(self.mcp) != dict:
 			print "[NOTICE] Mcp matrix at (self.mcp) is currently not available. Computing Mcp with default kwargs"
 			self.mcp_matrices()
+		if vectorized:
+			from pyeconlab.trade.util import compute_product_changes_panel
+			if self.global_panel == False:
+				print "[WARNING] Vectorized product changes are aligned to the countries and products of the first year. Use dynamic_global_panel() first"
+			return compute_product_changes_panel(self.mcp)
 		# - Construct Return Containers - #
 		BothYears = dict()
 		NewProducts = dict()
@@ -1825,6 +2269,12 @@ class DynamicProductLevelExportSystem(object):
 		-----
 			1. These should probably be kept as separate functions as research specific functions? Include in the Class for now
 			2. No Persistence is Modelled - Kept as a separate Function (compute_persistence())
+			3. Sparse Proximity (proximity_matrices(top_k=, threshold=)) is supported. The 'mean' and 'median' cutoff values are
+			   computed from the full matrices but links that are not stored are treated as 0.0 when classifying. Classification
+			   matches the dense proximity only for threshold filtering with threshold <= prox_cutoff. With top_k, links above
+			   prox_cutoff that are outside a product's top_k are 0.0 so some probable products can be classified as improbable
+			   (use dense proximity for exact results)
+			4. Memory-Mapped Proximity (proximity_matrices(filename=)) is supported and read lazily
 
 		.. 	Future Work        
 			------------
@@ -1847,6 +2297,8 @@ class DynamicProductLevelExportSystem(object):
 		else:
 			prox_cutoff_option = ''
 
+		from pyeconlab.trade.util.proximity import nonzero_statistic
+
 		# - Compute Dynamics (Two-Period) - #
 		Mcp_BothYears, Mcp_NewProducts, Mcp_DieProducts = self.compute_product_changes(verbose=verbose)  
 		
@@ -1870,7 +2322,10 @@ class DynamicProductLevelExportSystem(object):
 			countries = Mcp_BothYears[years].index
 			products = Mcp_BothYears[years].columns
 			# - Decide prox_cutoff - #
-			if str(prox_cutoff_option).lower() == 'median':
+			sparse_proximity = type(Prox_BaseYear) != pd.DataFrame or type(Prox_NextYear) != pd.DataFrame
+			if sparse_proximity and str(prox_cutoff_option).lower() in ['median', 'mean']:
+				prox_cutoff = nonzero_statistic([Prox_BaseYear, Prox_NextYear], statistic=prox_cutoff_option)      #Statistic of the Full Matrices (see Note 3)
+			elif str(prox_cutoff_option).lower() == 'median':
 				prox_series1 = Prox_BaseYear.unstack()
 				prox_series2 = Prox_NextYear.unstack()
 				joint_series = prox_series1.append(prox_series2)
@@ -172,6 +172,8 @@ class ProductLevelExportSystem(object):
 		self.use_objects = None
 		self.network_attrs = dict()                 #Useful when not using Objects on the Core Network Structure to have attribute tables coded by 'ISO3C' or 'SITCR2' etc
 		self.network_preserve = dict()
+		self.graph = None                           # Sparse Network Representation (see construct_sparse_graph())
+		self.backbone = None                        # Product Space Backbone (see product_space_backbone())
 		# Optional Pointers to data_preserve to hold in-memory copies
 		self.pandas = None
 		self.bipartitegraph = None
@@ -198,6 +200,7 @@ class ProductLevelExportSystem(object):
 		self.rca_den = None
 		self.mcp = None
 		self.mcp_notes = ''
+		self.mcp_packed = None                      # Bit-Packed Mcp (see pack_mcp())
 		self.proximity = None
 		self.proximity_notes = ''
 		self.ubiquity = None
@@ -216,6 +219,17 @@ class ProductLevelExportSystem(object):
 		self.mpp_notes = ''
 		self.pci = None
 		self.pci_notes = ''
+		self.density = None                         # Opportunity Metrics (see compute_opportunity_metrics())
+		self.distance = None
+		self.complexity_outlook = None
+		self.opportunity_gain = None
+		self.fitness = None                         # Fitness-Complexity (see compute_fitness_complexity())
+		self.fc_complexity = None
+		self.fc_notes = ''
+		self.country_proximity = None               # Country Proximity (see compute_country_proximity())
+		self.country_proximity_notes = ''
+		self.proximity_zscore = None                # Proximity Null Model (see compute_proximity_null_model())
+		self.proximity_pvalue = None
 
 		## -- Temporary Objects -- ##
 		self.temp = dict()
@@ -546,15 +560,21 @@ class ProductLevelExportSystem(object):
 	## -- Network Object Constructors -- ##
 	#######################################
 
-	def construct_network(self, ntype='bipartitegraph', c=None, p=None, verbose=False):
+	def construct_network(self, ntype='bipartitegraph', c=None, p=None, networkx=True, verbose=False):
 		'''
 			Construct a Requested Network of ntype
 			
+			Options:
+			-------
+				[1] networkx 	: 	If False only the sparse graph is constructed (self.graph) [Default: True]
+
 			Notes:
 			------
 				[1] Generating Networks with Prefilled P objects (Products) is currently not supported!
 		'''
 		if verbose: print "Constructing a Network of Type: %s" % ntype
+		if not networkx:
+			return self.construct_sparse_graph(ntype, verbose=verbose)
 		# - No Country Objects Provided - #
 		if c == None:                                                                   #IS this going to cause comparison isues when c != None? Better to test isinstance(c, Country())
 			if ntype == 'bipartitegraph':
@@ -587,17 +607,8 @@ class ProductLevelExportSystem(object):
 				[1] verbose_limit   :   number of lines to show as example computation
 		'''
 		if verbose: print "Constructing BiPartiteGraph: %s (with verbose_limit: %s)" % (self.year, verbose_limit)
-		n = nx.Graph()
-		n.add_nodes_from(self.countries, bipartite='countries')
-		n.add_nodes_from(self.products, bipartite='productcodes')
-		verbose_counter = 0
-		for idx, val in self.data.iterrows():
-			(country, productcode) = idx
-			export = val['export']
-			n.add_edge(country, productcode, export=export)
-			if verbose_counter <= verbose_limit:
-				if verbose: print "Adding %s from %s to %s" % (export, country, productcode)
-			verbose_counter += 1
+		graph = self.construct_sparse_graph('bipartitegraph', verbose=verbose, verbose_limit=verbose_limit)
+		n = graph.to_networkx()
 		self.network = n
 		return n
 
@@ -641,14 +652,9 @@ class ProductLevelExportSystem(object):
 			self.products[productcode] = Product(code=productcode, classification=self.product_classification, ntype='node')
 			n.add_node(self.products[productcode], bipartite='productcodes')
 		#Declare Edges
-		verbose_counter = 0
-		for idx, val in self.data.iterrows():
-			(country, productcode) = idx
-			export = val['export']  
-			n.add_edge(self.countries[country], self.products[productcode], export=export)
-			if verbose_counter <= verbose_limit:
-				if verbose: print "Adding %s from %s to %s" % (export, self.countries[country], self.products[productcode])             #removed  self.products[productcode].code as __repr__ should handle this
-			verbose_counter += 1
+		graph = self.construct_sparse_graph('bipartitegraph', verbose=verbose, verbose_limit=verbose_limit)
+		sources, targets, values = graph.edges()
+		n.add_edges_from((self.countries[country], self.products[productcode], {'export' : export}) for country, productcode, export in zip(sources, targets, values))
 		self.network = n
 		return n 
 
@@ -660,20 +666,8 @@ class ProductLevelExportSystem(object):
 			Construct a Simple MultiDiGraph
 		'''
 		if verbose: print "Constructing MultiDiGraph: %s (with verbose_limit: %s)" % (self.year, verbose_limit)
-		n = nx.MultiDiGraph()
-		n.add_nodes_from(self.countries)
-		# - Add World Node - #
-		if 'WLD' not in self.countries: 
-			n.add_node('WLD')
-		verbose_counter = 0
-		for idx, val in self.data.iterrows():
-			(country, productcode) = idx
-			export = val['export']
-			n.add_edge(country, 'WLD', key=productcode, export=export)
-			if verbose: 
-				if verbose_counter <= verbose_limit:
-					print "Adding %s (%s) from %s to %s" % (export, productcode, country, productcode)
-				verbose_counter += 1
+		graph = self.construct_sparse_graph('multidigraph', verbose=verbose, verbose_limit=verbose_limit)
+		n = graph.to_networkx(world_node='WLD')
 		self.network = n
 		return n
 
@@ -710,22 +704,69 @@ class ProductLevelExportSystem(object):
 			raise ValueError('WLD Country() object not found!')                                     #Could Create an Empty Instance?
 		n.add_node(self.countries['WLD'])
 		#Declare Edges
-		verbose_counter = 0
-		for idx, val in self.data.iterrows():
-			(country, productcode) = idx
-			export = val['export']
-			# - Create Edge Object - #
+		def product_edge(productcode, export):
 			p = Product(ntype='edge')
 			p.code = productcode
-			p.value = export 
-			n.add_edge(self.countries[country], self.countries['WLD'], key=productcode, export=p)                                   #From Country to World - Export Value
-			if verbose: 
-				if verbose_counter <= verbose_limit:
-					print "Adding %s (%s) from %s to %s" % (p, p.code, self.countries[country], self.countries['WLD'])
-				verbose_counter += 1
+			p.value = export
+			return p
+		graph = self.construct_sparse_graph('multidigraph', verbose=verbose, verbose_limit=verbose_limit)
+		sources, targets, values = graph.edges()
+		n.add_edges_from((self.countries[country], self.countries['WLD'], productcode, {'export' : product_edge(productcode, export)}) for country, productcode, export in zip(sources, targets, values))       #From Country to World - Export Value
 		self.network = n
 		return n
 
+	# - Sparse Graphs - #
+	#####################
+
+	def construct_sparse_graph(self, ntype='bipartitegraph', verbose=False, verbose_limit=10):
+		'''
+			Construct a Sparse Graph (scipy.sparse adjacency of countries x productcodes) from self.data in bulk
+
+			Options:
+			-------
+				[1] ntype 			: 	'bipartitegraph' or 'multidigraph' (sets the networkx export type of self.graph.to_networkx())
+				[2] verbose_limit   :   number of edges to show as example computation
+
+			Notes:
+			------
+				[1] Edges are added for every row of self.data (including zero exports) as with construct_bipartite()
+				[2] Country and Product labels are taken from self.countries and self.products (or from self.data if these hold objects)
+		'''
+		from pyeconlab.trade.util.graph import sparse_graph_from_series
+		if ntype not in ['bipartitegraph', 'multidigraph']:
+			raise ValueError("'ntype' must be a bipartitegraph or multidigraph")
+		countries = None if type(self.countries) == dict else self.countries
+		products = None if type(self.products) == dict else self.products
+		self.graph = sparse_graph_from_series(self.data['export'], ntype=ntype, row_labels=countries, col_labels=products, name=self.year)
+		if verbose:
+			sources, targets, values = self.graph.edges()
+			for country, productcode, export in zip(sources, targets, values)[:verbose_limit+1]:
+				print "Adding %s from %s to %s" % (export, country, productcode)
+		return self.graph
+
+	def product_space_backbone(self, threshold=0.55, networkx=False, verbose=False):
+		'''
+			Construct the Product Space Backbone (Maximum Spanning Tree + Links with proximity >= threshold) from self.proximity
+
+			Options:
+			-------
+				[1] threshold 	: 	Proximity threshold for links added to the spanning tree [Default: 0.55 (Hidalgo et al. 2007)]
+				[2] networkx 	: 	Return a networkx Graph rather than the SparseGraph [Default: False]
+
+			Notes:
+			------
+				[1] See trade.util.graph.product_space_backbone(). The SparseGraph is stored in self.backbone
+		'''
+		from pyeconlab.trade.util.graph import product_space_backbone
+		if self.proximity is None:
+			if verbose: print "Proximity matrix at (self.proximity) is currently not available. Computing Proximity (with default KWARGS)"
+			self.proximity_matrix()
+		if verbose: print "Computing Product Space Backbone (threshold: %s)" % threshold
+		self.backbone = product_space_backbone(self.proximity, threshold=threshold, name=self.year)
+		if networkx:
+			return self.backbone.to_networkx()
+		return self.backbone
+
 
 	###########################################
 	## -- International Trade Computables -- ##
@@ -1085,14 +1126,60 @@ class ProductLevelExportSystem(object):
 		self.mcp.name = 'Mcp'
 		return self.mcp
 
+	def pack_mcp(self, drop_dataframe=False, verbose=False):
+		"""
+		Store the Mcp Matrix as a Bit-Packed Matrix (One Bit per Cell) at self.mcp_packed
+
+		Parameters
+		----------
+		drop_dataframe 	: 	bool, optional(default=False)
+							Remove the DataFrame representation (self.mcp = None) to save memory
+							Use unpack_mcp() to restore the DataFrame for display or pandas export
+
+		Notes
+		-----
+			[1] self.mcp_packed is a dict() containing 'cp' (countries x packed products), 'pc' (products x packed countries), 'countries' and 'products'
+			[2] compute_ubiquity(), compute_diversity() use popcounts over the packed words when self.mcp is not available
+			[3] proximity_matrix_packed() computes co-export counts from the packed words
+			[4] np.nan values are stored as 0
+		"""
+		from pyeconlab.trade.util.bitpacked import pack_matrix
+		if type(self.mcp) != pd.DataFrame:
+			if verbose: print "Mcp matrix at (self.mcp) is currently not available. Computing Mcp (with default KWARGS)"
+			self.mcp_matrix()
+		cp, num_products = pack_matrix(self.mcp.values, axis=1)
+		pc, num_countries = pack_matrix(self.mcp.values, axis=0)
+		self.mcp_packed = {'cp' : cp, 'pc' : pc, 'countries' : self.mcp.index, 'products' : self.mcp.columns}
+		if verbose: print "Packed Mcp (%s x %s) from %s bytes to %s bytes" % (num_countries, num_products, self.mcp.values.nbytes, cp.nbytes + pc.nbytes)
+		if drop_dataframe:
+			self.mcp = None
+		return self.mcp_packed
+
+	def unpack_mcp(self, verbose=False):
+		"""
+		Restore the Mcp DataFrame (self.mcp) from the Bit-Packed Matrix (self.mcp_packed)
+		"""
+		from pyeconlab.trade.util.bitpacked import unpack_matrix
+		if self.mcp_packed is None:
+			raise ValueError("No Bit-Packed Mcp at self.mcp_packed. Run pack_mcp() first")
+		countries, products = self.mcp_packed['countries'], self.mcp_packed['products']
+		self.mcp = pd.DataFrame(unpack_matrix(self.mcp_packed['cp'], len(products)), index=countries, columns=products)
+		self.mcp.name = 'Mcp'
+		return self.mcp
+
 
 	### --- Proximity Matrix Functions --- ###
 	##########################################
 
-	def proximity_matrix(self, fillna=False, clear_temp=True, verbose=False):
+	def proximity_matrix(self, fillna=False, clear_temp=True, filename=None, tile_size=512, verbose=False):
 		'''
 			ProductSpace Function for Computing Proximity Matrix
 			
+			Options:
+			-------
+				[1] filename 	=> 	Compute in tiles and write to a memory-mapped .npy file (see proximity_matrix_tiled())
+				[2] tile_size 	=> 	Tile size for the tiled computation
+			
 			Notes:
 			------
 				[1] Numpy Implimentation: timeit results: 1000 loops, best of 3: 857 µs per loop
@@ -1100,8 +1187,35 @@ class ProductLevelExportSystem(object):
 				[3] compute_proximity() method allows for non-standard proximity matrices to be computed ('asymmetric', 'minmax' etc.)
 			  **[4] Converted to Using a NUMBA accelerated version (Big Improvement in Performance 49 x Faster than Numpy)
 		'''
+		if filename != None:
+			return self.proximity_matrix_tiled(filename, tile_size=tile_size, fillna=fillna, verbose=verbose)
 		return self.proximity_matrix_numba(fillna=fillna, clear_temp=clear_temp, verbose=verbose)
 
+	def proximity_matrix_tiled(self, filename, matrix_type='symmetric', tile_size=512, fillna=False, verbose=False):
+		'''
+			ProductSpace Function for Computing an Out-of-Core Proximity Matrix (trade.util.proximity.MemmapProximity)
+
+			Options:
+			-------
+				[1] filename 		=> 	.npy file for the memory-mapped matrix (labels are written to a .labels.json sidecar)
+				[2] matrix_type 	=>  'symmetric', 'asymmetric', 'minmax'
+				[3] tile_size 		=> 	Peak memory is tile_size x tile_size rather than products x products
+
+			Notes:
+			-----
+				[1] self.proximity is loaded lazily and supports mean(), sum(), get_value() (compute_average_centrality() and emergence routines)
+				[2] Use self.proximity.to_dataframe() to load the full matrix into memory
+				[3] An existing matrix can be attached with self.proximity = MemmapProximity(filename)
+		'''
+		from pyeconlab.trade.util.proximity import tiled_proximity_to_memmap
+		if type(self.mcp) != pd.DataFrame:
+			if verbose: print "Mcp matrix at (self.mcp) is currently not available. Computing Mcp (with default KWARGS)"
+			self.mcp = self.mcp_matrix()
+		self.proximity = tiled_proximity_to_memmap(self.mcp, filename, matrix_type=matrix_type, tile_size=tile_size, fillna=fillna, verbose=verbose)
+		self.proximity_notes = self.proximity.notes
+		if verbose: print self.proximity
+		return self.proximity
+
 
 	def proximity_matrix_pandas(self, fillna=False, clear_temp=True, verbose=False):
 		'''
@@ -1256,6 +1370,70 @@ class ProductLevelExportSystem(object):
 		self.proximity_notes = 'symmetric'
 		return self.proximity
 
+	def proximity_matrix_packed(self, fillna=False, clear_temp=True, verbose=False):
+		'''
+			ProductSpace Function for Computing Proximity Matrix from the Bit-Packed Mcp Matrix (self.mcp_packed)
+			
+			Notes:
+			-----
+				[1] Co-Export Counts are computed with bitwise-AND and popcounts over packed words (no floating point Mcp is required)
+				[2] Products with zero ubiquity are np.nan (consistent with proximity_matrix_numba())
+				[3] Runs pack_mcp() if self.mcp_packed is not available
+		'''
+		from pyeconlab.trade.util.bitpacked import popcount, coexport_counts_packed
+		if self.mcp_packed is None:
+			if verbose: print "Bit-Packed Mcp at (self.mcp_packed) is currently not available. Running pack_mcp()"
+			self.pack_mcp(verbose=verbose)
+		products = self.mcp_packed['products']
+		self.temp['coexport'] = coexport_counts_packed(self.mcp_packed['pc'])
+		self.temp['ubiquity'] = popcount(self.mcp_packed['pc']).astype(np.float64)
+		with np.errstate(divide='ignore', invalid='ignore'):
+			proximity = self.temp['coexport'] / np.maximum.outer(self.temp['ubiquity'], self.temp['ubiquity'])
+		zero = self.temp['ubiquity'] == 0
+		proximity[zero, :] = np.nan
+		proximity[:, zero] = np.nan
+		self.proximity = pd.DataFrame(proximity, index=copy.deepcopy(products), columns=copy.deepcopy(products))
+		if verbose: print "Index: %s (%s); Columns: %s (%s)" % (self.proximity.index.name, len(self.proximity.index), self.proximity.columns.name, len(self.proximity.columns))
+		## - Fill Na Option - ##
+		if fillna:
+			self.proximity = self.proximity.fillna(0.0)
+		## - Remove Temp Data - ##
+		if clear_temp:
+			del self.temp['coexport']
+			del self.temp['ubiquity']
+		self.proximity.name = 'Proximity'
+		self.proximity.index.set_names(names=['productcode1'], inplace=True)
+		self.proximity.columns.set_names(names=['productcode2'], inplace=True)
+		self.proximity_notes = 'symmetric'
+		return self.proximity
+
+	def proximity_matrix_sparse(self, matrix_type='symmetric', top_k=None, threshold=None, block_size=512, verbose=False):
+		'''
+			ProductSpace Function for Computing a Sparse Proximity Matrix (trade.util.proximity.SparseProximity)
+
+			Options:
+			-------
+				[1] matrix_type 	=>  'symmetric', 'asymmetric', 'minmax'
+				[2] top_k 			=> 	Keep the k strongest links for each product
+				[3] threshold 		=> 	Keep links with proximity >= threshold
+				[4] block_size 		=> 	Number of rows computed at a time
+
+			Notes:
+			-----
+				[1] The full matrix is computed in row blocks and never held in memory
+				[2] Column mean/sum and nonzero mean/median of the FULL matrix are computed exactly during the build 
+					(used by compute_average_centrality() and the prox_cutoff in compute_probable_improbable_emergence())
+				[3] Use self.proximity.to_dataframe() for a dense representation of the stored links
+		'''
+		from pyeconlab.trade.util.proximity import sparse_proximity_from_mcp
+		if type(self.mcp) != pd.DataFrame:
+			if verbose: print "Mcp matrix at (self.mcp) is currently not available. Computing Mcp (with default KWARGS)"
+			self.mcp = self.mcp_matrix()
+		self.proximity = sparse_proximity_from_mcp(self.mcp, matrix_type=matrix_type, top_k=top_k, threshold=threshold, block_size=block_size, verbose=verbose)
+		self.proximity_notes = self.proximity.notes
+		if verbose: print self.proximity
+		return self.proximity
+
 	## - Cython Version of the Computational Helper Function: coexport_probability_cy() - ##
 	########################################################################################
 
@@ -1395,147 +1573,37 @@ class ProductLevelExportSystem(object):
 
 	def compute_country_proximity(self, matrix_type='symmetric', clear_temp=True, fillna=False, verbose=False):
 		"""
-		ProductSpace Funtion for Generating Different Country Proximity Matrix Types ('Symmetric', #'Assymetric', 'MinMax')
+		ProductSpace Funtion for Generating Different Country Proximity Matrix Types ('symmetric', 'asymmetric', 'minmax', 'pearsons')
 		
 		Options:
 		-------
-			[1] type    =>  'symmetric', #'assymetric', 'minmax'
-		"""
-		## -- Helper Functions -- ##
-		def proximity_matrix_symmetric(self):
-			'''
-			ProductSpace Funtion for Computing Proximity Matrix
-			Notes:
-			-----
-				[1] Pandas Method for Computing a Symmetrix Proximity Matrix
-				[2] 100 loops, best of 3: 2.84 ms per loop (4 x 3 Example)
-			'''
-			## - Check Mcp State - ##
-			if type(self.mcp) != pd.DataFrame:
-				if verbose: print "Mcp matrix at (self.mcp) is currently not available. Computing Mcp with default kwargs"
-				self.mcp = self.mcp_matrix()
-			## - Compute Symmetric Proximity - ##
-			self.country_proximity = pd.DataFrame(index=self.mcp.index, columns=self.mcp.index)      #np.nan initialised matrix
-			countries = self.mcp.index
-			self.temp['index_sums'] = self.mcp.sum(axis=1)
-			for cntry1 in countries:
-				for cntry2 in countries:
-					cond_prob = (self.mcp.ix[cntry1] * self.mcp.ix[cntry2]).sum() / max(self.temp['index_sums'].ix[cntry1], self.temp['index_sums'].ix[cntry2])
-					self.country_proximity.set_value(index=cntry1, col=cntry2, value=cond_prob)
-			self.country_proximity_notes = 'symmetric'
-			## - Fill Na Option - ##
-			if fillna:
-				self.country_proximity = self.country_proximity.fillna(0.0)
-			## - Remove Temp Data - ##
-			if clear_temp:
-				del self.temp['index_sums']
-			self.country_proximity.name = 'CntryProximity'
-			return self.country_proximity
-		
-		def proximity_matrix_pearsons(self):
-			## - Check Mcp State - ##
-			if type(self.mcp) != pd.DataFrame:
-				if verbose: print "Mcp matrix at (self.mcp) is currently not available. Computing Mcp with default kwargs"
-				self.mcp = self.mcp_matrix()
-			## - Compute Symmetric Proximity - ##
-			self.country_proximity = pd.DataFrame(index=self.mcp.index, columns=self.mcp.index)      #np.nan initialised matrix
-			countries = self.mcp.index
-			for cntry1 in countries:
-				for cntry2 in countries:
-					pearsons = self.mcp.ix[cntry1].corr(self.mcp.ix[cntry2])
-					self.country_proximity.set_value(index=cntry1, col=cntry2, value=pearsons)
-			self.country_proximity_notes = 'symmetric'
-			## - Fill Na Option - ##
-			if fillna:
-				self.country_proximity = self.country_proximity.fillna(0.0)
-			self.country_proximity.name = 'CntryProximity'
-			return self.country_proximity
-
-		# def proximity_matrix_asymmetric(self):
-		# 	'''
-		# 		ProductSpace Function to Compute an Assymetric Proximity Matrix
-		# 		Notes:
-		# 		-----
-		# 			[1] This have not been optimised with NUMBA
-		# 	'''
-		# 	num_products = len(self.products)
-		# 	# Initialise NumPy Array as results collector    
-		# 	self.proximity = np.zeros((num_products, num_products))
-		# 	self.temp['data'] = self.mcp.T.as_matrix()           
-		# 	self.temp['col_sums'] = self.mcp.sum().values                       #Row Vector#
-		# 	for index1 in xrange(0,num_products):
-		# 		for index2 in xrange(0,num_products):                      
-		# 			cond_prob = (self.temp['data'][index1] * self.temp['data'][index2]).sum() / self.temp['col_sums'][index2]       # ProductCode 1 by convention (PP')/P [Nb: This is index2 in Numpy]
-		# 			self.proximity[index1][index2] = cond_prob
-		# 	# Return DataFrame Representation       
-		# 	self.proximity = pd.DataFrame(self.proximity, index=self.products, columns=self.products)
-		# 	self.proximity.index.name = 'productcode1'
-		# 	self.proximity.columns.name = 'productcode2'
-		# 	self.proximity_notes = 'assymetric'
-		# 	if verbose: print "Index: %s (%s); Columns: %s (%s)" % (self.proximity.index.name, len(self.proximity.index), self.proximity.columns.name, len(self.proximity.columns))
-		# 	## - Fill Na Option - ##
-		# 	if fillna:
-		# 		self.proximity.fillna(0.0)
-		# 	## - Remove Temp Data - ##
-		# 	if clear_temp:
-		# 		del self.temp['col_sums']
-		# 		del self.temp['data']
-		# 	self.proximity.name = 'Proximity'
-		# 	return self.proximity
-
-		# def proximity_matrix_minmax(self):
-		# 	'''
-		# 		ProductSpace Function to Compute a MinMax Proximity Matrix
-		# 		Notes:
-		# 		-----
-		# 			[1] This have not been optimised with NUMBA
-		# 	'''
-		# 	num_products = len(self.products)
-		# 	# Initialise NumPy Array as results collector    
-		# 	self.proximity = np.zeros((num_products, num_products))
-		# 	self.temp['data'] = self.mcp.T.as_matrix()           
-		# 	self.temp['col_sums'] = self.mcp.sum().values                   #Row Vector#
-		# 	for index1 in xrange(0,num_products):
-		# 		for index2 in xrange(0,num_products):
-		# 			joint_export_num = (self.temp['data'][index1] * self.temp['data'][index2]).sum()
-		# 			if index2 < index1:                                                     #Placing Max Values in Top Right Diagonal Quadrant
-		# 				max_exports_num  = max(self.temp['col_sums'][index1], self.temp['col_sums'][index2])
-		# 				cond_prob = joint_export_num / max_exports_num
-		# 			else:                                                                   #Placing Min Values in Top Right Diagonal Quadrant
-		# 				min_exports_num = min(self.temp['col_sums'][index1], self.temp['col_sums'][index2])
-		# 				cond_prob = joint_export_num / min_exports_num
-		# 			self.proximity[index1][index2] = cond_prob
-		# 	# Return DataFrame Representation
-		# 	self.proximity = pd.DataFrame(self.proximity, index=self.products, columns=self.products)
-		# 	self.proximity.index.name = 'productcode1'
-		# 	self.proximity.columns.name = 'productcode2'
-		# 	self.proximity_notes = 'minmax'
-		# 	if verbose: print "Index: %s (%s); Columns: %s (%s)" % (self.proximity.index.name, len(self.proximity.index), self.proximity.columns.name, len(self.proximity.columns))
-		# 	## - Fill Na Option - ##
-		# 	if fillna:
-		# 		self.proximity.fillna(0.0)
-		# 	## - Remove Temp Data - ##
-		# 	if clear_temp:
-		# 		del self.temp['col_sums']
-		# 		del self.temp['data']
-		# 	self.proximity.name = 'Proximity'
-		# 	return self.proximity
+			[1] type    =>  'symmetric', 'asymmetric', 'minmax', 'pearsons'
 
-		## -- Funtion Code -- ##
+		Notes:
+		-----
+			[1] Computed in one pass from the Mcp array as matrix products (np.corrcoef for 'pearsons'). See trade.util.proximity.country_proximity_matrix()
+			[2] DynamicProductLevelExportSystem.compute_country_proximity() computes all years in a single batched pass
+			[3] clear_temp is retained for compatibility (no temporary data is stored)
+		"""
+		from pyeconlab.trade.util.proximity import country_proximity_matrix
+		if matrix_type not in ['symmetric', 'asymmetric', 'minmax', 'pearsons']:
+			raise ValueError("Proximity type must be either symmetric, asymmetric, minmax, or pearsons")
 		if type(self.mcp) != pd.DataFrame:
 			if verbose: print "Mcp matrix at (self.mcp) is currently not available. Computing Mcp (with default KWARGS)"
 			self.mcp = self.mcp_matrix()
-		# - Output - #
-		if matrix_type == 'symmetric':
-			return proximity_matrix_symmetric(self)
-		elif matrix_type == 'asymmetric':
-			return proximity_matrix_asymmetric(self)
-		elif matrix_type == 'minmax':
-			return proximity_matrix_minmax(self)
-		elif matrix_type == 'pearsons':
-			return proximity_matrix_pearsons(self)
-		else:
-			raise ValueError("Proximity type must be either symmetric, asymmetric, minmax, or pearsons")
+		return self.set_country_proximity(country_proximity_matrix(self.mcp.values, matrix_type=matrix_type), matrix_type, fillna=fillna)
+
+	def set_country_proximity(self, values, matrix_type, fillna=False):
+		"""
+		Set Country Proximity from a numpy Array (see trade.util.proximity.country_proximity_matrix())
+		"""
+		self.country_proximity = pd.DataFrame(values, index=self.mcp.index.copy(), columns=self.mcp.index.copy())
+		self.country_proximity_notes = matrix_type
+		## - Fill Na Option - ##
+		if fillna:
+			self.country_proximity = self.country_proximity.fillna(0.0)
+		self.country_proximity.name = 'CntryProximity'
+		return self.country_proximity
 	
 
 	### --- Centrality Measures --- ###
@@ -1557,6 +1625,7 @@ class ProductLevelExportSystem(object):
 		Notes
 		----- 
 			1. sum_not_mean = Hausmann uses SUM() rather than normalised mean -> Same Overall Graph Shape!
+			2. Accepts a SparseProximity (proximity_matrix_sparse()) or MemmapProximity (proximity_matrix_tiled()) matrix as mean() is exact for the full matrix
 		
 		Return
 		------
@@ -1572,6 +1641,58 @@ class ProductLevelExportSystem(object):
 			avg_centrality =  self.mcp.mul(self.proximity.mean(), axis=1).sum(axis=1).div(num_prods_exported)
 		return avg_centrality
 
+	def opportunity_inputs(self, pci=True, verbose=False):
+		"""
+		Return Aligned numpy Arrays of Mcp, Proximity and PCI for Opportunity Metrics (Computing them with default kwargs if required)
+		"""
+		if type(self.mcp) != pd.DataFrame:
+			if verbose: print "Mcp matrix at (self.mcp) is currently not available. Computing Mcp (with default KWARGS)"
+			self.mcp_matrix()
+		if self.proximity is None:
+			if verbose: print "Proximity matrix at (self.proximity) is currently not available. Computing Proximity (with default KWARGS)"
+			self.proximity_matrix()
+		proximity = self.proximity if type(self.proximity) == pd.DataFrame else self.proximity.to_dataframe()
+		proximity = proximity.reindex(index=self.mcp.columns, columns=self.mcp.columns).values
+		if not pci:
+			return self.mcp.values, proximity, None
+		if type(self.pci) != pd.Series:
+			if verbose: print "self.pci is not a Series ... running self.compute_pci() with default kwargs"
+			self.compute_pci()
+		return self.mcp.values, proximity, self.pci.reindex(self.mcp.columns).values
+
+	def compute_opportunity_metrics(self, verbose=False):
+		"""
+		Compute Density, Distance, Complexity Outlook and Opportunity Gain from Mcp, Proximity and PCI
+
+		Returns
+		-------
+		self.density (cp), self.distance (cp), self.complexity_outlook (c), self.opportunity_gain (cp)
+
+		Notes
+		-----
+			1. Computed as matrix products (see trade.util.opportunity for definitions)
+			2. SparseProximity and MemmapProximity matrices are loaded with to_dataframe()
+			3. DynamicProductLevelExportSystem.compute_opportunity_metrics() computes all years in a single batched pass
+		"""
+		from pyeconlab.trade.util.opportunity import compute_opportunity_metrics
+		mcp, proximity, pci = self.opportunity_inputs(verbose=verbose)
+		if verbose: print "Computing: Density, Distance, Complexity Outlook, Opportunity Gain"
+		self.set_opportunity_metrics(compute_opportunity_metrics(mcp, proximity, pci))
+		return self.density, self.distance, self.complexity_outlook, self.opportunity_gain
+
+	def set_opportunity_metrics(self, metrics):
+		"""
+		Set Opportunity Metrics from numpy Arrays (see trade.util.opportunity.compute_opportunity_metrics())
+		"""
+		countries, products = self.mcp.index, self.mcp.columns
+		self.density = pd.DataFrame(metrics['density'], index=countries.copy(), columns=products.copy())
+		self.density.name = 'density'
+		self.distance = pd.DataFrame(metrics['distance'], index=countries.copy(), columns=products.copy())
+		self.distance.name = 'distance'
+		self.complexity_outlook = pd.Series(metrics['complexity_outlook'], index=countries.copy(), name='COI')
+		self.opportunity_gain = pd.DataFrame(metrics['opportunity_gain'], index=countries.copy(), columns=products.copy())
+		self.opportunity_gain.name = 'COG'
+
 
 	### --- Ubiquity and Diversity --- ###
 	######################################
@@ -1579,7 +1700,14 @@ class ProductLevelExportSystem(object):
 	def compute_ubiquity(self, verbose=False):
 		'''
 			Compute Ubiquity from Mcp Matrix (self.mcp)
+			Uses popcounts over the Bit-Packed Mcp (self.mcp_packed) if self.mcp is not available
 		'''
+		if type(self.mcp) != pd.DataFrame and self.mcp_packed is not None:
+			from pyeconlab.trade.util.bitpacked import popcount
+			self.ubiquity = pd.Series(popcount(self.mcp_packed['pc']).astype(np.float64), index=copy.deepcopy(self.mcp_packed['products']))
+			self.ubiquity.name = 'ubiquity'
+			self.ubiquity.index.name = 'productcode'
+			return self.ubiquity
 		if type(self.mcp) != pd.DataFrame:                                                                          #Assume Mcp has been computed. Improve this
 			if verbose: print "No Mcp Matrix at self.mcp. Running mcp_matrix() method with default kwargs"
 			self.mcp = self.mcp_matrix()
@@ -1591,7 +1719,14 @@ class ProductLevelExportSystem(object):
 	def compute_diversity(self, verbose=False):
 		'''
 			Compute Diversity from Mcp Matrix (self.mcp)
+			Uses popcounts over the Bit-Packed Mcp (self.mcp_packed) if self.mcp is not available
 		'''
+		if type(self.mcp) != pd.DataFrame and self.mcp_packed is not None:
+			from pyeconlab.trade.util.bitpacked import popcount
+			self.diversity = pd.Series(popcount(self.mcp_packed['cp']).astype(np.float64), index=copy.deepcopy(self.mcp_packed['countries']))
+			self.diversity.name = 'diversity'
+			self.diversity.index.name = 'country'
+			return self.diversity
 		if type(self.mcp) != pd.DataFrame:
 			if verbose: print "No Mcp Matrix at self.mcp. Running mcp_matrix() method with default kwargs"
 			self.mcp = self.mcp_matrix()
@@ -1612,10 +1747,41 @@ class ProductLevelExportSystem(object):
 			Header Function for Computing Mcc Matrices
 			Notes:
 			------
-				[1] Current Options are Pandas, Numba 
+				[1] Current Options are Pandas, Numba, Numpy
+				[2] Uses the Numpy (Matrix Product) Implementation
 
 		'''
-		return self.compute_mcc_numba(verbose)
+		return self.compute_mcc_numpy(verbose=verbose)
+
+	def compute_mcc_numpy(self, verbose=False):
+		'''
+			Compute Mcc Matrix as Two Matrix Products: Mcc = D^-1 . M . U^-1 . M^T 
+			
+			Notes:
+			------
+				[1] D = diag(diversity) and U = diag(ubiquity) of M (Countries and Products with Nonzero Relationships)
+				[2] Zero Relationship Rows and Columns are Masked using Index Arrays and Returned as np.nan (consistent with compute_mcc_numba())
+		'''
+		if type(self.mcp) != pd.DataFrame:
+			if verbose: print "Mcp matrix at (self.mcp) is currently not available. Computing Mcp (with default KWARGS)"
+			self.mcp_matrix()
+		if verbose: print "Computing: Mcc"
+		values = self.mcp.values
+		# - Index Arrays of Nonzero Relationships (Rows then Columns as in remove_zero_relationships_matrix()) - #
+		cidx = np.flatnonzero(np.nansum(values, axis=1) != 0)
+		pidx = np.flatnonzero(np.nansum(values[cidx], axis=0) != 0)
+		M = values[np.ix_(cidx, pidx)]
+		Mcc = np.dot(M / M.sum(axis=0), M.T) / M.sum(axis=1)[:, np.newaxis]
+		# - Return DataFrame Representation (np.nan for Zero Relationships) - #
+		num_countries = len(self.mcp.index)
+		full = np.empty((num_countries, num_countries))
+		full.fill(np.nan)
+		full[np.ix_(cidx, cidx)] = Mcc
+		Mcc = pd.DataFrame(full, index=self.mcp.index.copy(), columns=self.mcp.index.copy())
+		Mcc.index.name = 'country'
+		Mcc.columns.name = 'country_prime'
+		self.mcc = Mcc
+		return Mcc
 
 
 	def compute_mcc_numba(self, clear_temp=True, verbose=False):
@@ -1802,9 +1968,40 @@ class ProductLevelExportSystem(object):
 			Compute Mpp Matrix
 			Notes:
 			------
-				[1] If Diversity and Ubiquity then there exists an Mcp and Product List so no need to check self.mcp and self.products
+				[1] Current Options are Pandas, Numba, Numpy
+				[2] Uses the Numpy (Matrix Product) Implementation
 		'''
-		return self.compute_mpp_numba(verbose)
+		return self.compute_mpp_numpy(verbose=verbose)
+
+	def compute_mpp_numpy(self, verbose=False):
+		'''
+			Compute Mpp Matrix as Two Matrix Products: Mpp = U^-1 . M^T . D^-1 . M
+			
+			Notes:
+			------
+				[1] D = diag(diversity) and U = diag(ubiquity) of M (Countries and Products with Nonzero Relationships)
+				[2] Zero Relationship Rows and Columns are Masked using Index Arrays and Returned as np.nan (consistent with compute_mpp_numba())
+		'''
+		if type(self.mcp) != pd.DataFrame:
+			if verbose: print "Mcp matrix at (self.mcp) is currently not available. Computing Mcp (with default KWARGS)"
+			self.mcp_matrix()
+		if verbose: print "Computing: Mpp"
+		values = self.mcp.values
+		# - Index Arrays of Nonzero Relationships (Rows then Columns as in remove_zero_relationships_matrix()) - #
+		cidx = np.flatnonzero(np.nansum(values, axis=1) != 0)
+		pidx = np.flatnonzero(np.nansum(values[cidx], axis=0) != 0)
+		M = values[np.ix_(cidx, pidx)]
+		Mpp = np.dot(M.T, M / M.sum(axis=1)[:, np.newaxis]) / M.sum(axis=0)[:, np.newaxis]
+		# - Return DataFrame Representation (np.nan for Zero Relationships) - #
+		num_products = len(self.mcp.columns)
+		full = np.empty((num_products, num_products))
+		full.fill(np.nan)
+		full[np.ix_(pidx, pidx)] = Mpp
+		Mpp = pd.DataFrame(full, index=self.mcp.columns.copy(), columns=self.mcp.columns.copy())
+		Mpp.index.name = 'productcode'
+		Mpp.columns.name = 'productcode_prime'
+		self.mpp = Mpp
+		return Mpp
 
 
 	def compute_mpp_numba(self, clear_temp=True, verbose=False):
@@ -2069,6 +2266,90 @@ class ProductLevelExportSystem(object):
 		self.kcn = Kcn
 		self.kpn = Kpn
 		return Kcn, Kpn
+
+	def compute_fitness_complexity(self, tol=1e-8, max_iterations=1000, verbose=False):
+		"""
+		Compute Country Fitness and Product Complexity using the Fitness-Complexity Algorithm (Tacchella et al. 2012)
+
+		Parameters
+		----------
+		tol 			: 	float, optional(default=1e-8)
+							Convergence Tolerance on the maximum absolute change in log(Fitness) and log(Complexity)
+		max_iterations 	: 	int, optional(default=1000)
+							Maximum number of iterations
+
+		Returns
+		-------
+		self.fitness (c), self.fc_complexity (p)
+
+		Notes
+		-----
+			1. Computed as sparse matrix-vector iterations in log-space (see trade.util.complexity)
+			2. Countries and Products with zero diversity / ubiquity are np.nan
+			3. DynamicProductLevelExportSystem.compute_fitness_complexity() computes all years in a single batched pass
+		"""
+		from pyeconlab.trade.util.complexity import fitness_complexity_panel
+		if type(self.mcp) != pd.DataFrame:
+			if verbose: print "Mcp matrix at (self.mcp) is currently not available. Computing Mcp (with default KWARGS)"
+			self.mcp_matrix()
+		if verbose: print "Computing: Fitness-Complexity"
+		self.set_fitness_complexity(*fitness_complexity_panel(self.mcp.values, tol=tol, max_iterations=max_iterations, verbose=verbose))
+		return self.fitness, self.fc_complexity
+
+	def set_fitness_complexity(self, fitness, complexity, iterations, converged):
+		"""
+		Set Fitness and Complexity from numpy Arrays (see trade.util.complexity.fitness_complexity_panel())
+		"""
+		self.fitness = pd.Series(fitness, index=self.mcp.index.copy(), name='Fitness')
+		self.fc_complexity = pd.Series(complexity, index=self.mcp.columns.copy(), name='Complexity')
+		self.fc_notes = "Iterations: %s; Converged: %s" % (iterations, converged)
+		if not converged:
+			print "[WARNING] Fitness-Complexity did not converge after %s iterations" % iterations
+
+	def compute_proximity_null_model(self, num_draws=100, matrix_type='symmetric', seed=None, processes=None, num_trades=None, verbose=False):
+		"""
+		Compute Proximity z-scores and p-values against randomized Mcp matrices that preserve Diversity and Ubiquity
+
+		Parameters
+		----------
+		num_draws 	: 	int, optional(default=100)
+						Number of randomized Mcp matrices
+		matrix_type : 	str, optional(default='symmetric')
+						'symmetric', 'asymmetric' or 'minmax' (see trade.util.proximity.proximity_block)
+		seed 		: 	int, optional(default=None)
+						Master seed for reproducible draws
+		processes 	: 	int, optional(default=None)
+						Number of local processes (default: all cores; 1 runs serially)
+		num_trades 	: 	int, optional(default=None)
+						Curveball trades per draw (default: 5 x number of countries)
+
+		Returns
+		-------
+		self.proximity_zscore (pp), self.proximity_pvalue (pp)
+
+		Notes
+		-----
+			1. See trade.util.nullmodel for the Curveball randomization and statistics
+			2. Observed proximity is recomputed from self.mcp with the same kernel as the draws
+		"""
+		from pyeconlab.trade.util.nullmodel import proximity_null_model
+		if type(self.mcp) != pd.DataFrame:
+			if verbose: print "Mcp matrix at (self.mcp) is currently not available. Computing Mcp (with default KWARGS)"
+			self.mcp_matrix()
+		if verbose: print "Computing: Proximity Null Model (%s draws)" % num_draws
+		observed, results = proximity_null_model(self.mcp.values, num_draws=num_draws, matrix_type=matrix_type, seed=seed, processes=processes, num_trades=num_trades, verbose=verbose)
+		self.set_proximity_null_model(results)
+		return self.proximity_zscore, self.proximity_pvalue
+
+	def set_proximity_null_model(self, results):
+		"""
+		Set Proximity z-scores and p-values from numpy Arrays (see trade.util.nullmodel.run_null_models())
+		"""
+		products = self.mcp.columns
+		self.proximity_zscore = pd.DataFrame(results['zscore'], index=products.copy(), columns=products.copy())
+		self.proximity_zscore.name = 'ProximityZScore'
+		self.proximity_pvalue = pd.DataFrame(results['pvalue'], index=products.copy(), columns=products.copy())
+		self.proximity_pvalue.name = 'ProximityPValue'
 	
 
 	def identify_inefficient_trade(self, row_ascending=True, column_ascending=True, no_zero_relationships=True, verbose=False):
@@ -2082,6 +2363,10 @@ class ProductLevelExportSystem(object):
 		no_zero_relationships   :   bool, optional(default=True)
 									Remove All Zero Relationships in Columns and Rows
 
+		Notes
+		-----
+			1. Distances are a broadcast of the cumulative (non-dimensional) product and country scale vectors masked by Mcp
+
 		"""
 		from pyeconlab.trade.util import prepare_scaling_vectors
 
@@ -2091,25 +2376,15 @@ class ProductLevelExportSystem(object):
 		sort_mcp = self.sorted_matrix(self.mcp.copy(), row_sortby=self.eci.copy(), row_ascending=row_ascending, column_sortby=self.pci.copy(), column_ascending=column_ascending, verbose=False)
 		#-ScaleBy-#
 		data, row_scaleby, column_scaleby = prepare_scaling_vectors(sort_mcp, row_scaleby=self.total_country_export, column_scaleby=self.total_product_export)
-		#Scaling Vectors-#
-		yscale = np.array(row_scaleby)
-		yscale = yscale / np.sum(yscale)                    #Normalise (0,1) 
-		yscale = np.insert(yscale.cumsum(), 0, 0)           #Replace y with scaled vector
-		col_scales = pd.DataFrame(yscale[1:], index=data.index, columns=['yscale'])
-		xscale = np.array(column_scaleby)
-		xscale = xscale / np.sum(xscale)                    #Normalise (0,1)
-		xscale = np.insert(xscale.cumsum(), 0, 0)           #Replace x with scaled vector
-		row_scales = pd.DataFrame(xscale[1:], index=data.columns, columns=['xscale'])
-
-		for country in data.index:
-			if verbose: print "Computing for Country: %s" % country
-			location = col_scales.ix[country].values[0]                     #Location is the Countries location along the column axis in non-dimensional terms                     
-			sort_mcp_country = sort_mcp.ix[country]
-			for product in sort_mcp_country[sort_mcp_country == 1].index:
-				#Replace Mcp Information with Distance Information#
-				dist = row_scales.ix[product].values[0] - location          #Exports higher than expected based on country position are +ve and products lower than expected -ve
-				sort_mcp.set_value(index=country, col=product,  value=dist)
-
+		#-Scaling Vectors (Position of the end of each Country and Product along the non-dimensional axis)-#
+		yscale = np.array(row_scaleby.reindex(data.index))
+		yscale = (yscale / np.sum(yscale)).cumsum()                     #Normalise (0,1) 
+		xscale = np.array(column_scaleby.reindex(data.columns))
+		xscale = (xscale / np.sum(xscale)).cumsum()                     #Normalise (0,1)
+		#-Replace Mcp Information with Distance Information-#
+		#Exports higher than expected based on country position are +ve and products lower than expected -ve
+		values = data.values
+		sort_mcp = pd.DataFrame(np.where(values == 1, xscale[np.newaxis, :] - yscale[:, np.newaxis], values), index=data.index, columns=data.columns)
 		sort_mcp.index.name = 'country'
 		sort_mcp.columns.name = 'productcode'
 		return sort_mcp
@@ -2294,6 +2569,8 @@ class ProductLevelExportSystem(object):
 			[1] Default behaviour is 'LEFT' Index Joining. Mcp matrix will be preserved ... if want matched between the two series then need to change default flag 'how' to 'inner' (intersection)
 			[2] df_matrix can be MultiIndex if there are concordances attached. Keep this function simple and make another method sorted_multiindex_matrix()
 			[3] This will Filter the results based on that found in the index of row_sortby and column_sortby series
+			[4] Row and Column permutations are computed with a stable argsort and applied by integer indexing (see trade.util.sorting). 
+				row_sortby and column_sortby are no longer sorted inplace
 		
 		Future Work:
 		-----------
@@ -2305,36 +2582,31 @@ class ProductLevelExportSystem(object):
 			[6] Split Function into sorted_matrix_rows() and sorted_matrix_columns() and then get sorted_matrix() to parse the options and call relevant methods to simplify code?
 	
 		"""
+		from pyeconlab.trade.util.sorting import sortby_positions, take_positions
+		## -- Check Null Input Condition -- ##
+		if type(row_sortby) != pd.Series and type(column_sortby) != pd.Series:
+			if row_sortby is not None:
+				raise ValueError("row_sortby must be a pd.Series")
+			if column_sortby is not None:
+				raise ValueError("column_sortby must be a pd.Series")
+			raise ValueError("Need to specify a row_sortby series or column_sortby series or both")
+		rows, row_labels, columns, column_labels = None, None, None, None
 		## -- Sort Rows by Index -- ##
 		if type(row_sortby) == pd.Series:       
-			InMatrixRowIndex = set(df_matrix.index)
-			InRowSortbyIndex = set(row_sortby.index)
-			RowItemsDropped = InMatrixRowIndex - InRowSortbyIndex
+			RowItemsDropped = set(df_matrix.index) - set(row_sortby.index)
 			if RowItemsDropped: print "[WARNING] Items dropped from Matrix Row Index: %s (Not in row_sortby)" % RowItemsDropped
-			row_sortby.sort(ascending=row_ascending)
-			sorted_df_matrix = df_matrix.reindex(index=row_sortby.index)
-		elif row_sortby == None:                                                                #Pass if Nothing to Do [Default Value == None]; This will throw a ValueError if DataFrame is passed
-			pass
-		else:
+			row_labels, rows, row_values = sortby_positions(df_matrix.index, row_sortby, ascending=row_ascending, how='right')
+		elif row_sortby is not None:
 			raise ValueError("row_sortby must be a pd.Series")
 		## -- Sort Columns by Index -- ##
 		if type(column_sortby) == pd.Series:
-			InMatrixColIndex = set(df_matrix.columns)
-			InColSortbyIndex = set(column_sortby.index)
-			ColItemsDropped = (InMatrixColIndex - InColSortbyIndex)
+			ColItemsDropped = set(df_matrix.columns) - set(column_sortby.index)
 			if ColItemsDropped: print "[WARNING] Items dropped from Matrix Column Index: %s (Not in column_sortby)" % ColItemsDropped
-			column_sortby.sort(ascending=column_ascending)
-			if type(row_sortby) == pd.Series:                                                   
-				sorted_df_matrix = sorted_df_matrix.reindex(columns=column_sortby.index)        #Sort Already Sorted Matrix by row_matrix 
-			else: 
-				sorted_df_matrix = df_matrix.reindex(columns=column_sortby.index)               #Sort the column index
-		elif column_sortby == None:
-			pass                                                                                #Pass if Nothing to Do [Default Value == None]; This will throw a ValueError if DataFrame is passed
-		else:
+			column_labels, columns, column_values = sortby_positions(df_matrix.columns, column_sortby, ascending=column_ascending, how='right')
+		elif column_sortby is not None:
 			raise ValueError("column_sortby must be a pd.Series")
 		## -- Return Sorted Data -- ##
-		if type(row_sortby) != pd.Series and type(column_sortby) != pd.Series:                  #Check Null input Condition
-			raise ValueError("Need to specify a row_sortby series or column_sortby series or both")
+		sorted_df_matrix = take_positions(df_matrix, rows=rows, columns=columns, row_labels=row_labels, column_labels=column_labels)
 		return sorted_df_matrix
 
 
@@ -2344,11 +2616,11 @@ class ProductLevelExportSystem(object):
 
 			row_sortby, column_sortby       :   pd.Series or [pd.Series]
 
-		  **Status: This Function is currently UNTESTED**
-
 			Notes:
 			-----
 				[1] To match to relevant level of Index the Incoming Series needs to have the same name as the level in the index!
+				[2] Row and Column permutations are computed with a stable argsort of the level positions and applied by integer indexing
+				[3] When a list of Series is passed the last Series is the primary ordering (later sorts are stable)
 
 			Future Work:
 			------------
@@ -2357,47 +2629,33 @@ class ProductLevelExportSystem(object):
 				[3] Split Function into sorted_multiindex_matrix_rows() and sorted_multiindex_matrix_columns() that is called by sorted_multiindex_matrix() to simplify code?
 		'''
 		## -- Helper Functions -- ##
-		def row_sorter(df_matrix, row_sortby, row_ascending):
-			## -- Check Input -- ##
-			if type(row_sortby) != pd.Series: raise ValueError("row_sortby must be a pd.Series")                                                                #Ensures all Passed List Items are Checked.
-			if row_sortby.name not in df_matrix.index.levels: raise ValueError("row_sortby.name doesn't match any of the Row index level names")
-			row_sortby.sort(ascending=row_ascending)
-			### CHECK THIS ###
-			sorted_df_matrix = df_matrix.reindex(index=row_sortby.index, level=row_sortby.name)
-			### END ###
-			return sorted_df_matrix
-
-		def column_sorter(df_matrix, column_sortby, column_ascending):
-			## - Check Input -- ##
-			if type(column_sortby) != pd.Series: raise ValueError("column_sortby must be a pd.Series")                                                          #Ensures all Passed List Items are Checked.
-			if column_sortby.name not in df_matrix.columns.levels: raise ValueError("column_sortby.name doesn't match any of the Column index level names")
-			column_sortby.sort(ascending=column_ascending)
-			### CHECK THIS ###
-			sorted_df_matrix = df_matrix.reindex(columns=column_sortby.index, level=column_sortby.name)
-			### END ###
-			return sorted_df_matrix 
-
+		def level_positions(labels, sortby, ascending):
+			""" Stable permutation of a MultiIndex that orders one level by sortby (labels not in sortby are dropped as with reindex(level=)) """
+			if type(sortby) != pd.Series: raise ValueError("sortby must be a pd.Series")
+			if sortby.name not in labels.names: raise ValueError("sortby.name (%s) doesn't match any of the index level names" % sortby.name)
+			level_labels, positions, values = sortby_positions(labels.levels[labels.names.index(sortby.name)], sortby, ascending=ascending, how='inner')
+			rank = np.empty(len(labels.levels[labels.names.index(sortby.name)]) + 1, dtype=np.int64)			#-Positions are in the full level (+1 for missing labels (-1))-#
+			rank.fill(-1)
+			rank[positions] = np.arange(len(positions))
+			row_rank = rank[labels.labels[labels.names.index(sortby.name)]]
+			order = np.argsort(row_rank, kind='mergesort')
+			return order[row_rank[order] != -1]
+
+		from pyeconlab.trade.util.sorting import sortby_positions, take_positions
 		## -- Parse Types -- ##
-		if df_matrix.index != pd.MultiIndex:
+		if row_sortby is None and column_sortby is None:
+			raise ValueError("Must specify row_sortby or column_sortby or both")
+		if row_sortby is not None and type(df_matrix.index) != pd.MultiIndex:
 			raise ValueError("This Method Requires df_matrix to have a MultiIndex")
-		## -- Sort Rows -- ##
-		sorted_df_matrix = df_matrix.copy(deep=True)                                                #Prepare a Copy of df_matrix
-		if type(row_sortby) == pd.Series:                                                           #Sort One Level
-			sorted_df_matrix = row_sorter(sorted_df_matrix, row_sortby, row_ascending)
-		elif type(row_sortby) == list:                                                              #Sort Multiple Levels Sorting First by Item 1 and Last by Item n
-			for row_sortby_item in row_sortby:
-				sorted_df_matrix = row_sortby(sorted_df_matrix, row_sortby_item, row_ascending)
+		if column_sortby is not None and type(df_matrix.columns) != pd.MultiIndex:
+			raise ValueError("This Method Requires df_matrix to have a MultiIndex")
+		## -- Sort Rows (Sorting First by Item 1 and Last by Item n) -- ##
+		sorted_df_matrix = df_matrix
+		for sortby in (row_sortby if type(row_sortby) == list else [row_sortby] if row_sortby is not None else []):
+			sorted_df_matrix = take_positions(sorted_df_matrix, rows=level_positions(sorted_df_matrix.index, sortby, row_ascending))
 		## -- Sort Columns -- ##
-		if type(column_sortby) == pd.Series:
-			sorted_df_matrix = column_sorter(sorted_df_matrix, column_sortby, column_ascending)
-		elif type(column_sortby) == list:
-			for column_sortby_item in column_sortby:                                                #Sort Multiple Levels Sorting First by Item 1 and Last by Item n
-				sorted_df_matrix = column_sorter(sorted_df_matrix, column_sortby, column_ascending)
-		## -- Return Sorted Data -- ##
-		try:                                                                                        #Check Zero Sorting Series Condition
-			if row_sortby==None and column_sortby == None: raise ValueError("Must specify row_sortby or column_sortby or both")
-		except:
-			pass
+		for sortby in (column_sortby if type(column_sortby) == list else [column_sortby] if column_sortby is not None else []):
+			sorted_df_matrix = take_positions(sorted_df_matrix, columns=level_positions(sorted_df_matrix.columns, sortby, column_ascending))
 		return sorted_df_matrix
 
 	#######################
@@ -3578,11 +3836,17 @@ class ProductLevelExportSystem(object):
 
 		# - Function Code - # 
 		
+		# - Sparse and Memory-Mapped Proximity is Loaded for Display Only - #
+		if type(self.proximity) != pd.DataFrame:
+			proximity = self.proximity.to_dataframe()
+		else:
+			proximity = self.proximity
+
 		# - Sorting Work in Pandas - #
 		if type(sortby) != pd.Series:                           # By Default this should be sorted by ProductCode
-			sorted_proximity = self.proximity 
+			sorted_proximity = proximity 
 		else:
-			sorted_proximity = self.sorted_matrix(self.proximity, row_sortby=sortby, column_sortby=sortby)
+			sorted_proximity = self.sorted_matrix(proximity, row_sortby=sortby, column_sortby=sortby)
 		
 		# When scaleby is defined (default to specific labelled products) #
 		if type(scaleby) == pd.Series:              
@@ -3590,7 +3854,7 @@ class ProductLevelExportSystem(object):
 		
 		# - Generate Graph Data Matrix - #
 		if prox_cutoff != -1:
-			matr = sorted_proximity.applymap(lambda x: prox_cutoff if x >= prox_cutoff else x).as_matrix()     #Only One Sided Filter (Perhaps write a filter method)     
+			matr = sorted_proximity.clip_upper(prox_cutoff).as_matrix()      #Only One Sided Filter (np.nan preserved)
 		else:
 			matr = sorted_proximity.as_matrix()
 
@@ -3706,7 +3970,10 @@ class ProductLevelExportSystem(object):
 				[1] Make BiPartiteGraph Representation
 				[2] Cleaner View of MultiDiGraph            => Currently use Cytoscape and Gephi for Viz
 		''' 
-		fig = nx.draw(self.network)
+		network = self.network
+		if network is None and self.graph is not None:
+			network = self.graph.to_networkx()
+		fig = nx.draw(network)
 		if show: plt.show() 
 		else: return fig                            
 
@@ -2,6 +2,10 @@
 Tests for DynamicProductLevelExportSystem Module
 """
 
+import os
+import shutil
+import tempfile
+import numpy as np
 import pandas as pd
 from pyeconlab.util import package_folder
 from pyeconlab.trade.systems import DynamicProductLevelExportSystem
@@ -195,4 +199,63 @@ class TestDynamicProductLevelExportSystemBasic(object):
 	# print A[2001].cp_matrix
 
 	# print "\nTesting cp_matrices() Getter Method"
-	# print A.cp_matrices()
\ No newline at end of file
+	# print A.cp_matrices()
+
+
+class TestDynamicProductLevelExportSystemMemoryBudget(object):
+	"""
+	Memory Budget Tests for Dynamic Product Level Export System
+	"""
+
+	def setup(self):
+		rng = np.random.RandomState(5)
+		years, countries, products = range(2000, 2006), ['C%02d' % idx for idx in xrange(20)], ['%04d' % idx for idx in xrange(50)]
+		index = pd.MultiIndex.from_product([years, countries, products], names=['year', 'country', 'productcode'])
+		self.data = pd.DataFrame({'export' : np.where(rng.rand(len(index)) > 0.5, rng.lognormal(0, 1, len(index)), 0.0)}, index=index)
+		self.data = self.data.reset_index(['country', 'productcode'])
+		self.spill_dir = tempfile.mkdtemp()
+
+	def teardown(self):
+		shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+	def build(self, memory_budget=None):
+		A = DynamicProductLevelExportSystem(memory_budget=memory_budget, spill_dir=self.spill_dir if memory_budget else None)
+		A.from_df(self.data.copy())
+		A.rca_matrices(complete_data=True)
+		A.mcp_matrices()
+		A.proximity_matrices()
+		return A
+
+	def test_spill_matches_in_memory(self):
+		A = self.build()
+		B = self.build(memory_budget=20000)
+		counters = B.memory_budget_counters
+		assert counters['spills'] > 0 and counters['reloads'] > 0
+		for year in A.years:
+			assert_frame_equal(A[year].rca, B[year].rca)
+			assert_frame_equal(A[year].proximity, B[year].proximity)
+		assert A.memory_budget_counters is None
+		B.release_memory_budget()
+		assert type(B.ples) == dict
+		assert_frame_equal(A[2000].mcp, B[2000].mcp)
+
+	def test_slice_under_budget(self):
+		A = self.build()
+		B = self.build(memory_budget=20000)
+		view = B[2000:2004]
+		assert sorted(view.keys()) == range(2000, 2004)
+		for year in [2003, 2002, 2001, 2000]:
+			view[year].mcp
+		assert B.memory_budget_counters['spills'] > 0
+		for year, ples in view.items():
+			assert_frame_equal(A[year].mcp, view[year].mcp)
+		assert_frame_equal(A[2000].mcp, B[2000:2004][2000].mcp)
+
+	def test_pickle_keeps_spill_dir(self):
+		B = self.build(memory_budget=20000)
+		fn = os.path.join(self.spill_dir, 'system.pickle')
+		B.to_pickle(fn)
+		C = DynamicProductLevelExportSystem(memory_budget=30000, spill_dir=os.path.join(self.spill_dir, 'C'))
+		C.from_pickle(fn)
+		assert C.ples.spill_dir == os.path.join(self.spill_dir, 'C') and C.ples.memory_budget == 30000
+		assert_frame_equal(B[2000].mcp, C[2000].mcp)
@@ -0,0 +1,91 @@
+"""
+Tests for ProductLevelExportSystem Module
+"""
+
+import numpy as np
+import pandas as pd
+from pyeconlab.trade.systems import ProductLevelExportSystem
+
+from pandas.util.testing import assert_frame_equal
+
+
+class TestProductLevelExportSystemMatrices(object):
+	"""
+	Tests for Matrix Implementations of ProductSpace Methods
+	"""
+
+	@classmethod
+	def setup_class(cls):
+		rng = np.random.RandomState(5)
+		values = (rng.rand(12, 30) > 0.6).astype(float)
+		values[:, 4] = 0 										#Zero Ubiquity Product
+		values[2, :] = 0 										#Zero Diversity Country
+		cls.mcp = pd.DataFrame(values, index=pd.Index(['C%02d' % x for x in range(12)], name='country'), columns=pd.Index(['%04d' % x for x in range(30)], name='productcode'))
+
+	def setup_system(self):
+		A = ProductLevelExportSystem()
+		A.mcp = self.mcp.copy()
+		A.countries = self.mcp.index
+		A.products = self.mcp.columns
+		A.compute_diversity()
+		A.compute_ubiquity()
+		return A
+
+	def test_mcc_numpy(self):
+		A = self.setup_system()
+		computed = A.compute_mcc_numpy()
+		expected = A.compute_mcc_pandas()
+		valid = self.mcp.sum(axis=1) != 0
+		assert computed.loc[~valid].isnull().all().all()
+		assert_frame_equal(computed.loc[valid, valid], expected.loc[valid, valid].astype(float), check_names=False)
+
+	def test_mpp_numpy(self):
+		A = self.setup_system()
+		A.mcp = A.mcp.loc[self.mcp.sum(axis=1) != 0] 				#compute_mpp_pandas() requires no zero diversity countries
+		A.compute_diversity()
+		computed = A.compute_mpp_numpy()
+		expected = A.compute_mpp_pandas()
+		valid = self.mcp.sum() != 0
+		assert computed.loc[~valid].isnull().all().all()
+		assert_frame_equal(computed.loc[valid, valid], expected.loc[valid, valid].astype(float), check_names=False)
+
+
+class TestProductLevelExportSystemSorting(object):
+	"""
+	Tests for Sorting and Inefficient Trade Methods
+	"""
+
+	@classmethod
+	def setup_class(cls):
+		rng = np.random.RandomState(7)
+		index = pd.MultiIndex.from_product([['A', 'B', 'C', 'D', 'E'], ['X', 'Y']], names=['country', 'region'])
+		cls.matrix = pd.DataFrame(rng.rand(10, 3), index=index, columns=pd.Index(['0011', '0012', '0013'], name='productcode'))
+		values = (rng.rand(6, 8) > 0.5).astype(float)
+		cls.mcp = pd.DataFrame(values, index=pd.Index(['C%02d' % x for x in range(6)], name='country'), columns=pd.Index(['%04d' % x for x in range(8)], name='productcode'))
+
+	def test_sorted_multiindex_matrix_partial_sortby(self):
+		A = ProductLevelExportSystem()
+		sortby = pd.Series([2.0, 1.0], index=pd.Index(['D', 'E'], name='country'), name='country')
+		result = A.sorted_multiindex_matrix(self.matrix, row_sortby=sortby)
+		expected = self.matrix.loc[[('E', 'X'), ('E', 'Y'), ('D', 'X'), ('D', 'Y')]]
+		assert_frame_equal(result, expected)
+
+	def test_identify_inefficient_trade(self):
+		rng = np.random.RandomState(3)
+		A = ProductLevelExportSystem()
+		A.mcp = self.mcp.copy()
+		A.eci = pd.Series(rng.rand(6), index=self.mcp.index)
+		A.pci = pd.Series(rng.rand(8), index=self.mcp.columns)
+		A._total_country_export = pd.Series(rng.rand(6) + 1, index=self.mcp.index)
+		A._total_product_export = pd.Series(rng.rand(8) + 1, index=self.mcp.columns)
+		result = A.identify_inefficient_trade(no_zero_relationships=False)
+		#-Reference: Explicit Loops over the Sorted Mcp-#
+		countries, products = list(A.eci.sort_values().index), list(A.pci.sort_values().index)
+		yscale = A._total_country_export[countries].cumsum() / A._total_country_export.sum()
+		xscale = A._total_product_export[products].cumsum() / A._total_product_export.sum()
+		expected = self.mcp.loc[countries, products].copy()
+		for country in countries:
+			for product in products:
+				if expected.loc[country, product] == 1:
+					expected.loc[country, product] = xscale[product] - yscale[country]
+		assert_frame_equal(result, expected)
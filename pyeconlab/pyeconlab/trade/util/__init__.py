@@ -1,7 +1,17 @@
 from .stats import describe
 from .pandas_converters import from_dict_to_dataframe, from_dict_of_series_to, reindex_multi_to_single, reindex_single_to_multi
-from .dynamics import compute_product_changes
-from .dynamic_converters import reindex_dynamic_dataframe, compute_persistence, reindex_dynamic_dict
+from .dynamics import compute_product_changes, compute_product_changes_panel, mcp_to_boolean_panel, product_changes_panel, rolling_persistence, pack_boolean_panel, unpack_boolean_panel, boolean_panel_to_dynamic_dict
+from .dynamic_converters import reindex_dynamic_dataframe, compute_persistence, compute_persistence_panel, reindex_dynamic_dict
 from .network import compute_average_centrality, compute_diffusion_properties_nx, construct_network_from_adjacency_df
 from .dataframe import attach_attributes
+from .bitpacked import pack_matrix, unpack_matrix, popcount, coexport_counts_packed
+from .proximity import SparseProximity, sparse_proximity_from_mcp, nonzero_statistic, MemmapProximity, tiled_proximity_to_memmap, country_proximity_matrix
+from .opportunity import compute_density, compute_opportunity_metrics
+from .complexity import fitness_complexity_panel
+from .nullmodel import curveball_randomize, probable_emergence, proximity_null_model, run_null_models
+from .graph import SparseGraph, sparse_graph_from_series, product_space_backbone
+from .memory import SpillStore, SpillStoreView, pinned, parse_nbytes, object_nbytes
+from .productlevels import ProductCodeCube, productcode_cube
+from .aggregation import CountryAggregates
+from .panel import CountryYearPanel
 from .plotting import prepare_scaling_vectors
\ No newline at end of file
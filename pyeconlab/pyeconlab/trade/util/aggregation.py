@@ -0,0 +1,158 @@
+"""
+Country and Geographic Aggregates
+=================================
+
+Compile a membership dictionary (i.e. {'AUS' : 'Oceania', 'NZL' : 'Oceania'}) into a sparse country x region matrix
+and aggregate long trade data to regions on the exporter side, the importer side or both
+
+Method
+------
+Each row of the data is expanded to one row for each region its country belongs to (using the indptr/indices of the
+csr membership matrix) and the expanded data is summed in a single groupby on integer region codes. Overlapping
+memberships (a country in several regions) are supported and a country can be in no region at all
+
+Usage
+-----
+    areas = CountryAggregates({'AUS' : 'Oceania', 'NZL' : 'Oceania', 'USA' : ['Americas', 'OECD'], 'AUT' : 'OECD'})
+    areas.aggregate(data, columns=['eiso3c', 'iiso3c'])
+
+"""
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+
+class CountryAggregates(object):
+    """
+    Sparse Country x Region Membership Matrix
+
+    Parameters
+    ----------
+    members     :   dict
+                    Membership dictionary {country : region} or {country : [region, region]} for overlapping memberships
+    name        :   str, optional(default=None)
+                    Name of the aggregation (i.e. 'areaname')
+
+    Notes
+    -----
+        1. The compiled matrix can be reused to aggregate several datasets
+
+    """
+
+    def __init__(self, members, name=None):
+        pairs = list()
+        for country, regions in members.items():
+            if isinstance(regions, (list, tuple, set)):
+                pairs.extend((country, region) for region in regions)
+            elif not pd.isnull(regions):
+                pairs.append((country, regions))
+        pairs = sorted(set(pairs))
+        self.name = name
+        self.countries = pd.Index(sorted(set(country for country, region in pairs)))
+        self.regions = pd.Index(sorted(set(region for country, region in pairs)))
+        rows = self.countries.get_indexer([country for country, region in pairs])
+        cols = self.regions.get_indexer([region for country, region in pairs])
+        self.matrix = sp.csr_matrix((np.ones(len(pairs), dtype=np.int8), (rows, cols)), shape=(len(self.countries), len(self.regions)))
+
+    def __repr__(self):
+        return "CountryAggregates %s(%s countries in %s regions)" % ("'%s' " % self.name if self.name else "", len(self.countries), len(self.regions))
+
+    @classmethod
+    def from_frame(cls, df, country='iso3c', region='region', name=None):
+        """ Compile from a Table of Countries and Regions (one row per membership) """
+        members = dict()
+        for c, r in df[[country, region]].dropna().itertuples(index=False):
+            members.setdefault(c, []).append(r)
+        return cls(members, name=name if name is not None else region)
+
+    def members(self, region):
+        """ Countries in a Region """
+        loc = self.regions.get_loc(region)
+        return list(self.countries.take(self.matrix.tocsc()[:, loc].indices))
+
+    def expand(self, countries, unmatched='drop'):
+        """
+        Rows and Region Codes for each Membership of an array of countries
+
+        Parameters
+        ----------
+        countries   :   array-like
+                        Country codes
+        unmatched   :   str, optional(default='drop')
+                        'drop' countries that are not in any region, 'keep' them as their own region, or provide a region label (i.e. '.')
+                        Missing (NaN) countries are dropped in all cases (as pandas groupby). Unmatched countries whose code
+                        equals a region label are assigned to that region (labels are unique)
+
+        Returns
+        -------
+        rows, codes, labels     (labels.take(codes) is the region of countries[rows])
+
+        """
+        countries = np.asarray(countries, dtype=object)
+        position = self.countries.get_indexer(countries)
+        matched = position >= 0
+        counts = np.zeros(len(countries), dtype=np.int64)
+        counts[matched] = np.diff(self.matrix.indptr)[position[matched]]
+        rows = np.repeat(np.arange(len(countries)), counts)
+        #-Offset of each Membership within the country's indptr range-#
+        offsets = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+        codes = self.matrix.indices[self.matrix.indptr[position[rows]] + offsets]
+        labels = np.asarray(self.regions, dtype=object)
+        other = np.flatnonzero(~matched & pd.notnull(countries))                   #-Missing countries are always dropped-#
+        if unmatched == 'drop' or len(other) == 0:
+            return rows, codes, labels
+        if unmatched == 'keep':
+            extra, extra_labels = pd.factorize(countries[other], sort=True)
+            labels = np.concatenate([labels, np.asarray(extra_labels, dtype=object)])
+        else:
+            extra = np.zeros(len(other), dtype=np.int64)
+            labels = np.concatenate([labels, np.array([unmatched], dtype=object)])
+        rows = np.concatenate([rows, other])
+        codes = np.concatenate([codes, extra + len(self.regions)])
+        #-A kept country (or label) equal to a region label is merged into that region-#
+        unique_codes, labels = pd.factorize(labels)
+        codes = unique_codes[codes]
+        labels = np.asarray(labels, dtype=object)
+        order = np.argsort(rows, kind='mergesort')
+        return rows[order], codes[order], labels
+
+    def aggregate(self, data, columns=['eiso3c'], values=['value'], unmatched='drop'):
+        """
+        Aggregate Long Data to Regions
+
+        Parameters
+        ----------
+        data        :   pd.DataFrame
+                        Long data (i.e. ['year', 'eiso3c', 'iiso3c', 'productcode', 'value']). An index is reset into columns
+        columns     :   list, optional(default=['eiso3c'])
+                        Country columns to replace by regions (i.e. ['eiso3c'], ['iiso3c'] or ['eiso3c', 'iiso3c'])
+        values      :   list, optional(default=['value'])
+                        Columns to sum. Other columns are kept as keys
+        unmatched   :   str, optional(default='drop')
+                        'drop', 'keep' or a region label for countries that are not in any region (see expand())
+
+        Returns
+        -------
+        pd.DataFrame with the same columns as data and a region in place of each country in columns
+
+        """
+        if type(data.index) == pd.MultiIndex or data.index.name is not None:
+            data = data.reset_index()
+        keys = [item for item in data.columns if item not in values]
+        rows = np.arange(len(data))
+        region_codes, region_labels = dict(), dict()
+        for column in columns:
+            expanded, codes, region_labels[column] = self.expand(data[column].values[rows], unmatched=unmatched)
+            for item in region_codes:
+                region_codes[item] = region_codes[item][expanded]
+            region_codes[column] = codes
+            rows = rows[expanded]
+        #-Single GroupBy on Integer Region Codes-#
+        result = dict()
+        for item in data.columns:
+            result[item] = region_codes[item] if item in columns else data[item].values[rows]
+        result = pd.DataFrame(result, columns=data.columns).groupby(keys, sort=True)[values].sum().reset_index()
+        for column in columns:
+            result[column] = region_labels[column].take(result[column].values)
+        return result[list(data.columns)]
@@ -0,0 +1,89 @@
+"""
+Bit-Packed Matrix Utilities
+===========================
+
+Functions for storing {0,1} matrices (such as Mcp) with one bit per cell and computing
+counts (ubiquity, diversity, co-export) with vectorized popcounts over the packed words
+
+Notes
+-----
+    1. Words are uint64 (packed bytes padded to a multiple of 8) so bitwise-AND operates on 64 cells at a time
+    2. np.nan values are treated as 0
+
+"""
+
+import numpy as np
+
+# - Number of Set Bits for each uint8 Value - #
+POPCOUNT_TABLE = np.array([bin(x).count('1') for x in range(256)], dtype=np.uint8)
+
+def pack_matrix(values, axis=1):
+    """
+    Pack a {0,1} Matrix into uint64 Words along an Axis
+
+    Parameters
+    ----------
+    values  :   np.array or pd.DataFrame
+                2D matrix of {0,1} values (np.nan treated as 0)
+    axis    :   int, optional(default=1)
+                Axis to pack along. axis=1 packs each row; axis=0 packs each column (result is indexed by column)
+
+    Returns
+    -------
+    packed (np.array(uint64) num_vectors x num_words), num_bits (length of the packed axis required to unpack)
+
+    """
+    values = np.asarray(values, dtype=np.float64)
+    bits = np.nan_to_num(values) != 0
+    if axis == 0:
+        bits = bits.T
+    num_bits = bits.shape[1]
+    packed = np.packbits(bits, axis=1)
+    padding = (-packed.shape[1]) % 8
+    if padding or packed.shape[1] == 0:
+        packed = np.hstack([packed, np.zeros((packed.shape[0], padding or 8), dtype=np.uint8)])
+    return np.ascontiguousarray(packed).view(np.uint64), num_bits
+
+def unpack_matrix(packed, num_bits, axis=1, dtype=np.float64):
+    """
+    Unpack uint64 Words (see pack_matrix) to a {0,1} Matrix of dtype
+    """
+    bits = np.unpackbits(np.ascontiguousarray(packed).view(np.uint8), axis=1)[:, :num_bits]
+    if axis == 0:
+        bits = bits.T
+    return bits.astype(dtype)
+
+def popcount(packed, axis=-1):
+    """
+    Count Set Bits of Packed Words summed over an Axis
+    """
+    packed = np.ascontiguousarray(packed)
+    counts = POPCOUNT_TABLE[packed.view(np.uint8)]
+    if axis == -1 or axis == packed.ndim - 1:
+        return counts.sum(axis=-1, dtype=np.int64)
+    # - Bytes are expanded along the last axis; collapse them before summing over another axis - #
+    counts = counts.reshape(packed.shape + (packed.dtype.itemsize,)).sum(axis=-1, dtype=np.int64)
+    return counts.sum(axis=axis)
+
+def coexport_counts_packed(packed, block_size=256):
+    """
+    Compute Pairwise Co-Occurrence Counts between all Packed Vectors
+
+    Parameters
+    ----------
+    packed      :   np.array(uint64)
+                    num_vectors x num_words (i.e. products x packed countries from pack_matrix(mcp, axis=0))
+    block_size  :   int, optional(default=256)
+                    Number of vectors to intersect at a time (bounds the temporary memory to block_size x num_vectors x num_words)
+
+    Returns
+    -------
+    counts (np.array(int64) num_vectors x num_vectors)
+
+    """
+    num_vectors = packed.shape[0]
+    counts = np.empty((num_vectors, num_vectors), dtype=np.int64)
+    for start in xrange(0, num_vectors, block_size):
+        block = packed[start:start+block_size]
+        counts[start:start+block.shape[0]] = popcount(block[:, np.newaxis, :] & packed[np.newaxis, :, :], axis=-1)
+    return counts
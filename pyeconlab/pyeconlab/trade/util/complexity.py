@@ -0,0 +1,97 @@
+"""
+Complexity Utilities
+====================
+
+Fitness-Complexity Algorithm (Tacchella et al. 2012)
+------------------------------------------------
+    F_c^(n) = sum_p M_cp Q_p^(n-1)                  F_c^(n) <- F_c^(n) / <F^(n)>
+    Q_p^(n) = 1 / sum_c M_cp / F_c^(n-1)            Q_p^(n) <- Q_p^(n) / <Q^(n)>
+
+Notes
+-----
+    1. Iterations are computed in log-space (log F, log Q) with a max-shift before exponentiating so that vanishing
+       fitness values (for non-nested matrices) do not overflow 1 / F
+    2. A panel of years is stacked into a single block-diagonal sparse matrix so each iteration is one sparse
+       matrix-vector product for all years. Each year stops updating once it has converged
+    3. Countries and Products with zero diversity / ubiquity are excluded and returned as np.nan
+
+"""
+
+import numpy as np
+from scipy import sparse
+
+def segment_logmeanexp(values, valid):
+    """
+    log(mean(exp(values))) over the valid entries of each row of a 2D array (computed with a max-shift)
+    """
+    shift = np.where(valid, values, -np.inf).max(axis=1)
+    shift[~np.isfinite(shift)] = 0.0
+    total = np.where(valid, np.exp(values - shift[:, np.newaxis]), 0.0).sum(axis=1)
+    count = valid.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.log(total / count) + shift
+
+def fitness_complexity_panel(mcp, tol=1e-8, max_iterations=1000, verbose=False):
+    """
+    Compute Fitness (Countries) and Complexity (Products) for a Panel of Mcp Matrices
+
+    Parameters
+    ----------
+    mcp             :   np.array
+                        t x c x p (or c x p) Mcp Matrices (np.nan treated as 0)
+    tol             :   float, optional(default=1e-8)
+                        Convergence Tolerance on the maximum absolute change in log(F) and log(Q)
+    max_iterations  :   int, optional(default=1000)
+                        Maximum number of iterations
+
+    Returns
+    -------
+    fitness (t x c), complexity (t x p), iterations (t), converged (t)
+    (Returned without the year axis if mcp is c x p)
+
+    """
+    mcp = np.nan_to_num(np.asarray(mcp, dtype=np.float64))
+    single = mcp.ndim == 2
+    if single:
+        mcp = mcp[np.newaxis]
+    num_years, num_countries, num_products = mcp.shape
+    M = sparse.block_diag([sparse.csr_matrix(mcp[t] != 0, dtype=np.float64) for t in xrange(num_years)], format='csr')
+    MT = M.T.tocsr()
+    valid_c = (mcp != 0).sum(axis=2) > 0
+    valid_p = (mcp != 0).sum(axis=1) > 0
+    log_f = np.zeros((num_years, num_countries))
+    log_q = np.zeros((num_years, num_products))
+    iterations = np.zeros(num_years, dtype=np.int64)
+    converged = np.zeros(num_years, dtype=bool)
+    for num in xrange(1, max_iterations + 1):
+        # - Fitness: F = M . Q - #
+        shift_q = np.where(valid_p, log_q, -np.inf).max(axis=1)
+        shift_q[~np.isfinite(shift_q)] = 0.0
+        exp_q = np.where(valid_p, np.exp(log_q - shift_q[:, np.newaxis]), 0.0)
+        with np.errstate(divide='ignore'):
+            new_f = np.log(M.dot(exp_q.ravel()).reshape(num_years, num_countries)) + shift_q[:, np.newaxis]
+        # - Complexity: Q = 1 / (M^T . 1/F) - #
+        shift_f = np.where(valid_c, -log_f, -np.inf).max(axis=1)
+        shift_f[~np.isfinite(shift_f)] = 0.0
+        exp_f = np.where(valid_c, np.exp(-log_f - shift_f[:, np.newaxis]), 0.0)
+        with np.errstate(divide='ignore'):
+            new_q = -(np.log(MT.dot(exp_f.ravel()).reshape(num_years, num_products)) + shift_f[:, np.newaxis])
+        # - Normalise by the Mean - #
+        new_f -= segment_logmeanexp(new_f, valid_c)[:, np.newaxis]
+        new_q -= segment_logmeanexp(new_q, valid_p)[:, np.newaxis]
+        # - Convergence (Years that have Converged are not Updated) - #
+        with np.errstate(invalid='ignore'):
+            change = np.maximum(np.where(valid_c, np.abs(new_f - log_f), 0.0).max(axis=1), np.where(valid_p, np.abs(new_q - log_q), 0.0).max(axis=1))
+        active = ~converged
+        log_f[active] = new_f[active]
+        log_q[active] = new_q[active]
+        iterations[active] = num
+        converged |= active & (change < tol)
+        if verbose: print "[FitnessComplexity] Iteration: %s; Max Change: %s; Converged Years: %s of %s" % (num, np.nanmax(change[active]), converged.sum(), num_years)
+        if converged.all():
+            break
+    fitness = np.where(valid_c, np.exp(log_f), np.nan)
+    complexity = np.where(valid_p, np.exp(log_q), np.nan)
+    if single:
+        return fitness[0], complexity[0], iterations[0], converged[0]
+    return fitness, complexity, iterations, converged
@@ -6,6 +6,8 @@ import pandas as pd
 import copy
 import numpy as np
 
+from .dynamics import mcp_to_boolean_panel, rolling_persistence
+
 def compute_persistence(mcp, dict_cp, persistence_length=1, name="Var", output="summary", verbose=False):
     ''' Compute Persistence in the Data ... Ensure Product Persists in n-folowing years
         Status: Validated (May Consider different Versions to improve speed)
@@ -39,6 +41,53 @@ def compute_persistence(mcp, dict_cp, persistence_length=1, name="Var", output="
             persistent_data[year] = persistent_data[year].sum(axis=1)
     return persistent_data
 
+def compute_persistence_panel(mcp, dict_cp, persistence_length=1, name="Var", output="summary", packbits=False, verbose=False):
+    ''' Compute Persistence in the Data using a Rolling Logical-AND over a Boolean Mcp Panel
+        Status: Validated against compute_persistence
+        Return:     persistent_data (same structure as compute_persistence)
+        Options:    persistence_length  Defines how many years to look forward (default=1 year)
+                    name                IF dataframe has no name it will be assigned Var and returned VarPersistent
+                    output              'summary' -> returns sum (across products) Country Level Data 
+                                        'panel'   -> returns (np.array, years, countries, products) with NaN years stored as False
+                                        else returns Country x Product Level
+                    packbits            Bit-Pack the 'panel' output along the product axis
+        Notes:      dict_cp and mcp are assumed to be on a global panel (countries x products) as produced by dynamic_global_panel()
+    '''
+    years = sorted(dict_cp.keys())
+    start_year = years[0]
+    final_year = start_year+len(years)-1
+    try:
+        data_name = dict_cp[start_year].name
+    except:
+        data_name = name
+    countries = dict_cp[start_year].index
+    products = dict_cp[start_year].columns
+    panel, mcp_years, countries, products = mcp_to_boolean_panel(mcp, index=countries, columns=products)
+    persists, valid = rolling_persistence(panel, persistence_length)
+    if verbose: print "Persistence Length: %s; Valid Years: %s" % (persistence_length, [y for y,v in zip(mcp_years, valid) if v])
+    persistent_data = dict()
+    for year in years:
+        if (year+persistence_length) > final_year:
+            persistent_data[year] = pd.DataFrame(np.nan, index=countries, columns=products)
+        else:
+            position = year - mcp_years[0]
+            if position < 0 or not valid[position]:
+                raise ValueError("mcp does not contain the years required for persistence of %s" % year)
+            data = dict_cp[year]
+            if not (data.index.equals(countries) and data.columns.equals(products)):
+                data = data.reindex(index=countries, columns=products)
+            persistent_data[year] = pd.DataFrame(data.values * persists[position], index=countries, columns=products)
+        persistent_data[year].name = data_name + 'Persistent'
+    if output.lower() == "panel":
+        values = np.array([persistent_data[year].fillna(0).values != 0 for year in years])
+        if packbits:
+            values = np.packbits(values, axis=-1)
+        return values, years, countries, products
+    if output.lower() == "summary":
+        for year in years:
+            persistent_data[year] = persistent_data[year].sum(axis=1)
+    return persistent_data
+
 def reindex_dynamic_dataframe(df, year_pairs='years', verbose=False):
     ''' Converts a dynamicaly referenced Dataframe (i.e. '1962-1963') to a dataframe with index to_year and from_year
     '''
@@ -4,8 +4,17 @@ Useful Trade Dynamics Utilities
 
 A collection of functions useful for computing dynamic elements in trade analysis
 
+Panel Methods
+-------------
+The *_panel functions stack a Dict(Mcp) into a single boolean array (years x countries x products) so that 
+every year transition is computed in one shifted-array operation rather than per-transition pandas arithmetic.
+Results can be bit-packed along the product axis (np.packbits) and converted back to the Dict('YYYY-YYYY') outputs
+
 """
 
+import numpy as np
+import pandas as pd
+
 
 def compute_product_changes(mcp):
     """
@@ -38,4 +47,167 @@ def compute_product_changes(mcp):
         Mcp_NewProducts[change_key].name = 'NewProducts'
         Mcp_DieProducts[change_key] = mcp[base_year] - Mcp_BothYears[change_key]
         Mcp_DieProducts[change_key].name = 'DieProducts'
-    return Mcp_BothYears, Mcp_NewProducts, Mcp_DieProducts
\ No newline at end of file
+    return Mcp_BothYears, Mcp_NewProducts, Mcp_DieProducts
+
+## -- Boolean Panel Methods -- ##
+
+def mcp_to_boolean_panel(mcp, index=None, columns=None):
+    """
+    Stack a Dict(Mcp) into a Boolean Panel
+
+    Parameters
+    ----------
+    mcp     :   dict(pd.DataFrame)
+                Dictionary of Country x Product Mcp Matrices indexed by year
+    index   :   pd.Index, optional(default=None)
+                Countries to align each year to (default: index of the first year)
+    columns :   pd.Index, optional(default=None)
+                Products to align each year to (default: columns of the first year)
+
+    Returns
+    -------
+    panel (np.array(bool) years x countries x products), years, countries, products
+
+    Notes
+    -----
+        1. Years must be consecutive (as for compute_product_changes). Missing country-product pairs are treated as False
+    
+    """
+    years = sorted(mcp.keys())
+    if len(years) > 1 and np.any(np.diff(years) != 1):
+        raise ValueError("Years must be consecutive to compute year transitions: %s" % years)
+    if index is None:
+        index = mcp[years[0]].index
+    if columns is None:
+        columns = mcp[years[0]].columns
+    panel = np.empty((len(years), len(index), len(columns)), dtype=bool)
+    for i, year in enumerate(years):
+        data = mcp[year]
+        if not (data.index.equals(index) and data.columns.equals(columns)):
+            data = data.reindex(index=index, columns=columns)
+        panel[i] = data.fillna(0).values != 0
+    return panel, years, index, columns
+
+def pack_boolean_panel(panel):
+    """
+    Bit-Pack a Boolean Panel along the Product (last) Axis
+    
+    Returns
+    -------
+    packed (np.array(uint8)), num_products (required to unpack)
+    
+    """
+    return np.packbits(panel, axis=-1), panel.shape[-1]
+
+def unpack_boolean_panel(packed, num_products):
+    """
+    Unpack a Bit-Packed Panel (see pack_boolean_panel) to a Boolean Panel
+    """
+    return np.unpackbits(packed, axis=-1)[..., :num_products].astype(bool)
+
+def product_changes_panel(panel, packbits=False):
+    """
+    Compute Product Changes for all Year Transitions
+
+    Parameters
+    ----------
+    panel    :  np.array(bool)
+                Boolean Panel (years x countries x products) (see mcp_to_boolean_panel)
+    packbits :  bool, optional(default=False)
+                Return results bit-packed along the product axis
+    
+    Returns
+    -------
+    BothYears, NewProducts, DieProducts (each (years-1) x countries x products, where entry t is the transition t -> t+1)
+    
+    """
+    base = panel[:-1]
+    following = panel[1:]
+    both = base & following
+    new = following & ~base
+    die = base & ~following
+    if packbits:
+        return np.packbits(both, axis=-1), np.packbits(new, axis=-1), np.packbits(die, axis=-1)
+    return both, new, die
+
+def rolling_persistence(panel, persistence_length=1):
+    """
+    Rolling Logical-AND along the Year Axis
+
+    Parameters
+    ----------
+    panel               :   np.array(bool)
+                            Boolean Panel (years x countries x products)
+    persistence_length  :   int, optional(default=1)
+                            Number of following years the product must be held
+
+    Returns
+    -------
+    persists (np.array(bool)), valid (np.array(bool) by year)
+    persists[t] is True where the product is held in all years t+1, ..., t+persistence_length
+    valid[t] is False where there are fewer than persistence_length following years (persists[t] is then False)
+
+    """
+    num_years = panel.shape[0]
+    persistence_length = int(persistence_length)
+    if persistence_length < 1:
+        raise ValueError("persistence_length must be >= 1")
+    persists = np.zeros(panel.shape, dtype=bool)
+    valid = np.arange(num_years) + persistence_length < num_years
+    num_valid = valid.sum()
+    if num_valid > 0:
+        # - Window Count of Years Held: cs[t+L+1] - cs[t+1] - #
+        cs = np.zeros((num_years + 1,) + panel.shape[1:], dtype=np.int32)
+        np.cumsum(panel, axis=0, out=cs[1:])
+        persists[:num_valid] = (cs[persistence_length+1:] - cs[1:num_valid+1]) == persistence_length
+    return persists, valid
+
+def boolean_panel_to_dynamic_dict(changes, years, countries, products, name, num_products=None, dtype=np.float64):
+    """
+    Convert a Transition Panel (see product_changes_panel) to a Dict(DataFrame) keyed by 'YYYY-YYYY'
+
+    Parameters
+    ----------
+    changes      : np.array(bool or packed uint8)
+                   (years-1) x countries x products
+    years        : list
+                   Years of the underlying panel
+    name         : str
+                   DataFrame .name attribute
+    num_products : int, optional(default=None)
+                   If provided, changes is treated as bit-packed and unpacked to num_products
+    dtype        : np.dtype, optional(default=np.float64)
+                   Value type of the returned DataFrames (Mcp matrices are float when filled)
+
+    """
+    if num_products is not None:
+        changes = unpack_boolean_panel(changes, num_products)
+    data = dict()
+    for i, base_year in enumerate(years[:-1]):
+        change_key = str(base_year) + '-' + str(years[i+1])
+        data[change_key] = pd.DataFrame(changes[i].astype(dtype), index=countries, columns=products)
+        data[change_key].name = name
+    return data
+
+def compute_product_changes_panel(mcp, dtype=np.float64):
+    """
+    Compute Product Changes Year to Year using a Boolean Panel
+
+    Returns the same outputs as compute_product_changes in a single shifted-array operation over all transitions
+
+    Parameters
+    ----------
+    mcp :   dict(pd.DataFrame)
+            Dictionary of Country x Product Mcp Matrices indexed by year
+        
+    Returns
+    -------
+    Dict(Products in Both Years), Dict(New Products), and Dict(Dieing Products)
+    
+    """
+    panel, years, countries, products = mcp_to_boolean_panel(mcp)
+    both, new, die = product_changes_panel(panel)
+    Mcp_BothYears = boolean_panel_to_dynamic_dict(both, years, countries, products, name='ProductsBothYears', dtype=dtype)
+    Mcp_NewProducts = boolean_panel_to_dynamic_dict(new, years, countries, products, name='NewProducts', dtype=dtype)
+    Mcp_DieProducts = boolean_panel_to_dynamic_dict(die, years, countries, products, name='DieProducts', dtype=dtype)
+    return Mcp_BothYears, Mcp_NewProducts, Mcp_DieProducts
@@ -0,0 +1,215 @@
+"""
+Sparse Graph Utilities
+======================
+
+Network structures stored as scipy.sparse adjacency matrices with node labels. Graphs are built in bulk from arrays
+and exported to networkx only when requested (to_networkx())
+
+Network Types
+-------------
+    'bipartitegraph'    :   countries x productcodes (edge weight = export)
+    'multidigraph'      :   countries x productcodes exported as country -> WLD edges keyed by productcode
+    'productspace'      :   productcodes x productcodes (symmetric, edge weight = proximity)
+
+"""
+
+import copy
+import numpy as np
+import pandas as pd
+import networkx as nx
+from scipy import sparse
+from scipy.sparse import csgraph
+
+from .proximity import SparseProximity, MemmapProximity
+
+class SparseGraph(object):
+    """
+    Sparse Adjacency Matrix with Row and Column Node Labels
+
+    Attributes
+    ----------
+    adjacency   :   scipy.sparse.csr_matrix
+                    row_labels x col_labels (explicit zeros are kept as edges)
+    row_labels  :   pd.Index
+    col_labels  :   pd.Index
+    ntype       :   str
+                    'bipartitegraph', 'multidigraph' or 'productspace'
+    weight      :   str
+                    Edge attribute name used by to_networkx()
+
+    """
+
+    def __init__(self, adjacency, row_labels, col_labels, ntype='bipartitegraph', weight='export', name='', notes=''):
+        self.adjacency = adjacency.tocsr()
+        self.row_labels = row_labels
+        self.col_labels = col_labels
+        self.ntype = ntype
+        self.weight = weight
+        self.name = name
+        self.notes = notes
+
+    def __repr__(self):
+        return "SparseGraph [%s] (%s x %s) with %s edges [%s]" % (self.ntype, self.adjacency.shape[0], self.adjacency.shape[1], self.number_of_edges(), self.notes)
+
+    def number_of_nodes(self):
+        if self.ntype == 'productspace':
+            return len(self.row_labels)
+        return len(self.row_labels) + len(self.col_labels)
+
+    def number_of_edges(self):
+        if self.ntype == 'productspace':
+            return len(self.edges()[0])
+        return self.adjacency.nnz
+
+    def edges(self):
+        """
+        Edges as (row_labels, col_labels, weights) arrays (productspace edges are listed once from the upper triangle)
+        """
+        adjacency = self.adjacency
+        if self.ntype == 'productspace':
+            adjacency = sparse.triu(adjacency)
+        adjacency = adjacency.tocoo()
+        return np.asarray(self.row_labels)[adjacency.row], np.asarray(self.col_labels)[adjacency.col], adjacency.data
+
+    def degree(self, axis=1):
+        """ Number of Edges of each Row (axis=1) or Column (axis=0) Node """
+        counts = np.diff(self.adjacency.indptr) if axis == 1 else np.bincount(self.adjacency.indices, minlength=self.adjacency.shape[1])
+        labels = self.row_labels if axis == 1 else self.col_labels
+        return pd.Series(counts, index=copy.deepcopy(labels), name='degree')
+
+    def connected_components(self):
+        """
+        Connected Components (scipy.sparse.csgraph)
+
+        Returns
+        -------
+        num_components, pd.Series(component) indexed by node label (row nodes followed by column nodes for bipartite graphs)
+        """
+        if self.ntype == 'productspace':
+            num_components, components = csgraph.connected_components(self.adjacency, directed=False)
+            return num_components, pd.Series(components, index=copy.deepcopy(self.row_labels), name='component')
+        adjacency = self.adjacency.astype(bool).astype(np.int8)
+        square = sparse.bmat([[None, adjacency], [adjacency.T, None]], format='csr')
+        num_components, components = csgraph.connected_components(square, directed=False)
+        labels = pd.Index(list(self.row_labels) + list(self.col_labels))
+        return num_components, pd.Series(components, index=labels, name='component')
+
+    def to_networkx(self, row_nodes=None, col_nodes=None, world_node='WLD', edge_factory=None):
+        """
+        Export to a networkx Graph (bipartitegraph, productspace) or MultiDiGraph (multidigraph)
+
+        Parameters
+        ----------
+        row_nodes       :   dict, optional(default=None)
+                            Mapping of row label to node object (i.e. Country() objects)
+        col_nodes       :   dict, optional(default=None)
+                            Mapping of column label to node object (i.e. Product() objects)
+        world_node      :   optional(default='WLD')
+                            Target node for multidigraph edges
+        edge_factory    :   function, optional(default=None)
+                            edge_factory(col_label, value) returns the edge attribute value (i.e. Product() edge objects)
+
+        """
+        sources, targets, values = self.edges()
+        if self.ntype == 'multidigraph':
+            network = nx.MultiDiGraph()
+            row_nodes = row_nodes if row_nodes is not None else dict((label, label) for label in self.row_labels)
+            network.add_nodes_from(row_nodes[label] for label in self.row_labels)
+            network.add_node(world_node)
+            if edge_factory is None:
+                network.add_edges_from((row_nodes[source], world_node, target, {self.weight : value}) for source, target, value in zip(sources, targets, values))
+            else:
+                network.add_edges_from((row_nodes[source], world_node, target, {self.weight : edge_factory(target, value)}) for source, target, value in zip(sources, targets, values))
+            return network
+        network = nx.Graph()
+        if self.ntype == 'productspace':
+            network.add_nodes_from(self.row_labels)
+            network.add_weighted_edges_from(zip(sources, targets, values), weight=self.weight)
+            return network
+        row_nodes = row_nodes if row_nodes is not None else dict((label, label) for label in self.row_labels)
+        col_nodes = col_nodes if col_nodes is not None else dict((label, label) for label in self.col_labels)
+        network.add_nodes_from((row_nodes[label] for label in self.row_labels), bipartite='countries')
+        network.add_nodes_from((col_nodes[label] for label in self.col_labels), bipartite='productcodes')
+        network.add_edges_from((row_nodes[source], col_nodes[target], {self.weight : value}) for source, target, value in zip(sources, targets, values))
+        return network
+
+def sparse_graph_from_series(data, ntype='bipartitegraph', row_labels=None, col_labels=None, name=''):
+    """
+    Construct a SparseGraph from a (row, col) MultiIndex Series (i.e. self.data['export'])
+
+    Parameters
+    ----------
+    data        :   pd.Series
+                    Indexed by (country, productcode)
+    ntype       :   str, optional(default='bipartitegraph')
+    row_labels  :   list, optional(default=None)
+                    Row nodes (default: unique level 0 values). Labels not in data are included as isolated nodes
+    col_labels  :   list, optional(default=None)
+                    Column nodes (default: unique level 1 values)
+
+    """
+    rows = data.index.get_level_values(0)
+    cols = data.index.get_level_values(1)
+    row_labels = pd.Index(row_labels if row_labels is not None else rows.unique())
+    col_labels = pd.Index(col_labels if col_labels is not None else cols.unique())
+    row_codes = row_labels.get_indexer(rows)
+    col_codes = col_labels.get_indexer(cols)
+    if (row_codes == -1).any() or (col_codes == -1).any():
+        raise ValueError("data contains nodes that are not in row_labels or col_labels")
+    adjacency = sparse.coo_matrix((data.values.astype(np.float64), (row_codes, col_codes)), shape=(len(row_labels), len(col_labels)))
+    return SparseGraph(adjacency, row_labels, col_labels, ntype=ntype, weight=data.name if data.name is not None else 'export', name=name)
+
+def proximity_values_and_labels(proximity):
+    """
+    Return (values, products) for a pd.DataFrame, SparseProximity or MemmapProximity (Sparse values are returned as scipy.sparse)
+    """
+    if isinstance(proximity, SparseProximity):
+        return proximity.matrix, proximity.products
+    if isinstance(proximity, MemmapProximity):
+        return proximity.matrix, proximity.products
+    return proximity.values, proximity.index
+
+def product_space_backbone(proximity, threshold=0.55, name='ProductSpace'):
+    """
+    Product Space Backbone: Maximum Spanning Tree plus all links with proximity >= threshold (Hidalgo et al. 2007)
+
+    Parameters
+    ----------
+    proximity   :   pd.DataFrame, SparseProximity or MemmapProximity
+                    Symmetric Proximity Matrix
+    threshold   :   float, optional(default=0.55)
+                    Links with proximity >= threshold are added to the spanning tree (None for the tree only)
+
+    Returns
+    -------
+    SparseGraph (ntype='productspace', weight='proximity')
+
+    Notes
+    -----
+        1. The maximum spanning tree is computed with scipy.sparse.csgraph.minimum_spanning_tree on (max + 1 - proximity)
+           so that only the ordering of links is used
+        2. Self links and np.nan / zero proximities are not links. Unconnected components give a spanning forest
+
+    """
+    values, products = proximity_values_and_labels(proximity)
+    weights = sparse.triu(sparse.csr_matrix(np.nan_to_num(np.asarray(values)) if not sparse.issparse(values) else values), k=1).tocsr()
+    weights.data = np.nan_to_num(weights.data)
+    weights.eliminate_zeros()
+    if weights.nnz == 0:
+        return SparseGraph(sparse.csr_matrix((len(products), len(products))), products, products, ntype='productspace', weight='proximity', name=name)
+    # - Maximum Spanning Tree - #
+    inverted = weights.copy()
+    inverted.data = weights.data.max() + 1.0 - weights.data
+    tree = csgraph.minimum_spanning_tree(inverted).tocoo()
+    tree_rows, tree_cols = np.minimum(tree.row, tree.col), np.maximum(tree.row, tree.col)
+    backbone = sparse.coo_matrix((np.ones(len(tree_rows)), (tree_rows, tree_cols)), shape=weights.shape).tocsr()
+    # - Threshold Links - #
+    if threshold is not None:
+        strong = weights.copy()
+        strong.data = (strong.data >= threshold).astype(np.float64)
+        strong.eliminate_zeros()
+        backbone = backbone + strong
+    backbone.data = np.ones(len(backbone.data))
+    backbone = backbone.multiply(weights).tocsr()
+    backbone = backbone + backbone.T
+    return SparseGraph(backbone, products, products, ntype='productspace', weight='proximity', name=name, notes="MST + Threshold: %s" % threshold)
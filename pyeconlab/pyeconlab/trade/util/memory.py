@@ -0,0 +1,337 @@
+"""
+Memory Budget Utilities
+=======================
+
+Keep a dictionary of large objects (i.e. DynamicProductLevelExportSystem.ples {year : ProductLevelExportSystem})
+within a memory budget by spilling the least recently used entries to disk
+
+Spilling
+--------
+An entry is spilled by pickling the array-like attributes in its __dict__ (DataFrames, Series, np.arrays,
+scipy.sparse matrices and dictionaries of these) to a file in spill_dir and deleting them from the object. The object
+itself stays in the store so references to it remain valid. Accessing the entry through the store (store[key])
+restores the attributes into the same object
+
+Notes
+-----
+    1. Sizes are shallow estimates (DataFrame.memory_usage(deep=False), np.array.nbytes). Python objects held in object
+       columns and networkx graphs are not counted
+    2. The most recently accessed entry is never spilled so an entry is complete while it is being worked on even if it
+       is larger than the budget on its own
+    3. An attribute of a spilled entry raises an AttributeError if it is read through a reference held from before the
+       spill. Access entries through the store (store[key]) or a view (store.view(keys)) to reload them, or pin the
+       entries (with pinned(store, keys): ...) while references to them are held
+    4. Pickling a store reloads all entries. The unpickled store keeps the budget and a spill_dir given by the user
+       (a temporary spill_dir is replaced by a new one)
+    5. items() and values() are lazy. Each entry is reloaded when it is reached so only one spilled entry is brought
+       back at a time
+    6. Spill files are removed (and a temporary spill_dir deleted) by close() or when the store is garbage collected
+
+"""
+
+import os
+import re
+import shutil
+import tempfile
+import contextlib
+import collections
+import cPickle as pickle
+
+import numpy as np
+import pandas as pd
+
+NBYTES_UNITS = {'B' : 1, 'KB' : 1024, 'MB' : 1024**2, 'GB' : 1024**3, 'TB' : 1024**4}
+
+def parse_nbytes(value):
+    """
+    Parse a Memory Size
+
+    Parameters
+    ----------
+    value   :   int or str
+                Number of bytes or a string with units (i.e. '512MB', '8 GB')
+
+    """
+    if isinstance(value, (int, long, float, np.integer, np.floating)):
+        return int(value)
+    match = re.match(r"^\s*([0-9.]+)\s*([KMGT]?B)\s*$", str(value).upper())
+    if match is None:
+        raise ValueError("Cannot parse memory size: %s [Examples: 1073741824, '512MB', '8GB']" % value)
+    return int(float(match.group(1)) * NBYTES_UNITS[match.group(2)])
+
+def value_nbytes(value):
+    """ Shallow Size of an Array-Like Value in Bytes (0 for other objects) """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True))
+    if isinstance(value, pd.Index):
+        return int(value.nbytes)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if hasattr(value, 'indptr') and hasattr(value, 'data'):                 #-scipy.sparse csr/csc-#
+        return int(value.data.nbytes + value.indices.nbytes + value.indptr.nbytes)
+    if isinstance(value, dict):
+        return sum(value_nbytes(item) for item in value.values())
+    return 0
+
+def spillable_attributes(obj):
+    """ Attributes of obj that hold Array-Like Data (name : nbytes) """
+    return dict((name, nbytes) for name, nbytes in ((name, value_nbytes(value)) for name, value in obj.__dict__.items()) if nbytes > 0)
+
+def object_nbytes(obj):
+    """ Shallow Size of the Array-Like Attributes of obj in Bytes """
+    return sum(spillable_attributes(obj).values())
+
+
+class SpillStore(dict):
+    """
+    Dictionary that Keeps its Entries within a Memory Budget by Spilling Least Recently Used Entries to Disk
+
+    Parameters
+    ----------
+    memory_budget   :   int or str
+                        Memory budget in bytes or a string with units (i.e. '8GB')
+    spill_dir       :   str, optional(default=None)
+                        Directory for spill files [Default: a temporary directory that is removed by close()]
+    verbose         :   bool, optional(default=False)
+
+    Notes
+    -----
+        1. counters records the number of spills and reloads and the bytes moved in each direction
+        2. The budget is enforced on each access and assignment through the store
+        3. Pinned entries (pin()) are never spilled. The budget can be exceeded while entries are pinned
+
+    """
+
+    def __init__(self, memory_budget, spill_dir=None, verbose=False):
+        dict.__init__(self)
+        self.memory_budget = parse_nbytes(memory_budget)
+        self._remove_spill_dir = spill_dir is None
+        if spill_dir is None:
+            spill_dir = tempfile.mkdtemp(prefix='pyeconlab-spill-')
+        elif not os.path.isdir(spill_dir):
+            os.makedirs(spill_dir)
+        self.spill_dir = spill_dir
+        self.verbose = verbose
+        self.spilled = dict()                               #-key : spill file-#
+        self.counters = {'spills' : 0, 'reloads' : 0, 'spilled_bytes' : 0, 'reloaded_bytes' : 0}
+        self._lru = collections.OrderedDict()               #-Least Recently Used First-#
+        self.pinned = set()
+
+    def __repr__(self):
+        return "SpillStore (%s entries, %s spilled, budget %s bytes) at %s" % (len(self), len(self.spilled), self.memory_budget, self.spill_dir)
+
+    def __reduce__(self):
+        return (restore_spill_store, (self.memory_budget, self.user_spill_dir, self.verbose, self.to_dict()))
+
+    @property
+    def user_spill_dir(self):
+        """ spill_dir if it was given by the user (None for a temporary spill_dir) """
+        return None if self._remove_spill_dir else self.spill_dir
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:                                   #-Interpreter shutdown or a partially constructed store-#
+            pass
+
+    ## -- Dictionary Interface -- ##
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if key in self.spilled:
+            self.reload(key)
+        self.touch(key)
+        self.enforce_budget()
+        return value
+
+    def __setitem__(self, key, value):
+        if key in self.spilled:
+            os.remove(self.spilled.pop(key))
+        dict.__setitem__(self, key, value)
+        self.touch(key)
+        self.enforce_budget()
+
+    def __delitem__(self, key):
+        if key in self.spilled:
+            os.remove(self.spilled.pop(key))
+        self._lru.pop(key, None)
+        self.pinned.discard(key)
+        dict.__delitem__(self, key)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def itervalues(self):
+        for key in self.keys():
+            yield self[key]
+
+    def iteritems(self):
+        for key in self.keys():
+            yield key, self[key]
+
+    def values(self):
+        """ Lazy Values (each entry is reloaded when it is reached) """
+        return self.itervalues()
+
+    def items(self):
+        """ Lazy (key, value) Pairs (each entry is reloaded when it is reached) """
+        return self.iteritems()
+
+    def view(self, keys):
+        """ Dictionary View of keys that Reloads Entries through the Store on Access """
+        return SpillStoreView(self, keys)
+
+    def to_dict(self):
+        """ Reload all Entries (ignoring the budget) and return a Plain Dictionary """
+        for key in self.spilled.keys():
+            self.reload(key)
+        return dict(dict.items(self))
+
+    ## -- Memory Management -- ##
+
+    def touch(self, key):
+        """ Mark key as the Most Recently Used Entry """
+        self._lru.pop(key, None)
+        self._lru[key] = None
+
+    def pin(self, keys):
+        """ Reload keys and Keep them in Memory until unpin() """
+        for key in keys:
+            self.pinned.add(key)
+            self[key]
+
+    def unpin(self, keys):
+        """ Release Pinned keys and Enforce the Budget """
+        self.pinned.difference_update(keys)
+        self.enforce_budget()
+
+    @property
+    def resident_nbytes(self):
+        """ Shallow Size of the Entries Held in Memory """
+        return sum(object_nbytes(dict.__getitem__(self, key)) for key in self._lru if key not in self.spilled)
+
+    def enforce_budget(self):
+        """ Spill Least Recently Used Entries until the Resident Entries fit in the Budget (the most recent and pinned entries are kept) """
+        resident = [key for key in self._lru if key not in self.spilled]
+        sizes = dict((key, object_nbytes(dict.__getitem__(self, key))) for key in resident)
+        total = sum(sizes.values())
+        for key in resident[:-1]:
+            if total <= self.memory_budget:
+                break
+            if sizes[key] == 0 or key in self.pinned:
+                continue
+            self.spill(key)
+            total -= sizes[key]
+
+    def spill(self, key):
+        """ Pickle the Array-Like Attributes of an Entry to spill_dir and Delete them from the Entry """
+        obj = dict.__getitem__(self, key)
+        attributes = spillable_attributes(obj)
+        fd, fn = tempfile.mkstemp(prefix="%s-" % re.sub(r"[^\w.-]", "_", str(key)), suffix='.pickle', dir=self.spill_dir)     #-Unique if stores share a spill_dir-#
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(dict((name, obj.__dict__[name]) for name in attributes), f, protocol=pickle.HIGHEST_PROTOCOL)
+        for name in attributes:
+            del obj.__dict__[name]
+        self.spilled[key] = fn
+        self.counters['spills'] += 1
+        self.counters['spilled_bytes'] += sum(attributes.values())
+        if self.verbose: print "[INFO] Spilled %s (%s bytes) to %s" % (key, sum(attributes.values()), fn)
+
+    def reload(self, key):
+        """ Restore the Spilled Attributes of an Entry """
+        fn = self.spilled.pop(key)
+        with open(fn, 'rb') as f:
+            attributes = pickle.load(f)
+        os.remove(fn)
+        obj = dict.__getitem__(self, key)
+        obj.__dict__.update(attributes)
+        self.counters['reloads'] += 1
+        self.counters['reloaded_bytes'] += sum(value_nbytes(value) for value in attributes.values())
+        if self.verbose: print "[INFO] Reloaded %s from %s" % (key, fn)
+
+    def close(self):
+        """ Remove the Spill Files (and the spill_dir if it was created by the store). Call to_dict() first to keep spilled entries """
+        for key in self.spilled.keys():
+            os.remove(self.spilled.pop(key))
+        if self._remove_spill_dir:
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+
+def restore_spill_store(memory_budget, spill_dir, verbose, entries):
+    """ Rebuild a Pickled SpillStore (see SpillStore.__reduce__) """
+    store = SpillStore(memory_budget, spill_dir=spill_dir, verbose=verbose)
+    for key in sorted(entries.keys()):
+        store[key] = entries[key]
+    return store
+
+
+class SpillStoreView(dict):
+    """
+    Dictionary View of Selected Entries of a SpillStore
+
+    Entries are read through the store so a spilled entry is reloaded on access (i.e. store.view(years)[year].mcp)
+
+    Parameters
+    ----------
+    store   :   SpillStore
+    keys    :   list
+                Keys of the view (a KeyError is raised for keys that are not in store)
+
+    """
+
+    def __init__(self, store, keys):
+        dict.__init__(self, ((key, dict.__getitem__(store, key)) for key in keys))
+        self.store = store
+
+    def __getitem__(self, key):
+        if not dict.__contains__(self, key):
+            raise KeyError(key)
+        return self.store[key]
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def itervalues(self):
+        for key in self.keys():
+            yield self[key]
+
+    def iteritems(self):
+        for key in self.keys():
+            yield key, self[key]
+
+    def values(self):
+        return self.itervalues()
+
+    def items(self):
+        return self.iteritems()
+
+    def __reduce__(self):
+        return (dict, (dict((key, self[key]) for key in self.keys()),))
+
+
+@contextlib.contextmanager
+def pinned(data, keys):
+    """
+    Pin keys of a SpillStore for the Duration of a with Block (no-op for a plain dictionary)
+
+    Usage
+    -----
+        with pinned(self.ples, years):
+            ples_list = [self.ples[year] for year in years]
+
+    """
+    if not isinstance(data, SpillStore):
+        yield data
+        return
+    keys = [key for key in keys if key not in data.pinned]         #-Nested pins release only their own keys-#
+    data.pin(keys)
+    try:
+        yield data
+    finally:
+        data.unpin(keys)
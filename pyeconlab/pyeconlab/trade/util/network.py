@@ -3,6 +3,7 @@ import networkx as nx
 import numpy as np
 
 from .dynamics import compute_product_changes
+from .proximity import SparseProximity
 
 def compute_average_centrality(mcp, proximity, normalized=True, sum_not_mean=False):
     """
@@ -135,20 +136,22 @@ def construct_network_from_adjacency_df(data):
 
     Parameters
     ----------
-    data    :   pd.DataFrame(CP and PP Matrix)
+    data    :   pd.DataFrame(CP and PP Matrix) or SparseProximity
                 Adjacency Matrix (i.e. cp or pp matrix) as a Pandas DataFrame
+                SparseProximity edges are added in bulk from the stored links only
     
     """   
+    if isinstance(data, SparseProximity):
+        links = data.matrix.tocoo()
+        products = np.asarray(data.products)
+        network = nx.Graph()
+        network.add_nodes_from(products)
+        network.add_weighted_edges_from(zip(products[links.row], products[links.col], links.data))
+        return network
     if type(data) == type(pd.DataFrame()):
-        data_name = data.name
-        data = pd.DataFrame(data.unstack())             
-        data.columns = pd.Index([data_name])
-        data = data.reset_index()                   #Move Index to Data Level to Parse as a Weighted Edge List
+        # - Edges are added in bulk in the order of data.unstack() (later duplicates of an undirected pair overwrite earlier weights) - #
+        sources = np.tile(np.asarray(data.index), len(data.columns))
+        targets = np.repeat(np.asarray(data.columns), len(data.index))
         network = nx.Graph()
-        for row in data.iterrows():
-            index, row_data = row
-            source = row_data['productcode1']
-            target = row_data['productcode2']
-            edge_weight = row_data[data_name]
-            network.add_edge(source, target, weight=edge_weight)
-    return network
\ No newline at end of file
+        network.add_weighted_edges_from(zip(sources, targets, data.values.T.ravel()))
+    return network
@@ -0,0 +1,268 @@
+"""
+Null Model Utilities
+====================
+
+Significance testing of Proximity and Product Emergence against randomized Mcp matrices
+
+Randomization
+-------------
+Curveball algorithm (Strona et al. 2014). Each trade picks two countries, pools the products exported by only one
+of them and redistributes the pool at random. Country diversity and product ubiquity are preserved exactly
+
+Statistics
+----------
+Each draw is reduced to running sums of (null - observed), (null - observed)^2 and the number of draws >= observed
+so memory does not grow with the number of draws. Results are:
+    zscore  = (observed - mean) / std
+    pvalue  = (1 + #{null >= observed}) / (1 + num_draws)                  [one-sided empirical p-value]
+
+Notes
+-----
+    1. Every draw has its own np.random.RandomState seeded from a master seed and draws are split into tasks of a
+       fixed size that are combined in order, so results are reproducible and do not depend on the number of processes
+    2. Tasks run on a local multiprocessing.Pool (processes=1 runs serially)
+
+"""
+
+import numpy as np
+import multiprocessing
+
+from .proximity import proximity_block
+
+## -- Randomization -- ##
+
+def curveball_randomize(mcp_values, num_trades=None, rng=None):
+    """
+    Randomize a {0,1} Matrix preserving Row and Column Sums (Curveball Algorithm)
+
+    Parameters
+    ----------
+    mcp_values  :   np.array
+                    Country x Product Matrix (np.nan treated as 0)
+    num_trades  :   int, optional(default=None)
+                    Number of pairwise trades (default: 5 x number of countries)
+    rng         :   np.random.RandomState, optional(default=None)
+
+    """
+    if rng is None:
+        rng = np.random.RandomState()
+    bits = np.nan_to_num(np.asarray(mcp_values, dtype=np.float64)) != 0
+    rows = [np.flatnonzero(row) for row in bits]
+    num_rows = len(rows)
+    if num_trades is None:
+        num_trades = 5 * num_rows
+    for a, b in rng.randint(0, num_rows, size=(num_trades, 2)):
+        if a == b:
+            continue
+        shared = np.intersect1d(rows[a], rows[b], assume_unique=True)
+        only_a = np.setdiff1d(rows[a], shared, assume_unique=True)
+        only_b = np.setdiff1d(rows[b], shared, assume_unique=True)
+        if len(only_a) == 0 or len(only_b) == 0:
+            continue
+        pool = np.concatenate([only_a, only_b])
+        rng.shuffle(pool)
+        rows[a] = np.concatenate([shared, pool[:len(only_a)]])
+        rows[b] = np.concatenate([shared, pool[len(only_a):]])
+    randomized = np.zeros(bits.shape, dtype=np.float64)
+    for idx, row in enumerate(rows):
+        randomized[idx, row] = 1.0
+    return randomized
+
+## -- Statistics -- ##
+
+def proximity_values(mcp_values, matrix_type='symmetric'):
+    """
+    Dense Proximity Matrix of a {0,1} Matrix (see trade.util.proximity.proximity_block)
+    """
+    mcp_values = np.nan_to_num(np.asarray(mcp_values, dtype=np.float64))
+    ubiquity = mcp_values.sum(axis=0)
+    return proximity_block(mcp_values, ubiquity, 0, len(ubiquity), matrix_type=matrix_type)
+
+def nonzero_cutoff(proximities, statistic='median'):
+    """
+    Mean or Median of the nonzero (non np.nan) values across a list of Proximity arrays
+    """
+    values = np.concatenate([np.asarray(proximity).ravel() for proximity in proximities])
+    values = values[np.isfinite(values) & (values != 0.0)]
+    if statistic == 'median':
+        return np.median(values)
+    elif statistic == 'mean':
+        return np.mean(values)
+    raise ValueError("statistic must be 'mean' or 'median'")
+
+def probable_emergence(base_mcp, new_products, proximity, prox_cutoff):
+    """
+    Classify New Products as Probable or Improbable (vectorized compute_probable_improbable_emergence())
+
+    Parameters
+    ----------
+    base_mcp        :   np.array
+                        Country x Product Mcp in the Base Year
+    new_products    :   np.array
+                        Country x Product {0,1} New Products in the Next Year
+    proximity       :   np.array
+                        Product x Product Proximity
+    prox_cutoff     :   float
+
+    Returns
+    -------
+    probable (c x p bool), improbable (c x p bool)
+
+    Notes
+    -----
+        1. A new product is probable if ANY base year product has proximity > prox_cutoff (np.nan counts as probable)
+        2. Countries without base year products have no classified new products
+
+    """
+    base_mcp = np.nan_to_num(np.asarray(base_mcp, dtype=np.float64))
+    new_products = np.nan_to_num(np.asarray(new_products, dtype=np.float64)) == 1.0
+    with np.errstate(invalid='ignore'):
+        close = (~(proximity <= prox_cutoff)).astype(np.float64)
+    probable = new_products & (np.dot(base_mcp, close.T) > 0)
+    improbable = new_products & ~probable & (base_mcp.sum(axis=1) > 0)[:, np.newaxis]
+    return probable, improbable
+
+## -- Null Model Workers -- ##
+
+def proximity_draws(payload, seeds):
+    """
+    Null Proximity for each seed. payload = (mcp_values, matrix_type, num_trades)
+    """
+    mcp_values, matrix_type, num_trades = payload
+    for seed in seeds:
+        yield proximity_values(curveball_randomize(mcp_values, num_trades=num_trades, rng=np.random.RandomState(seed)), matrix_type=matrix_type)
+
+def emergence_draws(payload, seeds):
+    """
+    Null Number of Probable New Products per Country for each seed
+    payload = (base_mcp, next_mcp, new_products, prox_cutoff, style, matrix_type, num_trades)
+
+    Notes
+    -----
+        1. Observed base year baskets and new products are kept. Only the Mcp matrices used to compute proximity are randomized
+    """
+    base_mcp, next_mcp, new_products, prox_cutoff, style, matrix_type, num_trades = payload
+    for seed in seeds:
+        rng = np.random.RandomState(seed)
+        if style == 'base':
+            proximity = proximity_values(curveball_randomize(base_mcp, num_trades=num_trades, rng=rng), matrix_type=matrix_type)
+        elif style == 'next':
+            proximity = proximity_values(curveball_randomize(next_mcp, num_trades=num_trades, rng=rng), matrix_type=matrix_type)
+        else:
+            proximity = (proximity_values(curveball_randomize(base_mcp, num_trades=num_trades, rng=rng), matrix_type=matrix_type) +
+                         proximity_values(curveball_randomize(next_mcp, num_trades=num_trades, rng=rng), matrix_type=matrix_type)) / 2.0
+        probable, improbable = probable_emergence(base_mcp, new_products, proximity, prox_cutoff)
+        yield probable.sum(axis=1).astype(np.float64)
+
+NULL_MODEL_WORKERS = {
+    'proximity' : proximity_draws,
+    'emergence' : emergence_draws,
+}
+
+def null_model_task(task):
+    """
+    Accumulate (sum of deviations, sum of squared deviations, number of draws >= observed) over a set of seeds
+    task = (job_id, worker, payload, observed, seeds)
+
+    Notes
+    -----
+        1. Deviations are taken from the observed value (np.nan -> 0) to avoid cancellation when computing the variance
+    """
+    job_id, worker, payload, observed, seeds = task
+    shift = np.nan_to_num(observed)
+    total = np.zeros(observed.shape)
+    total_sq = np.zeros(observed.shape)
+    exceed = np.zeros(observed.shape)
+    for values in NULL_MODEL_WORKERS[worker](payload, seeds):
+        deviation = values - shift
+        total += deviation
+        total_sq += deviation ** 2
+        with np.errstate(invalid='ignore'):
+            exceed += values >= observed
+    return job_id, total, total_sq, exceed
+
+def run_null_models(jobs, num_draws=100, seed=None, processes=None, draws_per_task=10, verbose=False):
+    """
+    Run a list of Null Models on a shared Process Pool
+
+    Parameters
+    ----------
+    jobs                :   list
+                            List of (worker, payload, observed) where worker is a key of NULL_MODEL_WORKERS
+    num_draws           :   int, optional(default=100)
+                            Number of randomized draws for each job
+    seed                :   int, optional(default=None)
+                            Master seed. Job j, draw d uses the seed at [j, d] of RandomState(seed).randint(...)
+    processes           :   int, optional(default=None)
+                            Number of processes (default: multiprocessing.cpu_count(); 1 runs serially)
+    draws_per_task      :   int, optional(default=10)
+                            Number of draws computed by each task
+
+    Returns
+    -------
+    list of dict('mean', 'std', 'zscore', 'pvalue') in the order of jobs
+
+    """
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    seeds = np.random.RandomState(seed).randint(0, 2**31 - 1, size=(len(jobs), num_draws))
+    tasks = list()
+    for job_id, (worker, payload, observed) in enumerate(jobs):
+        observed = np.asarray(observed, dtype=np.float64)
+        for start in xrange(0, num_draws, draws_per_task):
+            tasks.append((job_id, worker, payload, observed, seeds[job_id, start:start+draws_per_task]))
+    if verbose: print "[INFO] Running %s jobs x %s draws as %s tasks on %s processes" % (len(jobs), num_draws, len(tasks), processes)
+    if processes == 1:
+        partials = map(null_model_task, tasks)
+    else:
+        pool = multiprocessing.Pool(processes)
+        try:
+            partials = pool.map(null_model_task, tasks)
+        finally:
+            pool.close()
+            pool.join()
+    # - Combine Partial Sums - #
+    results = list()
+    for job_id, (worker, payload, observed) in enumerate(jobs):
+        observed = np.asarray(observed, dtype=np.float64)
+        total, total_sq, exceed = np.zeros(observed.shape), np.zeros(observed.shape), np.zeros(observed.shape)
+        for partial_id, partial_total, partial_total_sq, partial_exceed in partials:
+            if partial_id == job_id:
+                total += partial_total
+                total_sq += partial_total_sq
+                exceed += partial_exceed
+        deviation = total / num_draws
+        std = np.sqrt(np.maximum(total_sq / num_draws - deviation ** 2, 0.0))
+        mean = np.nan_to_num(observed) + deviation
+        with np.errstate(divide='ignore', invalid='ignore'):
+            zscore = -deviation / std
+        zscore[np.isnan(observed)] = np.nan
+        pvalue = (1.0 + exceed) / (1.0 + num_draws)
+        pvalue[np.isnan(observed)] = np.nan
+        results.append({'mean' : mean, 'std' : std, 'zscore' : zscore, 'pvalue' : pvalue})
+    return results
+
+def proximity_null_model(mcp, num_draws=100, matrix_type='symmetric', seed=None, processes=None, num_trades=None, verbose=False):
+    """
+    Proximity z-scores and p-values against Curveball randomized Mcp
+
+    Parameters
+    ----------
+    mcp         :   np.array
+                    Country x Product {0,1} Matrix
+    num_draws   :   int, optional(default=100)
+    matrix_type :   str, optional(default='symmetric')
+    seed        :   int, optional(default=None)
+    processes   :   int, optional(default=None)
+    num_trades  :   int, optional(default=None)
+                    Curveball trades per draw (default: 5 x number of countries)
+
+    Returns
+    -------
+    observed proximity, dict('mean', 'std', 'zscore', 'pvalue')
+
+    """
+    mcp = np.nan_to_num(np.asarray(mcp, dtype=np.float64))
+    observed = proximity_values(mcp, matrix_type=matrix_type)
+    results = run_null_models([('proximity', (mcp, matrix_type, num_trades), observed)], num_draws=num_draws, seed=seed, processes=processes, verbose=verbose)
+    return observed, results[0]
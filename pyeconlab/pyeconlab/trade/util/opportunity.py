@@ -0,0 +1,73 @@
+"""
+Product Space Opportunity Metrics
+=================================
+
+Density, Distance, Complexity Outlook and Opportunity Gain computed as matrix products of Mcp and Proximity
+
+Definitions (Hausmann et al. Atlas of Economic Complexity)
+-----------
+    density             w_cp    = sum_p' M_cp' phi_p'p / sum_p' phi_p'p
+    distance            d_cp    = 1 - w_cp
+    complexity outlook  COI_c   = sum_p (1 - d_cp) (1 - M_cp) PCI_p
+    opportunity gain    COG_cp  = sum_p' (phi_pp' / sum_p'' phi_p''p') (1 - M_cp') PCI_p' - (1 - d_cp) PCI_p
+
+Notes
+-----
+    1. All functions accept a single year (c x p, p x p, p) or a stack of years (t x c x p, t x p x p, t x p)
+    2. np.nan values in Mcp and Proximity are treated as 0
+
+"""
+
+import numpy as np
+
+def compute_density(mcp, proximity):
+    """
+    Compute Density (w_cp) for all Country-Product pairs
+
+    Parameters
+    ----------
+    mcp         :   np.array
+                    c x p (or t x c x p) Mcp Matrix
+    proximity   :   np.array
+                    p x p (or t x p x p) Proximity Matrix
+
+    """
+    mcp = np.nan_to_num(np.asarray(mcp, dtype=np.float64))
+    proximity = np.nan_to_num(np.asarray(proximity, dtype=np.float64))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.matmul(mcp, proximity) / proximity.sum(axis=-2)[..., np.newaxis, :]
+
+def compute_opportunity_metrics(mcp, proximity, pci):
+    """
+    Compute Density, Distance, Complexity Outlook and Opportunity Gain in a Single Pass
+
+    Parameters
+    ----------
+    mcp         :   np.array
+                    c x p (or t x c x p) Mcp Matrix
+    proximity   :   np.array
+                    p x p (or t x p x p) Proximity Matrix
+    pci         :   np.array
+                    p (or t x p) Product Complexity Index
+
+    Returns
+    -------
+    dict('density', 'distance', 'complexity_outlook', 'opportunity_gain')
+    complexity_outlook is c (or t x c); all other metrics are c x p (or t x c x p)
+
+    """
+    mcp = np.nan_to_num(np.asarray(mcp, dtype=np.float64))
+    proximity = np.nan_to_num(np.asarray(proximity, dtype=np.float64))
+    pci = np.nan_to_num(np.asarray(pci, dtype=np.float64))[..., np.newaxis, :]
+    column_sum = proximity.sum(axis=-2)[..., np.newaxis, :]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        density = np.matmul(mcp, proximity) / column_sum
+        opportunity = (1.0 - mcp) * pci / column_sum                        #(1 - M_cp') PCI_p' / sum_p'' phi_p''p'
+    opportunity[~np.isfinite(opportunity)] = 0.0
+    not_exported = 1.0 - mcp
+    metrics = dict()
+    metrics['density'] = density
+    metrics['distance'] = 1.0 - density
+    metrics['complexity_outlook'] = np.nansum(density * not_exported * pci, axis=-1)
+    metrics['opportunity_gain'] = np.matmul(opportunity, np.swapaxes(proximity, -1, -2)) - density * pci
+    return metrics
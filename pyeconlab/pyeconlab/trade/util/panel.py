@@ -0,0 +1,148 @@
+"""
+Country x Year Panel Assembly
+=============================
+
+Collect (country, year) keyed metrics and covariates and assemble them into a single pd.DataFrame
+
+Method
+------
+Items are held as key arrays and value arrays. The output index is computed once (the union of the keys of items added
+with how='outer', sorted) and each column is placed with a single get_indexer and direct assignment into a preallocated
+array. The cost is linear in the number of columns rather than a chain of join/merge calls that copies the growing frame
+
+Usage
+-----
+    panel = CountryYearPanel()
+    panel.add(AvgCentrality, how='outer')                                   #{year : pd.Series(country)} or (country, year) indexed
+    panel.add(wdi.series_long(['NY.GDP.MKTP.CD', 'SP.POP.TOTL']))           #how='left' aligns to the panel index
+    df = panel.to_frame()
+
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def panel_item(data, name=None):
+    """
+    Keys and Values of a (Country, Year) Keyed Item
+
+    Parameters
+    ----------
+    data    :   dict, pd.Series or pd.DataFrame
+                {year : pd.Series(index=country)} (i.e. output of DynamicProductLevelExportSystem methods) or a pd.Series / pd.DataFrame
+                with a (country, year) MultiIndex (the first two levels are used)
+    name    :   str, optional(default=None)
+                Column name for a dict or pd.Series [Default: the Series name]
+
+    Returns
+    -------
+    countries, years, [(column, values)]
+
+    """
+    if isinstance(data, dict):
+        years = sorted(data.keys())
+        if len(years) == 0:
+            return np.array([], dtype=object), np.array([], dtype=np.int64), [(name, np.array([]))]
+        if name is None:
+            name = data[years[0]].name
+        countries = np.concatenate([np.asarray(data[year].index, dtype=object) for year in years])
+        values = np.concatenate([np.asarray(data[year].values) for year in years])
+        years = np.repeat(years, [len(data[year]) for year in years])
+        return countries, years, [(name, values)]
+    if not isinstance(data.index, pd.MultiIndex):
+        raise ValueError("data must be indexed by (country, year) [Index: %s]" % data.index.names)
+    countries = np.asarray(data.index.get_level_values(0), dtype=object)
+    years = np.asarray(data.index.get_level_values(1))
+    if isinstance(data, pd.Series):
+        return countries, years, [(name if name is not None else data.name, data.values)]
+    return countries, years, [(column, data[column].values) for column in data.columns]
+
+
+class CountryYearPanel(object):
+    """
+    Assemble a (Country, Year) pd.DataFrame from Metrics and Covariates
+
+    Parameters
+    ----------
+    names   :   list, optional(default=['country', 'year'])
+                Index names of the output
+
+    Notes
+    -----
+        1. Items added with how='outer' define the index (the union of their keys). Items added with how='left' are aligned
+           to it and keys not in the index are ignored. If no item is 'outer' the union of all items is used
+        2. Years are compared as integers so dict keys, int and str years align
+        3. Column names must be unique across items
+
+    """
+
+    def __init__(self, names=['country', 'year']):
+        self.names = names
+        self._items = list()
+        self._columns = list()
+
+    def __repr__(self):
+        return "CountryYearPanel (%s items, %s columns)" % (len(self._items), len(self._columns))
+
+    @property
+    def columns(self):
+        return list(self._columns)
+
+    def add(self, data, name=None, how='left'):
+        """
+        Add a Metric or Covariate
+
+        Parameters
+        ----------
+        data    :   dict, pd.Series or pd.DataFrame
+                    See panel_item()
+        name    :   str, optional(default=None)
+                    Column name for a dict or pd.Series
+        how     :   str, optional(default='left')
+                    'outer' adds the keys to the panel index, 'left' aligns to the panel index
+
+        """
+        if how not in ['outer', 'left']:
+            raise ValueError("how must be 'outer' or 'left'")
+        countries, years, values = panel_item(data, name=name)
+        years = np.asarray(years).astype(np.int64)
+        for column, _ in values:
+            if column in self._columns:
+                raise ValueError("Column %s has already been added to the panel" % column)
+        keys = pd.MultiIndex.from_arrays([countries, years])
+        if not keys.is_unique:
+            raise ValueError("Item with columns %s has duplicate (country, year) keys" % [column for column, _ in values])
+        self._items.append((keys, values, how))
+        self._columns.extend(column for column, _ in values)
+        return self
+
+    @property
+    def index(self):
+        """ Panel Index (Sorted Union of the Keys of 'outer' Items) """
+        items = [keys for keys, values, how in self._items if how == 'outer']
+        if len(items) == 0:
+            items = [keys for keys, values, how in self._items]
+        countries = np.concatenate([np.asarray(keys.get_level_values(0), dtype=object) for keys in items])
+        years = np.concatenate([np.asarray(keys.get_level_values(1)) for keys in items])
+        index = pd.MultiIndex.from_arrays([countries, years], names=self.names).drop_duplicates()
+        return index.sortlevel()[0]
+
+    def to_frame(self):
+        """ Assemble the Panel into a pd.DataFrame indexed by (country, year) """
+        if len(self._items) == 0:
+            raise ValueError("No items have been added to the panel")
+        index = self.index
+        data = dict()
+        for keys, values, how in self._items:
+            loc = index.get_indexer(keys)
+            found = loc >= 0
+            for column, array in values:
+                if array.dtype.kind in 'biuf':
+                    column_data = np.empty(len(index), dtype=np.float64)
+                else:
+                    column_data = np.empty(len(index), dtype=object)
+                column_data.fill(np.nan)
+                column_data[loc[found]] = array[found]
+                data[column] = column_data
+        return pd.DataFrame(data, index=index, columns=self._columns)
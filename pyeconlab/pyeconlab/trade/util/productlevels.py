@@ -0,0 +1,182 @@
+"""
+Hierarchical Product Code Aggregation
+=====================================
+
+Aggregate trade flows to every coarser level of a hierarchical product classification in one pass
+(SITC L4 -> L3 -> L2 -> L1 or HS6 -> HS4 -> HS2)
+
+Method
+------
+The data is sorted once by (keys, productcode) using integer codes. As product codes are hierarchical, truncating the
+sorted product codes keeps the rows sorted so each coarser level is a reduction (np.add.reduceat) over contiguous runs
+of the previous level's output. The cost of every additional level is proportional to the number of rows in the level
+below it rather than the size of the original data
+
+Notes
+-----
+    1. Missing values are skipped in sums (as pandas). A group with only missing values is np.nan
+    2. Rows with a missing key are dropped (as pandas groupby)
+    3. Rows of each level are sorted by the keys and then the product code
+
+"""
+
+import numpy as np
+import pandas as pd
+
+NON_AGGREGABLE = ['quantity', 'unit', 'dot']
+
+def reduce_runs(values, starts):
+    """ Sum Contiguous Runs of values beginning at starts (np.nan only if all values in a run are missing) """
+    present = ~np.isnan(values)
+    sums = np.add.reduceat(np.where(present, values, 0.0), starts, axis=0)
+    counts = np.add.reduceat(present.astype(np.int64), starts, axis=0)
+    sums[counts == 0] = np.nan
+    return sums
+
+def run_starts(key_codes):
+    """ Positions where any of the (sorted) integer key arrays changes """
+    size = len(key_codes[0])
+    if size == 0:
+        return np.array([], dtype=np.int64)
+    change = np.zeros(size, dtype=bool)
+    change[0] = True
+    for codes in key_codes:
+        change[1:] |= codes[1:] != codes[:-1]
+    return np.flatnonzero(change)
+
+
+class ProductCodeCube(object):
+    """
+    Trade Flows Aggregated to Several Levels of a Product Classification (see productcode_cube())
+
+    Usage
+    -----
+        cube = productcode_cube(data, productcode='sitc4')
+        cube[3]                     pd.DataFrame aggregated to 'sitc3'
+        cube.stack()                All levels in a long pd.DataFrame with a 'level' column
+
+    Notes
+    -----
+        1. Levels are held as integer codes and DataFrames are built (and cached) when a level is sliced
+
+    """
+
+    def __init__(self, columns, productcode, name, key_uniques, levels):
+        self.columns = columns
+        self.productcode = productcode
+        self.name = name
+        self._key_uniques = key_uniques
+        self._levels = levels
+        self._frames = dict()
+
+    def __repr__(self):
+        return "ProductCodeCube (levels: %s) on %s" % (self.levels, self.columns)
+
+    def __contains__(self, level):
+        return level in self._levels
+
+    def __getitem__(self, level):
+        return self.level(level)
+
+    @property
+    def levels(self):
+        return sorted(self._levels.keys(), reverse=True)
+
+    def level(self, level):
+        """ Aggregated pd.DataFrame for a level with the product code column named name % level (i.e. 'sitc3') """
+        if level not in self._levels:
+            raise ValueError("Level %s is not in the cube [Levels: %s]" % (level, self.levels))
+        if level not in self._frames:
+            key_codes, product_codes, product_uniques, values = self._levels[level]
+            data = dict()
+            for column in self.columns:
+                if column == self.productcode:
+                    data[self.name % level] = product_uniques.take(product_codes)
+                elif column in key_codes:
+                    data[column] = self._key_uniques[column].take(key_codes[column])
+                else:
+                    data[column] = values[column]
+            columns = [self.name % level if column == self.productcode else column for column in self.columns]
+            self._frames[level] = pd.DataFrame(data, columns=columns)
+        return self._frames[level]
+
+    def stack(self, productcode='productcode'):
+        """ All Levels in a Long pd.DataFrame (product codes in a single column) with a 'level' column """
+        frames = list()
+        for level in self.levels:
+            data = self.level(level).rename(columns={self.name % level : productcode})
+            data.insert(0, 'level', level)
+            frames.append(data)
+        return pd.concat(frames, ignore_index=True)
+
+
+def productcode_cube(data, productcode='sitc4', levels=None, keys=None, values=['value'], name=None):
+    """
+    Aggregate Data to Coarser Levels of a Hierarchical Product Classification
+
+    Parameters
+    ----------
+    data        :   pd.DataFrame
+                    Long data with a product code column (i.e. ['year', 'eiso3c', 'iiso3c', 'sitc4', 'value'])
+    productcode :   str, optional(default='sitc4')
+                    Product code column at the finest level
+    levels      :   list, optional(default=None)
+                    Coarser levels to compute (number of leading characters) [Default: all levels below the code length]
+    keys        :   list, optional(default=None)
+                    Columns to aggregate over in the output column order [Default: all columns except values, productcode
+                    and non-aggregable columns ('quantity', 'unit', 'dot') with productcode in its original position]
+    values      :   list, optional(default=['value'])
+                    Columns to sum
+    name        :   str, optional(default=None)
+                    Format of the product code column for each level [Default: productcode with the level as a suffix (i.e. 'sitc%s')]
+
+    Returns
+    -------
+    ProductCodeCube with the finest level (duplicates summed) and each of levels
+
+    """
+    if keys is None:
+        keys = [column for column in data.columns if column not in values + NON_AGGREGABLE]
+    if productcode not in keys:
+        keys = list(keys) + [productcode]
+    columns = list(keys) + list(values)
+    others = [column for column in keys if column != productcode]
+    if name is None:
+        name = productcode.rstrip('0123456789') + '%s'
+    #-Integer Codes-#
+    key_codes, key_uniques = dict(), dict()
+    valid = np.ones(len(data), dtype=bool)
+    for column in others:
+        key_codes[column], key_uniques[column] = pd.factorize(data[column], sort=True)
+        valid &= key_codes[column] >= 0
+    product_codes, product_uniques = pd.factorize(data[productcode], sort=True)
+    valid &= product_codes >= 0
+    product_uniques = np.asarray(product_uniques, dtype=object)
+    full_level = max(len(code) for code in product_uniques) if len(product_uniques) else 0
+    if levels is None:
+        levels = range(full_level-1, 0, -1)
+    levels = sorted(set(levels), reverse=True)
+    if len(levels) and levels[0] >= full_level:
+        raise ValueError("Levels must be coarser than the product codes (length %s)" % full_level)
+    #-Sort Once by (keys, productcode)-#
+    order = np.lexsort([product_codes[valid]] + [key_codes[column][valid] for column in reversed(others)])
+    order = np.flatnonzero(valid)[order]
+    key_codes = dict((column, codes[order]) for column, codes in key_codes.items())
+    product_codes = product_codes[order]
+    value_arrays = dict((column, np.asarray(data[column].values, dtype=np.float64)[order]) for column in values)
+    #-Finest Level (Sum Duplicates)-#
+    cube = dict()
+    starts = run_starts([key_codes[column] for column in others] + [product_codes])
+    current = (dict((column, codes[starts]) for column, codes in key_codes.items()), product_codes[starts], product_uniques, \
+                    dict((column, reduce_runs(array, starts)) for column, array in value_arrays.items()))
+    cube[full_level] = current
+    #-Coarser Levels from the Previous Level-#
+    for level in levels:
+        key_codes, product_codes, product_uniques, value_arrays = current
+        truncated_codes, truncated_uniques = pd.factorize(np.array([code[0:level] for code in product_uniques], dtype=object), sort=True)
+        product_codes = truncated_codes.take(product_codes)                                            #Sorted Order is Preserved
+        starts = run_starts([key_codes[column] for column in others] + [product_codes])
+        current = (dict((column, codes[starts]) for column, codes in key_codes.items()), product_codes[starts], np.asarray(truncated_uniques, dtype=object), \
+                        dict((column, reduce_runs(array, starts)) for column, array in value_arrays.items()))
+        cube[level] = current
+    return ProductCodeCube(columns, productcode, name, dict((column, np.asarray(uniques)) for column, uniques in key_uniques.items()), cube)
@@ -0,0 +1,513 @@
+"""
+Proximity Matrix Utilities
+==========================
+
+Block-wise construction of Proximity Matrices from Mcp that never holds the full (products x products) dense matrix in memory
+
+SparseProximity
+---------------
+Stores only the strongest links (top-k per product and/or values >= threshold) as a scipy.sparse CSR matrix.
+Statistics of the FULL matrix that are used downstream (column mean and sum, nonzero mean and median) are computed
+exactly during the build, so consumers such as compute_average_centrality() and the emergence prox_cutoff
+do not depend on which links were stored
+
+MemmapProximity
+---------------
+Computes the full matrix in (tile x tile) blocks and writes it to a memory-mapped .npy file with a .labels.json sidecar 
+(labels, matrix_type and column statistics). The matrix is loaded lazily (np.load(mmap_mode='r')) so peak memory is 
+bounded by the tile size rather than products^2
+
+Country Proximity
+-----------------
+country_proximity_matrix() computes the (countries x countries) analogues from Mcp rows for one year or a stack of years
+
+Notes
+-----
+    1. Proximity values are ratios of integer counts so the number of unique values is small. The exact distribution
+       of nonzero values is kept as (values, counts) which allows exact medians across several years
+
+"""
+
+import os
+import copy
+import json
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+## -- Block Computation -- ##
+
+def proximity_block(mcp_values, ubiquity, start, stop, matrix_type='symmetric', col_start=0, col_stop=None):
+    """
+    Compute Rows [start, stop) and Columns [col_start, col_stop) of a Proximity Matrix
+
+    Parameters
+    ----------
+    mcp_values  :   np.array
+                    Country x Product {0,1} Matrix (no np.nan)
+    ubiquity    :   np.array
+                    Column sums of mcp_values
+    matrix_type :   str, optional(default='symmetric')
+                    'symmetric'     -> Coexport / max(u1, u2)
+                    'asymmetric'    -> Coexport / u2
+                    'minmax'        -> Coexport / max(u1, u2) below the diagonal and Coexport / min(u1, u2) on and above it
+    col_start   :   int, optional(default=0)
+    col_stop    :   int, optional(default=None)
+                    Column range of the tile (default: all columns)
+
+    Notes
+    -----
+        1. Products with zero ubiquity are np.nan (consistent with proximity_matrix_numba())
+
+    """
+    if col_stop is None:
+        col_stop = len(ubiquity)
+    coexport = np.dot(mcp_values[:, start:stop].T, mcp_values[:, col_start:col_stop])
+    u1 = ubiquity[start:stop, np.newaxis]
+    u2 = ubiquity[np.newaxis, col_start:col_stop]
+    if matrix_type == 'symmetric':
+        denominator = np.maximum(u1, u2)
+    elif matrix_type == 'asymmetric':
+        denominator = np.repeat(u2, stop - start, axis=0)
+    elif matrix_type == 'minmax':
+        rows = np.arange(start, stop)[:, np.newaxis]
+        cols = np.arange(col_start, col_stop)[np.newaxis, :]
+        denominator = np.where(cols < rows, np.maximum(u1, u2), np.minimum(u1, u2))
+    else:
+        raise ValueError("Proximity type must be either symmetric, asymmetric, or minmax")
+    with np.errstate(divide='ignore', invalid='ignore'):
+        block = coexport / denominator
+    block[ubiquity[start:stop] == 0, :] = np.nan
+    block[:, ubiquity[col_start:col_stop] == 0] = np.nan
+    return block
+
+def country_proximity_matrix(mcp, matrix_type='symmetric'):
+    """
+    Compute Country Proximity from Mcp as Matrix Products (c x p, or a t x c x p stack of years)
+
+    Parameters
+    ----------
+    mcp         :   np.array
+                    Country x Product {0,1} Matrix (np.nan treated as 0)
+    matrix_type :   str, optional(default='symmetric')
+                    'symmetric'     -> Coexport / max(d1, d2)
+                    'asymmetric'    -> Coexport / d2
+                    'minmax'        -> Coexport / max(d1, d2) below the diagonal and Coexport / min(d1, d2) on and above it
+                    'pearsons'      -> Pearson correlation of the Mcp rows (np.corrcoef)
+
+    Notes
+    -----
+        1. Entries with a zero denominator (zero diversity) are np.nan, as are undefined pearsons correlations
+
+    """
+    mcp = np.nan_to_num(np.asarray(mcp, dtype=np.float64))
+    single = mcp.ndim == 2
+    if single:
+        mcp = mcp[np.newaxis]
+    if matrix_type == 'pearsons':
+        with np.errstate(divide='ignore', invalid='ignore'):
+            proximity = np.array([np.corrcoef(values) for values in mcp])
+    else:
+        proximity = country_proximity_stack(mcp, matrix_type)
+    if single:
+        return proximity[0]
+    return proximity
+
+def country_proximity_stack(mcp, matrix_type='symmetric'):
+    """
+    Coexport based Country Proximity for a t x c x p stack (see country_proximity_matrix())
+    """
+    coexport = np.matmul(mcp, np.swapaxes(mcp, 1, 2))
+    diversity = mcp.sum(axis=2)
+    d1 = diversity[:, :, np.newaxis]
+    d2 = diversity[:, np.newaxis, :]
+    if matrix_type == 'symmetric':
+        denominator = np.maximum(d1, d2)
+    elif matrix_type == 'asymmetric':
+        denominator = np.repeat(d2, mcp.shape[1], axis=1)
+    elif matrix_type == 'minmax':
+        rows, cols = np.indices((mcp.shape[1], mcp.shape[1]))
+        denominator = np.where(cols < rows, np.maximum(d1, d2), np.minimum(d1, d2))
+    else:
+        raise ValueError("Proximity type must be either symmetric, asymmetric, minmax, or pearsons")
+    with np.errstate(divide='ignore', invalid='ignore'):
+        proximity = coexport / denominator
+    return proximity
+
+def combine_value_counts(value_counts):
+    """
+    Combine a list of (values, counts) into a single sorted (values, counts)
+    """
+    values = np.concatenate([v for v, c in value_counts]) if len(value_counts) > 0 else np.array([])
+    counts = np.concatenate([c for v, c in value_counts]) if len(value_counts) > 0 else np.array([], dtype=np.int64)
+    values, inverse = np.unique(values, return_inverse=True)
+    counts = np.bincount(inverse, weights=counts, minlength=len(values)).astype(np.int64)
+    return values, counts
+
+def value_counts_median(values, counts):
+    """
+    Exact Median of a Distribution given as sorted (values, counts) (Even Counts Average the Middle Values as in pandas)
+    """
+    total = counts.sum()
+    if total == 0:
+        return np.nan
+    cumulative = np.cumsum(counts)
+    lower = values[np.searchsorted(cumulative, (total - 1) // 2 + 1)]
+    upper = values[np.searchsorted(cumulative, total // 2 + 1)]
+    return (lower + upper) / 2.0
+
+def value_counts_mean(values, counts):
+    """
+    Exact Mean of a Distribution given as (values, counts)
+    """
+    total = counts.sum()
+    if total == 0:
+        return np.nan
+    return np.dot(values, counts) / float(total)
+
+
+## -- Sparse Proximity -- ##
+
+class SparseProximity(object):
+    """
+    Sparse (CSR) Proximity Matrix with Exact Statistics of the Full Matrix
+
+    Attributes
+    ----------
+    matrix          :   scipy.sparse.csr_matrix
+                        Stored Links (productcode1 x productcode2)
+    products        :   pd.Index
+                        Product Labels (Rows and Columns)
+    column_sum      :   np.array
+                        Exact column sums of the full matrix (np.nan excluded)
+    column_count    :   np.array
+                        Number of non np.nan entries in each column of the full matrix
+    value_counts    :   tuple(np.array, np.array)
+                        Exact distribution of nonzero (non np.nan) values of the full matrix
+
+    Notes
+    -----
+        1. mean(), sum() and len() match the pandas behaviour of a dense proximity DataFrame so it can be used
+           in compute_average_centrality() without modification
+        2. Links that are not stored are returned as 0.0 by get_value()
+
+    """
+
+    def __init__(self, matrix, products, column_sum, column_count, value_counts, name='Proximity', notes=''):
+        self.matrix = matrix.tocsr()
+        self.products = products
+        self.column_sum = column_sum
+        self.column_count = column_count
+        self.value_counts = value_counts
+        self.name = name
+        self.notes = notes
+        self._positions = None
+
+    def __repr__(self):
+        return "SparseProximity (%s x %s) with %s stored links [%s]" % (self.shape[0], self.shape[1], self.matrix.nnz, self.notes)
+
+    def __len__(self):
+        return len(self.products)
+
+    @property
+    def shape(self):
+        return self.matrix.shape
+
+    @property
+    def index(self):
+        return self.products
+
+    @property
+    def columns(self):
+        return self.products
+
+    def mean(self):
+        """ Exact Column Mean of the Full Matrix (as pd.DataFrame.mean()) """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return pd.Series(self.column_sum / self.column_count, index=copy.deepcopy(self.products))
+
+    def sum(self):
+        """ Exact Column Sum of the Full Matrix (as pd.DataFrame.sum()) """
+        return pd.Series(self.column_sum, index=copy.deepcopy(self.products))
+
+    def nonzero_mean(self):
+        return value_counts_mean(*self.value_counts)
+
+    def nonzero_median(self):
+        return value_counts_median(*self.value_counts)
+
+    def position(self, productcode):
+        if self._positions is None:
+            self._positions = pd.Series(np.arange(len(self.products)), index=self.products)
+        return self._positions[productcode]
+
+    def get_value(self, index, col):
+        """ Stored Proximity between index (productcode1) and col (productcode2) (0.0 if not stored) """
+        return self.matrix[self.position(index), self.position(col)]
+
+    def to_dataframe(self):
+        """ Dense pd.DataFrame of the Stored Links (for display) """
+        df = pd.DataFrame(self.matrix.toarray(), index=copy.deepcopy(self.products), columns=copy.deepcopy(self.products))
+        df.index.name = 'productcode1'
+        df.columns.name = 'productcode2'
+        df.name = self.name
+        return df
+
+def nonzero_value_counts(proximity):
+    """
+    Distribution of the Nonzero (non np.nan) Values of a pd.DataFrame, SparseProximity or MemmapProximity as sorted (values, counts)
+    """
+    if isinstance(proximity, pd.DataFrame):
+        values = proximity.values.ravel()
+        return np.unique(values[(values != 0.0) & ~np.isnan(values)], return_counts=True)
+    return proximity.value_counts
+
+def nonzero_statistic(proximities, statistic='median'):
+    """
+    Exact Mean or Median of the Nonzero Values over a list of proximity matrices (i.e. Base and Next Years)
+
+    Each proximity can be a pd.DataFrame, SparseProximity or MemmapProximity (a mix of types is supported)
+    """
+    values, counts = combine_value_counts([nonzero_value_counts(prox) for prox in proximities])
+    if str(statistic).lower() == 'median':
+        return value_counts_median(values, counts)
+    elif str(statistic).lower() == 'mean':
+        return value_counts_mean(values, counts)
+    else:
+        raise ValueError("statistic must be 'mean' or 'median'")
+
+def sparse_proximity_from_mcp(mcp, matrix_type='symmetric', top_k=None, threshold=None, block_size=512, verbose=False):
+    """
+    Compute a SparseProximity Matrix from an Mcp DataFrame in Row Blocks
+
+    Parameters
+    ----------
+    mcp         :   pd.DataFrame
+                    Country x Product Mcp Matrix
+    matrix_type :   str, optional(default='symmetric')
+                    'symmetric', 'asymmetric' or 'minmax' (see proximity_block())
+    top_k       :   int, optional(default=None)
+                    Keep the k largest links in each row (productcode1)
+    threshold   :   float, optional(default=None)
+                    Keep links with proximity >= threshold
+    block_size  :   int, optional(default=512)
+                    Number of rows computed at a time (peak memory is block_size x products)
+
+    Notes
+    -----
+        1. If both top_k and threshold are specified a link must satisfy both
+        2. Zero valued links are never stored
+
+    """
+    if top_k is None and threshold is None:
+        raise ValueError("Specify top_k and/or threshold to filter the proximity matrix")
+    products = mcp.columns
+    mcp_values = np.nan_to_num(mcp.values.astype(np.float64))
+    ubiquity = mcp_values.sum(axis=0)
+    num_products = len(products)
+    column_sum = np.zeros(num_products)
+    column_count = np.zeros(num_products, dtype=np.int64)
+    value_counts = []
+    rows, cols, data = [], [], []
+    for start in xrange(0, num_products, block_size):
+        stop = min(start + block_size, num_products)
+        if verbose: print "Computing Proximity Rows: %s to %s" % (start, stop)
+        block = proximity_block(mcp_values, ubiquity, start, stop, matrix_type)
+        valid = ~np.isnan(block)
+        block = np.where(valid, block, 0.0)
+        # - Exact Statistics of the Full Matrix - #
+        column_sum += block.sum(axis=0)
+        column_count += valid.sum(axis=0)
+        keep = block != 0.0
+        value_counts.append(np.unique(block[keep], return_counts=True))
+        # - Filter Links - #
+        if threshold is not None:
+            keep &= block >= threshold
+        if top_k is not None and top_k < num_products:
+            ranked = np.where(keep, block, -np.inf)
+            cutoff = np.partition(ranked, num_products - top_k, axis=1)[:, num_products - top_k]
+            keep &= ranked >= cutoff[:, np.newaxis]                     #Ties at the k-th value are kept
+        block_rows, block_cols = np.nonzero(keep)
+        rows.append(block_rows + start)
+        cols.append(block_cols)
+        data.append(block[block_rows, block_cols])
+    rows = np.concatenate(rows) if rows else np.array([], dtype=np.int64)
+    cols = np.concatenate(cols) if cols else np.array([], dtype=np.int64)
+    data = np.concatenate(data) if data else np.array([])
+    matrix = sparse.csr_matrix((data, (rows, cols)), shape=(num_products, num_products))
+    notes = matrix_type
+    if top_k is not None: notes += '; top_k=%s' % top_k
+    if threshold is not None: notes += '; threshold=%s' % threshold
+    return SparseProximity(matrix, copy.deepcopy(products), column_sum, column_count, combine_value_counts(value_counts), notes=notes)
+
+
+## -- Memory-Mapped Proximity -- ##
+
+def proximity_label_file(filename):
+    """ Label Sidecar Filename for a Memory-Mapped Proximity .npy File """
+    return os.path.splitext(filename)[0] + '.labels.json'
+
+class MemmapProximity(object):
+    """
+    Lazily Loaded Proximity Matrix stored in a Memory-Mapped .npy File (see tiled_proximity_to_memmap())
+
+    Parameters
+    ----------
+    filename    :   str
+                    .npy file (the label sidecar is found with proximity_label_file())
+    block_size  :   int, optional(default=512)
+                    Number of rows read at a time when streaming statistics
+
+    Notes
+    -----
+        1. mean(), sum() and len() match the pandas behaviour of a dense proximity DataFrame (used in compute_average_centrality())
+        2. value_counts (nonzero value distribution) is computed by streaming row blocks on first use
+        3. The matrix is read-only. Use to_dataframe() to load the full matrix into memory
+
+    """
+
+    def __init__(self, filename, block_size=512):
+        self.filename = filename
+        self.block_size = block_size
+        with open(proximity_label_file(filename), 'r') as fl:
+            labels = json.load(fl)
+        self.products = pd.Index(labels['labels'], name=labels['index_name'])
+        self.column_sum = np.array(labels['column_sum'])
+        self.column_count = np.array(labels['column_count'], dtype=np.int64)
+        self.name = labels['name']
+        self.notes = labels['notes']
+        self._matrix = None
+        self._value_counts = None
+        self._positions = None
+
+    def __repr__(self):
+        return "MemmapProximity (%s x %s) at %s [%s]" % (len(self.products), len(self.products), self.filename, self.notes)
+
+    def __len__(self):
+        return len(self.products)
+
+    @property
+    def matrix(self):
+        if self._matrix is None:
+            self._matrix = np.load(self.filename, mmap_mode='r')
+        return self._matrix
+
+    @property
+    def shape(self):
+        return (len(self.products), len(self.products))
+
+    @property
+    def index(self):
+        return self.products
+
+    @property
+    def columns(self):
+        return self.products
+
+    @property
+    def value_counts(self):
+        if self._value_counts is None:
+            value_counts = []
+            for start in xrange(0, len(self.products), self.block_size):
+                block = np.asarray(self.matrix[start:start+self.block_size])
+                value_counts.append(np.unique(block[(block != 0.0) & ~np.isnan(block)], return_counts=True))
+            self._value_counts = combine_value_counts(value_counts)
+        return self._value_counts
+
+    def mean(self):
+        """ Exact Column Mean of the Full Matrix (as pd.DataFrame.mean()) """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return pd.Series(self.column_sum / self.column_count, index=copy.deepcopy(self.products))
+
+    def sum(self):
+        """ Exact Column Sum of the Full Matrix (as pd.DataFrame.sum()) """
+        return pd.Series(self.column_sum, index=copy.deepcopy(self.products))
+
+    def nonzero_mean(self):
+        return value_counts_mean(*self.value_counts)
+
+    def nonzero_median(self):
+        return value_counts_median(*self.value_counts)
+
+    def position(self, productcode):
+        if self._positions is None:
+            self._positions = pd.Series(np.arange(len(self.products)), index=self.products)
+        return self._positions[productcode]
+
+    def get_value(self, index, col):
+        """ Proximity between index (productcode1) and col (productcode2) """
+        return self.matrix[self.position(index), self.position(col)]
+
+    def to_dataframe(self):
+        """ Load the Full Matrix as a pd.DataFrame """
+        df = pd.DataFrame(np.array(self.matrix), index=copy.deepcopy(self.products), columns=copy.deepcopy(self.products))
+        df.index.name = 'productcode1'
+        df.columns.name = 'productcode2'
+        df.name = self.name
+        return df
+
+def tiled_proximity_to_memmap(mcp, filename, matrix_type='symmetric', tile_size=512, fillna=False, verbose=False):
+    """
+    Compute a Proximity Matrix in (tile_size x tile_size) Blocks and Write it to a Memory-Mapped .npy File
+
+    Parameters
+    ----------
+    mcp         :   pd.DataFrame
+                    Country x Product Mcp Matrix
+    filename    :   str
+                    Output .npy file. Labels and column statistics are written to proximity_label_file(filename)
+    matrix_type :   str, optional(default='symmetric')
+                    'symmetric', 'asymmetric' or 'minmax' (see proximity_block())
+    tile_size   :   int, optional(default=512)
+                    Peak memory is tile_size x tile_size (plus the Mcp array)
+    fillna      :   bool, optional(default=False)
+                    Write 0.0 in place of np.nan (products with zero ubiquity)
+
+    Returns
+    -------
+    MemmapProximity
+
+    Notes
+    -----
+        1. Symmetric matrices only compute tiles on and above the diagonal and write the transpose below it
+
+    """
+    products = mcp.columns
+    mcp_values = np.nan_to_num(mcp.values.astype(np.float64))
+    ubiquity = mcp_values.sum(axis=0)
+    num_products = len(products)
+    column_sum = np.zeros(num_products)
+    column_count = np.zeros(num_products, dtype=np.int64)
+    output = np.lib.format.open_memmap(filename, mode='w+', dtype=np.float64, shape=(num_products, num_products))
+    for start in xrange(0, num_products, tile_size):
+        stop = min(start + tile_size, num_products)
+        if verbose: print "Computing Proximity Rows: %s to %s" % (start, stop)
+        col_starts = xrange(start, num_products, tile_size) if matrix_type == 'symmetric' else xrange(0, num_products, tile_size)
+        for col_start in col_starts:
+            col_stop = min(col_start + tile_size, num_products)
+            tile = proximity_block(mcp_values, ubiquity, start, stop, matrix_type, col_start=col_start, col_stop=col_stop)
+            valid = ~np.isnan(tile)
+            if fillna:
+                tile[~valid] = 0.0
+                valid[:] = True
+            output[start:stop, col_start:col_stop] = tile
+            column_sum[col_start:col_stop] += np.where(valid, tile, 0.0).sum(axis=0)
+            column_count[col_start:col_stop] += valid.sum(axis=0)
+            if matrix_type == 'symmetric' and col_start != start:
+                output[col_start:col_stop, start:stop] = tile.T
+                column_sum[start:stop] += np.where(valid, tile, 0.0).sum(axis=1)
+                column_count[start:stop] += valid.sum(axis=1)
+    output.flush()
+    del output
+    labels = {
+        'labels'        : [x.item() if hasattr(x, 'item') else x for x in products],
+        'index_name'    : products.name,
+        'name'          : 'Proximity',
+        'notes'         : matrix_type + '; tiled',
+        'column_sum'    : list(column_sum),
+        'column_count'  : [int(x) for x in column_count],
+    }
+    with open(proximity_label_file(filename), 'w') as fl:
+        json.dump(labels, fl)
+    return MemmapProximity(filename, block_size=tile_size)
@@ -2,8 +2,79 @@
 Sorting Utilities
 """
 
+import re
+import numpy as np
+import pandas as pd
 
-def sorted_dataframes(dataframes, row_sortby=None, row_ascending=True, column_sortby=None, colunn_ascending=True, verbose=False, remove_nan=False, strict_index=False, how='left'):
+## -- Ordering Engine -- ##
+
+def sort_positions(values, ascending=True):
+    """
+    Integer positions that sort values (stable argsort with np.nan placed last)
+
+    values can be numeric or labels (i.e. str region names). The order is computed on sorted factor codes
+    """
+    codes, uniques = pd.factorize(np.asarray(values), sort=True)
+    if not ascending:
+        codes = np.where(codes >= 0, len(uniques) - 1 - codes, codes)
+    keys = np.where(codes >= 0, codes, len(uniques))                                #-np.nan (code -1) is placed last-#
+    return np.argsort(keys, kind='mergesort')
+
+def sortby_positions(labels, sortby, ascending=True, how='left'):
+    """
+    Compute Sorted Labels and their Integer Positions in labels
+
+    Parameters
+    ----------
+    labels      :   pd.Index
+                    Labels of the axis to be sorted
+    sortby      :   pd.Series
+                    Labelled values to sort by
+    how         :   str, optional(default='left')
+                    'left'  -> keep labels (missing sortby values are placed last)
+                    'inner' -> keep labels that are in sortby
+                    'right' -> use sortby labels (labels not in the axis are returned as -1)
+                    'outer' -> union of labels and sortby labels (sortby labels not in the axis are returned as -1)
+
+    Returns
+    -------
+    sorted labels (pd.Index), positions (np.array, -1 for labels not in the axis), sorted sortby values
+
+    """
+    if how == 'left':
+        target = labels
+    elif how == 'inner':
+        target = labels[labels.isin(sortby.index)]
+    elif how == 'right':
+        target = sortby.index
+    elif how == 'outer':
+        target = labels.append(sortby.index[~sortby.index.isin(labels)])
+        target.name = labels.name
+    else:
+        raise ValueError("how must be 'left', 'inner', 'right' or 'outer'")
+    values = sortby.reindex(target).values
+    order = sort_positions(values, ascending=ascending)
+    target = target[order]
+    return target, labels.get_indexer(target), values[order]
+
+def take_positions(df, rows=None, columns=None, row_labels=None, column_labels=None):
+    """
+    Reorder a DataFrame by Integer Positions (-1 positions are filled with np.nan as with reindex())
+    """
+    values = df.values
+    rows = np.arange(values.shape[0]) if rows is None else np.asarray(rows)
+    columns = np.arange(values.shape[1]) if columns is None else np.asarray(columns)
+    if (rows == -1).any() or (columns == -1).any():
+        values = np.pad(values.astype(np.float64), ((0, 1), (0, 1)), mode='constant', constant_values=np.nan)
+    index = df.index.take(rows) if row_labels is None else row_labels
+    cols = df.columns.take(columns) if column_labels is None else column_labels
+    result = pd.DataFrame(values[np.ix_(rows, columns)], index=index, columns=cols)
+    result.index.names = df.index.names
+    result.columns.names = df.columns.names
+    return result
+
+
+def sorted_dataframes(dataframes, row_sortby=None, row_ascending=True, column_sortby=None, column_ascending=True, verbose=False, remove_nan=False, strict_index=False, how='left'):
     ''' Return Dictionary of sorted Dataframe's
         Dependency: sorted_dataframe_year()
         Updated: 
@@ -12,106 +83,68 @@ def sorted_dataframes(dataframes, row_sortby=None, row_ascending=True, column_so
     sorted_dataframes = dict()
     if type(dataframes) == dict:
         for year in dataframes:
-            sorted_dataframes[year] = sorted_dataframe_year(dataframes[year], row_sortby, row_ascending, column_sortby, column_ascending, verbose, remove_nan, ascending, strict_index, how)
+            sorted_dataframes[year] = sorted_dataframe_year(dataframes[year], row_sortby, row_ascending, column_sortby, column_ascending, verbose, remove_nan, strict_index, how)
     else:
         print "Error: Need to pass a Dict(DataFrames) to this Function"
         return None
     return sorted_dataframes
 
 
+def check_sortby_index_name(sortby, labels, axis_name, strict_index=False):
+    """
+    Warn if the sortby index name differs from the axis name (Return False if strict_index and names differ)
+    """
+    if str(sortby.index.name).lower() == str(labels.name).lower():
+        return True
+    print 'WARNING: %s Index Names are not the same!, You might be JOINING inappropriate data [Index1: %s; Index2: %s]' % (axis_name, sortby.index.name, labels.name)
+    # Advise USER that Index are similar based on simple REGEXR
+    name1, name2 = str(sortby.index.name).lower(), str(labels.name).lower()
+    if len(name1) <= len(name2):
+        match = re.search(re.escape(name1), name2)
+    else:
+        match = re.search(re.escape(name2), name1)
+    if match: print '%s INDEX1 and INDEX2 are SIMILARLY NAMED .... Probably OK!' % axis_name
+    return not strict_index
+
 def sorted_dataframe_year(dataframe_year, row_sortby=None, row_ascending=True, column_sortby=None, column_ascending=True, verbose=False, remove_nan=False, strict_index=False, how='left'):
     ''' Return Sorted DataFrame_Year
         Status: Current
         Sort DataFrame_Year by row or column by passing a series to sort on (Default: Ascending Sort)
         Note: Default behaviour is 'LEFT' Index Joining. Mcp matrix will be preserved ... if want matched between the two series then need to change default flag 'how' to 'inner' (intersection)
         Future Work: 1. This could be made more robust by using REGEXR to see if index1 and index2 contain the same basic info "country" vs "countrycode" - Currently only issue's advice due to limited REGEXR exploration
-                     2. This Function could be re-written with new knowledge of index object creation (but not time urgent)
         Notes:
                 21/06/2013   -> Updated to account for MultiIndex DataFrames. If Incoming as MultiIndex, it Returns as MultiIndex. But this function only sorts non-hierarchical indices
+                Row and Column permutations are computed with argsort (sortby_positions()) and applied by integer indexing (take_positions())
+                remove_nan drops rows (columns) containing np.nan in the data or the sortby value
         Updates:
                 03/07/2013   -> Updated ascending option to allow row or column to be ascending/descending individually
     '''       
-    #Check Incoming dataframe Index Type
-    row_index_multilevel = False
-    col_index_multilevel = False
-    if type(dataframe_year.index) == pd.MultiIndex:
-        row_index_multilevel = True
-    if type(dataframe_year.columns) == pd.MultiIndex:
-        col_index_multilevel = True
+    if type(row_sortby) != pd.Series and type(column_sortby) != pd.Series:
+        print "Error: Need to pass a row_sortby series and/or a column_sortby series"
+        return None
     if str(how) == 'inner':
         print "WARNING: Returned DataFrame will Return the INTERSECTION of LEFT AND RIGHT Index; therefore items could be dropped from the original dataframe if data is not available"
-    if type(row_sortby) == pd.Series:                                      # row_sortby
+    rows, row_labels, columns, column_labels = None, None, None, None
+    if type(row_sortby) == pd.Series:
         if verbose: print 'Series Index Name: %s -> DataFrame Index Name: %s' % (row_sortby.index.name, dataframe_year.index.name)
-        if row_sortby.index.name.lower() != dataframe_year.index.name.lower():
-            print 'WARNING: Row Index Names are not the same!, You might be JOINING inappropriate data [Index1: %s; Index2: %s]' % (row_sortby.index.name, dataframe_year.index.name)
-            # Advise USER that Index are similar based on simple REGEXR
-            if len(row_sortby.index.name) <= len(dataframe_year.index.name):
-                match = re.search(row_sortby.index.name.lower(), dataframe_year.index.name.lower())
-            else:
-                match = re.search(dataframe_year.index.name.lower(), row_sortby.index.name.lower())
-            if match: print 'INDEX1 and INDEX2 are SIMILARLY NAMED .... Probably OK!'
-            if strict_index: return None
+        if not check_sortby_index_name(row_sortby, dataframe_year.index, 'Row', strict_index): return None
         if verbose: print 'Row Sortby: %s had dimension: %s vs. DataFrame: %s' % (row_sortby.name, row_sortby.shape[0], dataframe_year.shape[0])
-        joined = dataframe_year.join(row_sortby, how=how)
-        sorted_joined = joined.sort(row_sortby.name, ascending=row_ascending)
-        if remove_nan: sorted_joined = sorted_joined.dropna()
-        del sorted_joined[row_sortby.name]
-        if verbose: print 'ROW: Incoming DataFrame Length: %s --> Outgoing DataFrame Length: %s' % (len(dataframe_year), len(sorted_joined))
-        if type(column_sortby) == pd.Series:                               #both row and column sortby
-            if verbose: print 'Series Index Name: %s -> DataFrame Index Name: %s' % (column_sortby.index.name, dataframe_year.index.name)
-            if column_sortby.index.name.lower() != dataframe_year.columns.name.lower():
-                print 'WARNING: Column Index Names are not the same!, You might be JOINING inappropriate data [Index1: %s; Index2: %s]' % (column_sortby.index.name, dataframe_year.columns.name)
-                if len(column_sortby.index.name) <= len(dataframe_year.columns.name):                                    #Changed 'if len(row_sortby.index.name)' to if len(column_sortby.index.name)
-                    match = re.search(column_sortby.index.name.lower(), dataframe_year.columns.name.lower())
-                else:
-                    match = re.search(dataframe_year.index.name.lower(), column_sortby.index.name.lower())             #Changed column_sortby.columns.name.lower() to column_sortby.index.name.lower()
-                if match: print 'Column INDEX1 and INDEX2 are SIMILARLY NAMED .... Probably OK!'
-                if strict_index: return None
-            if verbose: print 'Column Sortby: %s had dimension: %s vs. DataFrame: %s' % (column_sortby.name, column_sortby.shape[0], dataframe_year.shape[1])
-            joined = sorted_joined.T.join(column_sortby, how=how)
-            sorted_joined = joined.sort(column_sortby.name, ascending=column_ascending)
-            if remove_nan: sorted_joined  = sorted_joined.dropna()
-            del sorted_joined[column_sortby.name]
-            if verbose: print 'COLUMN: Incoming DataFrame Width: %s --> Outgoing DataFrame Width: %s' % (len(dataframe_year.T), len(sorted_joined))   #Len Works here because of the Transpose
-            sorted_joined = sorted_joined.T   #Move Rows back to Columns to match incoming orientation
-            #Reinstate row or col MultiIndex if incoming as MultiIndex
-            if row_index_multilevel:
-                sorted_joined.index = pd.MultiIndex.from_tuples(sorted_joined.index)
-            if col_index_multilevel:
-                sorted_joined.columns = pd.MultiIndex.from_tuples(sorted_joined.columns)
-            return sorted_joined
-        #Reinstate row or col MultiIndex if incoming as MultiIndex
-        if row_index_multilevel:
-            sorted_joined.index = pd.MultiIndex.from_tuples(sorted_joined.index)
-        if col_index_multilevel:
-            sorted_joined.columns = pd.MultiIndex.from_tuples(sorted_joined.columns)
-        return sorted_joined
-    elif type(column_sortby) == pd.Series:                                 # column sortby
-        if verbose: print 'Series Index Name: %s -> DataFrame Index Name: %s' % (column_sortby.index.name, dataframe_year.index.name)
-        if column_sortby.index.name.lower() != dataframe_year.columns.name.lower():
-            print 'WARNING: Column Index Names are not the same!, You might be JOINING inappropriate data [Index1: %s; Index2: %s]' % (column_sortby.index.name, dataframe_year.columns.name)
-            if len(column_sortby.index.name) <= len(dataframe_year.columns.name):                                        #Changed 'if len(row_sortby.index.name)' to if len(column_sortby.index.name)
-                match = re.search(column_sortby.index.name.lower(), dataframe_year.columns.name.lower())
-            else:
-                match = re.search(dataframe_year.index.name.lower(), column_sortby.index.name.lower())                #Changed column_sortby.columns.name.lower() to column_sortby.index.name.lower()
-            if match: print 'Column INDEX1 and INDEX2 are SIMILARLY NAMED .... Probably OK!'
-            if strict_index: return None
+        row_labels, rows, row_values = sortby_positions(dataframe_year.index, row_sortby, ascending=row_ascending, how=how)
+    if type(column_sortby) == pd.Series:
+        if verbose: print 'Series Index Name: %s -> DataFrame Index Name: %s' % (column_sortby.index.name, dataframe_year.columns.name)
+        if not check_sortby_index_name(column_sortby, dataframe_year.columns, 'Column', strict_index): return None
         if verbose: print 'Column Sortby: %s had dimension: %s vs. DataFrame: %s' % (column_sortby.name, column_sortby.shape[0], dataframe_year.shape[1])
-        joined = dataframe_year.T.join(column_sortby, how=how)
-        sorted_joined = joined.sort(column_sortby.name, ascending=column_ascending)
-        if remove_nan: sorted_joined  = sorted_joined.dropna()
-        del sorted_joined[column_sortby.name]
-        if verbose: print 'COLUMN: Incoming DataFrame Width: %s --> Outgoing DataFrame Width: %s' % (len(dataframe_year.T), len(sorted_joined)) #Len Works here because of the Transpose
-        sorted_joined = sorted_joined.T
-        #Reinstate row or col MultiIndex if incoming as MultiIndex
-        if row_index_multilevel:
-            sorted_joined.index = pd.MultiIndex.from_tuples(sorted_joined.index)
-        if col_index_multilevel:
-            sorted_joined.columns = pd.MultiIndex.from_tuples(sorted_joined.columns)
-        return sorted_joined
-    else:
-        print "Error: Need to pass a row_sortby series and/or a column_sortby series"
-        return None  
+        column_labels, columns, column_values = sortby_positions(dataframe_year.columns, column_sortby, ascending=column_ascending, how=how)
+    sorted_df = take_positions(dataframe_year, rows=rows, row_labels=row_labels)
+    if remove_nan and rows is not None:
+        sorted_df = sorted_df[~(sorted_df.isnull().any(axis=1).values | pd.isnull(row_values))]
+    if verbose and rows is not None: print 'ROW: Incoming DataFrame Length: %s --> Outgoing DataFrame Length: %s' % (len(dataframe_year), len(sorted_df))
+    if columns is not None:
+        sorted_df = take_positions(sorted_df, columns=columns, column_labels=column_labels)
+        if remove_nan:
+            sorted_df = sorted_df.loc[:, ~(sorted_df.isnull().any(axis=0).values | pd.isnull(column_values))]
+        if verbose: print 'COLUMN: Incoming DataFrame Width: %s --> Outgoing DataFrame Width: %s' % (dataframe_year.shape[1], sorted_df.shape[1])
+    return sorted_df
 
 
 def sort_multiindex_by_sortorder(dataframe_year, sort_level_by, axis=1, how='left'):
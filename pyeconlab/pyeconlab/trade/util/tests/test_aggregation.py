@@ -0,0 +1,75 @@
+"""
+Tests for Country and Geographic Aggregates
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+
+from pyeconlab.trade.util import CountryAggregates
+
+
+class TestSuite_aggregation(unittest.TestCase):
+	"""
+	Test CountryAggregates against a Merge on a Membership Table
+	"""
+
+	def setUp(self):
+		rng = np.random.RandomState(0)
+		countries = ['AUS', 'NZL', 'USA', 'CAN', 'CHN', 'ZZZ']
+		self.data = pd.DataFrame({
+			'year'          :   rng.choice([1990, 1991], 1000),
+			'eiso3c'        :   rng.choice(countries, 1000),
+			'iiso3c'        :   rng.choice(countries, 1000),
+			'productcode'   :   rng.choice(['0011', '0012'], 1000),
+			'value'         :   rng.rand(1000),
+		})[['year', 'eiso3c', 'iiso3c', 'productcode', 'value']]
+		self.members = {'AUS' : 'OCE', 'NZL' : 'OCE', 'USA' : ['AME', 'OECD'], 'CAN' : ['AME', 'OECD'], 'CHN' : 'ASI'}
+		self.table = pd.DataFrame([(c, r) for c, rs in self.members.items() for r in (rs if type(rs) == list else [rs])], columns=['iso3c', 'region'])
+
+	def expected(self, columns):
+		data = self.data
+		for column in columns:
+			data = data.merge(self.table, left_on=column, right_on='iso3c', how='inner')
+			data[column] = data['region']
+			del data['region'], data['iso3c']
+		return data.groupby(['year', 'eiso3c', 'iiso3c', 'productcode']).sum().reset_index()
+
+	def test_matrix(self):
+		areas = CountryAggregates.from_frame(self.table)
+		self.assertEqual(areas.matrix.shape, (5, 4))
+		self.assertEqual(areas.matrix.nnz, 7)
+		self.assertEqual(areas.members('OECD'), ['CAN', 'USA'])
+
+	def test_aggregate(self):
+		areas = CountryAggregates(self.members)
+		for columns in [['eiso3c'], ['iiso3c'], ['eiso3c', 'iiso3c']]:
+			result = areas.aggregate(self.data, columns=columns)
+			pd.util.testing.assert_frame_equal(result, self.expected(columns), check_dtype=False)
+
+	def test_unmatched(self):
+		areas = CountryAggregates(self.members)
+		keep = areas.aggregate(self.data, columns=['eiso3c'], unmatched='keep')
+		self.assertIn('ZZZ', set(keep['eiso3c']))
+		label = areas.aggregate(self.data.set_index(['year', 'eiso3c', 'iiso3c', 'productcode']), columns=['eiso3c', 'iiso3c'], unmatched='.')
+		self.assertEqual(set(label['eiso3c']), set(['OCE', 'AME', 'OECD', 'ASI', '.']))
+		np.testing.assert_allclose(label.loc[(label['eiso3c'] == '.') & (label['iiso3c'] == '.'), 'value'].sum(), \
+									self.data.loc[(self.data['eiso3c'] == 'ZZZ') & (self.data['iiso3c'] == 'ZZZ'), 'value'].sum())
+
+	def test_missing_country(self):
+		areas = CountryAggregates(self.members)
+		data = pd.DataFrame({'year' : [1990, 1990, 1990], 'eiso3c' : ['AUS', np.nan, 'ZZZ'], 'value' : [1.0, 100.0, 10.0]})[['year', 'eiso3c', 'value']]
+		for unmatched, expected in [('drop', {'OCE' : 1.0}), ('keep', {'OCE' : 1.0, 'ZZZ' : 10.0}), ('.', {'OCE' : 1.0, '.' : 10.0})]:
+			result = areas.aggregate(data, columns=['eiso3c'], unmatched=unmatched)
+			self.assertEqual(dict(zip(result['eiso3c'], result['value'])), expected)
+
+	def test_colliding_label(self):
+		areas = CountryAggregates({'AUS' : 'OCE', 'NZL' : 'OCE', 'USA' : 'USA_GROUP'})
+		data = pd.DataFrame({'year' : [1990] * 4, 'eiso3c' : ['AUS', 'OCE', 'ZZZ', 'NZL'], 'value' : [1.0, 10.0, 100.0, 1000.0]})[['year', 'eiso3c', 'value']]
+		rows, codes, labels = areas.expand(data['eiso3c'].values, unmatched='keep')
+		self.assertEqual(len(labels), len(set(labels)))
+		result = areas.aggregate(data, columns=['eiso3c'], unmatched='keep')
+		self.assertEqual(dict(zip(result['eiso3c'], result['value'])), {'OCE' : 1011.0, 'ZZZ' : 100.0})
+		self.assertEqual(result['value'].sum(), data['value'].sum())
+		result = areas.aggregate(data, columns=['eiso3c'], unmatched='OCE')
+		self.assertEqual(dict(zip(result['eiso3c'], result['value'])), {'OCE' : 1111.0})
@@ -0,0 +1,33 @@
+"""
+Tests for Bit-Packed Matrix Utilities
+"""
+
+import unittest
+import numpy as np
+
+from pyeconlab.trade.util import pack_matrix, unpack_matrix, popcount, coexport_counts_packed
+
+
+class TestSuite_bitpacked(unittest.TestCase):
+	"""
+	Test Popcount Counts against Floating Point Matrix Operations
+	"""
+
+	def setUp(self):
+		rng = np.random.RandomState(2)
+		self.mcp = (rng.rand(37, 130) > 0.6).astype(float)
+		self.mcp[0, 0] = np.nan
+
+	def test_roundtrip(self):
+		for axis in [0, 1]:
+			packed, num_bits = pack_matrix(self.mcp, axis=axis)
+			self.assertEqual(packed.dtype, np.uint64)
+			np.testing.assert_array_equal(unpack_matrix(packed, num_bits, axis=axis), np.nan_to_num(self.mcp))
+
+	def test_counts(self):
+		mcp = np.nan_to_num(self.mcp)
+		pc, num_countries = pack_matrix(mcp, axis=0)
+		cp, num_products = pack_matrix(mcp, axis=1)
+		np.testing.assert_array_equal(popcount(pc), mcp.sum(axis=0))
+		np.testing.assert_array_equal(popcount(cp), mcp.sum(axis=1))
+		np.testing.assert_array_equal(coexport_counts_packed(pc, block_size=16), np.dot(mcp.T, mcp))
@@ -0,0 +1,53 @@
+"""
+Tests for Fitness-Complexity
+"""
+
+import unittest
+import numpy as np
+
+from pyeconlab.trade.util import fitness_complexity_panel
+
+
+class TestSuite_fitness_complexity(unittest.TestCase):
+	"""
+	Test Log-Space Sparse Iterations against the Linear Definition
+	"""
+
+	def setUp(self):
+		rng = np.random.RandomState(7)
+		self.mcp = (rng.rand(3, 10, 15) > 0.5).astype(float)
+		self.mcp[1, 4, :] = 0.0 				#Zero Diversity Country
+		self.mcp[2, :, 6] = 0.0 				#Zero Ubiquity Product
+
+	def explicit(self, M, iterations):
+		rows, cols = M.sum(axis=1) > 0, M.sum(axis=0) > 0
+		M = M[rows][:, cols]
+		F, Q = np.ones(M.shape[0]), np.ones(M.shape[1])
+		for num in xrange(iterations):
+			F, Q = M.dot(Q), 1.0 / M.T.dot(1.0 / F)
+			F, Q = F / F.mean(), Q / Q.mean()
+		fitness, complexity = np.nan * np.ones(len(rows)), np.nan * np.ones(len(cols))
+		fitness[rows], complexity[cols] = F, Q
+		return fitness, complexity
+
+	def test_single_year(self):
+		fitness, complexity, iterations, converged = fitness_complexity_panel(self.mcp[0], tol=1e-10)
+		self.assertTrue(converged)
+		F, Q = self.explicit(self.mcp[0], iterations)
+		np.testing.assert_allclose(fitness, F)
+		np.testing.assert_allclose(complexity, Q)
+
+	def test_panel(self):
+		fitness, complexity, iterations, converged = fitness_complexity_panel(self.mcp, tol=1e-10)
+		self.assertTrue(converged.all())
+		for year in xrange(3):
+			F, Q = self.explicit(self.mcp[year], iterations[year])
+			np.testing.assert_allclose(fitness[year], F)
+			np.testing.assert_allclose(complexity[year], Q)
+		self.assertTrue(np.isnan(fitness[1, 4]))
+		self.assertTrue(np.isnan(complexity[2, 6]))
+
+	def test_max_iterations(self):
+		fitness, complexity, iterations, converged = fitness_complexity_panel(self.mcp, tol=1e-10, max_iterations=3)
+		self.assertFalse(converged.any())
+		self.assertTrue((iterations == 3).all())
@@ -0,0 +1,62 @@
+"""
+Tests for Trade Dynamics Utilities
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+
+from pandas.util.testing import assert_frame_equal, assert_series_equal
+from pyeconlab.trade.util import compute_product_changes, compute_product_changes_panel, compute_persistence, compute_persistence_panel, \
+									mcp_to_boolean_panel, product_changes_panel, boolean_panel_to_dynamic_dict, reindex_dynamic_dict
+
+
+class TestSuite_product_changes_panel(unittest.TestCase):
+	"""
+	Test Boolean Panel Methods against the Dict(DataFrame) Implementations
+	"""
+
+	def setUp(self):
+		rng = np.random.RandomState(1)
+		countries = pd.Index(['AUS', 'CHN', 'NZL', 'USA'], name='country')
+		products = pd.Index(['%04d' % x for x in range(11)], name='productcode')
+		self.mcp = dict()
+		for year in range(2000, 2006):
+			self.mcp[year] = pd.DataFrame((rng.rand(4, 11) > 0.5).astype(float), index=countries, columns=products)
+			self.mcp[year].name = 'Mcp'
+
+	def test_compute_product_changes_panel(self):
+		""" Panel outputs are equal to compute_product_changes """
+		for result, expected in zip(compute_product_changes_panel(self.mcp), compute_product_changes(self.mcp)):
+			self.assertEqual(sorted(result.keys()), sorted(expected.keys()))
+			for key in expected.keys():
+				assert_frame_equal(result[key], expected[key])
+				self.assertEqual(result[key].name, expected[key].name)
+
+	def test_packbits_roundtrip(self):
+		""" Bit-Packed Transitions Convert back to the Dict Outputs """
+		panel, years, countries, products = mcp_to_boolean_panel(self.mcp)
+		both, new, die = product_changes_panel(panel, packbits=True)
+		result = boolean_panel_to_dynamic_dict(new, years, countries, products, name='NewProducts', num_products=len(products))
+		expected = compute_product_changes(self.mcp)[1]
+		for key in expected.keys():
+			assert_frame_equal(result[key], expected[key])
+
+	def test_compute_persistence_panel(self):
+		""" Rolling Logical-AND Persistence is equal to compute_persistence """
+		new_products = reindex_dynamic_dict(compute_product_changes(self.mcp)[1], base='finish')
+		for persistence_length in [1, 2, 3]:
+			result = compute_persistence_panel(self.mcp, new_products, persistence_length=persistence_length, output='summary')
+			expected = compute_persistence(self.mcp, new_products, persistence_length=persistence_length, output='summary')
+			for year in expected.keys():
+				assert_series_equal(result[year], expected[year])
+			result = compute_persistence_panel(self.mcp, new_products, persistence_length=persistence_length, output='matrix')
+			expected = compute_persistence(self.mcp, new_products, persistence_length=persistence_length, output='matrix')
+			for year in expected.keys():
+				assert_frame_equal(result[year], expected[year])
+				self.assertEqual(result[year].name, 'NewProductsPersistent')
+
+	def test_non_consecutive_years(self):
+		""" Non-Consecutive Years Raise a ValueError """
+		mcp = dict((year, self.mcp[year]) for year in [2000, 2002])
+		self.assertRaises(ValueError, mcp_to_boolean_panel, mcp)
@@ -0,0 +1,38 @@
+"""
+Tests for Sparse Graph Utilities
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+
+from pyeconlab.trade.util import sparse_graph_from_series, product_space_backbone
+
+
+class TestSuite_sparse_graph(unittest.TestCase):
+	"""
+	Test Bulk Graph Construction and Product Space Backbone
+	"""
+
+	def test_bipartite(self):
+		idx = pd.MultiIndex.from_tuples([('AUS', '0011'), ('AUS', '0012'), ('NZL', '0011')], names=['country', 'productcode'])
+		data = pd.Series([1.0, 0.0, 3.0], index=idx, name='export')
+		graph = sparse_graph_from_series(data, row_labels=['AUS', 'NZL', 'USA'])
+		self.assertEqual(graph.number_of_edges(), 3)
+		network = graph.to_networkx()
+		self.assertEqual(network.number_of_nodes(), 5)
+		self.assertEqual(network['AUS']['0012']['export'], 0.0)
+		self.assertEqual(network.node['USA']['bipartite'], 'countries')
+
+	def test_backbone(self):
+		products = pd.Index(['a', 'b', 'c', 'd'])
+		values = np.array([	[1.0, 0.9, 0.2, 0.1],
+							[0.9, 1.0, 0.3, 0.6],
+							[0.2, 0.3, 1.0, 0.4],
+							[0.1, 0.6, 0.4, 1.0] ])
+		proximity = pd.DataFrame(values, index=products, columns=products)
+		tree = product_space_backbone(proximity, threshold=None).to_networkx()
+		self.assertEqual(sorted(tuple(sorted(edge)) for edge in tree.edges()), [('a', 'b'), ('b', 'd'), ('c', 'd')])
+		backbone = product_space_backbone(proximity, threshold=0.3)
+		self.assertEqual(backbone.number_of_edges(), 4)
+		self.assertEqual(backbone.to_networkx()['b']['c']['proximity'], 0.3)
@@ -0,0 +1,129 @@
+"""
+Tests for Memory Budget Utilities
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import cPickle as pickle
+import numpy as np
+import pandas as pd
+
+from pyeconlab.trade.util import SpillStore, pinned, parse_nbytes, object_nbytes
+
+
+class Matrices(object):
+	""" Object with Array-Like and Scalar Attributes """
+
+	def __init__(self, seed):
+		rng = np.random.RandomState(seed)
+		self.data = pd.DataFrame(rng.rand(100, 10))
+		self.values = rng.rand(1000)
+		self.temp = {'num' : pd.Series(rng.rand(100))}
+		self.empty = None
+		self.notes = 'seed %s' % seed
+
+
+class TestSuite_memory(unittest.TestCase):
+	"""
+	Test SpillStore LRU Spilling and Reloading
+	"""
+
+	def setUp(self):
+		self.spill_dir = tempfile.mkdtemp()
+		self.expected = dict((year, Matrices(year)) for year in xrange(2000, 2005))
+		self.size = object_nbytes(Matrices(0))
+
+	def tearDown(self):
+		shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+	def test_parse_nbytes(self):
+		self.assertEqual(parse_nbytes(1024), 1024)
+		self.assertEqual(parse_nbytes('2KB'), 2048)
+		self.assertEqual(parse_nbytes('1.5 GB'), int(1.5 * 1024**3))
+		self.assertRaises(ValueError, parse_nbytes, '8 bananas')
+
+	def test_spill_and_reload(self):
+		store = SpillStore(2 * self.size, spill_dir=self.spill_dir)
+		for year in xrange(2000, 2005):
+			store[year] = Matrices(year)
+		self.assertEqual(sorted(store.spilled.keys()), [2000, 2001, 2002])
+		self.assertEqual(store.counters['spills'], 3)
+		self.assertTrue(store.resident_nbytes <= 2 * self.size)
+		self.assertFalse(hasattr(dict.__getitem__(store, 2000), 'data'))
+		self.assertEqual(dict.__getitem__(store, 2000).notes, 'seed 2000')
+		obj = store[2000]
+		self.assertIs(obj, dict.__getitem__(store, 2000))
+		pd.util.testing.assert_frame_equal(obj.data, self.expected[2000].data)
+		np.testing.assert_array_equal(obj.values, self.expected[2000].values)
+		pd.util.testing.assert_series_equal(obj.temp['num'], self.expected[2000].temp['num'])
+		self.assertEqual(store.counters['reloads'], 1)
+		self.assertEqual(sorted(store.spilled.keys()), [2001, 2002, 2003])
+		self.assertEqual(len(os.listdir(self.spill_dir)), 3)
+
+	def test_most_recent_kept(self):
+		store = SpillStore(1, spill_dir=self.spill_dir)
+		for year in xrange(2000, 2003):
+			store[year] = Matrices(year)
+		self.assertEqual(sorted(store.spilled.keys()), [2000, 2001])
+		self.assertTrue(hasattr(store[2001], 'data'))
+
+	def test_pickle_and_close(self):
+		store = SpillStore(self.size, spill_dir=self.spill_dir)
+		for year in xrange(2000, 2003):
+			store[year] = Matrices(year)
+		restored = pickle.loads(pickle.dumps(store, protocol=pickle.HIGHEST_PROTOCOL))
+		self.assertEqual(type(restored), SpillStore)
+		self.assertEqual((restored.memory_budget, restored.spill_dir), (self.size, self.spill_dir))
+		for year in xrange(2000, 2003):
+			pd.util.testing.assert_frame_equal(restored[year].data, self.expected[year].data)
+		store.close()
+		restored.close()
+		self.assertEqual(os.listdir(self.spill_dir), [])
+
+	def test_lazy_items(self):
+		store = SpillStore(self.size, spill_dir=self.spill_dir)
+		for year in xrange(2000, 2005):
+			store[year] = Matrices(year)
+		for year, obj in store.items():
+			pd.util.testing.assert_frame_equal(obj.data, self.expected[year].data)
+			self.assertTrue(store.resident_nbytes <= self.size)
+		for obj in store.values():
+			self.assertTrue(hasattr(obj, 'data'))
+			self.assertTrue(store.resident_nbytes <= self.size)
+		self.assertEqual(len(store.spilled), 4)
+
+	def test_temporary_spill_dir_removed(self):
+		store = SpillStore(self.size)
+		for year in xrange(2000, 2003):
+			store[year] = Matrices(year)
+		spill_dir = store.spill_dir
+		self.assertTrue(os.path.isdir(spill_dir))
+		del store
+		self.assertFalse(os.path.exists(spill_dir))
+
+	def test_pinned(self):
+		store = SpillStore(self.size, spill_dir=self.spill_dir)
+		for year in xrange(2000, 2005):
+			store[year] = Matrices(year)
+		with pinned(store, [2000, 2001, 2002]):
+			objs = [store[year] for year in [2000, 2001, 2002]]
+			store[2004]
+			for year, obj in zip([2000, 2001, 2002], objs):
+				pd.util.testing.assert_frame_equal(obj.data, self.expected[year].data)
+		self.assertEqual(store.pinned, set())
+		self.assertTrue(store.resident_nbytes <= self.size)
+		with pinned(self.expected, [2000]) as data:
+			self.assertIs(data, self.expected)
+
+	def test_view(self):
+		store = SpillStore(self.size, spill_dir=self.spill_dir)
+		for year in xrange(2000, 2005):
+			store[year] = Matrices(year)
+		view = store.view([2000, 2001, 2002])
+		self.assertEqual(sorted(view.keys()), [2000, 2001, 2002])
+		for year in [2000, 2001, 2002, 2000]:
+			pd.util.testing.assert_frame_equal(view[year].data, self.expected[year].data)
+		self.assertRaises(KeyError, view.__getitem__, 2004)
+		self.assertRaises(KeyError, store.view, [2010])
@@ -0,0 +1,39 @@
+"""
+Tests for Null Model Utilities
+"""
+
+import unittest
+import numpy as np
+
+from pyeconlab.trade.util import curveball_randomize, probable_emergence, proximity_null_model
+
+
+class TestSuite_nullmodel(unittest.TestCase):
+	"""
+	Test Curveball Randomization and Null Model Statistics
+	"""
+
+	def setUp(self):
+		rng = np.random.RandomState(11)
+		self.mcp = (rng.rand(12, 20) > 0.6).astype(float)
+
+	def test_curveball_preserves_degrees(self):
+		randomized = curveball_randomize(self.mcp, rng=np.random.RandomState(0))
+		np.testing.assert_array_equal(randomized.sum(axis=1), self.mcp.sum(axis=1))
+		np.testing.assert_array_equal(randomized.sum(axis=0), self.mcp.sum(axis=0))
+		self.assertFalse((randomized == self.mcp).all())
+
+	def test_reproducible_across_processes(self):
+		observed, serial = proximity_null_model(self.mcp, num_draws=12, seed=3, processes=1)
+		observed, parallel = proximity_null_model(self.mcp, num_draws=12, seed=3, processes=2)
+		for key in ['mean', 'std', 'zscore', 'pvalue']:
+			np.testing.assert_allclose(serial[key], parallel[key])
+		self.assertTrue(np.nanmin(serial['pvalue']) >= 1.0 / 13)
+
+	def test_probable_emergence(self):
+		base = np.array([[1, 0, 0], [0, 0, 0], [0, 1, 0]], dtype=float)
+		new = np.array([[0, 1, 1], [1, 0, 0], [0, 0, 1]], dtype=float)
+		proximity = np.array([[1.0, 0.5, 0.1], [0.5, 1.0, 0.1], [0.1, 0.1, 1.0]])
+		probable, improbable = probable_emergence(base, new, proximity, 0.2)
+		np.testing.assert_array_equal(probable, [[False, True, False], [False, False, False], [False, False, False]])
+		np.testing.assert_array_equal(improbable, [[False, False, True], [False, False, False], [False, False, True]])
@@ -0,0 +1,50 @@
+"""
+Tests for Product Space Opportunity Metrics
+"""
+
+import unittest
+import numpy as np
+
+from pyeconlab.trade.util import compute_density, compute_opportunity_metrics
+
+
+class TestSuite_opportunity_metrics(unittest.TestCase):
+	"""
+	Test Matrix Product Implementations against Explicit Sums
+	"""
+
+	def setUp(self):
+		rng = np.random.RandomState(4)
+		self.mcp = (rng.rand(3, 8, 12) > 0.6).astype(float)
+		proximity = rng.rand(3, 12, 12)
+		self.proximity = (proximity + proximity.transpose(0, 2, 1)) / 2.0
+		self.pci = rng.randn(3, 12)
+
+	def explicit(self, M, phi, pci):
+		C, P = M.shape
+		density = np.zeros((C, P))
+		gain = np.zeros((C, P))
+		for c in xrange(C):
+			for p in xrange(P):
+				density[c, p] = sum(M[c, k] * phi[k, p] for k in xrange(P)) / phi[:, p].sum()
+		for c in xrange(C):
+			for p in xrange(P):
+				gain[c, p] = sum(phi[p, k] / phi[:, k].sum() * (1 - M[c, k]) * pci[k] for k in xrange(P)) - density[c, p] * pci[p]
+		outlook = (density * (1 - M) * pci).sum(axis=1)
+		return density, outlook, gain
+
+	def test_single_year(self):
+		metrics = compute_opportunity_metrics(self.mcp[0], self.proximity[0], self.pci[0])
+		density, outlook, gain = self.explicit(self.mcp[0], self.proximity[0], self.pci[0])
+		np.testing.assert_allclose(metrics['density'], density)
+		np.testing.assert_allclose(metrics['distance'], 1 - density)
+		np.testing.assert_allclose(metrics['complexity_outlook'], outlook)
+		np.testing.assert_allclose(metrics['opportunity_gain'], gain)
+		np.testing.assert_allclose(compute_density(self.mcp[0], self.proximity[0]), density)
+
+	def test_batched_years(self):
+		metrics = compute_opportunity_metrics(self.mcp, self.proximity, self.pci)
+		for year in xrange(3):
+			single = compute_opportunity_metrics(self.mcp[year], self.proximity[year], self.pci[year])
+			for name in single.keys():
+				np.testing.assert_allclose(metrics[name][year], single[name])
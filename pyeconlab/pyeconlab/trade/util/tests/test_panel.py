@@ -0,0 +1,60 @@
+"""
+Tests for Country x Year Panel Assembly
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+
+from pyeconlab.trade.util import CountryYearPanel, from_dict_of_series_to
+
+
+class TestSuite_panel(unittest.TestCase):
+	"""
+	Test CountryYearPanel against a Chain of join/merge Calls
+	"""
+
+	def setUp(self):
+		rng = np.random.RandomState(0)
+		countries = ['AUS', 'CHN', 'USA', 'FRA']
+		self.metrics = list()
+		for name in ['AvgCentrality', 'ProbableProducts']:
+			self.metrics.append(dict((year, pd.Series(rng.rand(3), index=list(rng.choice(countries, 3, replace=False)), name=name)) for year in range(1990, 1994)))
+		index = pd.MultiIndex.from_product([countries + ['TWN'], range(1985, 1996)], names=['iso3c', 'year'])
+		self.covariates = pd.DataFrame({'GDP' : rng.rand(len(index)), 'TotalPop' : rng.rand(len(index))}, index=index)
+		self.covariates = self.covariates.loc[rng.rand(len(index)) < 0.8]
+		tradelib = pd.DataFrame({'iso3c' : ['AUS', 'CHN'], 'year' : [1991, 1992], 'tradelib' : ['open', 'closed']})
+		self.tradelib = tradelib.set_index(['iso3c', 'year'])
+
+	def expected(self):
+		df = from_dict_of_series_to(self.metrics[0], series_name='AvgCentrality')
+		df = df.join(from_dict_of_series_to(self.metrics[1], series_name='ProbableProducts'), how='outer')
+		df.index = pd.Index(df.index)
+		for item in [self.covariates.copy(), self.tradelib.copy()]:
+			item.index = pd.Index(item.index)
+			df = df.merge(item, how='left', left_index=True, right_index=True)
+		df.index = pd.MultiIndex.from_tuples(df.index, names=['country', 'year'])
+		return df
+
+	def test_to_frame(self):
+		panel = CountryYearPanel()
+		panel.add(self.metrics[0], how='outer').add(self.metrics[1], how='outer')
+		panel.add(self.covariates).add(self.tradelib)
+		result = panel.to_frame()
+		self.assertEqual(panel.columns, ['AvgCentrality', 'ProbableProducts', 'GDP', 'TotalPop', 'tradelib'])
+		pd.util.testing.assert_frame_equal(result, self.expected().sortlevel())
+
+	def test_errors(self):
+		panel = CountryYearPanel()
+		panel.add(self.covariates, how='outer')
+		self.assertRaises(ValueError, panel.add, self.covariates)
+		self.assertRaises(ValueError, panel.add, self.metrics[0], how='inner')
+		self.assertRaises(ValueError, CountryYearPanel().to_frame)
+		self.assertEqual(len(panel.to_frame()), len(self.covariates))
+
+	def test_empty_item(self):
+		panel = CountryYearPanel()
+		panel.add(self.covariates, how='outer').add(dict(), name='AvgCentrality')
+		result = panel.to_frame()
+		self.assertEqual(len(result), len(self.covariates))
+		self.assertTrue(result['AvgCentrality'].isnull().all())
@@ -0,0 +1,55 @@
+"""
+Tests for Hierarchical Product Code Aggregation
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+
+from pyeconlab.trade.util import productcode_cube
+
+
+class TestSuite_productlevels(unittest.TestCase):
+	"""
+	Test each Level of a ProductCodeCube against a groupby on Truncated Product Codes
+	"""
+
+	def setUp(self):
+		rng = np.random.RandomState(0)
+		self.data = pd.DataFrame({
+			'year'      :   rng.choice([1990, 1991], 2000),
+			'eiso3c'    :   rng.choice(['AUS', 'USA', 'CHN'], 2000),
+			'sitc4'     :   ['%04d' % code for code in rng.randint(0, 3000, 2000)],
+			'value'     :   rng.rand(2000),
+			'quantity'  :   rng.rand(2000),
+		})[['year', 'sitc4', 'eiso3c', 'value', 'quantity']]
+		self.data.loc[rng.rand(2000) < 0.1, 'value'] = np.nan
+
+	def expected(self, level):
+		data = self.data[['year', 'sitc4', 'eiso3c', 'value']].copy()
+		data['sitc4'] = data['sitc4'].str[0:level]
+		data = data.rename(columns={'sitc4' : 'sitc%s' % level})
+		data = data.groupby(['year', 'eiso3c', 'sitc%s' % level]).sum().reset_index()
+		return data[['year', 'sitc%s' % level, 'eiso3c', 'value']]
+
+	def test_levels(self):
+		cube = productcode_cube(self.data, productcode='sitc4')
+		self.assertEqual(cube.levels, [4, 3, 2, 1])
+		for level in cube.levels:
+			pd.util.testing.assert_frame_equal(cube[level], self.expected(level))
+
+	def test_selected_levels_and_stack(self):
+		cube = productcode_cube(self.data, productcode='sitc4', levels=[2], keys=['year', 'eiso3c'])
+		self.assertEqual(cube.levels, [4, 2])
+		self.assertEqual(list(cube[2].columns), ['year', 'eiso3c', 'sitc2', 'value'])
+		self.assertRaises(ValueError, cube.level, 3)
+		stacked = cube.stack()
+		self.assertEqual(list(stacked.columns), ['level', 'year', 'eiso3c', 'productcode', 'value'])
+		self.assertEqual(len(stacked), len(cube[4]) + len(cube[2]))
+		np.testing.assert_allclose(stacked.groupby('level')['value'].sum(), [self.data['value'].sum()] * 2)
+
+	def test_all_missing_group(self):
+		data = pd.DataFrame({'sitc4' : ['0011', '0012', '0021'], 'value' : [np.nan, np.nan, 1.0]})
+		cube = productcode_cube(data, productcode='sitc4', levels=[3])
+		self.assertTrue(np.isnan(cube[3]['value'].iloc[0]))
+		self.assertEqual(cube[3]['value'].iloc[1], 1.0)
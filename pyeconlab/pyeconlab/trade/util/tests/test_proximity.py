@@ -0,0 +1,134 @@
+"""
+Tests for Proximity Matrix Utilities
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+from pandas.util.testing import assert_series_equal
+from pyeconlab.trade.util import sparse_proximity_from_mcp, nonzero_statistic, tiled_proximity_to_memmap, MemmapProximity, country_proximity_matrix
+
+
+def random_mcp(seed=3):
+	"""
+	Random Mcp Matrix with a Zero Ubiquity Product and its Dense Symmetric Proximity Matrix
+	"""
+	rng = np.random.RandomState(seed)
+	values = (rng.rand(25, 60) > 0.7).astype(float)
+	values[:, 7] = 0
+	mcp = pd.DataFrame(values, index=pd.Index(['C%s' % x for x in range(25)], name='country'), columns=pd.Index(['%04d' % x for x in range(60)], name='productcode'))
+	coexport = np.dot(values.T, values)
+	ubiquity = values.sum(axis=0)
+	with np.errstate(divide='ignore', invalid='ignore'):
+		dense = coexport / np.maximum.outer(ubiquity, ubiquity)
+	dense[7, :] = np.nan
+	dense[:, 7] = np.nan
+	return mcp, pd.DataFrame(dense, index=mcp.columns, columns=mcp.columns)
+
+
+class TestSuite_sparse_proximity(unittest.TestCase):
+	"""
+	Test SparseProximity Statistics against a Dense Proximity Matrix
+	"""
+
+	def setUp(self):
+		self.mcp, self.dense = random_mcp()
+
+	def test_statistics(self):
+		""" Statistics of the Full Matrix are Exact """
+		prox = sparse_proximity_from_mcp(self.mcp, top_k=5, block_size=16)
+		assert_series_equal(prox.mean(), self.dense.mean(), check_names=False)
+		series = self.dense.unstack()
+		series = series[series != 0.0]
+		self.assertAlmostEqual(prox.nonzero_median(), series.median())
+		self.assertAlmostEqual(nonzero_statistic([prox, prox], statistic='mean'), series.mean())
+
+	def test_mixed_statistics(self):
+		""" Nonzero Statistics over a Dense and a Sparse Proximity """
+		prox = sparse_proximity_from_mcp(self.mcp, top_k=5, block_size=16)
+		series = self.dense.unstack()
+		series = series[series != 0.0]
+		joint = series.append(series)
+		self.assertAlmostEqual(nonzero_statistic([self.dense, prox], statistic='median'), joint.median())
+		self.assertAlmostEqual(nonzero_statistic([prox, self.dense], statistic='mean'), joint.mean())
+		self.assertAlmostEqual(nonzero_statistic([self.dense, self.dense], statistic='mean'), joint.mean())
+
+	def test_filters(self):
+		""" Stored Links satisfy top_k and threshold filters """
+		prox = sparse_proximity_from_mcp(self.mcp, top_k=5, threshold=0.4, block_size=16)
+		self.assertTrue((prox.matrix.data >= 0.4).all())
+		expected = self.dense.fillna(0.0)
+		for row in xrange(prox.shape[0]):
+			stored = prox.matrix[row].toarray().ravel()
+			num_above = (expected.values[row] >= 0.4).sum()
+			self.assertTrue((stored > 0).sum() >= min(5, num_above))
+			np.testing.assert_allclose(stored[stored > 0], expected.values[row][stored > 0])
+
+
+class TestSuite_memmap_proximity(unittest.TestCase):
+	"""
+	Test Tiled Memory-Mapped Proximity against a Dense Proximity Matrix
+	"""
+
+	def setUp(self):
+		self.mcp, self.dense = random_mcp()
+		self.directory = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def test_statistics(self):
+		fn = os.path.join(self.directory, 'proximity.npy')
+		tiled_proximity_to_memmap(self.mcp, fn, tile_size=16)
+		prox = MemmapProximity(fn)
+		np.testing.assert_allclose(np.asarray(prox.matrix), self.dense.values)
+		self.assertEqual(list(prox.products), list(self.mcp.columns))
+		assert_series_equal(prox.mean(), self.dense.mean(), check_names=False)
+		series = self.dense.unstack()
+		series = series[series != 0.0]
+		self.assertAlmostEqual(prox.nonzero_median(), series.median())
+
+
+class TestSuite_country_proximity(unittest.TestCase):
+	"""
+	Test Matrix Product Country Proximity against Explicit Pairwise Computation
+	"""
+
+	def setUp(self):
+		self.mcp = random_mcp()[0].values
+		self.mcp[3, :] = 0 									#Zero Diversity Country
+
+	def explicit(self, matrix_type):
+		C = self.mcp.shape[0]
+		diversity = self.mcp.sum(axis=1)
+		result = np.zeros((C, C))
+		for c1 in xrange(C):
+			for c2 in xrange(C):
+				coexport = (self.mcp[c1] * self.mcp[c2]).sum()
+				if matrix_type == 'symmetric' or (matrix_type == 'minmax' and c2 < c1):
+					denominator = max(diversity[c1], diversity[c2])
+				elif matrix_type == 'asymmetric':
+					denominator = diversity[c2]
+				else:
+					denominator = min(diversity[c1], diversity[c2])
+				result[c1, c2] = coexport / denominator if denominator else np.nan
+		return result
+
+	def test_matrix_types(self):
+		for matrix_type in ['symmetric', 'asymmetric', 'minmax']:
+			np.testing.assert_allclose(country_proximity_matrix(self.mcp, matrix_type), self.explicit(matrix_type))
+
+	def test_pearsons(self):
+		result = country_proximity_matrix(self.mcp, 'pearsons')
+		series = pd.DataFrame(self.mcp.T)
+		np.testing.assert_allclose(result, series.corr().values)
+
+	def test_batched(self):
+		stack = np.array([self.mcp, self.mcp[::-1]])
+		for matrix_type in ['symmetric', 'asymmetric', 'minmax', 'pearsons']:
+			batched = country_proximity_matrix(stack, matrix_type)
+			np.testing.assert_allclose(batched[1], country_proximity_matrix(self.mcp[::-1], matrix_type))
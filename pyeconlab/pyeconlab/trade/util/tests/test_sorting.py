@@ -0,0 +1,48 @@
+"""
+Tests for Sorting Utilities
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+
+from pandas.util.testing import assert_frame_equal
+from pyeconlab.trade.util.sorting import sorted_dataframe_year, sortby_positions, take_positions
+
+
+class TestSuite_sorting(unittest.TestCase):
+	"""
+	Test argsort Ordering against pandas reindex
+	"""
+
+	def setUp(self):
+		rng = np.random.RandomState(1)
+		self.df = pd.DataFrame(rng.rand(6, 5), index=pd.Index(list('abcdef'), name='country'), columns=pd.Index(list('vwxyz'), name='productcode'))
+		self.row_sortby = pd.Series([3.0, 1.0, np.nan, 2.0, 0.5], index=pd.Index(list('abcdg'), name='country'), name='eci')
+		self.column_sortby = pd.Series(rng.randn(5), index=self.df.columns, name='pci')
+
+	def test_right_positions(self):
+		labels, rows, values = sortby_positions(self.df.index, self.row_sortby, ascending=False, how='right')
+		self.assertEqual(list(labels), ['a', 'd', 'b', 'g', 'c'])
+		result = take_positions(self.df, rows=rows, row_labels=labels)
+		assert_frame_equal(result, self.df.reindex(index=labels))
+
+	def test_sorted_dataframe_year(self):
+		result = sorted_dataframe_year(self.df, row_sortby=self.row_sortby, column_sortby=self.column_sortby, column_ascending=False)
+		self.assertEqual(list(result.index), ['b', 'd', 'a', 'c', 'e', 'f'])
+		self.assertEqual(list(result.columns), list(self.column_sortby.sort_values(ascending=False).index))
+		result = sorted_dataframe_year(self.df, row_sortby=self.row_sortby, remove_nan=True)
+		self.assertEqual(list(result.index), ['b', 'd', 'a'])
+
+	def test_string_sortby(self):
+		sortby = pd.Series(['OCE', 'AME', np.nan, 'ASI', 'AME', 'OCE'], index=self.df.index, name='region')
+		result = sorted_dataframe_year(self.df, row_sortby=sortby)
+		self.assertEqual(list(result.index), ['b', 'e', 'd', 'a', 'f', 'c'])
+		result = sorted_dataframe_year(self.df, row_sortby=sortby, row_ascending=False, remove_nan=True)
+		self.assertEqual(list(result.index), ['a', 'f', 'd', 'b', 'e'])
+
+	def test_outer(self):
+		result = sorted_dataframe_year(self.df, row_sortby=self.row_sortby, how='outer')
+		self.assertEqual(list(result.index), ['g', 'b', 'd', 'a', 'c', 'e', 'f'])
+		self.assertTrue(result.loc['g'].isnull().all())
+		assert_frame_equal(result.drop('g'), self.df.reindex(index=['b', 'd', 'a', 'c', 'e', 'f']))
@@ -25,6 +25,9 @@ Future Work
 
 import copy
 import re
+import sys
+import json
+import time
 import pandas as pd
 import numpy as np
 from itertools import chain, repeat
@@ -227,11 +230,89 @@ def merge_columns(ldf, rdf, on, collapse_columns=('value_x', 'value_y', 'value')
         print report
     return outer
 
+def lookup_keys(*keys):
+    """ Broadcast scalar and array-like keys (i.e. cntry, series_code, year) to arrays of the same length """
+    length = max([len(key) for key in keys if not np.isscalar(key)] + [1])
+    return [np.repeat(key, length) if np.isscalar(key) else np.asarray(key) for key in keys]
+
+def lookup_values(values, keys, missing='nan', overrides=None):
+    """
+    Vectorised Lookup of many Keys in an Indexed Series (a single reindex)
+
+    Parameters
+    ----------
+    values      :   pd.Series
+                    Values with a unique (Multi)Index (i.e. (iso3c, series_code, year))
+    keys        :   pd.Index or pd.MultiIndex
+                    Keys to lookup (may contain duplicates)
+    missing     :   str or value, optional(default='nan')
+                    Missing value policy: 'nan' returns np.nan, 'raise' raises a KeyError, 'drop' drops missing keys or
+                    provide a fill value
+    overrides   :   dict or pd.Series, optional(default=None)
+                    Fallback values {key : value} used when a key has no value (i.e. {('TWN', 'NY.GDP.PCAP.PP.KD', 2000) : 17400})
+
+    Returns
+    -------
+    pd.Series indexed by keys (in the same order)
+
+    """
+    result = values.reindex(keys)
+    if overrides is not None:
+        if type(overrides) == dict:
+            overrides = pd.Series(overrides.values(), index=pd.Index(overrides.keys()))
+        fallback = overrides.reindex(keys).values
+        result = pd.Series(np.where(result.isnull().values, fallback, result.values), index=result.index, name=result.name)
+    mask = result.isnull().values
+    if not mask.any() or missing == 'nan':
+        return result
+    if missing == 'raise':
+        raise KeyError("No values found for %s keys: %s" % (mask.sum(), list(keys[mask][:10])))
+    if missing == 'drop':
+        return result[~mask]
+    return result.fillna(missing)
+
 
 # ------------------------- #
 # - Row Finding Functions - #
 # ------------------------- #
 
+def groupby_sum_observed(df, keys, values=['value']):
+    """
+    df.groupby(keys, as_index=False)[values].sum() over Observed Groups Only
+
+    Parameters
+    ----------
+    df      :   pd.DataFrame
+    keys    :   list
+                Key columns (can be pd.Categorical)
+    values  :   list, optional(default=['value'])
+                Columns to sum
+
+    Notes
+    -----
+    1. Categorical keys are grouped on their integer codes and restored afterwards. pandas 0.19 groupby on categorical
+       columns returns the cartesian product of all categories (with np.nan values for unobserved groups)
+    2. Groups are sorted by value (not category order) so the result matches a groupby on object keys
+    3. Missing categorical values (code -1) are kept as their own (last) group
+
+    """
+    categorical = [key for key in keys if pd.api.types.is_categorical_dtype(df[key])]
+    frame = pd.DataFrame(dict((key, df[key].values) for key in keys if key not in categorical), columns=keys)
+    order = dict()
+    for key in categorical:
+        order[key] = np.argsort(df[key].cat.categories.values, kind='mergesort')     #-Sort groups by value (as object keys)-#
+        rank = np.empty(len(order[key]) + 1, dtype=np.int64)
+        rank[order[key]] = np.arange(len(order[key]))
+        rank[-1] = len(order[key])                                                 #-Missing (code -1) is placed last-#
+        frame[key] = rank[df[key].cat.codes.values]
+    for column in values:
+        frame[column] = df[column].values
+    result = frame.groupby(keys, as_index=False, sort=True)[values].sum()
+    for key in categorical:
+        codes = np.append(order[key], -1)[result[key].values]
+        result[key] = pd.Categorical.from_codes(codes, df[key].cat.categories)
+    return result[keys + values]
+
 def find_row(df, row):
     """
     Find and Return a Row in a DataFrame
@@ -402,9 +483,10 @@ def update_operations(self, add_op_string):
             self.operations += add_op_string
     except:
         self.operations = add_op_string
+    record_operation(self, add_op_string)
 
 
-def check_operations(self, opstring, verbose=False):
+def check_operations(self, opstring, start=False, verbose=False):
     """ 
     Check if Operation has been conducted on class attribute .operations
     
@@ -412,6 +494,9 @@ def check_operations(self, opstring, verbose=False):
     ----------
     opstring   :   str
                         A string to append to the current operations string. 
+    start       :   bool, optional(default=False)
+                    Mark the start of the operation for the operations log if it has not been conducted.
+                    Use only in the guard of the operation itself (not for prerequisite checks)
 
     Returns
     -------
@@ -428,13 +513,118 @@ def check_operations(self, opstring, verbose=False):
 
     """
     try:
-        if re.search(opstring, self.operations):
-            if verbose: print "[INFO] Operation %s has already been conducted on dataset" % opstring 
-            return True
-        else:
-            return False
+        found = re.search(opstring, self.operations)
     except:
         raise ValueError("The incoming class does not have an operations attribute")
+    if found:
+        if verbose: print "[INFO] Operation %s has already been conducted on dataset" % opstring 
+        return True
+    if start:
+        start_operation(self, opstring)             #-Operation is about to be conducted-#
+    return False
+
+# - Operations Log - #
+
+def peak_rss():
+    """ Peak Resident Set Size of the Process in Bytes (np.nan if the resource module is not available) """
+    try:
+        import resource
+    except ImportError:
+        return np.nan
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform.startswith('darwin') else peak * 1024           #-Linux reports kilobytes-#
+
+def operation_data(self):
+    """ Dataset of a Constructor (self._dataset or self.dataset instance attributes) or None """
+    for attr in ['_dataset', 'dataset']:
+        data = self.__dict__.get(attr, None)
+        if isinstance(data, pd.DataFrame):
+            return data
+    return None
+
+def operation_snapshot(data):
+    """ (rows, memory, dtypes) of a DataFrame. Memory excludes the contents of python objects (memory_usage(deep=False)) """
+    if not isinstance(data, pd.DataFrame):
+        return np.nan, np.nan, ''
+    dtypes = data.dtypes.astype(str).value_counts().sort_index()
+    return len(data), int(data.memory_usage(index=True).sum()), ",".join("%s:%s" % (dtype, count) for dtype, count in dtypes.iteritems())
+
+def start_operation(self, opstring, data=None):
+    """
+    Mark the Start of an Operation for the Operations Log (called by check_operations(start=True))
+
+    Parameters
+    ----------
+    opstring    :   str
+                    Operation string
+    data        :   pd.DataFrame, optional(default=None)
+                    Data the operation acts on (default: self._dataset or self.dataset)
+
+    """
+    if not hasattr(self, '_operations_pending'):
+        self._operations_pending = dict()
+    data = data if data is not None else operation_data(self)
+    rows, memory, dtypes = operation_snapshot(data)
+    self._operations_pending[opstring] = {'start' : time.time(), 'peak_rss' : peak_rss(), 'rows_in' : rows, 'memory_in' : memory, 'dtypes_in' : dtypes}
+
+def record_operation(self, opstring, data=None):
+    """
+    Add an Operation to the Operations Log (called by update_operations())
+
+    Parameters
+    ----------
+    opstring    :   str
+                    Operation string
+    data        :   pd.DataFrame, optional(default=None)
+                    Data the operation produced (default: self._dataset or self.dataset)
+
+    Notes
+    -----
+    1. Timing starts at the last start_operation() (check_operations(start=True)) call for opstring. Operations without a start
+       are recorded with np.nan wall_time and inputs
+    2. peak_rss_delta is the increase in the peak resident set size of the process (0 if the operation stayed below
+       an earlier peak)
+    3. Records are appended to the JSON-lines file self.operations_log_fn (if set)
+
+    """
+    if not hasattr(self, '_operations_log'):
+        self._operations_log = list()
+    pending = getattr(self, '_operations_pending', dict()).pop(opstring, None)
+    data = data if data is not None else operation_data(self)
+    rows, memory, dtypes = operation_snapshot(data)
+    now, peak = time.time(), peak_rss()
+    record = {
+        'operation'         :   opstring,
+        'start'             :   pending['start'] if pending else np.nan,
+        'wall_time'         :   now - pending['start'] if pending else np.nan,
+        'peak_rss_delta'    :   peak - pending['peak_rss'] if pending else np.nan,
+        'rows_in'           :   pending['rows_in'] if pending else np.nan,
+        'rows_out'          :   rows,
+        'memory_in'         :   pending['memory_in'] if pending else np.nan,
+        'memory_out'        :   memory,
+        'dtypes_in'         :   pending['dtypes_in'] if pending else '',
+        'dtypes_out'        :   dtypes,
+    }
+    self._operations_log.append(record)
+    fn = getattr(self, 'operations_log_fn', None)
+    if fn:
+        with open(fn, 'a') as f:
+            f.write(json.dumps(dict((key, None if type(value) == float and np.isnan(value) else value) for key, value in record.items()), sort_keys=True) + "\n")
+    return record
+
+OPERATIONS_LOG_COLUMNS = ['operation', 'start', 'wall_time', 'peak_rss_delta', 'rows_in', 'rows_out', 'memory_in', 'memory_out', 'dtypes_in', 'dtypes_out']
+
+def operations_log(self):
+    """
+    Operations Log as a DataFrame (one row per recorded operation in the order conducted)
+
+    Columns
+    -------
+    operation, start (unix time), wall_time (seconds), peak_rss_delta (bytes), rows_in, rows_out, memory_in (bytes),
+    memory_out (bytes), dtypes_in, dtypes_out
+
+    """
+    return pd.DataFrame(getattr(self, '_operations_log', list()), columns=OPERATIONS_LOG_COLUMNS)
 
 
 # -------------------- #
@@ -0,0 +1,95 @@
+"""
+Tests for the WDI Store
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+
+from pyeconlab.wdi import wdi as wdimodule
+from pyeconlab.wdi import WDI
+
+
+def synthetic_wdi_csv(fn, seed=0):
+	""" Synthetic WDI_Data.csv (name, iso3c, series_description, series_code, years ...) """
+	rng = np.random.RandomState(seed)
+	countries = [('Australia', 'AUS'), ('China', 'CHN'), ('United States', 'USA')]
+	series = [('GDP (current US$)', 'NY.GDP.MKTP.CD'), ('Population, total', 'SP.POP.TOTL'), ('Land area (sq. km)', 'AG.LND.TOTL.K2')]
+	rows = [[name, iso3c, description, code] for name, iso3c in countries for description, code in series]
+	data = pd.DataFrame(rows, columns=['Country Name', 'Country Code', 'Indicator Name', 'Indicator Code'])
+	for year in range(1990, 1995):
+		data[str(year)] = rng.rand(len(data))
+		data.loc[rng.rand(len(data)) < 0.2, str(year)] = np.nan
+	data.to_csv(fn, index=False)
+	return data
+
+
+class TestSuite_wdi(unittest.TestCase):
+	"""
+	Test Lazy Series Loading from the Store against the In Memory WDI
+	"""
+
+	def setUp(self):
+		self.source_dir = tempfile.mkdtemp() + '/'
+		synthetic_wdi_csv(self.source_dir + 'WDI_Data.csv')
+		self.memory = WDI(self.source_dir, store=False, verbose=False)
+
+	def tearDown(self):
+		wdimodule.close_stores()
+		shutil.rmtree(self.source_dir)
+
+	def test_store_and_cache(self):
+		wdi = WDI(self.source_dir, store=True, verbose=False)
+		self.assertTrue(os.path.exists(self.source_dir + 'cache/wdi_store.h5'))
+		self.assertEqual(wdi.country_names, self.memory.country_names)
+		self.assertEqual(wdi.series_descriptions, self.memory.series_descriptions)
+		self.assertEqual(wdi._data, None)
+		pd.util.testing.assert_frame_equal(wdi.series('SP.POP.TOTL'), self.memory.series('SP.POP.TOTL'))
+		self.assertEqual(sorted(wdimodule.STORES[wdi.store_fn]['series'].keys()), ['SP.POP.TOTL'])
+		self.assertIs(WDI(self.source_dir, store=True, verbose=False)._store, wdi._store)
+		self.assertEqual(wdi.get('AUS', 'SP.POP.TOTL', 1991), self.memory.get('AUS', 'SP.POP.TOTL', '1991'))
+
+	def test_series_long(self):
+		wdi = WDI(self.source_dir, store=True, verbose=False)
+		codes = ['NY.GDP.MKTP.CD', 'SP.POP.TOTL']
+		result = wdi.series_long(codes)
+		self.assertEqual(list(result.columns), ['GDP', 'TotalPop'])
+		expected = self.memory.series_long(codes[0]).join(self.memory.series_long(codes[1]), how='inner')
+		pd.util.testing.assert_frame_equal(result, expected, check_names=False)
+		outer = wdi.series_long(codes, how='outer')
+		self.assertEqual(outer['GDP'].count(), len(self.memory.series_long(codes[0])))
+
+	def test_unknown_series(self):
+		wdi = WDI(self.source_dir, store=True, verbose=False)
+		self.assertRaises(KeyError, wdi.series_long, ['NY.GDP.MKTP.CD', 'XX.UNKNOWN'])
+		self.assertRaises(KeyError, self.memory.series_long, 'XX.UNKNOWN', how='outer')
+
+	def test_cache_dir(self):
+		self.assertFalse(os.path.exists(self.source_dir + 'cache/'))
+		cache_dir = tempfile.mkdtemp()
+		try:
+			wdi = WDI(self.source_dir, store=True, cache_dir=cache_dir, verbose=False)
+			self.assertTrue(os.path.exists(os.path.join(cache_dir, 'wdi_store.h5')))
+			self.assertFalse(os.path.exists(self.source_dir + 'cache/'))
+			self.assertEqual(wdi.get('USA', 'SP.POP.TOTL', 1994), self.memory.get('USA', 'SP.POP.TOTL', 1994))
+		finally:
+			wdimodule.close_stores()
+			shutil.rmtree(cache_dir)
+
+	def test_lookup(self):
+		wdi = WDI(self.source_dir, store=True, verbose=False)
+		cntry = ['AUS', 'CHN', 'TWN', 'AUS', 'USA']
+		year = [1990, 1991, 1992, 1990, 1994]
+		result = wdi.lookup(cntry, 'NY.GDP.MKTP.CD', year)
+		expected = [self.memory.get(c, 'NY.GDP.MKTP.CD', str(y)) for c, y in zip(cntry[:2], year[:2])]
+		np.testing.assert_array_equal(result.values[:2], expected)
+		self.assertTrue(np.isnan(result.values[2]))
+		self.assertEqual(result.values[0], result.values[3])
+		overrides = {('TWN', 'NY.GDP.MKTP.CD', 1992) : 17400.0}
+		self.assertEqual(wdi.lookup('TWN', 'NY.GDP.MKTP.CD', 1992, overrides=overrides).values[0], 17400.0)
+		self.assertRaises(KeyError, wdi.lookup, cntry, 'NY.GDP.MKTP.CD', year, missing='raise')
+		self.assertEqual(len(wdi.lookup(cntry, 'NY.GDP.MKTP.CD', year, missing='drop')), len(result.dropna()))
+		self.assertEqual(wdi.lookup(cntry, 'NY.GDP.MKTP.CD', year, missing=0.0).values[2], 0.0)
@@ -8,7 +8,6 @@ Handles the interaction with WDI Data Files
 Future Work:
 ------------
 #. Integrate ``MyDatasets`` Library for Dataset Management
-#. Incorporate Pickle Functionality for Quicker Retrieval of Data, rather than fetching the object all the time from the file. 
 #. Check all functionality has been migrated from previous standalone WDI library
 #. Allow fetching using World Bank API? [Current focus is on working with the downloadable WDI file]
 
@@ -19,14 +18,93 @@ Future Work:
 import os
 import sys
 import re
+import numpy as np
 import pandas as pd
 import itertools as it
 import pprint
 import warnings
 
+from pyeconlab.util import lookup_keys, lookup_values
 from .meta import WDISeriesCodes, CodeToName
 codes = WDISeriesCodes()
 
+### --- WDI Store --- ###
+
+STORE_DIR = "cache/"
+STORE_FN = "wdi_store.h5"
+STORES = dict()                                         #-Process Level Cache {fn : {'hdf', 'series', 'country_names', 'series_descriptions', 'years'}}-#
+
+def wdi_csv_to_store(csv_fn, fn, chunksize=100000, complevel=9, complib='zlib', verbose=True):
+    """
+    Convert WDI_Data.csv to an HDF Store Indexed by Series Code (One Time Conversion)
+
+    Parameters
+    ----------
+    csv_fn      :   str
+                    WDI_Data.csv file
+    fn          :   str
+                    HDF store file
+    chunksize   :   int, optional(default=100000)
+                    Number of rows read at a time
+
+    Notes
+    -----
+    1. Store Structure: ::
+
+        data        (table)     iso3c, series_code, years(t), ... ,years(T)     [series_code is an indexed data column]
+        countries   (fixed)     iso3c, name
+        series      (fixed)     series_code, series_description
+
+    2. The store is written to a temporary file and moved into place once complete
+
+    """
+    tmp_fn = fn + ".tmp"
+    if os.path.exists(tmp_fn):
+        os.remove(tmp_fn)
+    store = pd.HDFStore(tmp_fn, complevel=complevel, complib=complib)
+    countries, series = list(), list()
+    if verbose: print "[INFO] Converting %s to %s ..." % (csv_fn, fn)
+    for chunk in pd.read_csv(csv_fn, chunksize=chunksize):
+        chunk = chunk[[column for column in chunk.columns if not str(column).startswith('Unnamed')]]
+        chunk.columns = ['name', 'iso3c', 'series_description', 'series_code'] + [str(column) for column in chunk.columns[4:]]
+        countries.append(chunk[['iso3c', 'name']].drop_duplicates())
+        series.append(chunk[['series_code', 'series_description']].drop_duplicates())
+        data = chunk.drop(['name', 'series_description'], axis=1)
+        store.append('data', data, format='table', data_columns=['series_code'], index=False, min_itemsize={'iso3c' : 8, 'series_code' : 64})
+    store.create_table_index('data', columns=['series_code'], optlevel=9, kind='full')
+    store.put('countries', pd.concat(countries).drop_duplicates('iso3c').reset_index(drop=True))
+    store.put('series', pd.concat(series).drop_duplicates('series_code').reset_index(drop=True))
+    store.close()
+    os.rename(tmp_fn, fn)
+    return fn
+
+def open_store(fn):
+    """ 
+    Open a WDI Store (Read Only) Once per Process
+
+    Notes
+    -----
+    1. The handle, meta data and every series loaded through WDI.series_data() are kept for the life of the process 
+       so new WDI objects on the same store are cheap. Use close_stores() to release them
+
+    """
+    if fn not in STORES:
+        hdf = pd.HDFStore(fn, mode='r')
+        countries, series = hdf['countries'], hdf['series']
+        STORES[fn] = {
+            'hdf'                   :   hdf,
+            'series'                :   dict(),
+            'country_names'         :   dict(zip(countries['iso3c'], countries['name'])),
+            'series_descriptions'   :   dict(zip(series['series_code'], series['series_description'])),
+            'years'                 :   list(hdf.select('data', start=0, stop=0).columns[2:]),
+        }
+    return STORES[fn]
+
+def close_stores():
+    """ Close all WDI Stores opened in this Process """
+    for fn in STORES.keys():
+        STORES.pop(fn)['hdf'].close()
+
 ### --- WDI Data Class --- ###
 
 # source_dir="D:/work-data/datasets/70146f20cf40f818e6733d552c6cabb5/" (current local address)
@@ -39,6 +117,11 @@ class WDI(object):
     ----------
     source_dir  :   string
                     Specify the path to the dataset file. 
+    store       :   bool, optional(default=False)
+                    Use an HDF store (built from WDI_Data.csv on first use) and load series as they are requested. 
+                    If False WDI_Data.csv is parsed and all data is held in memory
+    cache_dir   :   str, optional(default=None)
+                    Directory for the HDF store when store=True [Default: source_dir/cache/]
 
     Notes
     -----
@@ -86,7 +169,8 @@ class WDI(object):
     #-Source Directory-#
     source_dir = "" 
     ## -- WDI Data -- ##
-    data = None                   #Data is by default Wide for Efficient Storage
+    _data = None                  #Data is by default Wide for Efficient Storage
+    _store = None
     country_codes = None
     country_names = dict() 
     series_codes = None         
@@ -99,14 +183,46 @@ class WDI(object):
 
     ## -- Setup and Initialise -- ##
 
-    def __init__(self, source_dir, verbose=True):       #Default - Verbosely setup WDI Object
+    def __init__(self, source_dir, store=False, cache_dir=None, verbose=True):       #Default - Verbosely setup WDI Object
         self.source_dir = source_dir
-        ## -- Load Data -- ##
-        self.data = pd.read_csv(self.source_dir + 'WDI_Data.csv', dtype={'year' : int})                         #Assume Relative Reference to File given as FN
-        self.from_df(self.data)
-        self.start_year = self.data.columns[0]
-        self.end_year = self.data.columns[-1]
+        self.cache_dir = cache_dir if cache_dir is not None else source_dir + STORE_DIR
+        if store:
+            ## -- Open Store -- ##
+            if not os.path.exists(self.store_fn):
+                if not os.path.exists(self.cache_dir):
+                    os.makedirs(self.cache_dir)
+                wdi_csv_to_store(self.source_dir + 'WDI_Data.csv', self.store_fn, verbose=verbose)
+            self._store = open_store(self.store_fn)
+            self.country_names = self._store['country_names']
+            self.country_codes = sorted(self.country_names.keys())
+            self.series_descriptions = self._store['series_descriptions']
+            self.series_codes = sorted(self.series_descriptions.keys())
+            self.start_year = self._store['years'][0]
+            self.end_year = self._store['years'][-1]
+        else:
+            ## -- Load Data -- ##
+            self.data = pd.read_csv(self.source_dir + 'WDI_Data.csv', dtype={'year' : int})                         #Assume Relative Reference to File given as FN
+            self.from_df(self.data)
+            self.start_year = self.data.columns[0]
+            self.end_year = self.data.columns[-1]
         if verbose: print "\n[INFO] Setup of WDI() is complete!\n"
+
+    @property
+    def store_fn(self):
+        return os.path.join(self.cache_dir, STORE_FN)
+
+    @property
+    def data(self):
+        """ Wide Data (iso3c, series_code) x years [Loads all series from the store on first access] """
+        if self._data is None and self._store is not None:
+            data = self._store['hdf'].select('data').set_index(['iso3c', 'series_code'])
+            data.columns.names = ['year']
+            self._data = data
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
         
     ## -- Object Information -- ##
 
@@ -147,13 +263,11 @@ class WDI(object):
         cols[3] = 'series_code' 
         df.columns = pd.Index(cols)
         # Set Meta Data #
-        tmp = df[['name', 'iso3c']].copy(deep=True).drop_duplicates()
-        for idx, s in tmp.iterrows():
-            self.country_names[s['iso3c']] = s['name']
+        tmp = df[['name', 'iso3c']].drop_duplicates()
+        self.country_names = dict(zip(tmp['iso3c'], tmp['name']))
         self.country_codes = sorted(self.country_names.keys())
-        tmp = df[['series_code', 'series_description']].copy(deep=True).drop_duplicates()
-        for idx, s in tmp.iterrows():
-            self.series_descriptions[s['series_code']] = s['series_description']
+        tmp = df[['series_code', 'series_description']].drop_duplicates()
+        self.series_descriptions = dict(zip(tmp['series_code'], tmp['series_description']))
         self.series_codes = sorted(self.series_descriptions.keys())
         del tmp
         # Remove Saved Meta Data from Data Table #
@@ -229,7 +343,41 @@ class WDI(object):
 
         """
         idx = (cntry, series_code)
-        return self.data.get_value(idx, year)
+        if self._data is not None or self._store is None:
+            return self.data.get_value(idx, str(year))
+        return self.series_data([series_code]).get_value(idx, str(year))           #-Memoized series (no copy)-#
+
+    def lookup(self, cntry, series_code, year, missing='nan', overrides=None, verbose=False):
+        """
+        Retrieve Data Values for Arrays of (Country, Series_Code, Year) Keys
+
+        Parameters
+        ----------
+        cntry           :   str or array-like
+                            ISO3C Country Codes
+        series_code     :   str or array-like
+                            WDI Series Codes
+        year            :   int or array-like
+        missing         :   str or value, optional(default='nan')
+                            Missing value policy ('nan', 'raise', 'drop' or a fill value)
+        overrides       :   dict, optional(default=None)
+                            Fallback values {(cntry, series_code, year) : value} for keys without data (i.e. {('TWN', 'NY.GDP.PCAP.PP.KD', 2000) : 17400})
+
+        Returns
+        -------
+        pd.Series indexed by (iso3c, series_code, year) aligned with the keys
+
+        Notes
+        -----
+        1. Scalars are broadcast (i.e. wdi.lookup(df['country'], 'NY.GDP.PCAP.CD', 2000).values)
+        2. Values are found with a single reindex of the requested series in long form
+
+        """
+        cntry, series_code, year = lookup_keys(cntry, series_code, year)
+        data = self.series_data(sorted(set(series_code)), verbose=verbose).stack()
+        data.index = data.index.set_levels(data.index.levels[2].astype(int), level='year')
+        keys = pd.MultiIndex.from_arrays([cntry, series_code, year.astype(int)], names=['iso3c', 'series_code', 'year'])
+        return lookup_values(data, keys, missing=missing, overrides=overrides)
 
     ## -- Filters -- ##
 
@@ -272,6 +420,31 @@ class WDI(object):
 
     ## -- Data Retrieval -- ##
 
+    def series_data(self, series_codes, verbose=False):
+        """
+        Wide Data (iso3c, series_code) x years for a list of series_codes
+
+        Notes
+        -----
+        1. Series are read from the store (only the requested series_codes) and memoized for the process unless 
+           the data attribute is already in memory (store=False, year_filter())
+        2. A single series is returned as the memoized frame (not a copy)
+
+        """
+        if self._data is not None or self._store is None:
+            return self.data.loc[self.data.index.get_level_values('series_code').isin(series_codes)]
+        cache = self._store['series']
+        missing = [code for code in series_codes if code not in cache]
+        if len(missing) > 0:
+            if verbose: print "[INFO] Loading series %s from %s" % (missing, self.store_fn)
+            data = self._store['hdf'].select('data', where='series_code=%r' % [str(code) for code in missing]).set_index(['iso3c', 'series_code'])
+            data.columns.names = ['year']
+            for code in missing:
+                cache[code] = data.loc[data.index.get_level_values('series_code') == code]
+        if len(series_codes) == 1:
+            return cache[series_codes[0]]
+        return pd.concat([cache[code] for code in series_codes])
+
     def series(self, series_code, cntry=None, verbose=False):
         """
         Returns a pd.Series or pd.DataFrame of WDI Series that matches a series_code
@@ -288,23 +461,24 @@ class WDI(object):
         data    :   pd.Series (single country) or pd.DataFrame (list of countries)
 
         """
+        data = self.series_data([series_code], verbose=verbose)
         if cntry == None:
             if verbose: print "No country specified ... returning data for ALL countries"
-            cntry = self.data.index.levels[0]
+            return data
         elif type(cntry) == unicode:                                #Should I use unicode utf-8 OR Strings?
             if verbose: print "Converting Unicode Country (%s) to ASCII String" % cntry
-            cntry.encode('ascii', 'ignore')
-        elif type(cntry) != list:
+            cntry = cntry.encode('ascii', 'ignore')
+        if type(cntry) != list:
             if verbose: print "Returning Series for Country: %s, and Series: %s" % (cntry, series_code)
             name = cntry + "-" + series_code
-            s = self.data.xs(cntry).xs(series_code)
+            s = data.xs(cntry).xs(series_code)
             s.name = name
             return s
         if verbose: print "Returning Series: %s for Countries: %s" % (series_code, cntry)
         idx = list(it.product(cntry, [series_code]))
-        return self.data.ix[idx]
+        return data.reindex(idx)
     
-    def series_long(self, series_code, verbose=False):
+    def series_long(self, series_code, how='inner', verbose=False):
         """
         Returns a DataFrame of WDI Series that matches series_codes
     
@@ -312,32 +486,39 @@ class WDI(object):
         ----------
         series_code     :   string or list(string)
                             WDI Series code      
+        how             :   str, optional(default='inner')
+                            'inner' keeps (iso3c, year) observations with data for all series, 'outer' keeps any observation
 
         Returns
         -------
-        data    :   pd.DataFrame
+        data    :   pd.DataFrame indexed by (iso3c, year) with a column for each series (named with CodeToName)
+
+        Notes
+        -----
+        1. All series are read in one request and reshaped with a single stack/unstack
 
-        ..  Future Work
-            -----------
-            [1] Write Tests
+        Raises
+        ------
+        KeyError
+            If a series_code is not in the dataset
 
         """
         if type(series_code) == str:
             series_code = [series_code]
-        for idx, code in enumerate(series_code):
-            data = self.series(code, cntry=None, verbose=verbose).reset_index()
-            del data['series_code']
-            data = data.set_index(['iso3c']).stack()
-            data = pd.DataFrame(data, columns=[CodeToName[code]])
-            if idx == 0:
-                df = data
-            else:
-                df = df.merge(data, left_index=True, right_index=True)
+        unknown = [code for code in series_code if code not in self.series_descriptions]
+        if len(unknown) > 0:
+            raise KeyError("Series codes not in the WDI dataset: %s" % unknown)
+        data = self.series_data(series_code, verbose=verbose)
+        df = data.stack().unstack(level='series_code')
+        if how == 'inner':
+            df = df.dropna(how='any')
+        elif how != 'outer':
+            raise ValueError("how must be 'inner' or 'outer'")
+        df = df.reindex(columns=series_code)
+        df.columns = pd.Index([CodeToName.get(code, code) for code in series_code])
         #-Ensure Years are Integers-#
-        df = df.reset_index()
-        df['year'] = df['year'].apply(lambda x: int(x))
-        df = df.set_index(['iso3c', 'year'])
-        return df
+        df.index = df.index.set_levels(df.index.levels[1].astype(int), level='year')
+        return df.sortlevel()
 
     def year_data(self, year, verbose=False):
         """ 